@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark the cost of streaming the scores in chunks along the entity dimension during filtered evaluation.
+
+With ``score_chunk_size``, the chunks which contain the true entities are scored twice: once to obtain the true scores,
+and once more when streaming all chunks, cf. :func:`pykeen.evaluation.evaluator.predict_true_scores_chunked`. This
+benchmark reports the evaluation time and the number of computed scores relative to unchunked evaluation.
+"""
+
+import functools
+import itertools as itt
+import time
+from datetime import datetime
+
+import click
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+from tqdm import tqdm
+
+from pykeen.evaluation import RankBasedEvaluator
+from pykeen.models import model_resolver
+from pykeen.triples import CoreTriplesFactory
+from pykeen.triples.generation import generate_triples
+from pykeen.utils import get_benchmark
+from pykeen.version import get_git_hash
+
+CHUNKED_EVALUATION_DIRECTORY = get_benchmark('chunked_evaluation')
+tsv_path = CHUNKED_EVALUATION_DIRECTORY / 'chunked_evaluation_benchmark.tsv'
+png_path = CHUNKED_EVALUATION_DIRECTORY / 'chunked_evaluation_benchmark.png'
+columns = [
+    'hash',
+    'model',
+    'num_entities',
+    'batch_size',
+    'score_chunk_size',
+    'replicate',
+    'time',
+    'num_scores',
+]
+
+
+def _log(s):
+    tqdm.write(f'[{datetime.now().strftime("%H:%M:%S")}] {s}')
+
+
+def _count_scores(model, counter):
+    """Count the number of scores computed by the model's chunked prediction."""
+    predict_chunks = model.predict_chunks
+
+    @functools.wraps(predict_chunks)
+    def _wrapped(*args, **kwargs):
+        for chunk in predict_chunks(*args, **kwargs):
+            counter[0] += chunk.numel()
+            yield chunk
+
+    model.predict_chunks = _wrapped
+
+
+@click.command()
+@click.option('-r', '--replicates', type=int, default=3, show_default=True)
+@click.option('-m', '--model', 'model_name', default='distmult', show_default=True)
+@click.option('-e', '--num-entities', type=int, default=20_000, show_default=True)
+@click.option('-n', '--num-triples', type=int, default=1_000, show_default=True)
+@click.option('-b', '--batch-size', type=int, default=256, show_default=True)
+@click.option('-d', '--embedding-dim', type=int, default=64, show_default=True)
+def main(replicates: int, model_name: str, num_entities: int, num_triples: int, batch_size: int, embedding_dim: int):
+    """Compare the time for filtered evaluation with and without chunked scoring."""
+    git_hash = get_git_hash()
+    factory = CoreTriplesFactory.create(
+        mapped_triples=generate_triples(
+            num_entities=num_entities, num_relations=10, num_triples=num_triples, compact=False, random_state=42,
+        ),
+        num_entities=num_entities,
+        num_relations=10,
+    )
+    model = model_resolver.make(model_name, triples_factory=factory, embedding_dim=embedding_dim)
+    num_scores = [0]
+    _count_scores(model, counter=num_scores)
+    chunk_sizes = [None] + [num_entities // 2 ** i for i in (1, 3, 5)]
+
+    click.echo(f'output directory: {CHUNKED_EVALUATION_DIRECTORY.as_posix()}')
+    rows = []
+    for score_chunk_size, replicate in tqdm(
+        itt.product(chunk_sizes, range(1, 1 + replicates)),
+        total=len(chunk_sizes) * replicates,
+    ):
+        evaluator = RankBasedEvaluator(score_chunk_size=score_chunk_size, automatic_memory_optimization=False)
+        num_scores[0] = 0
+        t = time.time()
+        evaluator.evaluate(
+            model=model,
+            mapped_triples=factory.mapped_triples,
+            additional_filter_triples=factory.mapped_triples,
+            batch_size=batch_size,
+            use_tqdm=False,
+        )
+        elapsed = time.time() - t
+        # without chunking, the scores are not computed via predict_chunks
+        scores = num_scores[0] or 2 * factory.num_triples * num_entities
+        _log(f'score_chunk_size={score_chunk_size} time={elapsed:.3f}s scores={scores:,}')
+        rows.append((
+            git_hash,
+            model_name,
+            num_entities,
+            batch_size,
+            score_chunk_size or num_entities,
+            replicate,
+            elapsed,
+            scores,
+        ))
+
+    df = pd.DataFrame(rows, columns=columns)
+    df.to_csv(tsv_path, sep='\t', index=False)
+    _make(df, git_hash)
+
+
+def _make(df, git_hash):
+    """Make the chart comparing the evaluation times by chunk size."""
+    fig, ax = plt.subplots(1, 1)
+    sns.barplot(data=df, x='score_chunk_size', y='time', ax=ax)
+    ax.set_xlabel('Score Chunk Size')
+    ax.set_ylabel('Evaluation Time (s)')
+    ax.set_title(git_hash)
+    fig.tight_layout()
+    fig.savefig(png_path, dpi=300)
+    plt.close(fig)
+
+
+if __name__ == '__main__':
+    main()
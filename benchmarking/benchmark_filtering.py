@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark the speed of the filterers for negative sampling."""
+
+import itertools as itt
+import time
+from datetime import datetime
+
+import click
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+import torch
+from humanize import intword
+from tqdm import tqdm
+
+from pykeen.datasets import get_dataset
+from pykeen.sampling.filtering import filterer_resolver
+from pykeen.utils import get_benchmark
+from pykeen.version import get_git_hash
+
+FILTERING_DIRECTORY = get_benchmark('filtering')
+tsv_path = FILTERING_DIRECTORY / 'filtering_benchmark.tsv'
+png_path = FILTERING_DIRECTORY / 'filtering_benchmark.png'
+columns = [
+    'hash',
+    'dataset',
+    'dataset_size',
+    'filterer',
+    'device',
+    'replicate',
+    'build_time',
+    'query_time',
+    'num_queries',
+    'false_positives',
+]
+
+
+def _log(s):
+    tqdm.write(f'[{datetime.now().strftime("%H:%M:%S")}] {s}')
+
+
+def _synthetic(num_triples: int, num_entities: int, num_relations: int, seed: int = 42) -> torch.LongTensor:
+    """Generate random triples."""
+    generator = torch.manual_seed(seed)
+    return torch.stack([
+        torch.randint(num_entities, size=(num_triples,), generator=generator),
+        torch.randint(num_relations, size=(num_triples,), generator=generator),
+        torch.randint(num_entities, size=(num_triples,), generator=generator),
+    ], dim=-1).unique(dim=0)
+
+
+def _corrupt(mapped_triples: torch.LongTensor, num_negs_per_pos: int, seed: int) -> torch.LongTensor:
+    """Corrupt heads or tails of the given triples uniformly at random."""
+    generator = torch.manual_seed(seed)
+    num_entities = mapped_triples[:, [0, 2]].max().item() + 1
+    negatives = mapped_triples.repeat_interleave(num_negs_per_pos, dim=0)
+    columns = 2 * torch.randint(2, size=(negatives.shape[0],), generator=generator)
+    negatives[torch.arange(negatives.shape[0]), columns] = torch.randint(
+        num_entities, size=(negatives.shape[0],), generator=generator,
+    )
+    return negatives.view(-1, num_negs_per_pos, 3)
+
+
+@click.command()
+@click.option('-r', '--replicates', type=int, default=3, show_default=True)
+@click.option('-n', '--num-negs-per-pos', type=int, default=32, show_default=True)
+@click.option('-b', '--batch-size', type=int, default=4096, show_default=True)
+@click.option('--max-batches', type=int, default=16, show_default=True)
+@click.option('--device', default='cuda' if torch.cuda.is_available() else 'cpu', show_default=True)
+@click.option('--skip-python-set', is_flag=True, help='Skip the (slow) Python set-based filterer.')
+def main(replicates: int, num_negs_per_pos: int, batch_size: int, max_batches: int, device: str, skip_python_set: bool):
+    """Compare the filterers on FB15k-237 and synthetic graphs of increasing size."""
+    git_hash = get_git_hash()
+    device = torch.device(device)
+    filterers = sorted(filterer_resolver.lookup_dict)
+    if skip_python_set:
+        filterers.remove('pythonset')
+
+    dataset = get_dataset(dataset='fb15k237')
+    graphs = {'FB15k-237': torch.cat([factory.mapped_triples for factory in dataset.factory_dict.values()])}
+    for num_triples in (10 ** 6, 10 ** 7):
+        graphs[f'synthetic-{intword(num_triples)}'] = _synthetic(
+            num_triples=num_triples, num_entities=num_triples // 10, num_relations=1_000,
+        )
+
+    click.echo(f'output directory: {FILTERING_DIRECTORY.as_posix()}')
+    rows = []
+    # the exact results, to count the false positives
+    exact_filterers = {}
+    for (dataset_name, mapped_triples), filterer, replicate in tqdm(
+        itt.product(graphs.items(), filterers, range(1, 1 + replicates)),
+        total=len(graphs) * len(filterers) * replicates,
+    ):
+        mapped_triples = mapped_triples.to(device)
+        t = time.time()
+        instance = filterer_resolver.make(filterer, mapped_triples=mapped_triples).to(device)
+        build_time = time.time() - t
+
+        positive_batches = mapped_triples[torch.randperm(mapped_triples.shape[0])].split(batch_size)[:max_batches]
+        negative_batches = [
+            _corrupt(batch.cpu(), num_negs_per_pos=num_negs_per_pos, seed=replicate).to(device)
+            for batch in positive_batches
+        ]
+        if dataset_name not in exact_filterers:
+            exact_filterers[dataset_name] = filterer_resolver.make('sortedarray', mapped_triples=mapped_triples)
+        exact = exact_filterers[dataset_name]
+
+        query_time = 0.0
+        false_positives = 0
+        for negative_batch in negative_batches:
+            if device.type == 'cuda':
+                torch.cuda.synchronize()
+            t = time.time()
+            mask = instance(negative_batch=negative_batch)
+            if device.type == 'cuda':
+                torch.cuda.synchronize()
+            query_time += time.time() - t
+            false_positives += (~mask & ~exact.contains(batch=negative_batch)).sum().item()
+        _log(f'{dataset_name} {filterer} build={build_time:.3f}s query={query_time:.3f}s')
+        rows.append((
+            git_hash,
+            dataset_name,
+            mapped_triples.shape[0],
+            filterer,
+            device.type,
+            replicate,
+            build_time,
+            query_time,
+            sum(batch.shape[0] * batch.shape[1] for batch in negative_batches),
+            false_positives,
+        ))
+
+    df = pd.DataFrame(rows, columns=columns)
+    df.to_csv(tsv_path, sep='\t', index=False)
+    _make(df, git_hash)
+
+
+def _make(df, git_hash):
+    """Make the chart comparing the query times by filterer."""
+    fig, ax = plt.subplots(1, 1)
+    sns.barplot(data=df, y='dataset', x='query_time', hue='filterer', ax=ax)
+    ax.set_xscale('log')
+    ax.set_xlabel('Query Time (s)')
+    ax.set_ylabel('')
+    ax.set_title(git_hash)
+    fig.tight_layout()
+    fig.savefig(png_path, dpi=300)
+    plt.close(fig)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,7 @@ import logging
 import os
 import time
 from datetime import datetime
+from typing import Dict, Tuple
 
 import click
 import matplotlib.pyplot as plt
@@ -17,7 +18,7 @@ from humanize import intword
 from tqdm import tqdm
 
 from pykeen.datasets import dataset_resolver, get_dataset
-from pykeen.triples.splitting import split
+from pykeen.triples.splitting import CleanupSplitter, CoverageSplitter, Splitter
 from pykeen.utils import get_benchmark
 from pykeen.version import get_git_hash
 
@@ -44,6 +45,15 @@ columns = [
 ]
 
 
+#: the splitting methods, including the cleanup variants to compare
+SPLITTERS: Dict[str, Splitter] = {
+    'cleanup': CleanupSplitter(cleaner='deterministic'),
+    'cleanup-randomized': CleanupSplitter(cleaner='randomized'),
+    'cleanup-batched-randomized': CleanupSplitter(cleaner='batchedrandomized'),
+    'coverage': CoverageSplitter(),
+}
+
+
 def _log(s):
     tqdm.write(f'[{datetime.now().strftime("%H:%M:%S")}] {s}')
 
@@ -51,7 +61,11 @@ def _log(s):
 @click.command()
 @click.option('-r', '--replicates', type=int, default=5, show_default=True)
 @click.option('-f', '--force', is_flag=True)
-def main(replicates: int, force: bool):
+@click.option(
+    '-m', '--method', 'methods', type=click.Choice(sorted(SPLITTERS)), multiple=True,
+    help='The splitting methods to benchmark. Defaults to all of them.',
+)
+def main(replicates: int, force: bool, methods: Tuple[str, ...]):
     import pykeen.triples.splitting
     pykeen.triples.splitting.logger.setLevel(logging.ERROR)
     import pykeen.triples.triples_factory
@@ -60,7 +74,7 @@ def main(replicates: int, force: bool):
     pykeen.utils.logger.setLevel(logging.ERROR)
 
     git_hash = get_git_hash()
-    methods = ['cleanup', 'coverage']
+    methods = methods or sorted(SPLITTERS)
     ratios = [0.8]
 
     click.echo(f'output directory: {SPLITTING_DIRECTORY.as_posix()}')
@@ -103,10 +117,9 @@ def main(replicates: int, force: bool):
         )
         for method, ratio, replicate in inner_it:
             t = time.time()
-            results = split(
-                mapped_triples,
+            results = SPLITTERS[method].split(
+                mapped_triples=mapped_triples,
                 ratios=[ratio, (1 - ratio) / 2],
-                method=method,
                 random_state=replicate,
             )
             split_time = time.time() - t
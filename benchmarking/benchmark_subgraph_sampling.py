@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark the speed of the subgraph samplers used for R-GCN training."""
+
+import itertools as itt
+import time
+from datetime import datetime
+
+import click
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+import torch
+from humanize import intword
+from tqdm import tqdm
+
+from pykeen.datasets import get_dataset
+from pykeen.triples.instances import FrontierSubGraphSLCWAInstances, SubGraphSLCWAInstances
+from pykeen.utils import get_benchmark
+from pykeen.version import get_git_hash
+
+SAMPLING_DIRECTORY = get_benchmark('subgraph_sampling')
+tsv_path = SAMPLING_DIRECTORY / 'subgraph_sampling_benchmark.tsv'
+png_path = SAMPLING_DIRECTORY / 'subgraph_sampling_benchmark.png'
+samplers = {
+    'reference': SubGraphSLCWAInstances,
+    'frontier': FrontierSubGraphSLCWAInstances,
+}
+columns = [
+    'hash',
+    'dataset',
+    'dataset_size',
+    'sampler',
+    'batch_size',
+    'replicate',
+    'build_time',
+    'sample_time',
+    'num_batches',
+]
+
+
+def _log(s):
+    tqdm.write(f'[{datetime.now().strftime("%H:%M:%S")}] {s}')
+
+
+def _synthetic(num_triples: int, num_entities: int, num_relations: int, seed: int = 42) -> torch.LongTensor:
+    """Generate random triples."""
+    generator = torch.manual_seed(seed)
+    return torch.stack([
+        torch.randint(num_entities, size=(num_triples,), generator=generator),
+        torch.randint(num_relations, size=(num_triples,), generator=generator),
+        torch.randint(num_entities, size=(num_triples,), generator=generator),
+    ], dim=-1).unique(dim=0)
+
+
+@click.command()
+@click.option('-r', '--replicates', type=int, default=3, show_default=True)
+@click.option('-b', '--batch-size', type=int, multiple=True, default=[256, 4096], show_default=True)
+@click.option('--num-batches', type=int, default=4, show_default=True)
+@click.option('--skip-reference', is_flag=True, help='Skip the (slow) reference sampler for the synthetic graphs.')
+def main(replicates: int, batch_size, num_batches: int, skip_reference: bool):
+    """Compare the subgraph samplers on FB15k-237 and a synthetic graph."""
+    git_hash = get_git_hash()
+
+    dataset = get_dataset(dataset='fb15k237')
+    graphs = {'FB15k-237': dataset.training.mapped_triples}
+    num_triples = 10 ** 6
+    graphs[f'synthetic-{intword(num_triples)}'] = _synthetic(
+        num_triples=num_triples, num_entities=num_triples // 10, num_relations=1_000,
+    )
+
+    click.echo(f'output directory: {SAMPLING_DIRECTORY.as_posix()}')
+    rows = []
+    for (dataset_name, mapped_triples), (sampler, cls), size, replicate in tqdm(
+        itt.product(graphs.items(), samplers.items(), batch_size, range(1, 1 + replicates)),
+        total=len(graphs) * len(samplers) * len(batch_size) * replicates,
+    ):
+        if skip_reference and sampler == 'reference' and dataset_name != 'FB15k-237':
+            continue
+        torch.manual_seed(replicate)
+        t = time.time()
+        instance = cls(mapped_triples=mapped_triples, batch_size=size)
+        build_time = time.time() - t
+
+        t = time.time()
+        for _ in range(num_batches):
+            instance.subgraph_sample()
+        sample_time = (time.time() - t) / num_batches
+        _log(f'{dataset_name} {sampler} batch_size={size} build={build_time:.3f}s sample={sample_time:.4f}s/batch')
+        rows.append((
+            git_hash,
+            dataset_name,
+            mapped_triples.shape[0],
+            sampler,
+            size,
+            replicate,
+            build_time,
+            sample_time,
+            num_batches,
+        ))
+
+    df = pd.DataFrame(rows, columns=columns)
+    df.to_csv(tsv_path, sep='\t', index=False)
+    _make(df, git_hash)
+
+
+def _make(df, git_hash):
+    """Make the chart comparing the sampling times per batch by sampler."""
+    g = sns.catplot(data=df, y='dataset', x='sample_time', hue='sampler', col='batch_size', kind='bar')
+    g.set(xscale='log')
+    g.set_axis_labels('Sampling Time per Batch (s)', '')
+    g.fig.suptitle(git_hash)
+    g.tight_layout()
+    g.savefig(png_path, dpi=300)
+    plt.close(g.fig)
+
+
+if __name__ == '__main__':
+    main()
@@ -199,6 +199,7 @@ def get_relation_pattern_types_df(
     parts: Optional[Collection[str]] = None,
     force: bool = False,
     add_labels: bool = True,
+    num_workers: Optional[int] = None,
 ) -> pd.DataFrame:
     r"""
     Categorize relations based on patterns from RotatE [sun2019]_.
@@ -238,6 +239,9 @@ def get_relation_pattern_types_df(
         Whether to enforce re-calculation even if a cached version is available.
     :param add_labels:
         Whether to add relation labels (if available).
+    :param num_workers:
+        The number of worker processes for checking ternary patterns, cf.
+        :func:`pykeen.triples.analysis.iter_ternary_patterns_sparse`.
 
     .. warning ::
 
@@ -262,7 +266,7 @@ def get_relation_pattern_types_df(
         # select triples
         mapped_triples = torch.cat([dataset.factory_dict[part].mapped_triples for part in parts], dim=0).tolist()
 
-        df = triple_analysis.relation_pattern_types(mapped_triples=mapped_triples)
+        df = triple_analysis.relation_pattern_types(mapped_triples=mapped_triples, num_workers=num_workers)
 
         # save to file
         cache_path.parent.mkdir(exist_ok=True, parents=True)
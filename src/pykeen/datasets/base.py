@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import pathlib
 import tarfile
@@ -16,7 +17,6 @@ import click
 import docdata
 import pandas as pd
 import requests
-import torch
 from more_click import verbose_option
 from pystow.utils import download, name_from_url
 from tabulate import tabulate
@@ -26,6 +26,7 @@ from ..triples import CoreTriplesFactory, TriplesFactory
 from ..triples.deteriorate import deteriorate
 from ..triples.remix import remix
 from ..triples.triples_factory import splits_similarity
+from ..triples.utils import _read_metadata, _write_metadata
 from ..typing import TorchRandomHint
 from ..utils import normalize_path, normalize_string
 
@@ -81,7 +82,10 @@ class Dataset:
     #: the dataset's name
     metadata: Optional[Mapping[str, Any]] = None
 
-    metadata_file_name: ClassVar[str] = "metadata.pth"
+    metadata_file_name: ClassVar[str] = "metadata.json"
+    #: the pickle file for metadata entries which cannot be stored as JSON; in the legacy binary format, it contains
+    #: all metadata
+    legacy_metadata_file_name: ClassVar[str] = "metadata.pth"
     triples_factory_cls: ClassVar[Type[CoreTriplesFactory]] = TriplesFactory
 
     def __eq__(self, __o: object) -> bool:  # noqa: D105
@@ -197,7 +201,10 @@ class Dataset:
 
     @classmethod
     def from_directory_binary(cls, path: Union[str, pathlib.Path]) -> "Dataset":
-        """Load a dataset from a directory."""
+        """Load a dataset from a directory written by :meth:`to_directory_binary`.
+
+        The triples are memory-mapped, cf. :meth:`pykeen.triples.CoreTriplesFactory.from_path_binary`.
+        """
         path = pathlib.Path(path)
 
         if not path.is_dir():
@@ -212,7 +219,8 @@ class Dataset:
             else:
                 logger.warning(f"{tf_path.as_uri()} does not exist.")
         metadata_path = path.joinpath(cls.metadata_file_name)
-        metadata = torch.load(metadata_path) if metadata_path.is_file() else None
+        metadata = json.loads(metadata_path.read_text()) if metadata_path.is_file() else None
+        metadata = _read_metadata(path=path.joinpath(cls.legacy_metadata_file_name), metadata=metadata)
         return EagerDataset(**tfs, metadata=metadata)
 
     def to_directory_binary(self, path: Union[str, pathlib.Path]) -> None:
@@ -224,7 +232,8 @@ class Dataset:
             logger.info(f"Stored {key} factory to {tf_path.as_uri()}")
         metadata = dict(self.metadata or {})
         metadata.setdefault("name", self.get_normalized_name())
-        torch.save(metadata, path.joinpath(self.metadata_file_name))
+        metadata = _write_metadata(path=path.joinpath(self.legacy_metadata_file_name), metadata=metadata)
+        path.joinpath(self.metadata_file_name).write_text(json.dumps(metadata, indent=2))
 
     @staticmethod
     def from_tf(tf: TriplesFactory, ratios: Optional[List[float]] = None) -> "Dataset":
@@ -369,6 +378,15 @@ class LazyDataset(Dataset):
     def _load_validation(self) -> None:
         raise NotImplementedError
 
+    def _get_source_paths(self) -> Optional[Sequence[pathlib.Path]]:
+        """Get the paths of the files from which the dataset is built.
+
+        :returns:
+            The paths, or None if the preprocessed dataset must not be cached, cf. :func:`pykeen.datasets.get_dataset`.
+            The files may not exist before the dataset is loaded for the first time.
+        """
+        return None
+
     def _help_cache(self, cache_root: Union[None, str, pathlib.Path]) -> pathlib.Path:
         """Get the appropriate cache root directory.
 
@@ -452,6 +470,10 @@ class PathDataset(LazyDataset):
                 load_triples_kwargs=self.load_triples_kwargs,
             )
 
+    # docstr-coverage: inherited
+    def _get_source_paths(self) -> Optional[Sequence[pathlib.Path]]:  # noqa: D102
+        return [path for path in (self.training_path, self.testing_path, self.validation_path) if path is not None]
+
     def __repr__(self) -> str:  # noqa: D105
         return (
             f'{self.__class__.__name__}(training_path="{self.training_path}", testing_path="{self.testing_path}",'
@@ -674,6 +696,10 @@ class PackedZipRemoteDataset(LazyDataset):
             relation_to_id=self._training.relation_to_id,
         )
 
+    # docstr-coverage: inherited
+    def _get_source_paths(self) -> Optional[Sequence[pathlib.Path]]:  # noqa: D102
+        return [self.path]
+
     def _load_helper(
         self,
         relative_path: pathlib.PurePath,
@@ -753,6 +779,13 @@ class CompressedSingleDataset(LazyDataset):
     def _get_path(self) -> pathlib.Path:
         return self.cache_root.joinpath(self.name)
 
+    # docstr-coverage: inherited
+    def _get_source_paths(self) -> Optional[Sequence[pathlib.Path]]:  # noqa: D102
+        # without a fixed seed, the split is not reproducible
+        if not isinstance(self.random_state, int):
+            return None
+        return [self._get_path()]
+
     def _load(self) -> None:
         df = self._get_df()
         tf_path = self._get_path()
@@ -852,6 +885,14 @@ class TabbedDataset(LazyDataset):
     def _get_path(self) -> Optional[pathlib.Path]:
         """Get the path of the data if there's a single file."""
 
+    # docstr-coverage: inherited
+    def _get_source_paths(self) -> Optional[Sequence[pathlib.Path]]:  # noqa: D102
+        path = self._get_path()
+        # without a fixed seed, the split is not reproducible
+        if path is None or not isinstance(self.random_state, int):
+            return None
+        return [path]
+
     def _get_df(self) -> pd.DataFrame:
         raise NotImplementedError
 
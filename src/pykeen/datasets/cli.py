@@ -19,7 +19,15 @@ from tqdm import tqdm
 from tqdm.contrib.logging import logging_redirect_tqdm
 
 from .base import Dataset
-from .utils import dataset_regex_option, iter_dataset_instances, max_triples_option, min_triples_option
+from .utils import (
+    _cached_get_dataset,
+    dataset_regex_option,
+    iter_dataset_classes,
+    iter_dataset_instances,
+    max_triples_option,
+    min_triples_option,
+    prune_dataset_cache,
+)
 from ..constants import PYKEEN_DATASETS
 from ..evaluation.evaluator import get_candidate_set_size
 from ..metrics.ranking import (
@@ -244,6 +252,43 @@ def verify(dataset_regex: Optional[str], min_triples: Optional[int], max_triples
     click.echo(df.to_markdown())
 
 
+@main.group()
+def cache():
+    """Manage the cache of preprocessed datasets."""
+
+
+@cache.command(name="build")
+@verbose_option
+@dataset_regex_option
+@min_triples_option
+@max_triples_option
+@force_option
+def build_cache(dataset_regex: Optional[str], min_triples: Optional[int], max_triples: Optional[int], force: bool):
+    """Preprocess datasets with their default parameters, and store them in the cache."""
+    for name, _ in iter_dataset_classes(
+        regex_name_filter=dataset_regex, min_triples=min_triples, max_triples=max_triples
+    ):
+        click.secho(f"Caching {name}", fg="green", bold=True)
+        try:
+            _cached_get_dataset(name, dataset_kwargs=None, force=force, cache=True)
+        except Exception as e:
+            click.secho(f"Failed {name}", fg="red", bold=True)
+            click.secho(str(e), fg="red", bold=True)
+
+
+@cache.command(name="prune")
+@verbose_option
+@click.option("--dataset", help="The name of the dataset. If not given, prune the cache of all datasets.")
+@click.option("--all", "prune_all", is_flag=True, help="Remove all entries, and not only the outdated ones.")
+def prune_cache(dataset: Optional[str], prune_all: bool):
+    """Remove outdated entries from the cache of preprocessed datasets."""
+    from . import dataset_resolver
+
+    name = dataset_resolver.normalize(dataset) if dataset else None
+    for path in prune_dataset_cache(name=name, prune_all=prune_all):
+        click.echo(f"Removed {path.as_uri()}")
+
+
 @main.command()
 @verbose_option
 @dataset_regex_option
@@ -4,20 +4,28 @@
 
 import base64
 import hashlib
+import json
 import logging
 import pathlib
 import re
-from typing import Any, Collection, Iterable, Mapping, Optional, Pattern, Tuple, Type, Union
+import shutil
+import tempfile
+from typing import Any, Collection, Iterable, List, Mapping, Optional, Pattern, Sequence, Tuple, Type, Union
 
 import click
+import pystow
 from tqdm import tqdm
 
-from .base import Dataset, EagerDataset, PathDataset
+from .base import Dataset, EagerDataset, LazyDataset, PathDataset
 from ..constants import PYKEEN_DATASETS
 from ..triples import CoreTriplesFactory
+from ..version import get_version
 
 logger = logging.getLogger(__name__)
 
+#: The name of the file which marks a complete entry in the cache of preprocessed datasets
+CACHE_INFO_FILE_NAME = "cache.json"
+
 dataset_regex_option = click.option("--dataset-regex", help="Regex for filtering datasets by name")
 max_triples_option = click.option("--max-triples", type=int)
 min_triples_option = click.option("--min-triples", type=int)
@@ -95,9 +103,17 @@ def get_dataset(
     training: Union[None, str, pathlib.Path, CoreTriplesFactory] = None,
     testing: Union[None, str, pathlib.Path, CoreTriplesFactory] = None,
     validation: Union[None, str, pathlib.Path, CoreTriplesFactory] = None,
+    cache: Optional[bool] = None,
 ) -> Dataset:
     """Get a dataset, cached based on the given kwargs.
 
+    Datasets which are retrieved by name, and which are built from files, e.g., subclasses of
+    :class:`pykeen.datasets.base.PathDataset` or :class:`pykeen.datasets.base.SingleTabbedDataset`, are cached after
+    preprocessing, i.e., mapping labels to IDs and splitting. The cache is stored in the binary format of
+    :meth:`pykeen.datasets.Dataset.to_directory_binary` under :data:`pykeen.constants.PYKEEN_DATASETS`, and is keyed
+    by the dataset's name, its keyword-based parameters, and a fingerprint of the source files. Use
+    ``pykeen datasets cache`` to prebuild or prune the cache.
+
     :param dataset: The name of a dataset, an instance of a dataset, or the class for a dataset.
     :param dataset_kwargs: The keyword arguments, only to be used when a class for a dataset is used for
         the ``dataset`` keyword argument.
@@ -105,6 +121,8 @@ def get_dataset(
     :param testing: A triples factory for testing triples or a path to a testing triples file  if ``dataset=None``
     :param validation: A triples factory for validation triples or a path to a validation triples file
         if ``dataset=None``
+    :param cache: Whether to use the cache of preprocessed datasets. If None, defaults to the configuration value
+        ``pykeen.datasets_cache``, e.g., set by the environment variable ``PYKEEN_DATASETS_CACHE``, or True.
     :returns: An instantiated dataset
 
     :raises ValueError: for incorrect usage of the input of the function
@@ -133,7 +151,7 @@ def get_dataset(
 
     if isinstance(dataset, str):
         if has_dataset(dataset):
-            return _cached_get_dataset(dataset, dataset_kwargs)
+            return _cached_get_dataset(dataset, dataset_kwargs, cache=cache)
         else:
             # Assume it's a file path
             return Dataset.from_path(dataset)
@@ -183,16 +201,52 @@ def _digest_kwargs(dataset_kwargs: Mapping[str, Any], ignore: Collection[str] =
 
 def _set_inverse_triples_(dataset_instance: Dataset, create_inverse_triples: bool) -> Dataset:
     # note: we only need to set the create_inverse_triples in the training factory.
-    dataset_instance.training.create_inverse_triples = create_inverse_triples
-    if create_inverse_triples:
-        dataset_instance.training.num_relations *= 2
+    training = dataset_instance.training
+    if training.create_inverse_triples != create_inverse_triples:
+        dataset_instance.training = training.clone_and_exchange_triples(
+            mapped_triples=training.mapped_triples,
+            create_inverse_triples=create_inverse_triples,
+        )
     return dataset_instance
 
 
+def _is_cache_enabled(cache: Optional[bool] = None) -> bool:
+    """Check whether the cache of preprocessed datasets is enabled, cf. :func:`get_dataset`."""
+    if cache is not None:
+        return cache
+    return pystow.get_config("pykeen", "datasets_cache", dtype=bool, default=True)
+
+
+def _get_source_fingerprint(paths: Sequence[pathlib.Path]) -> Optional[str]:
+    """Fingerprint the source files of a dataset, or return None if any of them does not exist.
+
+    The fingerprint is a hash of the files' paths, sizes, and modification times, as well as the PyKEEN version. The
+    file contents are not hashed, since this would require reading archives of several gigabytes on every start.
+    """
+    digester = hashlib.sha256()
+    digester.update(get_version().encode(encoding="utf8"))
+    for path in paths:
+        if not path.is_file():
+            return None
+        stat = path.stat()
+        digester.update(f"{path.resolve().as_posix()}:{stat.st_size}:{stat.st_mtime_ns}".encode(encoding="utf8"))
+    return base64.urlsafe_b64encode(digester.digest()).decode("utf8")[:32]
+
+
+def _iter_cache_directories(name: Optional[str] = None) -> Iterable[pathlib.Path]:
+    """Iterate over the directories of cached preprocessed datasets."""
+    pattern = f"{name or '*'}/cache/*/*/{CACHE_INFO_FILE_NAME}"
+    for path in sorted(PYKEEN_DATASETS.glob(pattern)):
+        # skip temporary directories of entries which are currently written
+        if not path.parent.name.startswith("."):
+            yield path.parent
+
+
 def _cached_get_dataset(
     dataset: str,
     dataset_kwargs: Optional[Mapping[str, Any]],
     force: bool = False,
+    cache: Optional[bool] = None,
 ) -> Dataset:
     """Get dataset by name, potentially using file-based cache."""
     from . import dataset_resolver
@@ -205,22 +259,86 @@ def _cached_get_dataset(
     dataset_cls = dataset_resolver.lookup(dataset)
     dataset = dataset_resolver.normalize_cls(dataset_cls)
 
-    ''' # get canonic path 
-    path = PYKEEN_DATASETS.joinpath(dataset, "cache", digest)
-
-    # try to use cached dataset
-    if path.is_dir() and not force:
-        logger.info(f"Loading cached preprocessed dataset from {path.as_uri()}")
-        return _set_inverse_triples_(
-            dataset_cls.from_directory_binary(path),
-            create_inverse_triples=dataset_kwargs.get("create_inverse_triples", False),
-        )'''
-
-    # load dataset without cache
+    # the lazy dataset does not load any triples yet
     dataset_instance = dataset_resolver.make(dataset, dataset_kwargs)
+    if not _is_cache_enabled(cache) or not isinstance(dataset_instance, LazyDataset):
+        return dataset_instance
+    source_paths = dataset_instance._get_source_paths()
+    if source_paths is None:
+        return dataset_instance
 
-    # store cache
-    #logger.info(f"Caching preprocessed dataset to {path.as_uri()}")
-    #dataset_instance.to_directory_binary(path=path)
+    # try to use cached dataset
+    fingerprint = _get_source_fingerprint(source_paths)
+    if fingerprint is not None and not force:
+        path = PYKEEN_DATASETS.joinpath(dataset, "cache", digest, fingerprint)
+        if path.joinpath(CACHE_INFO_FILE_NAME).is_file():
+            logger.info(f"Loading cached preprocessed dataset from {path.as_uri()}")
+            cached = _set_inverse_triples_(
+                dataset_cls.from_directory_binary(path),
+                create_inverse_triples=dataset_kwargs.get("create_inverse_triples", False),
+            )
+            # fill the requested (lazy) dataset instance, such that the dataset's class is preserved
+            dataset_instance._training = cached.training
+            dataset_instance._testing = cached.testing
+            dataset_instance._validation = cached.validation
+            return dataset_instance
+
+    # load dataset without cache; this also downloads missing source files
+    _ = dataset_instance.validation
+    fingerprint = _get_source_fingerprint(source_paths)
+    if fingerprint is None:
+        logger.warning(f"Not caching {dataset} since its source files are missing: {source_paths}")
+        return dataset_instance
+
+    # store cache. Write to a temporary directory first, such that concurrent processes never see partial results.
+    path = PYKEEN_DATASETS.joinpath(dataset, "cache", digest, fingerprint)
+    logger.info(f"Caching preprocessed dataset to {path.as_uri()}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = pathlib.Path(tempfile.mkdtemp(dir=path.parent, prefix=".tmp-"))
+    try:
+        dataset_instance.to_directory_binary(path=tmp_path)
+        tmp_path.joinpath(CACHE_INFO_FILE_NAME).write_text(
+            json.dumps(
+                dict(
+                    dataset=dataset,
+                    dataset_kwargs=dataset_kwargs,
+                    source_paths=[source_path.as_posix() for source_path in source_paths],
+                    fingerprint=fingerprint,
+                ),
+                indent=2,
+                default=str,
+            )
+        )
+        if force and path.exists():
+            shutil.rmtree(path)
+        # another process may have created the same entry in the meantime
+        if not path.exists():
+            tmp_path.rename(path)
+    except OSError as error:
+        logger.warning(f"Could not cache preprocessed dataset to {path.as_uri()}: {error}")
+    finally:
+        if tmp_path.exists():
+            shutil.rmtree(tmp_path)
 
     return dataset_instance
+
+
+def prune_dataset_cache(name: Optional[str] = None, prune_all: bool = False) -> List[pathlib.Path]:
+    """Remove outdated entries from the cache of preprocessed datasets.
+
+    An entry is outdated if its source files have been modified or removed since it was created.
+
+    :param name: The normalized name of a dataset. If None, prune the cache of all datasets.
+    :param prune_all: Whether to remove all entries, including those which are up to date.
+    :returns: The removed cache directories.
+    """
+    removed = []
+    for path in _iter_cache_directories(name=name):
+        info = json.loads(path.joinpath(CACHE_INFO_FILE_NAME).read_text())
+        fingerprint = _get_source_fingerprint([pathlib.Path(source_path) for source_path in info["source_paths"]])
+        if not prune_all and fingerprint == info["fingerprint"]:
+            continue
+        logger.info(f"Removing cached preprocessed dataset from {path.as_uri()}")
+        shutil.rmtree(path)
+        removed.append(path)
+    return removed
@@ -2,12 +2,14 @@
 
 """Implementation of wrapper around sklearn metrics."""
 
-from typing import Mapping, MutableMapping, Optional, Tuple, Type, cast
+import logging
+from typing import Mapping, MutableMapping, Optional, Set, Tuple, Type, cast
 
 import numpy as np
 import torch
 
 from .evaluator import Evaluator, MetricResults
+from .score_histogram import ScoreHistogram
 from ..constants import TARGET_TO_INDEX
 from ..metrics.classification import classification_metric_resolver
 from ..metrics.utils import Metric
@@ -18,6 +20,8 @@ __all__ = [
     "ClassificationMetricResults",
 ]
 
+logger = logging.getLogger(__name__)
+
 CLASSIFICATION_METRICS: Mapping[str, Type[Metric]] = {cls().key: cls for cls in classification_metric_resolver}
 
 
@@ -38,21 +42,45 @@ class ClassificationMetricResults(MetricResults):
             data[key] = value
         return ClassificationMetricResults(data=data)
 
+    @classmethod
+    def from_histogram(cls, histogram: ScoreHistogram):
+        """Return an instance of these metrics from a histogram of the positive and negative scores."""
+        return ClassificationMetricResults(
+            data={key: histogram.compute(metric) for key, metric in CLASSIFICATION_METRICS.items()}
+        )
+
     # docstr-coverage: inherited
     def get_metric(self, name: str) -> float:  # noqa: D102
         return self.data[name]
 
 
 class ClassificationEvaluator(Evaluator):
-    """An evaluator that uses a classification metrics."""
+    """An evaluator that uses a classification metrics.
+
+    By default, the scores are accumulated in a :class:`pykeen.evaluation.score_histogram.ScoreHistogram`, whose
+    memory does not depend on the number of evaluation triples. The metrics are then exact up to the documented
+    error bounds of the histogram. With ``exact=True``, all scores are kept, and the metrics are computed by
+    :mod:`sklearn` / :mod:`rexmex` instead.
+    """
 
     all_scores: MutableMapping[Tuple[Target, int, int], np.ndarray]
     all_positives: MutableMapping[Tuple[Target, int, int], np.ndarray]
 
-    def __init__(self, **kwargs):
+    #: the histogram of positive and negative scores, if not exact
+    histogram: Optional[ScoreHistogram]
+    #: the keys which have been added to the histogram
+    seen: Set[Tuple[Target, int, int]]
+
+    def __init__(self, exact: bool = False, resolution: float = 1.0e-03, **kwargs):
         """
         Initialize the evaluator.
 
+        :param exact:
+            whether to keep all scores and compute the metrics exactly, which requires memory linear in the number of
+            evaluation triples times the number of entities
+        :param resolution: >0
+            the bin width of the score histogram, if not exact, cf.
+            :class:`pykeen.evaluation.score_histogram.ScoreHistogram`
         :param kwargs:
             keyword-based parameters passed to :meth:`Evaluator.__init__`.
         """
@@ -63,6 +91,8 @@ class ClassificationEvaluator(Evaluator):
         )
         self.all_scores = {}
         self.all_positives = {}
+        self.histogram = None if exact else ScoreHistogram(resolution=resolution)
+        self.seen = set()
 
     # docstr-coverage: inherited
     def process_scores_(
@@ -76,10 +106,25 @@ class ClassificationEvaluator(Evaluator):
         if dense_positive_mask is None:
             raise KeyError("Sklearn evaluators need the positive mask!")
 
+        remaining = [i for i in range(hrt_batch.shape[1]) if i != TARGET_TO_INDEX[target]]
+        if self.histogram is not None:
+            # Ensure that each key gets counted only once; within a batch, the last occurrence is used
+            rows = {
+                key: i
+                for i, key in enumerate((target, *key) for key in hrt_batch[:, remaining].tolist())
+                if key not in self.seen
+            }
+            self.seen.update(rows.keys())
+            indices = torch.as_tensor(list(rows.values()), dtype=torch.long, device=scores.device)
+            self.histogram.update(
+                scores=scores[indices].detach().cpu().numpy(),
+                positives=dense_positive_mask[indices].detach().cpu().numpy(),
+            )
+            return
+
         # Transfer to cpu and convert to numpy
         scores = scores.detach().cpu().numpy()
         dense_positive_mask = dense_positive_mask.detach().cpu().numpy()
-        remaining = [i for i in range(hrt_batch.shape[1]) if i != TARGET_TO_INDEX[target]]
         keys = hrt_batch[:, remaining].detach().cpu().numpy()
 
         # Ensure that each key gets counted only once
@@ -92,8 +137,36 @@ class ClassificationEvaluator(Evaluator):
             self.all_scores[key] = scores[i]
             self.all_positives[key] = dense_positive_mask[i]
 
+    # docstr-coverage: inherited
+    def merge(self, other: Evaluator) -> None:  # noqa: D102
+        if not isinstance(other, ClassificationEvaluator):
+            raise TypeError(f"Cannot merge {other.__class__.__name__} into {self.__class__.__name__}")
+        if (self.histogram is None) != (other.histogram is None):
+            raise ValueError("Cannot merge an exact and a histogram-based evaluator.")
+        if self.histogram is not None and other.histogram is not None:
+            duplicates = self.seen.intersection(other.seen)
+            if duplicates:
+                # the histogram cannot tell which counts belong to which key
+                logger.warning(
+                    f"{len(duplicates)} keys have been processed by both evaluators, and are counted twice. Use "
+                    f"exact=True, or shard the evaluation triples by key, to avoid this.",
+                )
+            self.seen.update(other.seen)
+            self.histogram.merge(other.histogram)
+            return
+        # same semantics as processing the other evaluator's batches after the own ones
+        self.all_scores.update(other.all_scores)
+        self.all_positives.update(other.all_positives)
+
     # docstr-coverage: inherited
     def finalize(self) -> ClassificationMetricResults:  # noqa: D102
+        if self.histogram is not None:
+            result = ClassificationMetricResults.from_histogram(self.histogram)
+            # Clear buffers
+            self.histogram = ScoreHistogram(resolution=self.histogram.resolution)
+            self.seen.clear()
+            return result
+
         # Because the order of the values of an dictionary is not guaranteed,
         # we need to retrieve scores and masks using the exact same key order.
         all_keys = list(self.all_scores.keys())
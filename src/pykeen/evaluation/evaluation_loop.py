@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
 """Evaluation loops for KGE models."""
+import copy
 import dataclasses
 import logging
+import math
 from abc import abstractmethod
 from collections import defaultdict
 from typing import Any, Collection, DefaultDict, Generic, Iterable, List, Mapping, Optional, Tuple, TypeVar, Union, cast
@@ -11,13 +13,12 @@ import numpy
 import pandas
 import torch
 from class_resolver import HintOrType, OptionalKwargs
-from torch.utils.data import Dataset
+from torch.utils.data import Dataset, Subset
 from torch.utils.data.dataloader import DataLoader
 from torch_max_mem import MemoryUtilizationMaximizer
 from tqdm.auto import tqdm
 
-from .evaluator import Evaluator, MetricResults, filter_scores_
-from ..constants import TARGET_TO_INDEX
+from .evaluator import Evaluator, MetricResults, predict_true_scores_chunked
 from ..models import Model
 from ..triples import CoreTriplesFactory
 from ..typing import LABEL_HEAD, LABEL_RELATION, LABEL_TAIL, InductiveMode, MappedTriples, OneOrSequence, Target
@@ -78,6 +79,18 @@ def _evaluate(
     :return:
         the evaluation results
     """
+    _process_all(loop=loop, batch_size=batch_size, use_tqdm=use_tqdm, tqdm_kwargs=tqdm_kwargs, **kwargs)
+    return loop.evaluator.finalize()
+
+
+def _process_all(
+    loop: "EvaluationLoop",
+    batch_size: int,
+    use_tqdm: bool,
+    tqdm_kwargs: OptionalKwargs,
+    **kwargs,
+) -> None:
+    """Process all batches of the loop's dataset, accumulating the results in the loop's evaluator."""
     loop.model.eval()
     loader = loop.get_loader(batch_size=batch_size, **kwargs)
     total = len(loader)
@@ -92,7 +105,40 @@ def _evaluate(
         )
     for batch in loader:
         loop.process_batch(batch=batch)
-    return loop.evaluator.finalize()
+
+
+def _evaluate_shard(
+    loop: "EvaluationLoop",
+    start: int,
+    stop: int,
+    batch_size: int,
+    num_threads: int,
+    kwargs: Mapping[str, Any],
+) -> Evaluator:
+    """
+    Evaluate a contiguous shard of the loop's dataset in a worker process.
+
+    :param loop:
+        the evaluation loop. Its model is expected to reside in shared memory.
+    :param start:
+        the first index of the shard
+    :param stop:
+        the last index of the shard (exclusive)
+    :param batch_size:
+        the batch size
+    :param num_threads:
+        the number of threads to use for intra-op parallelism in the worker
+    :param kwargs:
+        additional keyword-based parameters passed to :meth:`EvaluationLoop.get_loader`
+
+    :return:
+        the evaluator holding the (unfinalized) buffers for the shard
+    """
+    torch.set_num_threads(num_threads)
+    loop.dataset = Subset(loop.dataset, indices=range(start, stop))
+    with torch.inference_mode():
+        _process_all(loop=loop, batch_size=batch_size, use_tqdm=False, tqdm_kwargs=None, **kwargs)
+    return loop.evaluator
 
 
 class EvaluationLoop(Generic[BatchType]):
@@ -163,6 +209,9 @@ class EvaluationLoop(Generic[BatchType]):
         # tqdm
         use_tqdm: bool = True,
         tqdm_kwargs: OptionalKwargs = None,
+        # sharding
+        num_shards: int = 1,
+        start_method: Optional[str] = None,
         # data loader
         **kwargs,
     ) -> MetricResults:
@@ -178,6 +227,11 @@ class EvaluationLoop(Generic[BatchType]):
             whether to use tqdm progress bar
         :param tqdm_kwargs:
             additional keyword-based parameters passed to tqdm
+        :param num_shards:
+            the number of worker processes to split the dataset across, cf. :meth:`evaluate_sharded`
+        :param start_method:
+            the start method for worker processes, cf. :func:`torch.multiprocessing.get_context`. Only used for more
+            than one shard.
         :param kwargs:
             additional keyword-based parameters passed to :meth:`get_loader`
 
@@ -192,6 +246,10 @@ class EvaluationLoop(Generic[BatchType]):
                 batch_size = len(self.dataset)
         # set model to evaluation mode
         self.model.eval()
+        if num_shards > 1:
+            return self.evaluate_sharded(
+                num_shards=num_shards, batch_size=batch_size, start_method=start_method, **kwargs
+            )
         # delegate to AMO wrapper
         return _evaluate(
             loop=self,
@@ -201,6 +259,65 @@ class EvaluationLoop(Generic[BatchType]):
             **kwargs,
         )
 
+    def evaluate_sharded(
+        self,
+        num_shards: int,
+        batch_size: int,
+        start_method: Optional[str] = None,
+        **kwargs,
+    ) -> MetricResults:
+        """
+        Evaluate the loop's model on the loop's dataset with multiple CPU worker processes.
+
+        The dataset is split into contiguous shards, which are processed by separate worker processes sharing a copy
+        of the model's parameters via shared memory. Each worker accumulates the (unfinalized) buffers of a copy of the
+        evaluator, which are merged in order via :meth:`pykeen.evaluation.Evaluator.merge` before finalization. Since
+        shard boundaries are aligned with batch boundaries, each batch is scored exactly as in single-process
+        evaluation, and the results are identical.
+
+        .. note ::
+            the model is copied once into shared memory, i.e., the peak memory requirement includes a second copy of
+            the model's parameters and buffers. The caller's model is left unchanged.
+
+        :param num_shards:
+            the number of shards, i.e., worker processes
+        :param batch_size:
+            the batch size. Automatic memory optimization is not supported for sharded evaluation.
+        :param start_method:
+            the start method for worker processes, cf. :func:`torch.multiprocessing.get_context`
+        :param kwargs:
+            additional keyword-based parameters passed to :meth:`get_loader`
+
+        :return:
+            the evaluation results.
+
+        :raises ValueError:
+            if the model does not reside on the CPU
+        """
+        if self.model.device.type != "cpu":
+            raise ValueError(f"Sharded evaluation is only supported on CPU, but the model is on {self.model.device}.")
+        self.model.eval()
+        # share a copy of the model's parameters & buffers instead of copying them to each worker. The copy is created
+        # outside inference mode, since parameters created inside would be inference tensors.
+        with torch.inference_mode(False):
+            model = copy.deepcopy(self.model)
+        model.share_memory()
+        loop = copy.copy(self)
+        loop.model = model
+        # align shard boundaries with batches
+        num_batches = math.ceil(len(self.dataset) / batch_size)
+        bounds = [min(len(self.dataset), batch_size * (i * num_batches // num_shards)) for i in range(num_shards + 1)]
+        num_threads = max(1, torch.get_num_threads() // num_shards)
+        context = torch.multiprocessing.get_context(start_method)
+        with context.Pool(processes=num_shards) as pool:
+            evaluators = pool.starmap(
+                _evaluate_shard,
+                [(loop, start, stop, batch_size, num_threads, kwargs) for start, stop in zip(bounds, bounds[1:])],
+            )
+        for evaluator in evaluators:
+            self.evaluator.merge(evaluator)
+        return self.evaluator.finalize()
+
 
 @dataclasses.dataclass
 class FilterIndex:
@@ -463,26 +580,41 @@ class LCWAEvaluationLoop(EvaluationLoop[Mapping[Target, MappedTriples]]):
         for target, (hrt_batch, filter_batch) in batch.items():
             # TODO: in theory, we could make a single score calculation for e.g.,
             # {(h, r, t1), (h, r, t1), ..., (h, r, tk)}
-            # predict scores for all candidates
-            scores = self.model.predict(hrt_batch=hrt_batch, target=target, mode=self.mode)
-            true_scores = dense_positive_mask = None
-
             # filter scores
             if self.evaluator.filtered:
                 if filter_batch is None:
                     raise AssertionError("Filter indices are required to filter scores.")
-                # extract true scores
-                batch_ids = torch.arange(scores.shape[0], device=scores.device)
-                target_ids = hrt_batch[:, TARGET_TO_INDEX[target]]
-                true_scores = scores[batch_ids, target_ids, None]
-                # replace by nan
-                scores = filter_scores_(scores=scores, filter_batch=filter_batch)
-                # rewrite true scores
-                scores[batch_ids, target_ids] = true_scores[:, 0]
+                # delegate filtering and processing of the raw scores to the evaluator
+                chunk_size = self.evaluator.score_chunk_size
+                if chunk_size:
+                    # stream the scores in chunks along the entity dimension
+                    self.evaluator.process_filtered_score_chunks_(
+                        hrt_batch=hrt_batch,
+                        target=target,
+                        true_scores=predict_true_scores_chunked(
+                            self.model, hrt_batch, target, chunk_size=chunk_size, mode=self.mode
+                        ),
+                        score_chunks=self.model.predict_chunks(
+                            hrt_batch, target, chunk_size=chunk_size, mode=self.mode
+                        ),
+                        filter_batch=filter_batch,
+                    )
+                else:
+                    self.evaluator.process_filtered_scores_(
+                        hrt_batch=hrt_batch,
+                        target=target,
+                        scores=self.model.predict(hrt_batch=hrt_batch, target=target, mode=self.mode),
+                        filter_batch=filter_batch,
+                    )
+                continue
+
+            # predict scores for all candidates
+            scores = self.model.predict(hrt_batch=hrt_batch, target=target, mode=self.mode)
+            dense_positive_mask = None
 
             # create dense positive masks
             # TODO: afaik, dense positive masks are not used on GPU -> we do not need to move the masks around
-            elif self.evaluator.requires_positive_mask:
+            if self.evaluator.requires_positive_mask:
                 if filter_batch is None:
                     raise AssertionError("Filter indices are required to create dense positive masks.")
                 dense_positive_mask = torch.zeros_like(scores, dtype=torch.bool, device=filter_batch.device)
@@ -493,6 +625,5 @@ class LCWAEvaluationLoop(EvaluationLoop[Mapping[Target, MappedTriples]]):
                 hrt_batch=hrt_batch,
                 target=target,
                 scores=scores,
-                true_scores=true_scores,
                 dense_positive_mask=dense_positive_mask,
             )
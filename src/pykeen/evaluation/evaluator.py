@@ -34,6 +34,7 @@ from ..utils import (
 __all__ = [
     "Evaluator",
     "MetricResults",
+    "PositiveFilterIndex",
     "filter_scores_",
     "evaluate",
     "prepare_filter_triples",
@@ -101,6 +102,7 @@ class Evaluator(ABC):
         slice_size: Optional[int] = None,
         automatic_memory_optimization: bool = True,
         mode: Optional[InductiveMode] = None,
+        score_chunk_size: Optional[int] = None,
     ):
         """Initialize the evaluator.
 
@@ -112,6 +114,12 @@ class Evaluator(ABC):
             evaluation with regards to the hardware at hand.
         :param mode:
             the inductive mode, or None for transductive evaluation
+        :param score_chunk_size: >0
+            The number of candidate entities to score at once. If given, the scores for filtered evaluation are
+            computed and consumed in chunks along the entity dimension, and never kept for all entities at once. Since
+            the true scores are required before the chunks can be consumed, the chunks containing the true entities
+            are scored twice, cf. :func:`predict_true_scores_chunked`, i.e., the scoring cost grows by up to a factor
+            of two, in exchange for peak memory of `batch_size * score_chunk_size` scores.
         """
         self.filtered = filtered
         self.requires_positive_mask = requires_positive_mask
@@ -119,6 +127,7 @@ class Evaluator(ABC):
         self.slice_size = slice_size
         self.automatic_memory_optimization = automatic_memory_optimization
         self.mode = mode
+        self.score_chunk_size = score_chunk_size
 
     @classmethod
     def get_normalized_name(cls) -> str:
@@ -146,11 +155,82 @@ class Evaluator(ABC):
         """
         raise NotImplementedError
 
+    def process_filtered_scores_(
+        self,
+        hrt_batch: MappedTriples,
+        target: Target,
+        scores: torch.FloatTensor,
+        filter_batch: torch.LongTensor,
+    ) -> None:
+        """Process a batch of triples with their raw scores for all entities, and the sparse filter.
+
+        The default implementation sets the scores of all filtered triples except the true one to NaN, and delegates
+        to :meth:`process_scores_`. Evaluators may override this method to avoid materializing the filtered scores.
+
+        :param hrt_batch: shape: (batch_size, 3)
+        :param target:
+            the prediction target
+        :param scores: shape: (batch_size, num_entities)
+            the raw scores. May be modified in-place.
+        :param filter_batch: shape: (m, 2)
+            the indices of all positives in format (batch_index, entity_id)
+        """
+        batch_ids = torch.arange(scores.shape[0], device=scores.device)
+        target_ids = hrt_batch[:, TARGET_TO_INDEX[target]].to(scores.device)
+        # extract true scores
+        true_scores = scores[batch_ids, target_ids, None]
+        # replace by nan
+        scores = filter_scores_(scores=scores, filter_batch=filter_batch)
+        # rewrite true scores
+        scores[batch_ids, target_ids] = true_scores[:, 0]
+        self.process_scores_(hrt_batch=hrt_batch, target=target, scores=scores, true_scores=true_scores)
+
+    def process_filtered_score_chunks_(
+        self,
+        hrt_batch: MappedTriples,
+        target: Target,
+        true_scores: torch.FloatTensor,
+        score_chunks: Iterable[torch.FloatTensor],
+        filter_batch: torch.LongTensor,
+    ) -> None:
+        """Process a batch of triples with chunks of their raw scores along the entity dimension, and the sparse filter.
+
+        The default implementation concatenates the chunks, and delegates to :meth:`process_filtered_scores_`.
+
+        :param hrt_batch: shape: (batch_size, 3)
+        :param target:
+            the prediction target
+        :param true_scores: shape: (batch_size, 1)
+            the scores of the true triples, as obtained by the same scoring routine as the chunks
+        :param score_chunks: shape: (batch_size, chunk_size_i)
+            the raw scores for consecutive chunks of all entities
+        :param filter_batch: shape: (m, 2)
+            the indices of all positives in format (batch_index, entity_id)
+        """
+        self.process_filtered_scores_(
+            hrt_batch=hrt_batch, target=target, scores=torch.cat(list(score_chunks), dim=1), filter_batch=filter_batch
+        )
+
     @abstractmethod
     def finalize(self) -> MetricResults:
         """Compute the final results, and clear buffers."""
         raise NotImplementedError
 
+    def merge(self, other: "Evaluator") -> None:
+        """
+        Merge the buffers of another evaluator into this one.
+
+        This allows to process disjoint parts of the evaluation triples by separate evaluator instances, e.g., in
+        different processes, and to obtain the results for all triples by merging them before finalization.
+
+        :param other:
+            the other evaluator, of the same type and configuration
+
+        :raises NotImplementedError:
+            if the evaluator does not support merging
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support merging.")
+
     def evaluate(
         self,
         model: Model,
@@ -444,6 +524,10 @@ def create_sparse_positive_filter_(
 
     :raises NotImplementedError:
         if the `filter_col` is not in `{0, 2}`
+
+    .. note ::
+        This function materializes a dense mask of shape (batch_size, num_positive_triples). For repeated lookups,
+        e.g., during evaluation, :class:`PositiveFilterIndex` is considerably more efficient.
     """
     if filter_col not in {0, 2}:
         raise NotImplementedError(
@@ -466,6 +550,79 @@ def create_sparse_positive_filter_(
     return filter_batch, relation_filter
 
 
+class PositiveFilterIndex:
+    """A sorted index over all positive triples for sparse filtering.
+
+    For each filter column, the positive triples are sorted once by the key `(relation, other_entity)`, where the other
+    entity is the tail for head-side filtering and the head for tail-side filtering. The positives of a batch are then
+    obtained by a range lookup via :func:`torch.searchsorted`, such that the filtering cost scales with the number of
+    true positives for the batch rather than with the total number of positive triples.
+    """
+
+    def __init__(self, mapped_triples: MappedTriples):
+        """
+        Initialize the index.
+
+        :param mapped_triples: shape: (num_positive_triples, 3)
+            All positive triples to base the filtering on. The index is created on the same device.
+        """
+        mapped_triples = mapped_triples.long()
+        # the multiplier for the relation component of the composite key
+        self.num_entities = int(mapped_triples[:, [0, 2]].max().item()) + 1 if mapped_triples.numel() else 1
+        self.keys = {}
+        self.values = {}
+        for filter_col in (0, 2):
+            keys, perm = self._keys(hrt_batch=mapped_triples, filter_col=filter_col).sort()
+            self.keys[filter_col] = keys
+            self.values[filter_col] = mapped_triples[perm, filter_col]
+
+    def _keys(self, hrt_batch: MappedTriples, filter_col: int) -> torch.LongTensor:
+        """Compute the composite (relation, other_entity) keys."""
+        other = hrt_batch[:, 2 - filter_col]
+        keys = hrt_batch[:, 1] * self.num_entities + other
+        # entities unknown to the index would otherwise collide with keys of the next relation
+        return torch.where(other < self.num_entities, keys, torch.full_like(keys, fill_value=-1))
+
+    def lookup(self, hrt_batch: MappedTriples, filter_col: int = 0) -> torch.LongTensor:
+        """
+        Compute indices of all positives.
+
+        For simplicity, only the head-side is described, i.e. filter_col=0. The tail-side is processed alike.
+
+        For each (h, r, t) triple in the batch, the entity identifiers are computed such that (h', r, t) exists in all
+        positive triples.
+
+        :param hrt_batch: shape: (batch_size, 3)
+            A batch of triples.
+        :param filter_col:
+            The column along which to filter. Allowed are {0, 2}, where 0 corresponds to filtering head-based and 2
+            corresponds to filtering tail-based.
+
+        :return: shape: (m, 2)
+            The indices of positives in format [(batch_index, entity_id)].
+
+        :raises NotImplementedError:
+            if the `filter_col` is not in `{0, 2}`
+        """
+        if filter_col not in self.keys:
+            raise NotImplementedError(
+                "This code has only been written for updating head (filter_col=0) or "
+                f"tail (filter_col=2) mask, but filter_col={filter_col} was given.",
+            )
+        keys = self.keys[filter_col]
+        query = self._keys(hrt_batch=hrt_batch.long(), filter_col=filter_col)
+        # range lookup in the sorted keys
+        start = torch.searchsorted(keys, query)
+        counts = torch.searchsorted(keys, query, right=True) - start
+        # expand the ranges to individual positions
+        batch_indices = torch.arange(hrt_batch.shape[0], device=keys.device).repeat_interleave(counts)
+        offsets = torch.arange(batch_indices.shape[0], device=keys.device) - (
+            counts.cumsum(dim=0) - counts
+        ).repeat_interleave(counts)
+        positions = start.repeat_interleave(counts) + offsets
+        return torch.stack([batch_indices, self.values[filter_col][positions]], dim=-1)
+
+
 def create_dense_positive_mask_(
     zero_tensor: torch.FloatTensor,
     filter_batch: torch.LongTensor,
@@ -639,12 +796,14 @@ def evaluate(
 
     # Prepare for result filtering
     if evaluator.filtered or evaluator.requires_positive_mask:
-        all_pos_triples = prepare_filter_triples(
-            mapped_triples=mapped_triples,
-            additional_filter_triples=additional_filter_triples,
-        ).to(device=device)
+        positive_filter_index = PositiveFilterIndex(
+            mapped_triples=prepare_filter_triples(
+                mapped_triples=mapped_triples,
+                additional_filter_triples=additional_filter_triples,
+            ).to(device=device),
+        )
     else:
-        all_pos_triples = None
+        positive_filter_index = None
 
     # Send tensors to device
     mapped_triples = mapped_triples.to(device=device)
@@ -677,16 +836,14 @@ def evaluate(
         # batch-wise processing
         for batch in batches:
             batch_size = batch.shape[0]
-            relation_filter = None
             for target in targets:
-                relation_filter = _evaluate_batch(
+                _evaluate_batch(
                     batch=batch,
                     model=model,
                     target=target,
                     evaluator=evaluator,
                     slice_size=slice_size,
-                    all_pos_triples=all_pos_triples,
-                    relation_filter=relation_filter,
+                    positive_filter_index=positive_filter_index,
                     restrict_entities_to=restrict_entities_to,
                     mode=mode,
                 )
@@ -712,18 +869,75 @@ def evaluate(
     return result
 
 
+def predict_true_scores_chunked(
+    model: Model,
+    hrt_batch: MappedTriples,
+    target: Target,
+    *,
+    chunk_size: int,
+    slice_size: Optional[int] = None,
+    mode: Optional[InductiveMode],
+) -> torch.FloatTensor:
+    """
+    Predict the scores of the true triples consistently with :meth:`pykeen.models.Model.predict_chunks`.
+
+    The scores of the true triples are compared to the scores of all other candidates in order to obtain ranks. Since
+    the rounding of the scores may depend on the shape of the scored chunk, and the position within it, scoring the
+    true triples separately, e.g., by :meth:`pykeen.models.Model.predict_hrt`, may artificially break or create ties.
+    Instead, the chunks containing the true candidates are scored for the whole batch, and the true scores are
+    extracted from them. This requires scoring at most `min(batch_size, num_chunks)` chunks, which are scored again
+    when streaming all chunks. Thus, in the worst case, i.e., if each chunk contains a true entity, the total scoring
+    cost doubles. Keeping the chunks instead would bound peak memory only by `batch_size * num_entities` again.
+
+    :param model:
+        the model
+    :param hrt_batch: shape: (batch_size, 3)
+        the triples
+    :param target:
+        the prediction target
+    :param chunk_size: >0
+        the maximum number of candidates to score at once
+    :param slice_size:
+        an optional slice size for computing the scores
+    :param mode:
+        the inductive mode, or None for transductive evaluation
+
+    :return: shape: (batch_size, 1)
+        the scores of the true triples
+    """
+    if target == LABEL_RELATION:
+        num_candidates = model.num_real_relations
+    else:
+        num_candidates = model._get_entity_len(mode=mode) or model.num_entities
+    true_ids = hrt_batch[:, TARGET_TO_INDEX[target]].to(model.device)
+    chunk_ids = torch.div(true_ids, chunk_size, rounding_mode="floor")
+    true_scores: Optional[torch.FloatTensor] = None
+    for chunk_id in chunk_ids.unique().tolist():
+        start = chunk_id * chunk_size
+        ids = torch.arange(start, min(start + chunk_size, num_candidates), device=model.device)
+        # the chunk is scored exactly as when iterating over all chunks
+        (chunk,) = model.predict_chunks(
+            hrt_batch, target, chunk_size=chunk_size, ids=ids, slice_size=slice_size, mode=mode
+        )
+        if true_scores is None:
+            true_scores = chunk.new_empty(hrt_batch.shape[0])
+        rows = torch.nonzero(chunk_ids == chunk_id, as_tuple=True)[0]
+        true_scores[rows] = chunk[rows, true_ids[rows] - start]
+    assert true_scores is not None
+    return true_scores.unsqueeze(dim=-1)
+
+
 def _evaluate_batch(
     batch: MappedTriples,
     model: Model,
     target: Target,
     evaluator: Evaluator,
     slice_size: Optional[int],
-    all_pos_triples: Optional[MappedTriples],
-    relation_filter: Optional[torch.BoolTensor],
+    positive_filter_index: Optional[PositiveFilterIndex],
     restrict_entities_to: Optional[torch.LongTensor],
     *,
     mode: Optional[InductiveMode],
-) -> torch.BoolTensor:
+) -> None:
     """
     Evaluate ranking for batch.
 
@@ -737,10 +951,8 @@ def _evaluate_batch(
         The evaluator
     :param slice_size:
         An optional slice size for computing the scores.
-    :param all_pos_triples:
-        All positive triples (required if filtering is necessary).
-    :param relation_filter:
-        The relation filter. Can be re-used.
+    :param positive_filter_index:
+        The index of all positive triples (required if filtering is necessary).
     :param restrict_entities_to:
         Restriction to evaluate only for these entities.
     :param mode:
@@ -748,29 +960,45 @@ def _evaluate_batch(
 
     :raises ValueError:
         if all positive triples are required (either due to filtered evaluation, or requiring dense masks).
-
-    :return:
-        The relation filter, which can be re-used for the same batch.
     """
-    scores = model.predict(hrt_batch=batch, target=target, slice_size=slice_size, mode=mode)
-
     if evaluator.filtered or evaluator.requires_positive_mask:
         column = TARGET_TO_INDEX[target]
-        if all_pos_triples is None:
+        if positive_filter_index is None:
             raise ValueError(
-                "If filtering_necessary of positive_masks_required is True, all_pos_triples has to be "
+                "If filtering_necessary of positive_masks_required is True, positive_filter_index has to be "
                 "provided, but is None."
             )
 
         # Create filter
-        positive_filter, relation_filter = create_sparse_positive_filter_(
-            hrt_batch=batch,
-            all_pos_triples=all_pos_triples,
-            relation_filter=relation_filter,
-            filter_col=column,
-        )
+        positive_filter = positive_filter_index.lookup(hrt_batch=batch, filter_col=column)
     else:
-        positive_filter = relation_filter = None
+        positive_filter = None
+
+    if evaluator.filtered and not evaluator.requires_positive_mask and restrict_entities_to is None:
+        assert positive_filter is not None
+        # let the evaluator process the raw scores together with the sparse filter
+        if evaluator.score_chunk_size:
+            evaluator.process_filtered_score_chunks_(
+                hrt_batch=batch,
+                target=target,
+                true_scores=predict_true_scores_chunked(
+                    model, batch, target, chunk_size=evaluator.score_chunk_size, slice_size=slice_size, mode=mode
+                ),
+                score_chunks=model.predict_chunks(
+                    batch, target, chunk_size=evaluator.score_chunk_size, slice_size=slice_size, mode=mode
+                ),
+                filter_batch=positive_filter,
+            )
+        else:
+            evaluator.process_filtered_scores_(
+                hrt_batch=batch,
+                target=target,
+                scores=model.predict(hrt_batch=batch, target=target, slice_size=slice_size, mode=mode),
+                filter_batch=positive_filter,
+            )
+        return
+
+    scores = model.predict(hrt_batch=batch, target=target, slice_size=slice_size, mode=mode)
 
     if evaluator.filtered:
         assert positive_filter is not None
@@ -807,8 +1035,6 @@ def _evaluate_batch(
         dense_positive_mask=positive_mask,
     )
 
-    return relation_filter
-
 
 def get_candidate_set_size(
     mapped_triples: MappedTriples,
@@ -2,10 +2,11 @@
 
 """Implementation of ranked based evaluator."""
 
+import copy
+import hashlib
 import itertools
 import logging
-import math
-import random
+import pathlib
 from collections import defaultdict
 from typing import Iterable, List, Mapping, MutableMapping, Optional, Sequence, Tuple, Type, TypeVar, Union, cast
 
@@ -17,6 +18,7 @@ import torch
 from class_resolver import HintOrType, OptionalKwargs
 
 from .evaluator import Evaluator, MetricResults, prepare_filter_triples
+from .rank_statistics import RankStatistics
 from .ranking_metric_lookup import MetricKey
 from .ranks import Ranks
 from ..constants import TARGET_TO_INDEX
@@ -36,7 +38,9 @@ from ..typing import (
     MappedTriples,
     RankType,
     Target,
+    TorchRandomHint,
 )
+from ..utils import ensure_torch_random_state
 
 __all__ = [
     "RankBasedEvaluator",
@@ -88,6 +92,27 @@ def _iter_ranks(
         yield SIDE_BOTH, rank_type, c_ranks, c_num_candidates, c_weights
 
 
+def _iter_statistics(
+    statistics: Mapping[Tuple[Target, RankType], RankStatistics],
+) -> Iterable[Tuple[ExtendedTarget, RankType, RankStatistics]]:
+    # terminate early if there are no statistics
+    if not statistics:
+        logger.debug("Empty statistics. This should only happen during size probing.")
+        return
+
+    sides = sorted({side for side, _ in statistics.keys()})
+    for rank_type in RANK_TYPES:
+        # individual side
+        for side in sides:
+            yield side, rank_type, statistics[side, rank_type]
+
+        # combined
+        combined = copy.deepcopy(statistics[sides[0], rank_type])
+        for side in sides[1:]:
+            combined.merge(statistics[side, rank_type])
+        yield SIDE_BOTH, rank_type, combined
+
+
 class RankBasedMetricResults(MetricResults):
     """Results from computing metrics."""
 
@@ -111,6 +136,20 @@ class RankBasedMetricResults(MetricResults):
             }
         )
 
+    @classmethod
+    def from_statistics(
+        cls,
+        metrics: Iterable[RankBasedMetric],
+        statistics: Iterable[Tuple[ExtendedTarget, RankType, RankStatistics]],
+    ) -> "RankBasedMetricResults":
+        """Create rank-based metric results from the given (streaming) rank statistics."""
+        return cls(
+            data={
+                (metric.key, target, rank_type): this_statistics.compute(metric)
+                for metric, (target, rank_type, this_statistics) in itertools.product(metrics, statistics)
+            }
+        )
+
     @classmethod
     def create_random(cls, random_state: Optional[int] = None) -> "RankBasedMetricResults":
         """Create random results useful for testing."""
@@ -229,6 +268,7 @@ class RankBasedEvaluator(Evaluator):
     num_entities: Optional[int]
     ranks: MutableMapping[Tuple[Target, RankType], List[np.ndarray]]
     num_candidates: MutableMapping[Target, List[np.ndarray]]
+    statistics: MutableMapping[Tuple[Target, RankType], RankStatistics]
 
     def __init__(
         self,
@@ -236,6 +276,8 @@ class RankBasedEvaluator(Evaluator):
         metrics: Optional[Sequence[HintOrType[RankBasedMetric]]] = None,
         metrics_kwargs: OptionalKwargs = None,
         add_defaults: bool = True,
+        streaming: bool = False,
+        chunk_size: Optional[int] = None,
         **kwargs,
     ):
         """Initialize rank-based evaluator.
@@ -249,6 +291,14 @@ class RankBasedEvaluator(Evaluator):
             additional keyword parameter
         :param add_defaults:
             whether to add all default metrics besides the ones specified by `metrics` / `metrics_kwargs`.
+        :param streaming:
+            whether to only keep mergeable sufficient statistics of the ranks rather than all individual ranks, cf.
+            :class:`pykeen.evaluation.rank_statistics.RankStatistics`. The individual ranks are only stored if any of
+            the metrics requires the full rank distribution, e.g., the median rank.
+        :param chunk_size:
+            an optional chunk size along the entity dimension for the computation of filtered ranks from the full
+            scores, cf. :meth:`pykeen.evaluation.ranks.Ranks.from_filtered_scores`. To also score the entities in
+            chunks, use `score_chunk_size` instead, cf. :class:`pykeen.evaluation.Evaluator`.
         :param kwargs: Additional keyword arguments that are passed to the base class.
         """
         super().__init__(
@@ -271,6 +321,9 @@ class RankBasedEvaluator(Evaluator):
             self.metrics.extend(rank_based_metric_resolver.make_many(metrics, metrics_kwargs))
         self.ranks = defaultdict(list)
         self.num_candidates = defaultdict(list)
+        self.streaming = streaming
+        self.statistics = {}
+        self.chunk_size = chunk_size
         self.num_entities = None
 
     # docstr-coverage: inherited
@@ -285,39 +338,237 @@ class RankBasedEvaluator(Evaluator):
         if true_scores is None:
             raise ValueError(f"{self.__class__.__name__} needs the true scores!")
 
-        batch_ranks = Ranks.from_scores(
-            true_score=true_scores,
-            all_scores=scores,
+        self.process_ranks_(
+            hrt_batch=hrt_batch,
+            target=target,
+            ranks=Ranks.from_scores(true_score=true_scores, all_scores=scores),
+            num_entities=scores.shape[1],
         )
-        self.num_entities = scores.shape[1]
-        for rank_type, v in batch_ranks.items():
-            self.ranks[target, rank_type].append(v.detach().cpu().numpy())
-        self.num_candidates[target].append(batch_ranks.number_of_options.detach().cpu().numpy())
 
     # docstr-coverage: inherited
-    def finalize(self) -> RankBasedMetricResults:  # noqa: D102
+    def process_filtered_scores_(
+        self,
+        hrt_batch: MappedTriples,
+        target: Target,
+        scores: torch.FloatTensor,
+        filter_batch: torch.LongTensor,
+    ) -> None:  # noqa: D102
+        batch_ranks = Ranks.from_filtered_scores(
+            scores=scores,
+            true_indices=hrt_batch[:, TARGET_TO_INDEX[target]],
+            filter_batch=filter_batch,
+            chunk_size=self.chunk_size,
+        )
+        self._process_filtered_ranks(
+            hrt_batch=hrt_batch, target=target, ranks=batch_ranks, num_entities=scores.shape[1]
+        )
+
+    # docstr-coverage: inherited
+    def process_filtered_score_chunks_(
+        self,
+        hrt_batch: MappedTriples,
+        target: Target,
+        true_scores: torch.FloatTensor,
+        score_chunks: Iterable[torch.FloatTensor],
+        filter_batch: torch.LongTensor,
+    ) -> None:  # noqa: D102
+        num_entities = 0
+
+        def _count(chunks: Iterable[torch.FloatTensor]) -> Iterable[torch.FloatTensor]:
+            nonlocal num_entities
+            for chunk in chunks:
+                num_entities += chunk.shape[1]
+                yield chunk
+
+        batch_ranks = Ranks.from_filtered_score_chunks(
+            true_scores=true_scores,
+            score_chunks=_count(score_chunks),
+            true_indices=hrt_batch[:, TARGET_TO_INDEX[target]],
+            filter_batch=filter_batch,
+        )
+        self._process_filtered_ranks(hrt_batch=hrt_batch, target=target, ranks=batch_ranks, num_entities=num_entities)
+
+    def _process_filtered_ranks(self, hrt_batch: MappedTriples, target: Target, ranks: Ranks, num_entities: int):
+        """Process filtered ranks, and warn if all candidates have been filtered."""
+        if (ranks.number_of_options <= 1).any():
+            logger.warning(
+                "User selected filtered metric computation, but all corrupted triples exists also as positive triples",
+            )
+        self.process_ranks_(hrt_batch=hrt_batch, target=target, ranks=ranks, num_entities=num_entities)
+
+    def process_ranks_(
+        self,
+        hrt_batch: MappedTriples,
+        target: Target,
+        ranks: Ranks,
+        num_entities: int,
+    ) -> None:
+        """Process a batch of triples with their (filtered) ranks.
+
+        :param hrt_batch: shape: (batch_size, 3)
+        :param target:
+            the prediction target
+        :param ranks:
+            the ranks of the true triples
+        :param num_entities:
+            the number of candidate entities
+        """
+        self.num_entities = num_entities
+        num_candidates = ranks.number_of_options.detach().cpu().numpy()
+        for rank_type, v in ranks.items():
+            if self.streaming:
+                if (target, rank_type) not in self.statistics:
+                    self.statistics[target, rank_type] = RankStatistics.for_metrics(self.metrics)
+                self.statistics[target, rank_type].update(ranks=v.detach().cpu().numpy(), num_candidates=num_candidates)
+            else:
+                self.ranks[target, rank_type].append(v.detach().cpu().numpy())
+        if not self.streaming:
+            self.num_candidates[target].append(num_candidates)
+
+    def compute(self) -> RankBasedMetricResults:
+        """
+        Compute the results for all ranks processed so far, without clearing the buffers.
+
+        :return:
+            the metric results
+
+        :raises ValueError:
+            if no scores have been processed yet
+        """
         if self.num_entities is None:
             raise ValueError
-        result = RankBasedMetricResults.from_ranks(
+        if self.streaming:
+            return RankBasedMetricResults.from_statistics(
+                metrics=self.metrics, statistics=_iter_statistics(self.statistics)
+            )
+        return RankBasedMetricResults.from_ranks(
             metrics=self.metrics,
             rank_and_candidates=_iter_ranks(ranks=self.ranks, num_candidates=self.num_candidates),
         )
-        # Clear buffers
+
+    def clear(self) -> None:
+        """Clear the buffers."""
         self.ranks.clear()
         self.num_candidates.clear()
+        self.statistics.clear()
+
+    # docstr-coverage: inherited
+    def merge(self, other: Evaluator) -> None:  # noqa: D102
+        if not isinstance(other, RankBasedEvaluator):
+            raise TypeError(f"Cannot merge {other.__class__.__name__} into {self.__class__.__name__}")
+        if self.streaming != other.streaming:
+            raise ValueError("Cannot merge the results of streaming and non-streaming evaluators.")
+        for key, statistics in other.statistics.items():
+            if key in self.statistics:
+                self.statistics[key].merge(statistics)
+            else:
+                self.statistics[key] = copy.deepcopy(statistics)
+        for key, ranks in other.ranks.items():
+            self.ranks[key].extend(ranks)
+        for target, num_candidates in other.num_candidates.items():
+            self.num_candidates[target].extend(num_candidates)
+        if self.num_entities is None:
+            self.num_entities = other.num_entities
 
+    # docstr-coverage: inherited
+    def finalize(self) -> RankBasedMetricResults:  # noqa: D102
+        result = self.compute()
+        self.clear()
         return result
 
 
+#: the maximum number of elements of intermediate (batch_size, num_candidates) tensors when sampling negatives
+_NEGATIVE_SAMPLING_BUDGET = 2**22
+
+
+def _sample_negatives_side(
+    evaluation_triples: MappedTriples,
+    filter_triples: MappedTriples,
+    column: int,
+    num_samples: int,
+    num_entities: int,
+    generator: Optional[torch.Generator],
+) -> torch.LongTensor:
+    """Sample true negatives for one side of all evaluation triples in bulk."""
+    # sorted index: the composite (relation, other entity) keys, and for each key, the sorted positive entities
+    # shape: (num_filter_triples,)
+    all_keys = filter_triples[:, 1] * num_entities + filter_triples[:, 2 - column]
+    keys, inverse = torch.unique(all_keys, return_inverse=True)
+    # note: this also removes duplicate filter triples
+    positives = torch.unique(inverse * num_entities + filter_triples[:, column])
+    counts = torch.bincount(torch.div(positives, num_entities, rounding_mode="floor"), minlength=keys.shape[0])
+    offsets = counts.cumsum(dim=0) - counts
+    # the evaluation triples are part of the filter triples, hence all their keys exist
+    ranks = torch.searchsorted(keys, evaluation_triples[:, 1] * num_entities + evaluation_triples[:, 2 - column])
+    pool_sizes = num_entities - counts[ranks]
+    if (pool_sizes < num_samples).any():
+        logger.warning(
+            f"There are less than num_samples={num_samples} candidates for {(pool_sizes < num_samples).sum()} "
+            f"evaluation triples for column={column}. Negatives will be repeated.",
+        )
+    if (pool_sizes == 0).any():
+        raise ValueError(f"There are evaluation triples without any negative candidates for column={column}.")
+
+    negatives = torch.empty(size=(evaluation_triples.shape[0], num_samples), dtype=torch.long)
+    # rejection sampling for all triples where it is efficient, i.e., most candidates are negatives.
+    rejection = (pool_sizes >= 2 * num_samples) & (2 * pool_sizes >= num_entities)
+    indices = rejection.nonzero().view(-1)
+    num_draws = 4 * num_samples
+    while indices.numel():
+        batch_size = max(1, _NEGATIVE_SAMPLING_BUDGET // num_draws)
+        failed = []
+        for batch_indices in indices.split(batch_size):
+            # shape: (batch_size, num_draws)
+            candidates = torch.randint(num_entities, size=(batch_indices.shape[0], num_draws), generator=generator)
+            # reject positives via a lookup in the sorted index
+            query = ranks[batch_indices, None] * num_entities + candidates
+            valid = positives[torch.searchsorted(positives, query).clamp_max(positives.shape[0] - 1)] != query
+            # reject repetitions, keeping the first occurrence in drawing order
+            sorted_candidates, perm = candidates.sort(dim=1, stable=True)
+            repeated = torch.zeros_like(valid)
+            repeated[:, 1:] = sorted_candidates[:, 1:] == sorted_candidates[:, :-1]
+            valid &= ~repeated.scatter(dim=1, index=perm, src=repeated)
+            # the first num_samples distinct negatives form a uniformly sampled subset
+            done = valid.sum(dim=1) >= num_samples
+            valid &= valid.cumsum(dim=1) <= num_samples
+            negatives[batch_indices[done]] = candidates[done][valid[done]].view(-1, num_samples)
+            failed.append(batch_indices[~done])
+        # retry the (rare) failed triples with more draws
+        indices = torch.cat(failed)
+        num_draws *= 2
+
+    # for the remaining triples, randomly permute all candidates
+    indices = (~rejection).nonzero().view(-1)
+    for batch_indices in indices.split(max(1, _NEGATIVE_SAMPLING_BUDGET // num_entities)):
+        batch_ranks = ranks[batch_indices]
+        priority = torch.rand(batch_indices.shape[0], num_entities, generator=generator)
+        # move positives to the end; expand the ranges of positives to individual positions
+        batch_counts = counts[batch_ranks]
+        rows = torch.arange(batch_indices.shape[0]).repeat_interleave(batch_counts)
+        positions = torch.arange(rows.shape[0]) - (batch_counts.cumsum(dim=0) - batch_counts)[rows]
+        positions += offsets[batch_ranks][rows]
+        priority[rows, positives[positions] % num_entities] = 2.0
+        # repeat candidates if there are less than num_samples
+        position = torch.arange(num_samples).unsqueeze(dim=0) % pool_sizes[batch_indices, None]
+        negatives[batch_indices] = priority.argsort(dim=1).gather(dim=1, index=position)
+    return negatives
+
+
 def sample_negatives(
     evaluation_triples: MappedTriples,
     additional_filter_triples: Union[None, MappedTriples, List[MappedTriples]] = None,
     num_samples: int = 50,
     num_entities: Optional[int] = None,
-) -> Mapping[Target, torch.FloatTensor]:
+    random_state: TorchRandomHint = None,
+) -> Mapping[Target, torch.LongTensor]:
     """
     Sample true negatives for sampled evaluation.
 
+    The negatives are sampled in bulk for all evaluation triples: for each triple, entities are drawn uniformly at
+    random, and positives as well as repetitions are rejected via a lookup in a sorted index of the filter triples. For
+    the (rare) triples where most entities are positives, a random permutation of all candidates is used instead. If
+    there are less than `num_samples` candidates, they are repeated.
+
     :param evaluation_triples: shape: (n, 3)
         the evaluation triples
     :param additional_filter_triples:
@@ -326,42 +577,75 @@ def sample_negatives(
         the number of samples
     :param num_entities:
         the number of entities
+    :param random_state:
+        the random state, or seed, to use for sampling. If None, the global random state of torch is used.
 
     :return:
-        A mapping of sides to negative samples
+        A mapping of sides to negative samples, each of shape (n, num_samples)
     """
-    additional_filter_triples = prepare_filter_triples(
-        mapped_triples=evaluation_triples,
-        additional_filter_triples=additional_filter_triples,
-    )
+    if additional_filter_triples is None:
+        additional_filter_triples = prepare_filter_triples(mapped_triples=evaluation_triples)
+    else:
+        if torch.is_tensor(additional_filter_triples):
+            additional_filter_triples = [additional_filter_triples]
+        # duplicates are removed when building the index, which is faster than a row-wise unique
+        additional_filter_triples = torch.cat([*additional_filter_triples, evaluation_triples], dim=0)
     num_entities = num_entities or (additional_filter_triples[:, [0, 2]].max().item() + 1)
-    columns = [LABEL_HEAD, LABEL_RELATION, LABEL_TAIL]
-    num_triples = evaluation_triples.shape[0]
-    df = pd.DataFrame(data=evaluation_triples.numpy(), columns=columns)
-    all_df = pd.DataFrame(data=additional_filter_triples.numpy(), columns=columns)
-    id_df = df.reset_index()
-    all_ids = set(range(num_entities))
-    negatives = {}
-    for side in [LABEL_HEAD, LABEL_TAIL]:
-        this_negatives = cast(torch.FloatTensor, torch.empty(size=(num_triples, num_samples), dtype=torch.long))
-        other = [c for c in columns if c != side]
-        for _, group in pd.merge(id_df, all_df, on=other, suffixes=["_eval", "_all"]).groupby(
-            by=other,
-        ):
-            pool = list(all_ids.difference(group[f"{side}_all"].unique().tolist()))
-            if len(pool) < num_samples:
-                logger.warning(
-                    f"There are less than num_samples={num_samples} candidates for side={side}, triples={group}.",
-                )
-                # repeat
-                pool = int(math.ceil(num_samples / len(pool))) * pool
-            for i in group["index"].unique():
-                this_negatives[i, :] = torch.as_tensor(
-                    data=random.sample(population=pool, k=num_samples),
-                    dtype=torch.long,
-                )
-        negatives[side] = this_negatives
-    return negatives
+    generator = None if random_state is None else ensure_torch_random_state(random_state)
+    return {
+        side: _sample_negatives_side(
+            evaluation_triples=evaluation_triples.long().cpu(),
+            filter_triples=additional_filter_triples.long().cpu(),
+            column=TARGET_TO_INDEX[side],
+            num_samples=num_samples,
+            num_entities=num_entities,
+            generator=generator,
+        )
+        for side in (LABEL_HEAD, LABEL_TAIL)
+    }
+
+
+def _fingerprint_negatives(
+    evaluation_triples: MappedTriples,
+    additional_filter_triples: Union[None, MappedTriples, List[MappedTriples]],
+    num_entities: int,
+    num_negatives: int,
+    random_state: TorchRandomHint,
+) -> str:
+    """Fingerprint the inputs of :func:`sample_negatives`, to detect stale cached negatives."""
+    digester = hashlib.sha256()
+    if additional_filter_triples is None:
+        additional_filter_triples = []
+    elif torch.is_tensor(additional_filter_triples):
+        additional_filter_triples = [additional_filter_triples]
+    for triples in (evaluation_triples, *additional_filter_triples):
+        digester.update(triples.detach().long().cpu().contiguous().numpy().tobytes())
+        # separate the individual tensors
+        digester.update(str(triples.shape).encode("utf8"))
+    if isinstance(random_state, torch.Generator):
+        digester.update(random_state.get_state().numpy().tobytes())
+    else:
+        digester.update(f"seed={random_state}".encode("utf8"))
+    digester.update(f"num_entities={num_entities};num_negatives={num_negatives}".encode("utf8"))
+    return digester.hexdigest()
+
+
+def _load_negatives(
+    path: Union[None, str, pathlib.Path],
+    fingerprint: str,
+) -> Optional[Mapping[Target, torch.LongTensor]]:
+    """Load cached negatives, if they exist and have been sampled with matching inputs."""
+    if path is None or not pathlib.Path(path).is_file():
+        return None
+    data = torch.load(path)
+    if data.get("fingerprint") != fingerprint:
+        logger.warning(
+            f"Ignoring cached negatives from {path}, since they were sampled for different evaluation or filter "
+            f"triples, number of entities or negatives, or random state.",
+        )
+        return None
+    logger.info(f"Loaded cached negatives from {path}")
+    return data["negatives"]
 
 
 class SampledRankBasedEvaluator(RankBasedEvaluator):
@@ -383,6 +667,8 @@ class SampledRankBasedEvaluator(RankBasedEvaluator):
         num_negatives: Optional[int] = None,
         head_negatives: Optional[torch.LongTensor] = None,
         tail_negatives: Optional[torch.LongTensor] = None,
+        random_state: TorchRandomHint = None,
+        negatives_path: Union[None, str, pathlib.Path] = None,
         **kwargs,
     ):
         """
@@ -400,6 +686,14 @@ class SampledRankBasedEvaluator(RankBasedEvaluator):
             the entity IDs of negative samples for head prediction for each evaluation triple
         :param tail_negatives: shape: (num_triples, num_negatives)
             the entity IDs of negative samples for tail prediction for each evaluation triple
+        :param random_state:
+            the random state, or seed, for sampling negatives; only relevant if not explicit negatives are given.
+            cf. :func:`pykeen.evaluation.rank_based_evaluator.sample_negatives`
+        :param negatives_path:
+            a file to cache the sampled negatives in; only relevant if not explicit negatives are given. If the file
+            exists and contains negatives sampled from the same evaluation and filter triples, number of entities and
+            negatives, and random state, they are loaded instead of sampled, e.g., to re-use the same negatives when
+            resuming training from a checkpoint. Otherwise, the sampled negatives are saved there.
         :param kwargs:
             additional keyword-based arguments passed to
             :meth:`pykeen.evaluation.rank_based_evaluator.RankBasedEvaluator.__init__`
@@ -417,12 +711,24 @@ class SampledRankBasedEvaluator(RankBasedEvaluator):
             )
             if num_negatives > evaluation_factory.num_entities:
                 raise ValueError("Cannot use more negative samples than there are entities.")
-            negatives = sample_negatives(
+            fingerprint = _fingerprint_negatives(
                 evaluation_triples=evaluation_factory.mapped_triples,
                 additional_filter_triples=additional_filter_triples,
                 num_entities=evaluation_factory.num_entities,
-                num_samples=num_negatives,
+                num_negatives=num_negatives,
+                random_state=random_state,
             )
+            negatives = _load_negatives(path=negatives_path, fingerprint=fingerprint)
+            if negatives is None:
+                negatives = sample_negatives(
+                    evaluation_triples=evaluation_factory.mapped_triples,
+                    additional_filter_triples=additional_filter_triples,
+                    num_entities=evaluation_factory.num_entities,
+                    num_samples=num_negatives,
+                    random_state=random_state,
+                )
+                if negatives_path is not None:
+                    torch.save(dict(fingerprint=fingerprint, negatives=dict(negatives)), negatives_path)
         elif head_negatives is None or tail_negatives is None:
             raise ValueError("Either both, head and tail negatives must be provided, or none.")
         else:
@@ -472,6 +778,37 @@ class SampledRankBasedEvaluator(RankBasedEvaluator):
         # TODO: should we give num_entities in the constructor instead of inferring it every time ranks are processed?
         self.num_entities = num_entities
 
+    # docstr-coverage: inherited
+    def process_filtered_scores_(
+        self,
+        hrt_batch: MappedTriples,
+        target: Target,
+        scores: torch.FloatTensor,
+        filter_batch: torch.LongTensor,
+    ) -> None:  # noqa: D102
+        # the ranks are computed only against the sampled negatives, which requires the (filtered) scores
+        Evaluator.process_filtered_scores_(
+            self, hrt_batch=hrt_batch, target=target, scores=scores, filter_batch=filter_batch
+        )
+
+    # docstr-coverage: inherited
+    def process_filtered_score_chunks_(
+        self,
+        hrt_batch: MappedTriples,
+        target: Target,
+        true_scores: torch.FloatTensor,
+        score_chunks: Iterable[torch.FloatTensor],
+        filter_batch: torch.LongTensor,
+    ) -> None:  # noqa: D102
+        Evaluator.process_filtered_score_chunks_(
+            self,
+            hrt_batch=hrt_batch,
+            target=target,
+            true_scores=true_scores,
+            score_chunks=score_chunks,
+            filter_batch=filter_batch,
+        )
+
 
 class MacroRankBasedEvaluator(RankBasedEvaluator):
     """Macro-average rank-based evaluation."""
@@ -498,8 +835,10 @@ class MacroRankBasedEvaluator(RankBasedEvaluator):
             additional keyword-based parameters passed to :meth:`RankBasedEvaluator.__init__`.
 
         :raises ValueError:
-            if neither evaluation triples nor a factory are provided
+            if neither evaluation triples nor a factory are provided, or streaming is requested
         """
+        if kwargs.get("streaming"):
+            raise ValueError(f"{self.__class__.__name__} does not support streaming, since it requires weights.")
         super().__init__(**kwargs)
         if evaluation_triples is None:
             if evaluation_factory is None:
@@ -522,21 +861,14 @@ class MacroRankBasedEvaluator(RankBasedEvaluator):
         return [c for c in self.COLUMNS if c != target]
 
     # docstr-coverage: inherited
-    def process_scores_(
+    def process_ranks_(
         self,
         hrt_batch: MappedTriples,
         target: Target,
-        scores: torch.FloatTensor,
-        true_scores: Optional[torch.FloatTensor] = None,
-        dense_positive_mask: Optional[torch.FloatTensor] = None,
+        ranks: Ranks,
+        num_entities: int,
     ) -> None:  # noqa: D102
-        super().process_scores_(
-            hrt_batch=hrt_batch,
-            target=target,
-            scores=scores,
-            true_scores=true_scores,
-            dense_positive_mask=dense_positive_mask,
-        )
+        super().process_ranks_(hrt_batch=hrt_batch, target=target, ranks=ranks, num_entities=num_entities)
         key_list = (
             hrt_batch[:, [TARGET_TO_INDEX[key] for key in self._get_key(target=target)]].detach().numpy().tolist()
         )
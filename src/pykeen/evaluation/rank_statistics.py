@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+"""Mergeable sufficient statistics for streaming rank-based evaluation.
+
+Most rank-based metrics, e.g., the mean rank, the mean reciprocal rank, or the hits at k, only depend on a few sums over
+the individual ranks. Similarly, the expectation-adjusted metrics only need the distribution of the number of
+candidates, which typically comprises only a few distinct values. :class:`RankStatistics` keeps these sufficient
+statistics such that metrics can be computed exactly at any point during the evaluation, and statistics computed on
+different shards of the evaluation triples can be merged. Only for metrics which need the full rank distribution, e.g.,
+the median rank, the individual ranks are stored.
+"""
+
+import math
+from typing import Callable, Collection, Dict, List, Mapping, Optional, Tuple, Type
+
+import numpy as np
+
+from ..metrics.ranking import (
+    ArithmeticMeanRank,
+    Count,
+    DerivedRankBasedMetric,
+    ExpectationNormalizedMetric,
+    GeometricMeanRank,
+    HarmonicMeanRank,
+    HitsAtK,
+    InverseArithmeticMeanRank,
+    InverseGeometricMeanRank,
+    InverseHarmonicMeanRank,
+    RankBasedMetric,
+    ReindexedMetric,
+    StandardDeviation,
+    Variance,
+    ZMetric,
+    _safe_divide,
+    generalized_harmonic_numbers,
+    harmonic_variances,
+)
+from ..utils import logcumsumexp
+
+__all__ = [
+    "RankStatistics",
+    "is_streamable",
+]
+
+#: closed-form computation of (base) metrics from the sufficient statistics
+STREAMING_METRICS: Mapping[Type[RankBasedMetric], Callable[["RankStatistics", RankBasedMetric], float]] = {
+    ArithmeticMeanRank: lambda s, m: s.rank_sum / s.count,
+    Count: lambda s, m: float(s.count),
+    GeometricMeanRank: lambda s, m: math.exp(s.log_rank_sum / s.count),
+    HarmonicMeanRank: lambda s, m: s.count / s.reciprocal_rank_sum,
+    HitsAtK: lambda s, m: s.hits[m.k] / s.count,  # type: ignore
+    InverseArithmeticMeanRank: lambda s, m: s.count / s.rank_sum,
+    InverseGeometricMeanRank: lambda s, m: math.exp(-s.log_rank_sum / s.count),
+    InverseHarmonicMeanRank: lambda s, m: s.reciprocal_rank_sum / s.count,
+    StandardDeviation: lambda s, m: math.sqrt(s.rank_m2 / s.count),
+    Variance: lambda s, m: s.rank_m2 / s.count,
+}
+
+
+def _mean_moments(
+    individual_expectation: np.ndarray, individual_variance: np.ndarray, counts: np.ndarray
+) -> Tuple[float, float]:
+    """Get expectation and variance of the mean over independent ranking tasks, grouped by number of candidates."""
+    num_ranks = counts.sum()
+    return (
+        (counts * individual_expectation).sum().item() / num_ranks,
+        (counts * individual_variance).sum().item() / num_ranks**2,
+    )
+
+
+def _hits_at_k_moments(metric: HitsAtK, values: np.ndarray, counts: np.ndarray) -> Tuple[float, float]:
+    # for each individual ranking task, we have I[r_i <= k] ~ Bernoulli(k/N_i)
+    p = np.minimum(metric.k / values, 1.0)
+    return _mean_moments(individual_expectation=p, individual_variance=p * (1 - p), counts=counts)
+
+
+def _inverse_harmonic_mean_rank_moments(
+    metric: InverseHarmonicMeanRank, values: np.ndarray, counts: np.ndarray
+) -> Tuple[float, float]:
+    n = values.max().item()
+    expectation = generalized_harmonic_numbers(n, p=-1.0) / np.arange(1, n + 1)
+    return _mean_moments(
+        individual_expectation=expectation[values - 1],
+        individual_variance=harmonic_variances(n)[values - 1],
+        counts=counts,
+    )
+
+
+def _geometric_mean_rank_moments(
+    metric: GeometricMeanRank, values: np.ndarray, counts: np.ndarray
+) -> Tuple[float, float]:
+    # log E[r_i^(factor/m)] for all N_i = 1 ... max_N_i, cf. GeometricMeanRank._log_individual_expectation_no_weight
+    log_x = np.log(np.arange(1, values.max().item() + 1, dtype=float)) / counts.sum()
+    log_expectation, log_second_moment = (
+        (counts * (logcumsumexp(factor * log_x)[values - 1] - np.log(values))).sum().item() for factor in (1.0, 2.0)
+    )
+    # V (prod x_i) = prod E[x_i^2] - prod(E[x_i])^2
+    expectation = math.exp(log_expectation)
+    return expectation, math.exp(log_second_moment) - expectation**2
+
+
+#: closed-form computation of the expectation and variance of (base) metrics under random ordering from the histogram
+#: of the number of candidates, given as arrays of unique values and their counts
+STREAMING_MOMENTS: Mapping[
+    Type[RankBasedMetric], Callable[[RankBasedMetric, np.ndarray, np.ndarray], Tuple[float, float]]
+] = {
+    ArithmeticMeanRank: lambda m, v, c: _mean_moments(
+        individual_expectation=0.5 * (v + 1), individual_variance=(v**2 - 1) / 12.0, counts=c
+    ),
+    GeometricMeanRank: _geometric_mean_rank_moments,  # type: ignore
+    HitsAtK: _hits_at_k_moments,  # type: ignore
+    InverseHarmonicMeanRank: _inverse_harmonic_mean_rank_moments,  # type: ignore
+}
+
+
+def _z_coefficients(metric: DerivedRankBasedMetric, expectation: float, variance: float) -> Tuple[float, float]:
+    scale = _safe_divide(1.0, math.sqrt(variance))
+    if not metric.base.increasing:
+        scale = -scale
+    return scale, -scale * expectation
+
+
+def _reindexed_coefficients(metric: DerivedRankBasedMetric, expectation: float, variance: float) -> Tuple[float, float]:
+    scale = _safe_divide(1.0, 1.0 - expectation)
+    return scale, -scale * expectation
+
+
+#: the affine transformation (scale, offset) of derived metrics from their base metric's expectation and variance, cf.
+#: :meth:`pykeen.metrics.ranking.DerivedRankBasedMetric.get_coefficients`
+STREAMING_COEFFICIENTS: Mapping[
+    Type[DerivedRankBasedMetric], Callable[[DerivedRankBasedMetric, float, float], Tuple[float, float]]
+] = {
+    ExpectationNormalizedMetric: lambda m, e, v: (_safe_divide(1.0, e), 0.0),
+    ReindexedMetric: _reindexed_coefficients,
+    ZMetric: _z_coefficients,
+}
+
+
+def _get_coefficients_function(
+    metric: DerivedRankBasedMetric,
+) -> Optional[Callable[[DerivedRankBasedMetric, float, float], Tuple[float, float]]]:
+    for cls, function in STREAMING_COEFFICIENTS.items():
+        if isinstance(metric, cls):
+            return function
+    return None
+
+
+def is_streamable(metric: RankBasedMetric) -> bool:
+    """Return whether the metric can be computed from the sufficient statistics without the individual ranks."""
+    if isinstance(metric, DerivedRankBasedMetric):
+        return (
+            type(metric.base) in STREAMING_MOMENTS
+            and _get_coefficients_function(metric) is not None
+            and is_streamable(metric.base)
+        )
+    return type(metric) in STREAMING_METRICS
+
+
+def _get_ks(metric: RankBasedMetric) -> List[int]:
+    """Get the k's of all hits at k metrics, including the ones used as a base of derived metrics."""
+    if isinstance(metric, DerivedRankBasedMetric):
+        return _get_ks(metric.base)
+    if isinstance(metric, HitsAtK):
+        return [metric.k]
+    return []
+
+
+class RankStatistics:
+    """Mergeable sufficient statistics over a stream of ranks and their number of candidates."""
+
+    #: the number of ranks
+    count: int
+    #: the sum of ranks
+    rank_sum: float
+    #: the sum of squared deviations from the mean rank, cf. Chan et al.'s parallel variance algorithm
+    rank_m2: float
+    #: the sum of reciprocal ranks
+    reciprocal_rank_sum: float
+    #: the sum of logarithmic ranks
+    log_rank_sum: float
+    #: the number of ranks which are at most k, for all requested k
+    hits: Dict[int, int]
+    #: the histogram of the number of candidates, a mapping from number of candidates to the number of ranks
+    num_candidates: Dict[int, int]
+    #: the individual ranks and their number of candidates, if any metric needs the full rank distribution
+    ranks: Optional[List[np.ndarray]]
+    candidates: Optional[List[np.ndarray]]
+
+    def __init__(self, ks: Collection[int] = tuple(), store_ranks: bool = False):
+        """
+        Initialize the statistics.
+
+        :param ks:
+            the k's for which to count the hits at k
+        :param store_ranks:
+            whether to additionally store the individual ranks, which is required for metrics which are not streamable
+        """
+        self.count = 0
+        self.rank_sum = self.rank_m2 = self.reciprocal_rank_sum = self.log_rank_sum = 0.0
+        self.hits = dict.fromkeys(ks, 0)
+        self.num_candidates = {}
+        self.ranks = [] if store_ranks else None
+        self.candidates = [] if store_ranks else None
+
+    @classmethod
+    def for_metrics(cls, metrics: Collection[RankBasedMetric]) -> "RankStatistics":
+        """Create empty statistics sufficient to compute the given metrics."""
+        return cls(
+            ks=sorted({k for metric in metrics for k in _get_ks(metric)}),
+            store_ranks=not all(map(is_streamable, metrics)),
+        )
+
+    def _merge_moments(self, count: int, rank_sum: float, rank_m2: float) -> None:
+        """Merge the first two moments of another set of ranks, cf. Chan et al. (1979)."""
+        if not count:
+            return
+        if self.count:
+            delta = rank_sum / count - self.rank_sum / self.count
+            self.rank_m2 += rank_m2 + delta**2 * self.count * count / (self.count + count)
+        else:
+            self.rank_m2 = rank_m2
+        self.rank_sum += rank_sum
+        self.count += count
+
+    def update(self, ranks: np.ndarray, num_candidates: np.ndarray) -> None:
+        """
+        Update the statistics with a batch of ranks.
+
+        :param ranks: shape: (n,)
+            the individual ranks
+        :param num_candidates: shape: (n,)
+            the number of candidates for each individual ranking task
+        """
+        ranks = np.asanyarray(ranks, dtype=float)
+        if not ranks.size:
+            return
+        self._merge_moments(count=ranks.size, rank_sum=ranks.sum(), rank_m2=((ranks - ranks.mean()) ** 2).sum())
+        self.reciprocal_rank_sum += np.reciprocal(ranks).sum().item()
+        self.log_rank_sum += np.log(ranks).sum().item()
+        for k in self.hits:
+            self.hits[k] += int(np.less_equal(ranks, k).sum())
+        for n, c in zip(*np.unique(num_candidates, return_counts=True)):
+            self.num_candidates[int(n)] = self.num_candidates.get(int(n), 0) + int(c)
+        if self.ranks is not None and self.candidates is not None:
+            self.ranks.append(ranks)
+            self.candidates.append(np.asanyarray(num_candidates))
+
+    def merge(self, other: "RankStatistics") -> "RankStatistics":
+        """
+        Merge the statistics of another stream of ranks into this one.
+
+        :param other:
+            the other statistics. They need to be created for the same metrics.
+
+        :return:
+            self, for chaining
+
+        :raises ValueError:
+            if the statistics were created for different metrics
+        """
+        if self.hits.keys() != other.hits.keys() or (self.ranks is None) != (other.ranks is None):
+            raise ValueError("Cannot merge statistics which were created for different metrics.")
+        self._merge_moments(count=other.count, rank_sum=other.rank_sum, rank_m2=other.rank_m2)
+        self.reciprocal_rank_sum += other.reciprocal_rank_sum
+        self.log_rank_sum += other.log_rank_sum
+        for k, c in other.hits.items():
+            self.hits[k] += c
+        for n, c in other.num_candidates.items():
+            self.num_candidates[n] = self.num_candidates.get(n, 0) + c
+        if self.ranks is not None and self.candidates is not None:
+            self.ranks.extend(other.ranks or [])
+            self.candidates.extend(other.candidates or [])
+        return self
+
+    def get_num_candidates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the histogram of the number of candidates as arrays of the sorted unique values and their counts."""
+        values, counts = zip(*sorted(self.num_candidates.items()))
+        return np.asarray(values), np.asarray(counts)
+
+    def compute(self, metric: RankBasedMetric) -> float:
+        """
+        Compute the value of a metric.
+
+        :param metric:
+            the metric
+
+        :return:
+            the metric's value
+
+        :raises ValueError:
+            if the metric is not streamable, and the individual ranks have not been stored
+        """
+        if is_streamable(metric):
+            if isinstance(metric, DerivedRankBasedMetric):
+                # the moments are computed from the histogram, without expanding it to the individual ranking tasks
+                expectation, variance = STREAMING_MOMENTS[type(metric.base)](metric.base, *self.get_num_candidates())
+                coefficients = _get_coefficients_function(metric)
+                assert coefficients is not None
+                scale, offset = coefficients(metric, expectation, variance)
+                return scale * self.compute(metric.base) + offset
+            return STREAMING_METRICS[type(metric)](self, metric)
+        if self.ranks is None or self.candidates is None:
+            raise ValueError(f"{metric} requires the individual ranks, but they have not been stored.")
+        return metric(ranks=np.concatenate(self.ranks), num_candidates=np.concatenate(self.candidates))
@@ -3,7 +3,7 @@
 """Utility class for storing ranks."""
 
 from dataclasses import dataclass
-from typing import Iterable, Mapping, Tuple
+from typing import Iterable, Mapping, Optional, Tuple
 
 import torch
 
@@ -95,3 +95,108 @@ class Ranks:
             realistic=realistic_rank,
             number_of_options=number_of_options,
         )
+
+    @classmethod
+    def from_filtered_score_chunks(
+        cls,
+        true_scores: torch.FloatTensor,
+        score_chunks: Iterable[torch.FloatTensor],
+        true_indices: torch.LongTensor,
+        filter_batch: torch.LongTensor,
+    ) -> "Ranks":
+        """Compute filtered ranks from raw score chunks along the entity dimension and a sparse filter.
+
+        This is equivalent to setting the scores of all filtered entities except the true one to NaN, and calling
+        :meth:`Ranks.from_scores`. However, the comparisons are only made once on the raw scores, and the
+        contributions of the (few) filtered entities are subtracted afterwards. Thus, no (NaN-filled) copy of the
+        scores is created, and the scores do not need to be kept in memory at once.
+
+        :param true_scores: shape: (batch_size, 1)
+            The score of the true triple.
+        :param score_chunks: shape: (batch_size, chunk_size_i)
+            The raw scores of all corrupted triples (including the true triple), as consecutive chunks along the
+            entity dimension.
+        :param true_indices: shape: (batch_size,)
+            The entity IDs of the true triples.
+        :param filter_batch: shape: (m, 2)
+            The indices of all positives in format (batch_index, entity_id). May contain the true triples.
+
+        :return:
+            a data structure containing the filtered ranks.
+        """
+        batch_size = true_scores.shape[0]
+        device = true_scores.device
+        # remove the true triples from the filter, and sort the remaining ones by entity ID
+        filter_batch = filter_batch.to(device)
+        batch_ids, entity_ids = filter_batch.unbind(dim=-1)
+        keep = entity_ids != true_indices.to(device)[batch_ids]
+        keys = torch.unique(entity_ids[keep] * batch_size + batch_ids[keep])
+        filter_entities = torch.div(keys, batch_size, rounding_mode="floor")
+        filter_batch_ids = keys % batch_size
+
+        # number of options with strictly larger / larger or equal / finite score
+        greater = true_scores.new_zeros(batch_size, dtype=torch.long)
+        greater_equal = torch.zeros_like(greater)
+        number_of_options = torch.zeros_like(greater)
+        offset = 0
+        for chunk in score_chunks:
+            width = chunk.shape[1]
+            greater += (chunk > true_scores).sum(dim=1)
+            greater_equal += (chunk >= true_scores).sum(dim=1)
+            number_of_options += torch.isfinite(chunk).sum(dim=1)
+            # subtract the contributions of the filtered entities within this chunk
+            start, stop = torch.searchsorted(
+                filter_entities, torch.as_tensor([offset, offset + width], device=device)
+            ).tolist()
+            if stop > start:
+                chunk_batch_ids = filter_batch_ids[start:stop]
+                filtered_scores = chunk[chunk_batch_ids, filter_entities[start:stop] - offset]
+                filtered_true_scores = true_scores[chunk_batch_ids, 0]
+                for counts, subtract in (
+                    (greater, filtered_scores > filtered_true_scores),
+                    (greater_equal, filtered_scores >= filtered_true_scores),
+                    (number_of_options, torch.isfinite(filtered_scores)),
+                ):
+                    counts.index_add_(0, chunk_batch_ids, subtract.long(), alpha=-1)
+            offset += width
+
+        # cf. Ranks.from_scores
+        optimistic_rank = greater + 1
+        pessimistic_rank = greater_equal
+        realistic_rank = (optimistic_rank + pessimistic_rank).float() * 0.5
+        return cls(
+            optimistic=optimistic_rank,
+            pessimistic=pessimistic_rank,
+            realistic=realistic_rank,
+            number_of_options=number_of_options,
+        )
+
+    @classmethod
+    def from_filtered_scores(
+        cls,
+        scores: torch.FloatTensor,
+        true_indices: torch.LongTensor,
+        filter_batch: torch.LongTensor,
+        chunk_size: Optional[int] = None,
+    ) -> "Ranks":
+        """Compute filtered ranks from raw scores and a sparse filter, cf. :meth:`Ranks.from_filtered_score_chunks`.
+
+        :param scores: shape: (batch_size, num_entities)
+            The raw scores of all corrupted triples (including the true triple). They are not modified.
+        :param true_indices: shape: (batch_size,)
+            The entity IDs of the true triples.
+        :param filter_batch: shape: (m, 2)
+            The indices of all positives in format (batch_index, entity_id). May contain the true triples.
+        :param chunk_size:
+            An optional chunk size along the entity dimension, in order to bound the size of intermediate tensors.
+
+        :return:
+            a data structure containing the filtered ranks.
+        """
+        true_scores = scores.gather(dim=1, index=true_indices.to(scores.device).unsqueeze(dim=1))
+        return cls.from_filtered_score_chunks(
+            true_scores=true_scores,
+            score_chunks=scores.split(chunk_size, dim=1) if chunk_size else [scores],
+            true_indices=true_indices,
+            filter_batch=filter_batch,
+        )
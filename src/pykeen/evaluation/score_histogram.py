@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+r"""Mergeable score histograms for streaming classification evaluation.
+
+Exact classification evaluation needs all scores together with their labels, i.e., ``num_entities`` values for each
+evaluation triple. The :class:`ScoreHistogram` instead counts the positive and negative scores in bins of fixed width,
+the *resolution*, and additionally keeps the exact number and sum of the positive and negative scores. Its memory
+only depends on the range of the scores divided by the resolution, and histograms of different shards of the
+evaluation triples can be merged.
+
+The classification metrics of :mod:`pykeen.metrics.classification` are computed from the histogram as follows:
+
+- the metrics which are not binarized, except for the ROC-AUC and the average precision, are computed from the "soft"
+  confusion matrix, i.e., $TP = \sum_{i \in P} s_i$, $FP = \sum_{i \in N} s_i$, $FN = |P| - TP$, and $TN = |N| - FP$.
+  They only depend on the number and sum of the positive and negative scores, and are thus exact.
+- the ROC-AUC and the average precision are computed for the binned scores, where scores in the same bin are treated as
+  ties, in the same way as in :mod:`sklearn.metrics`. The exact value for the original scores lies within the bounds
+  obtained by ordering all positives before, or after, all negatives within each bin. For the ROC-AUC, the error is
+  thus at most half the fraction of positive-negative pairs sharing a bin.
+- the binarized metrics predict the $|P|$ highest scores as positive, cf.
+  :func:`pykeen.metrics.classification.construct_indicator`. The predictions in the bin containing the threshold are
+  split proportionally between positives and negatives. Since all binarized metrics are monotonic in the number of true
+  positives, the exact value lies within the bounds obtained by predicting the positives or the negatives of this bin
+  first.
+
+The bounds are available via :meth:`ScoreHistogram.bounds`; they shrink with the resolution.
+"""
+
+from typing import Callable, Mapping, NamedTuple, Tuple, Type
+
+import numpy as np
+import rexmex.metrics.classification as rmc
+
+from ..metrics.classification import ClassificationMetric
+
+__all__ = [
+    "ScoreHistogram",
+    "Confusion",
+]
+
+#: the maximum absolute bin index, which also accommodates infinite scores
+MAX_BIN = 2**62
+
+
+class Confusion(NamedTuple):
+    """A (soft) confusion matrix."""
+
+    tp: np.float64
+    fp: np.float64
+    fn: np.float64
+    tn: np.float64
+
+    @classmethod
+    def from_true_positives(cls, tp: float, num_positives: int, num_negatives: int) -> "Confusion":
+        """Create the confusion matrix for predicting as many entries as positive as there are positives."""
+        fp = num_positives - tp
+        return cls(*map(np.float64, (tp, fp, num_positives - tp, num_negatives - fp)))
+
+
+def _mcc(c: Confusion) -> float:
+    """Calculate the Matthews correlation coefficient, with the same zero-division handling as :mod:`sklearn`."""
+    denominator = np.sqrt((c.tp + c.fp) * (c.tp + c.fn) * (c.tn + c.fp) * (c.tn + c.fn))
+    if denominator == 0:
+        return 0.0
+    return (c.tp * c.tn - c.fp * c.fn) / denominator
+
+
+#: closed-form computation of the classification metrics from the confusion matrix, keyed by the metric's function
+CONFUSION_METRICS: Mapping[Callable, Callable[[Confusion], float]] = {
+    rmc.true_negative_rate: lambda c: c.tn / (c.tn + c.fp),
+    rmc.true_positive_rate: lambda c: c.tp / (c.tp + c.fn),
+    rmc.positive_predictive_value: lambda c: c.tp / (c.tp + c.fp),
+    rmc.negative_predictive_value: lambda c: c.tn / (c.tn + c.fn),
+    rmc.false_negative_rate: lambda c: c.fn / (c.tp + c.fn),
+    rmc.false_positive_rate: lambda c: c.fp / (c.tn + c.fp),
+    rmc.false_discovery_rate: lambda c: c.fp / (c.fp + c.tp),
+    rmc.false_omission_rate: lambda c: c.fn / (c.fn + c.tn),
+    rmc.positive_likelihood_ratio: lambda c: (c.tp / (c.tp + c.fn)) / (c.fp / (c.tn + c.fp)),
+    rmc.negative_likelihood_ratio: lambda c: (c.fn / (c.tp + c.fn)) / (c.tn / (c.tn + c.fp)),
+    rmc.prevalence_threshold: lambda c: np.sqrt(c.fp / (c.tn + c.fp))
+    / (np.sqrt(c.fp / (c.tn + c.fp)) + np.sqrt(c.tp / (c.tp + c.fn))),
+    rmc.threat_score: lambda c: c.tp / (c.tp + c.fn + c.fp),
+    rmc.fowlkes_mallows_index: lambda c: np.sqrt(c.tp / (c.tp + c.fp) * c.tp / (c.tp + c.fn)),
+    rmc.informedness: lambda c: c.tp / (c.tp + c.fn) + c.tn / (c.tn + c.fp) - 1,
+    rmc.markedness: lambda c: c.tp / (c.tp + c.fp) + c.tn / (c.tn + c.fn) - 1,
+    rmc.diagnostic_odds_ratio: lambda c: (c.tp * c.tn) / (c.fp * c.fn),
+    rmc.accuracy_score: lambda c: (c.tp + c.tn) / (c.tp + c.fp + c.fn + c.tn),
+    rmc.balanced_accuracy_score: lambda c: (c.tp / (c.tp + c.fn) + c.tn / (c.tn + c.fp)) / 2,
+    rmc.f1_score: lambda c: 2 * c.tp / (2 * c.tp + c.fp + c.fn),
+    rmc.matthews_correlation_coefficient: _mcc,
+}
+
+
+class ScoreHistogram:
+    """A mergeable fixed-resolution histogram of positive and negative scores."""
+
+    #: the width of the bins
+    resolution: float
+    #: shape: (num_bins,), the sorted indices of the non-empty bins, i.e., $\lfloor s / resolution \rfloor$
+    bins: np.ndarray
+    #: shape: (num_bins, 2), the number of negatives (first column) and positives (second column) per bin
+    counts: np.ndarray
+    #: shape: (2,), the exact sum of the negative and positive scores
+    score_sums: np.ndarray
+
+    def __init__(self, resolution: float = 1.0e-03):
+        """
+        Initialize the histogram.
+
+        :param resolution: >0
+            the width of the bins. Smaller values tighten the error bounds at the cost of more bins.
+
+        :raises ValueError:
+            if the resolution is not positive
+        """
+        if resolution <= 0:
+            raise ValueError(f"resolution must be positive, but is {resolution}")
+        self.resolution = resolution
+        self.bins = np.empty(shape=(0,), dtype=np.int64)
+        self.counts = np.empty(shape=(0, 2), dtype=np.int64)
+        self.score_sums = np.zeros(shape=(2,))
+
+    @property
+    def num_negatives(self) -> int:
+        """The number of negative scores."""
+        return int(self.counts[:, 0].sum())
+
+    @property
+    def num_positives(self) -> int:
+        """The number of positive scores."""
+        return int(self.counts[:, 1].sum())
+
+    def _add(self, bins: np.ndarray, counts: np.ndarray) -> None:
+        """Add counts for (possibly unsorted and non-unique) bins."""
+        self.bins, inverse = np.unique(np.concatenate([self.bins, bins]), return_inverse=True)
+        counts = np.concatenate([self.counts, counts])
+        self.counts = np.stack(
+            [np.bincount(inverse, weights=counts[:, i], minlength=len(self.bins)) for i in range(2)], axis=-1
+        ).astype(np.int64)
+
+    def update(self, scores: np.ndarray, positives: np.ndarray) -> None:
+        """
+        Add scores to the histogram.
+
+        :param scores:
+            the scores, of arbitrary shape
+        :param positives:
+            the labels, a boolean array of the same shape as the scores
+        """
+        scores = np.asanyarray(scores, dtype=float).ravel()
+        positives = np.asanyarray(positives, dtype=bool).ravel()
+        bins = np.floor(np.clip(scores / self.resolution, -MAX_BIN, MAX_BIN)).astype(np.int64)
+        bins, inverse = np.unique(bins, return_inverse=True)
+        counts = np.bincount(2 * inverse + positives, minlength=2 * len(bins)).reshape(-1, 2)
+        self._add(bins=bins, counts=counts)
+        self.score_sums += (scores[~positives].sum(), scores[positives].sum())
+
+    def merge(self, other: "ScoreHistogram") -> "ScoreHistogram":
+        """
+        Merge the counts of another histogram into this one.
+
+        :param other:
+            the other histogram, with the same resolution
+
+        :return:
+            self, for chaining
+
+        :raises ValueError:
+            if the resolutions differ
+        """
+        if other.resolution != self.resolution:
+            raise ValueError(f"Cannot merge histograms of resolution {other.resolution} and {self.resolution}.")
+        self._add(bins=other.bins, counts=other.counts)
+        self.score_sums += other.score_sums
+        return self
+
+    def _soft_confusion(self) -> Confusion:
+        """Calculate the soft confusion matrix, which is exact."""
+        s_neg, s_pos = self.score_sums
+        return Confusion(
+            *map(np.float64, (s_pos, s_neg, self.num_positives - s_pos, self.num_negatives - s_neg)),
+        )
+
+    def _hard_confusions(self) -> Tuple[Confusion, Confusion, Confusion]:
+        """Calculate the estimated, lowest, and highest confusion matrix when predicting the top-|P| as positive."""
+        num_positives, num_negatives = self.num_positives, self.num_negatives
+        if not num_positives:
+            tps = (0.0, 0.0, 0.0)
+        else:
+            # in order of descending scores
+            negatives, positives = self.counts[::-1].T
+            totals = negatives + positives
+            # the bin which contains the threshold, and the number of its entries predicted as positive
+            boundary = int(np.searchsorted(np.cumsum(totals), num_positives))
+            k = num_positives - totals[:boundary].sum()
+            tp_above = positives[:boundary].sum()
+            tps = (
+                tp_above + k * positives[boundary] / totals[boundary],
+                tp_above + max(0, k - negatives[boundary]),
+                tp_above + min(k, positives[boundary]),
+            )
+        estimate, lower, upper = (
+            Confusion.from_true_positives(tp=tp, num_positives=num_positives, num_negatives=num_negatives) for tp in tps
+        )
+        return estimate, lower, upper
+
+    def _roc_auc(self) -> Tuple[float, float, float]:
+        """Calculate the estimated, lower, and upper bound of the ROC-AUC."""
+        num_pairs = float(self.num_positives) * self.num_negatives
+        if not num_pairs:
+            return (float("nan"),) * 3
+        negatives, positives = self.counts.astype(float).T
+        # pairs of a positive and a negative in a lower bin, and in the same bin
+        ordered = (positives * (np.cumsum(negatives) - negatives)).sum()
+        ties = (positives * negatives).sum()
+        return (ordered + 0.5 * ties) / num_pairs, ordered / num_pairs, (ordered + ties) / num_pairs
+
+    def _average_precision(self) -> Tuple[float, float, float]:
+        """Calculate the estimated, lower, and upper bound of the average precision."""
+        num_positives = self.num_positives
+        if not num_positives:
+            return (float("nan"),) * 3
+        # in order of descending scores
+        negatives, positives = self.counts[::-1].T
+        # the number of positives and of all entries in higher bins
+        positives_above = np.cumsum(positives) - positives
+        totals_above = np.cumsum(positives + negatives) - positives - negatives
+        # ties: all positives of a bin share the precision at the end of the bin
+        estimate = (
+            positives * (positives_above + positives) / (totals_above + positives + negatives)
+        ).sum() / num_positives
+        # the j-th positive within its bin, 1 <= j <= positives[i]
+        bin_of_positive = np.repeat(np.arange(len(positives)), positives)
+        j = np.arange(1, num_positives + 1) - np.repeat(positives_above, positives)
+        hits = positives_above[bin_of_positive] + j
+        # the negatives of a bin are ranked after (upper bound), or before (lower bound) its positives
+        upper = (hits / (totals_above[bin_of_positive] + j)).sum() / num_positives
+        lower = (hits / (totals_above[bin_of_positive] + negatives[bin_of_positive] + j)).sum() / num_positives
+        return estimate, lower, upper
+
+    def _compute(self, metric: Type[ClassificationMetric]) -> Tuple[float, float, float]:
+        """Calculate the estimate, and the lower and upper bound for a metric."""
+        if metric.func is rmc.roc_auc_score:
+            return self._roc_auc()
+        if metric.func is rmc.average_precision_score:
+            return self._average_precision()
+        func = CONFUSION_METRICS[metric.func]
+        confusions = self._hard_confusions() if metric.binarize else (self._soft_confusion(),) * 3
+        with np.errstate(divide="ignore", invalid="ignore"):
+            estimate, *bounds = (float(func(confusion)) for confusion in confusions)
+        return estimate, min(bounds), max(bounds)
+
+    def compute(self, metric: Type[ClassificationMetric]) -> float:
+        """
+        Compute the value of a metric.
+
+        :param metric:
+            the metric
+
+        :return:
+            the metric's (estimated) value
+        """
+        return self._compute(metric)[0]
+
+    def bounds(self, metric: Type[ClassificationMetric]) -> Tuple[float, float]:
+        """
+        Compute bounds for the value of a metric on the original, i.e., non-binned, scores.
+
+        :param metric:
+            the metric
+
+        :return:
+            a pair (lower, upper) of bounds. For the metrics which are computed exactly, both are equal.
+        """
+        _, lower, upper = self._compute(metric)
+        return lower, upper
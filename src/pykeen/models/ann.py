@@ -0,0 +1,650 @@
+# -*- coding: utf-8 -*-
+
+r"""
+Approximate nearest-neighbour search for top-k link prediction.
+
+For some interaction functions, the score of a triple $(h, r, t)$ can be written as a similarity between a *query
+vector* computed from $(h, r)$ and the representation of the tail $t$, e.g.,
+
+- :class:`pykeen.nn.modules.DistMultInteraction`: $\langle h \odot r, t \rangle$
+- :class:`pykeen.nn.modules.ComplExInteraction`: $Re(\langle h \odot r, \bar{t} \rangle)$
+- :class:`pykeen.nn.modules.TransEInteraction`: $-\|(h + r) - t\|_p$
+- :class:`pykeen.nn.modules.RotatEInteraction`: $-\|(h \odot r) - t\|_2$
+
+and analogously for the heads. Thus, finding the $k$ highest scoring tails for $(h, r)$ is a (maximum inner product
+or nearest neighbour) vector search, which can be answered approximately without scoring all entities.
+:class:`EntityIndex` builds an inverted file index (IVF) over the entity representations: the entities are
+clustered by $k$-means, and a query only scores the entities in the `num_probes` clusters whose centroids are most
+similar to the query vector. With the default of $\sqrt{n}$ clusters, a query thus scores
+$\mathcal{O}(\text{num_probes} \cdot \sqrt{n})$ instead of $n$ entities.
+
+The following code-block sketches an example use case, where we compare the approximate top-k tail predictions
+with exact scoring.
+
+.. code-block:: python
+
+    from pykeen.pipeline import pipeline
+    from pykeen.models.ann import EntityIndex, evaluate_recall
+
+    result = pipeline(dataset="fb15k237", model="DistMult")
+
+    # build the index; the index is a snapshot of the entity representations at this point
+    index = EntityIndex(model=result.model, num_probes=4)
+
+    # the 100 highest scoring tails for the first ten (h, r) pairs of the training set
+    hr_batch = result.training.mapped_triples[:10, :2]
+    prediction = index.search(hr_batch, k=100)
+
+    # compare against exact scoring
+    print(evaluate_recall(index=index, batch=hr_batch, k=100))
+
+Increasing `num_probes` trades speed for recall; probing all clusters corresponds to exact search.
+"""
+
+import dataclasses
+import math
+from abc import ABC, abstractmethod
+from typing import Callable, Mapping, NamedTuple, Optional, Type, Union
+
+import torch
+
+from .nbase import ERModel
+from ..nn.modules import ComplExInteraction, DistMultInteraction, Interaction, RotatEInteraction, TransEInteraction
+from ..typing import LABEL_HEAD, LABEL_TAIL, InductiveMode, Target, TorchRandomHint
+from ..utils import ensure_complex, ensure_torch_random_state, negative_norm
+
+__all__ = [
+    "EntityIndex",
+    "InvertedFileIndex",
+    "ApproximateTopK",
+    "RecallReport",
+    "evaluate_recall",
+    "get_query_encoder",
+    "QueryEncoder",
+    "InnerProductQueryEncoder",
+    "DistanceQueryEncoder",
+    "DistMultQueryEncoder",
+    "ComplExQueryEncoder",
+    "TransEQueryEncoder",
+    "RotatEQueryEncoder",
+]
+
+#: a similarity between query vectors, shape: (batch_size, dim), and candidate vectors, shape: (num, dim) or
+#: (batch_size, num, dim), which returns a tensor of shape (batch_size, num). Larger values are more similar.
+Similarity = Callable[[torch.FloatTensor, torch.FloatTensor], torch.FloatTensor]
+
+
+def _real_view(x: torch.Tensor) -> torch.FloatTensor:
+    """Convert a (possibly complex) tensor of shape (*, d) into a real tensor of shape (*, 2d)."""
+    (x,) = ensure_complex(x)
+    return torch.view_as_real(x).flatten(start_dim=-2)
+
+
+class QueryEncoder(ABC):
+    """Convert (head, relation) and (relation, tail) representations into query vectors for vector search."""
+
+    def __init__(self, interaction: Interaction):
+        """
+        Initialize the encoder.
+
+        :param interaction:
+            the interaction function
+        """
+        self.interaction = interaction
+
+    @abstractmethod
+    def similarity(self, queries: torch.FloatTensor, candidates: torch.FloatTensor) -> torch.FloatTensor:
+        """
+        Calculate the similarity between queries and candidates, which equals the interaction's score.
+
+        :param queries: shape: (batch_size, dim)
+            the query vectors
+        :param candidates: shape: (num, dim) or (batch_size, num, dim)
+            the candidate vectors
+
+        :return: shape: (batch_size, num)
+            the similarities
+        """
+        raise NotImplementedError
+
+    def encode_entities(self, x: torch.FloatTensor) -> torch.FloatTensor:
+        """
+        Convert entity representations into the vectors to search.
+
+        :param x: shape: (num_entities, *)
+            the entity representations
+
+        :return: shape: (num_entities, dim)
+            the entity vectors
+        """
+        return x
+
+    @abstractmethod
+    def encode_tail_query(self, h: torch.FloatTensor, r: torch.FloatTensor) -> torch.FloatTensor:
+        """
+        Encode (head, relation) representations into query vectors for tail prediction.
+
+        :param h: shape: (batch_size, *)
+            the head representations
+        :param r: shape: (batch_size, *)
+            the relation representations
+
+        :return: shape: (batch_size, dim)
+            the query vectors
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def encode_head_query(self, r: torch.FloatTensor, t: torch.FloatTensor) -> torch.FloatTensor:
+        """
+        Encode (relation, tail) representations into query vectors for head prediction.
+
+        :param r: shape: (batch_size, *)
+            the relation representations
+        :param t: shape: (batch_size, *)
+            the tail representations
+
+        :return: shape: (batch_size, dim)
+            the query vectors
+        """
+        raise NotImplementedError
+
+
+class InnerProductQueryEncoder(QueryEncoder, ABC):
+    """A query encoder for interactions which are an inner product between query and entity vector."""
+
+    # docstr-coverage: inherited
+    def similarity(self, queries: torch.FloatTensor, candidates: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        if candidates.ndimension() == 2:
+            # shared candidates: avoid materializing the (batch_size, num, dim) tensor
+            return queries @ candidates.t()
+        return (queries.unsqueeze(dim=-2) * candidates).sum(dim=-1)
+
+
+class DistanceQueryEncoder(QueryEncoder, ABC):
+    """A query encoder for interactions which are a negative distance between query and entity vector."""
+
+    #: the p for the norm
+    p: Union[int, float, str] = 2
+    #: whether to use the powered norm
+    power_norm: bool = False
+
+    # docstr-coverage: inherited
+    def similarity(self, queries: torch.FloatTensor, candidates: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        if candidates.ndimension() == 2 and not isinstance(self.p, str):
+            # shared candidates: avoid materializing the (batch_size, num, dim) tensor
+            distances = torch.cdist(queries, candidates, p=self.p, compute_mode="donot_use_mm_for_euclid_dist")
+            return -(distances**self.p) if self.power_norm else -distances
+        return negative_norm(queries.unsqueeze(dim=-2) - candidates, p=self.p, power_norm=self.power_norm)
+
+
+class DistMultQueryEncoder(InnerProductQueryEncoder):
+    """A query encoder for :class:`pykeen.nn.modules.DistMultInteraction`."""
+
+    # docstr-coverage: inherited
+    def encode_tail_query(self, h: torch.FloatTensor, r: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        return h * r
+
+    # docstr-coverage: inherited
+    def encode_head_query(self, r: torch.FloatTensor, t: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        return r * t
+
+
+class ComplExQueryEncoder(InnerProductQueryEncoder):
+    r"""A query encoder for :class:`pykeen.nn.modules.ComplExInteraction`.
+
+    Since $Re(\langle a, \bar{b} \rangle)$ equals the inner product of the real views of $a$ and $b$, and
+    $Re(\langle h, r, \bar{t} \rangle) = Re(\langle \bar{r} \odot t, \bar{h} \rangle)$, the search is an inner
+    product search over the real views.
+    """
+
+    # docstr-coverage: inherited
+    def encode_entities(self, x: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        return _real_view(x)
+
+    # docstr-coverage: inherited
+    def encode_tail_query(self, h: torch.FloatTensor, r: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        h, r = ensure_complex(h, r)
+        return _real_view(h * r)
+
+    # docstr-coverage: inherited
+    def encode_head_query(self, r: torch.FloatTensor, t: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        r, t = ensure_complex(r, t)
+        return _real_view(torch.conj(r) * t)
+
+
+class TransEQueryEncoder(DistanceQueryEncoder):
+    """A query encoder for :class:`pykeen.nn.modules.TransEInteraction`."""
+
+    def __init__(self, interaction: TransEInteraction):
+        """
+        Initialize the encoder.
+
+        :param interaction:
+            the interaction function, from which the norm is taken
+        """
+        super().__init__(interaction=interaction)
+        self.p = interaction.p
+        self.power_norm = interaction.power_norm
+
+    # docstr-coverage: inherited
+    def encode_tail_query(self, h: torch.FloatTensor, r: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        return h + r
+
+    # docstr-coverage: inherited
+    def encode_head_query(self, r: torch.FloatTensor, t: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        return t - r
+
+
+class RotatEQueryEncoder(DistanceQueryEncoder):
+    r"""A query encoder for :class:`pykeen.nn.modules.RotatEInteraction`.
+
+    For the head queries, we use that $|h \odot r - t| = |h - \bar{r} \odot t|$ for unit-modulus relations.
+    """
+
+    # docstr-coverage: inherited
+    def encode_entities(self, x: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        return _real_view(x)
+
+    # docstr-coverage: inherited
+    def encode_tail_query(self, h: torch.FloatTensor, r: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        h, r = ensure_complex(h, r)
+        return _real_view(h * r)
+
+    # docstr-coverage: inherited
+    def encode_head_query(self, r: torch.FloatTensor, t: torch.FloatTensor) -> torch.FloatTensor:  # noqa: D102
+        r, t = ensure_complex(r, t)
+        return _real_view(t * torch.conj(r))
+
+
+#: the query encoders for the supported interactions
+query_encoders: Mapping[Type[Interaction], Type[QueryEncoder]] = {
+    DistMultInteraction: DistMultQueryEncoder,
+    ComplExInteraction: ComplExQueryEncoder,
+    TransEInteraction: TransEQueryEncoder,
+    RotatEInteraction: RotatEQueryEncoder,
+}
+
+
+def get_query_encoder(interaction: Interaction) -> QueryEncoder:
+    """
+    Get the query encoder for an interaction.
+
+    :param interaction:
+        the interaction function
+
+    :return:
+        the query encoder
+
+    :raises NotImplementedError:
+        if the interaction function cannot be expressed as a vector search
+    """
+    for cls in type(interaction).__mro__:
+        if cls in query_encoders:
+            return query_encoders[cls](interaction)
+    raise NotImplementedError(
+        f"{interaction} is not supported for approximate nearest neighbour search. Supported interactions are: "
+        f"{sorted(cls.__name__ for cls in query_encoders)}",
+    )
+
+
+def _nearest_centroid(x: torch.FloatTensor, centroids: torch.FloatTensor, batch_size: int) -> torch.LongTensor:
+    """Assign each vector to its closest centroid w.r.t. the Euclidean distance."""
+    return torch.cat([torch.cdist(x_batch, centroids).argmin(dim=-1) for x_batch in x.split(batch_size)])
+
+
+def _kmeans(
+    x: torch.FloatTensor,
+    num_clusters: int,
+    num_iterations: int,
+    generator: torch.Generator,
+    batch_size: int,
+) -> torch.FloatTensor:
+    r"""
+    Cluster vectors by Lloyd's k-means algorithm.
+
+    :param x: shape: (n, d)
+        the vectors
+    :param num_clusters: $0 < k \leq n$
+        the number of clusters
+    :param num_iterations:
+        the number of iterations
+    :param generator:
+        the random state used for initialization and re-seeding empty clusters
+    :param batch_size:
+        the batch size for the assignment step
+
+    :return: shape: (k, d)
+        the centroids
+    """
+    n = x.shape[0]
+    centroids = x[torch.randperm(n, generator=generator)[:num_clusters].to(x.device)]
+    for _ in range(num_iterations):
+        assignment = _nearest_centroid(x=x, centroids=centroids, batch_size=batch_size)
+        counts = torch.bincount(assignment, minlength=num_clusters)
+        centroids = torch.zeros_like(centroids).index_add_(0, assignment, x) / counts.clamp_min(1).unsqueeze(dim=-1)
+        # re-seed empty clusters by random vectors
+        empty = counts == 0
+        if empty.any():
+            centroids[empty] = x[torch.randint(n, size=(int(empty.sum()),), generator=generator).to(x.device)]
+    return centroids
+
+
+class ApproximateTopK(NamedTuple):
+    """The result of an approximate top-k search."""
+
+    #: shape: (batch_size, k), the scores in descending order; -inf if less than k candidates were scored
+    scores: torch.FloatTensor
+
+    #: shape: (batch_size, k), the corresponding entity IDs; -1 if less than k candidates were scored
+    indices: torch.LongTensor
+
+    #: shape: (batch_size,), the number of candidates scored for each query
+    num_candidates: torch.LongTensor
+
+
+class InvertedFileIndex:
+    r"""An inverted file index (IVF) with a $k$-means coarse quantizer."""
+
+    #: shape: (n, d), the indexed vectors
+    vectors: torch.FloatTensor
+
+    #: shape: (num_lists, d), the cluster centroids
+    centroids: torch.FloatTensor
+
+    #: shape: (n,), the IDs of the vectors sorted by cluster
+    ids: torch.LongTensor
+
+    #: shape: (num_lists + 1,), the start of each cluster's IDs in :attr:`ids`, followed by n
+    offsets: torch.LongTensor
+
+    def __init__(
+        self,
+        vectors: torch.FloatTensor,
+        similarity: Similarity,
+        num_lists: Optional[int] = None,
+        num_iterations: int = 10,
+        random_state: TorchRandomHint = None,
+        batch_size: int = 4096,
+    ):
+        r"""
+        Build the index.
+
+        :param vectors: shape: (n, d)
+            the vectors to index
+        :param similarity:
+            the similarity used to select the clusters to probe and to score the candidates
+        :param num_lists: $0 <$ num_lists $\leq n$
+            the number of clusters. Defaults to $\sqrt{n}$.
+        :param num_iterations:
+            the number of $k$-means iterations
+        :param random_state:
+            the random state for the $k$-means initialization
+        :param batch_size:
+            the batch size for assigning vectors to clusters
+
+        :raises ValueError:
+            if the number of lists is invalid
+        """
+        n = vectors.shape[0]
+        if num_lists is None:
+            num_lists = max(1, round(math.sqrt(n)))
+        if not 0 < num_lists <= n:
+            raise ValueError(f"num_lists must be in (0, {n}], but is {num_lists}")
+        self.vectors = vectors
+        self.similarity = similarity
+        self.centroids = _kmeans(
+            x=vectors,
+            num_clusters=num_lists,
+            num_iterations=num_iterations,
+            generator=ensure_torch_random_state(random_state),
+            batch_size=batch_size,
+        )
+        assignment = _nearest_centroid(x=vectors, centroids=self.centroids, batch_size=batch_size)
+        # sort by cluster, i.e., store the lists without padding them to the largest cluster
+        self.ids = assignment.argsort()
+        counts = torch.bincount(assignment, minlength=num_lists)
+        self.offsets = torch.cat([counts.new_zeros(1), counts.cumsum(dim=0)])
+
+    @property
+    def num_lists(self) -> int:
+        """The number of clusters."""
+        return self.centroids.shape[0]
+
+    def search(self, queries: torch.FloatTensor, k: int, num_probes: int = 1) -> ApproximateTopK:
+        """
+        Search the (approximately) k most similar vectors.
+
+        The probed clusters are processed one at a time: all queries probing a cluster are scored against its vectors
+        at once, and merged into the running top-k. Thus, the working memory is bounded by
+        ``batch_size * (k + list_size)`` scores plus the ``list_size * d`` vectors of a single cluster.
+
+        :param queries: shape: (batch_size, d)
+            the query vectors
+        :param k: >0
+            the number of results per query
+        :param num_probes: >0
+            the number of clusters to search per query
+
+        :return:
+            the scores, IDs and number of scored candidates
+        """
+        batch_size = queries.shape[0]
+        # shape: (batch_size, num_probes)
+        probes = self.similarity(queries, self.centroids).topk(k=min(num_probes, self.num_lists), dim=-1).indices
+        scores = queries.new_full(size=(batch_size, k), fill_value=float("-inf"))
+        indices = torch.full_like(scores, fill_value=-1, dtype=torch.long)
+        num_candidates = torch.zeros(batch_size, dtype=torch.long, device=queries.device)
+        offsets = self.offsets.tolist()
+        for list_id in probes.unique().tolist():
+            # each query probes a cluster at most once
+            rows = (probes == list_id).any(dim=1).nonzero().squeeze(dim=1)
+            ids = self.ids[offsets[list_id] : offsets[list_id + 1]]
+            # shape: (len(rows), list_size); the cluster's vectors are shared by all its queries
+            list_scores = self.similarity(queries[rows], self.vectors[ids])
+            num_candidates[rows] += ids.shape[0]
+            # merge with the running top-k
+            list_scores = torch.cat([scores[rows], list_scores], dim=1)
+            list_indices = torch.cat([indices[rows], ids.unsqueeze(dim=0).expand(rows.shape[0], -1)], dim=1)
+            list_scores, positions = list_scores.topk(k=k, dim=-1)
+            scores[rows] = list_scores
+            indices[rows] = list_indices.gather(dim=1, index=positions)
+        indices[torch.isneginf(scores)] = -1
+        return ApproximateTopK(scores=scores, indices=indices, num_candidates=num_candidates)
+
+
+class EntityIndex:
+    """An approximate top-k index over the entity representations of an :class:`pykeen.models.ERModel`.
+
+    The index is a snapshot of the entity representations at construction time, i.e., it needs to be rebuilt after
+    the model has been trained further.
+    """
+
+    #: the vector index
+    index: InvertedFileIndex
+
+    #: the default number of clusters to probe per query
+    num_probes: int
+
+    def __init__(
+        self,
+        model: ERModel,
+        num_probes: int = 1,
+        num_lists: Optional[int] = None,
+        num_iterations: int = 10,
+        random_state: TorchRandomHint = None,
+        mode: Optional[InductiveMode] = None,
+    ):
+        """
+        Build the index.
+
+        :param model:
+            the model. Its interaction needs to be supported by :func:`get_query_encoder`, and it needs to have
+            exactly one entity and one relation representation.
+        :param num_probes: >0
+            the default number of clusters to probe per query
+        :param num_lists:
+            the number of clusters, cf. :class:`InvertedFileIndex`
+        :param num_iterations:
+            the number of $k$-means iterations
+        :param random_state:
+            the random state for the $k$-means initialization
+        :param mode:
+            The pass mode, which is None in the transductive setting and one of "training",
+            "validation", or "testing" in the inductive setting.
+
+        :raises ValueError:
+            if the model does not have exactly one entity and one relation representation
+        """
+        entity_representations = model._get_entity_representations_from_inductive_mode(mode=mode)
+        if len(entity_representations) != 1 or len(model.relation_representations) != 1:
+            raise ValueError(
+                f"{self.__class__.__name__} requires exactly one entity and one relation representation, but "
+                f"{model} has {len(entity_representations)} entity and {len(model.relation_representations)} "
+                f"relation representations.",
+            )
+        self.model = model
+        self.mode = mode
+        self.encoder = get_query_encoder(model.interaction)
+        self.num_probes = num_probes
+        model.eval()
+        with torch.inference_mode():
+            vectors = self.encoder.encode_entities(entity_representations[0](indices=None))
+        self.index = InvertedFileIndex(
+            vectors=vectors,
+            similarity=self.encoder.similarity,
+            num_lists=num_lists,
+            num_iterations=num_iterations,
+            random_state=random_state,
+        )
+
+    def _entities(self, indices: torch.LongTensor) -> torch.FloatTensor:
+        return self.model._get_entity_representations_from_inductive_mode(mode=self.mode)[0](indices=indices)
+
+    def _relations(self, indices: torch.LongTensor) -> torch.FloatTensor:
+        return self.model.relation_representations[0](indices=indices)
+
+    def encode(self, batch: torch.LongTensor, target: Target = LABEL_TAIL) -> torch.FloatTensor:
+        """
+        Encode a batch of (head, relation) or (relation, tail) pairs into query vectors.
+
+        :param batch: shape: (batch_size, 2), dtype: long
+            the (head, relation) pairs for tail prediction, or the (relation, tail) pairs for head prediction
+        :param target:
+            the prediction target, either "head" or "tail"
+
+        :return: shape: (batch_size, d)
+            the query vectors
+
+        :raises ValueError:
+            if the target is not supported
+        """
+        model = self.model
+        if target == LABEL_TAIL:
+            batch = model._prepare_batch(batch=batch, index_relation=1)
+        elif target == LABEL_HEAD:
+            batch = model._prepare_batch(batch=batch, index_relation=0)
+            if not model.use_inverse_triples:
+                return self.encoder.encode_head_query(r=self._relations(batch[:, 0]), t=self._entities(batch[:, 1]))
+            # head prediction is tail prediction with the inverse relation
+            batch = model._prepare_inverse_batch(batch=batch, index_relation=0)
+        else:
+            raise ValueError(f"Unsupported target: {target}")
+        return self.encoder.encode_tail_query(h=self._entities(batch[:, 0]), r=self._relations(batch[:, 1]))
+
+    @torch.inference_mode()
+    def search(
+        self,
+        batch: torch.LongTensor,
+        k: int,
+        target: Target = LABEL_TAIL,
+        num_probes: Optional[int] = None,
+    ) -> ApproximateTopK:
+        """
+        Search the (approximately) k highest scoring heads or tails.
+
+        :param batch: shape: (batch_size, 2), dtype: long
+            the (head, relation) pairs for tail prediction, or the (relation, tail) pairs for head prediction
+        :param k: >0
+            the number of predictions per pair
+        :param target:
+            the prediction target, either "head" or "tail"
+        :param num_probes: >0
+            the number of clusters to probe per query. Defaults to the index' setting.
+
+        :return:
+            the scores, entity IDs, and number of scored candidates. The scores are the same as the ones from
+            :meth:`pykeen.models.Model.predict`, up to numerical precision.
+        """
+        self.model.eval()
+        result = self.index.search(
+            queries=self.encode(batch=batch, target=target),
+            k=k,
+            num_probes=num_probes or self.num_probes,
+        )
+        if self.model.predict_with_sigmoid:
+            result = result._replace(scores=torch.sigmoid(result.scores))
+        return result
+
+
+@dataclasses.dataclass
+class RecallReport:
+    """A comparison of approximate against exact top-k predictions."""
+
+    #: the number of predictions per query
+    k: int
+
+    #: the number of queries
+    num_queries: int
+
+    #: the average fraction of the exact top-k entities found by the approximate search
+    recall: float
+
+    #: the number of entities considered by exact scoring
+    num_entities: int
+
+    #: the average fraction of entities scored by the approximate search
+    candidate_fraction: float
+
+
+def evaluate_recall(
+    index: EntityIndex,
+    batch: torch.LongTensor,
+    k: int,
+    target: Target = LABEL_TAIL,
+    num_probes: Optional[int] = None,
+) -> RecallReport:
+    """
+    Evaluate the recall of an approximate index against exact scoring.
+
+    :param index:
+        the index
+    :param batch: shape: (batch_size, 2), dtype: long
+        the (head, relation) pairs for tail prediction, or the (relation, tail) pairs for head prediction
+    :param k: >0
+        the number of predictions per query
+    :param target:
+        the prediction target, either "head" or "tail"
+    :param num_probes: >0
+        the number of clusters to probe per query. Defaults to the index' setting.
+
+    :return:
+        the recall report
+    """
+    approximate = index.search(batch=batch, k=k, target=target, num_probes=num_probes)
+    with torch.inference_mode():
+        if target == LABEL_TAIL:
+            scores = index.model.predict_t(batch, mode=index.mode)
+        else:
+            scores = index.model.predict_h(batch, mode=index.mode)
+    num_entities = scores.shape[1]
+    k = min(k, num_entities)
+    exact = scores.topk(k=k, dim=-1).indices
+    hits = (approximate.indices[:, :k, None] == exact[:, None, :]).any(dim=-1).sum(dim=-1)
+    return RecallReport(
+        k=k,
+        num_queries=batch.shape[0],
+        recall=(hits.float() / k).mean().item(),
+        num_entities=num_entities,
+        candidate_fraction=(approximate.num_candidates.float() / num_entities).mean().item(),
+    )
@@ -10,7 +10,7 @@ import os
 import pickle
 import warnings
 from abc import ABC, abstractmethod
-from typing import Any, ClassVar, Iterable, Mapping, Optional, Type, Union
+from typing import Any, ClassVar, Iterable, Iterator, Mapping, Optional, Type, Union
 
 import pandas as pd
 import torch
@@ -438,11 +438,208 @@ class Model(nn.Module, ABC):
 
         raise ValueError(f"Unknown target={target}")
 
+    """Chunked prediction methods"""
+
+    def score_t_chunks(
+        self,
+        hr_batch: torch.LongTensor,
+        *,
+        chunk_size: int,
+        ids: Optional[torch.LongTensor] = None,
+        slice_size: Optional[int] = None,
+        mode: Optional[InductiveMode] = None,
+    ) -> Iterator[torch.FloatTensor]:
+        """Score tails for a batch of (head, relation) pairs in chunks along the entity dimension.
+
+        The default implementation computes the scores for all tails at once, and splits them afterwards. Models
+        override this method to only compute the scores for one chunk of entities at a time, such that the peak
+        memory is bounded by `batch_size * chunk_size`.
+
+        :param hr_batch: shape: (batch_size, 2), dtype: long
+            The indices of (head, relation) pairs.
+        :param chunk_size: >0
+            The maximum number of entities to score at once.
+        :param ids: shape: (num_ids,), dtype: long
+            The candidate tail IDs. If None, all entities are scored, in the order of their IDs.
+        :param slice_size: >0
+            The divisor for the scoring function when using slicing.
+        :param mode:
+            The pass mode, which is None in the transductive setting and one of "training",
+            "validation", or "testing" in the inductive setting.
+
+        :yields: shape: (batch_size, chunk_size_i), dtype: float
+            The scores for consecutive chunks of the candidate tails.
+        """
+        scores = self.score_t(hr_batch, slice_size=slice_size, mode=mode)
+        if ids is not None:
+            scores = scores[:, ids]
+        yield from scores.split(chunk_size, dim=1)
+
+    def score_h_chunks(
+        self,
+        rt_batch: torch.LongTensor,
+        *,
+        chunk_size: int,
+        ids: Optional[torch.LongTensor] = None,
+        slice_size: Optional[int] = None,
+        mode: Optional[InductiveMode] = None,
+    ) -> Iterator[torch.FloatTensor]:
+        """Score heads for a batch of (relation, tail) pairs in chunks along the entity dimension.
+
+        The default implementation computes the scores for all heads at once, and splits them afterwards. Models
+        override this method to only compute the scores for one chunk of entities at a time, such that the peak
+        memory is bounded by `batch_size * chunk_size`.
+
+        :param rt_batch: shape: (batch_size, 2), dtype: long
+            The indices of (relation, tail) pairs.
+        :param chunk_size: >0
+            The maximum number of entities to score at once.
+        :param ids: shape: (num_ids,), dtype: long
+            The candidate head IDs. If None, all entities are scored, in the order of their IDs.
+        :param slice_size: >0
+            The divisor for the scoring function when using slicing.
+        :param mode:
+            The pass mode, which is None in the transductive setting and one of "training",
+            "validation", or "testing" in the inductive setting.
+
+        :yields: shape: (batch_size, chunk_size_i), dtype: float
+            The scores for consecutive chunks of the candidate heads.
+        """
+        scores = self.score_h(rt_batch, slice_size=slice_size, mode=mode)
+        if ids is not None:
+            scores = scores[:, ids]
+        yield from scores.split(chunk_size, dim=1)
+
+    def _postprocess_chunks(self, chunks: Iterable[torch.FloatTensor]) -> Iterator[torch.FloatTensor]:
+        """Apply the sigmoid to prediction chunks, if requested."""
+        for chunk in chunks:
+            yield torch.sigmoid(chunk) if self.predict_with_sigmoid else chunk
+
+    def predict_t_chunks(
+        self,
+        hr_batch: torch.LongTensor,
+        *,
+        chunk_size: int,
+        ids: Optional[torch.LongTensor] = None,
+        slice_size: Optional[int] = None,
+        mode: Optional[InductiveMode] = None,
+    ) -> Iterator[torch.FloatTensor]:
+        """Predict scores for tails in chunks along the entity dimension, cf. :meth:`predict_t`.
+
+        :param hr_batch: shape: (batch_size, 2), dtype: long
+            The indices of (head, relation) pairs.
+        :param chunk_size: >0
+            The maximum number of entities to score at once.
+        :param ids: shape: (num_ids,), dtype: long
+            The candidate tail IDs. If None, all entities are scored, in the order of their IDs.
+        :param slice_size: >0
+            The divisor for the scoring function when using slicing.
+        :param mode:
+            The pass mode. Is None for transductive and "training" / "validation" / "testing" in inductive.
+
+        :return: shape: (batch_size, chunk_size_i), dtype: float
+            An iterator over the scores for consecutive chunks of the candidate tails.
+        """
+        self.eval()  # Enforce evaluation mode
+        hr_batch = self._prepare_batch(batch=hr_batch, index_relation=1)
+        return self._postprocess_chunks(
+            self.score_t_chunks(hr_batch, chunk_size=chunk_size, ids=ids, slice_size=slice_size, mode=mode)
+        )
+
+    def predict_h_chunks(
+        self,
+        rt_batch: torch.LongTensor,
+        *,
+        chunk_size: int,
+        ids: Optional[torch.LongTensor] = None,
+        slice_size: Optional[int] = None,
+        mode: Optional[InductiveMode] = None,
+    ) -> Iterator[torch.FloatTensor]:
+        """Predict scores for heads in chunks along the entity dimension, cf. :meth:`predict_h`.
+
+        :param rt_batch: shape: (batch_size, 2), dtype: long
+            The indices of (relation, tail) pairs.
+        :param chunk_size: >0
+            The maximum number of entities to score at once.
+        :param ids: shape: (num_ids,), dtype: long
+            The candidate head IDs. If None, all entities are scored, in the order of their IDs.
+        :param slice_size: >0
+            The divisor for the scoring function when using slicing.
+        :param mode:
+            The pass mode. Is None for transductive and "training" / "validation" / "testing" in inductive.
+
+        :return: shape: (batch_size, chunk_size_i), dtype: float
+            An iterator over the scores for consecutive chunks of the candidate heads.
+        """
+        self.eval()  # Enforce evaluation mode
+        rt_batch = self._prepare_batch(batch=rt_batch, index_relation=0)
+        if self.use_inverse_triples:
+            chunks = self.score_t_chunks(
+                self._prepare_inverse_batch(batch=rt_batch, index_relation=0),
+                chunk_size=chunk_size,
+                ids=ids,
+                slice_size=slice_size,
+                mode=mode,
+            )
+        else:
+            chunks = self.score_h_chunks(rt_batch, chunk_size=chunk_size, ids=ids, slice_size=slice_size, mode=mode)
+        return self._postprocess_chunks(chunks)
+
+    def predict_chunks(
+        self,
+        hrt_batch: MappedTriples,
+        target: Target,
+        *,
+        chunk_size: int,
+        ids: Optional[torch.LongTensor] = None,
+        slice_size: Optional[int] = None,
+        mode: Optional[InductiveMode],
+    ) -> Iterator[torch.FloatTensor]:
+        """Predict scores for the given target in chunks, cf. :meth:`predict`.
+
+        :param hrt_batch: shape: (batch_size, 3), dtype: long
+            The indices of (head, relation, tail) triples. The column of the target is ignored.
+        :param target:
+            The prediction target.
+        :param chunk_size: >0
+            The maximum number of candidates to score at once.
+        :param ids: shape: (num_ids,), dtype: long
+            The candidate IDs. If None, all candidates are scored, in the order of their IDs.
+        :param slice_size: >0
+            The divisor for the scoring function when using slicing.
+        :param mode:
+            The pass mode. Is None for transductive and "training" / "validation" / "testing" in inductive.
+
+        :return: shape: (batch_size, chunk_size_i), dtype: float
+            An iterator over the scores for consecutive chunks of the candidates.
+
+        :raises ValueError:
+            if the target is unknown
+        """
+        if target == LABEL_TAIL:
+            return self.predict_t_chunks(
+                hrt_batch[:, 0:2], chunk_size=chunk_size, ids=ids, slice_size=slice_size, mode=mode
+            )
+
+        if target == LABEL_RELATION:
+            # the number of relations is typically small
+            scores = self.predict_r(hrt_batch[:, [0, 2]], slice_size=slice_size, mode=mode)
+            if ids is not None:
+                scores = scores[:, ids]
+            return iter(scores.split(chunk_size, dim=1))
+
+        if target == LABEL_HEAD:
+            return self.predict_h_chunks(
+                hrt_batch[:, 1:3], chunk_size=chunk_size, ids=ids, slice_size=slice_size, mode=mode
+            )
+
+        raise ValueError(f"Unknown target={target}")
+
     def get_all_prediction_df(
         self,
         *,
         k: Optional[int] = None,
-        batch_size: int = 1,
+        batch_size: Optional[int] = None,
         **kwargs,
     ) -> Union[ScorePack, pd.DataFrame]:
         """Compute scores for all triples, optionally returning only the k highest scoring.
@@ -453,7 +650,7 @@ class Model(nn.Module, ABC):
         :param k:
             The number of triples to return. Set to None, to keep all.
         :param batch_size:
-            The batch size to use for calculating scores.
+            The number of (head, relation) pairs to score at once. If None, it is determined automatically.
         :param kwargs: Additional kwargs to pass to :func:`pykeen.models.predict.get_all_prediction_df`.
         :return: shape: (k, 3)
             A tensor containing the k highest scoring triples, or all possible triples if k=None.
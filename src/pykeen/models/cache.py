@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+"""
+Caching for repeated inference.
+
+When serving link prediction queries, many queries share the same representations, and often even the same
+(head, relation) pairs. Without caching, each call to, e.g., :meth:`pykeen.models.ERModel.score_t` re-computes the
+representations, including normalization, transformations, or message passing over the whole graph for GNN-based
+representations such as :class:`pykeen.nn.representation.RGCNRepresentation`. The :class:`InferenceCache` stores
+
+1. the materialized representations, i.e., the result of computing the representations for all IDs, and
+2. for interactions supported by :func:`pykeen.models.ann.get_query_encoder`, the query vectors combining the head
+   and relation (or relation and tail) representations, in a bounded least-recently-used (LRU) cache.
+
+The cache is enabled by :meth:`pykeen.models.ERModel.enable_inference_cache`, and only used in evaluation mode with
+gradients disabled, e.g., within :func:`torch.inference_mode`, which is what the evaluation loops and
+:mod:`pykeen.models.predict` use. It is invalidated by :meth:`pykeen.models.Model.post_parameter_update`, by
+:meth:`torch.nn.Module.load_state_dict`, and when switching back to training mode. Parameters modified in any other
+way require an explicit call to :meth:`InferenceCache.clear`.
+
+.. code-block:: python
+
+    import torch
+    from pykeen.pipeline import pipeline
+
+    result = pipeline(dataset="nations", model="DistMult")
+    model = result.model
+    model.enable_inference_cache(max_size=10_000)
+
+    hr_batch = result.training.mapped_triples[:32, :2]
+    with torch.inference_mode():
+        # the first call materializes the representations and computes the query vectors
+        scores = model.predict_t(hr_batch)
+        # the second call re-uses them
+        scores = model.predict_t(hr_batch)
+    print(model.inference_cache.hits, model.inference_cache.misses)
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import torch
+
+from .ann import QueryEncoder
+
+__all__ = [
+    "InferenceCache",
+    "QueryVectorCache",
+]
+
+
+class QueryVectorCache:
+    """A bounded LRU cache for query vectors, keyed by pairs of IDs."""
+
+    #: the maximum number of cached vectors
+    max_size: int
+
+    #: a mapping from cached keys to their slot in the buffer, in least-recently used order
+    slots: "OrderedDict[Tuple[int, int], int]"
+
+    #: shape: (max_size, dim), the buffer of cached vectors, allocated on first use
+    buffer: Optional[torch.FloatTensor]
+
+    def __init__(self, max_size: int):
+        """
+        Initialize the cache.
+
+        :param max_size: >0
+            the maximum number of cached vectors
+
+        :raises ValueError:
+            if the maximum size is not positive
+        """
+        if max_size <= 0:
+            raise ValueError(f"max_size must be positive, but is {max_size}")
+        self.max_size = max_size
+        self.slots = OrderedDict()
+        self.buffer = None
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def get(
+        self,
+        pairs: torch.LongTensor,
+        compute: Callable[[torch.LongTensor], torch.FloatTensor],
+    ) -> torch.FloatTensor:
+        """
+        Get the vectors for a batch of ID pairs, computing and caching the missing ones.
+
+        :param pairs: shape: (batch_size, 2), dtype: long
+            the ID pairs
+        :param compute:
+            a function which computes the vectors, shape: (n, dim), for ID pairs, shape: (n, 2)
+
+        :return: shape: (batch_size, dim)
+            the vectors
+        """
+        unique_pairs, inverse = pairs.unique(dim=0, return_inverse=True)
+        keys = list(map(tuple, unique_pairs.tolist()))
+        hit_positions = [i for i, key in enumerate(keys) if key in self.slots]
+        miss_positions = [i for i, key in enumerate(keys) if key not in self.slots]
+        self.hits += len(hit_positions)
+        self.misses += len(miss_positions)
+        vectors: Optional[torch.FloatTensor] = None
+        if hit_positions:
+            assert self.buffer is not None
+            # mark as recently used, and read the cached vectors *before* any eviction
+            for i in hit_positions:
+                self.slots.move_to_end(keys[i])
+            hit_vectors = self.buffer[[self.slots[keys[i]] for i in hit_positions]]
+            vectors = hit_vectors.new_empty(len(keys), *hit_vectors.shape[1:])
+            vectors[hit_positions] = hit_vectors
+        if miss_positions:
+            miss_vectors = compute(unique_pairs[miss_positions])
+            if vectors is None:
+                vectors = miss_vectors.new_empty(len(keys), *miss_vectors.shape[1:])
+            vectors[miss_positions] = miss_vectors
+            self._insert(keys=[keys[i] for i in miss_positions], vectors=miss_vectors)
+        assert vectors is not None
+        return vectors[inverse]
+
+    def _insert(self, keys: List[Tuple[int, int]], vectors: torch.FloatTensor) -> None:
+        """Insert vectors, evicting the least-recently used ones if necessary."""
+        # if there are more new vectors than slots, only the last ones are cached
+        keys, vectors = keys[-self.max_size :], vectors[-self.max_size :]
+        if not keys:
+            return
+        if self.buffer is None:
+            self.buffer = vectors.new_empty(self.max_size, *vectors.shape[1:])
+        elif self.buffer.is_inference() and not torch.is_inference_mode_enabled():
+            # inference tensors cannot be updated in-place outside of inference mode
+            self.buffer = self.buffer.clone()
+        slots = []
+        for key in keys:
+            if len(self.slots) < self.max_size:
+                slot = len(self.slots)
+            else:
+                _, slot = self.slots.popitem(last=False)
+            self.slots[key] = slot
+            slots.append(slot)
+        self.buffer[slots] = vectors
+
+    def clear(self) -> None:
+        """Clear the cache."""
+        self.slots.clear()
+        self.buffer = None
+
+
+class InferenceCache:
+    """A cache of materialized representations and query vectors for repeated inference."""
+
+    #: the materialized representations, and other values computed once per parameter state
+    materialized: Dict[Hashable, Any]
+
+    #: the query vector caches, keyed by the prediction target and the inductive mode
+    queries: Dict[Hashable, QueryVectorCache]
+
+    def __init__(self, max_size: int = 4096, query_encoder: Optional[QueryEncoder] = None):
+        """
+        Initialize the cache.
+
+        :param max_size: >0
+            the maximum number of cached query vectors, per prediction target
+        :param query_encoder:
+            the query encoder, or None, if the interaction does not allow combining head and relation (or
+            relation and tail) representations into a single query vector
+
+        :raises ValueError:
+            if the maximum size is not positive
+        """
+        if max_size <= 0:
+            raise ValueError(f"max_size must be positive, but is {max_size}")
+        self.max_size = max_size
+        self.query_encoder = query_encoder
+        self.materialized = {}
+        self.queries = {}
+
+    @property
+    def hits(self) -> int:
+        """The number of query vectors taken from the cache."""
+        return sum(cache.hits for cache in self.queries.values())
+
+    @property
+    def misses(self) -> int:
+        """The number of query vectors which had to be computed."""
+        return sum(cache.misses for cache in self.queries.values())
+
+    def materialize(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get a materialized value, computing it if it is not cached yet.
+
+        Tensors are stored as detached copies, since, e.g., the materialized representations of an
+        :class:`pykeen.nn.representation.Embedding` are its weight, which may be updated in-place.
+
+        :param key:
+            the key, e.g., the representation module
+        :param compute:
+            a function computing the value
+
+        :return:
+            the (cached) value
+        """
+        if key not in self.materialized:
+            value = compute()
+            if torch.is_tensor(value):
+                value = value.detach().clone()
+            self.materialized[key] = value
+        return self.materialized[key]
+
+    def get_queries(self, key: Hashable) -> QueryVectorCache:
+        """
+        Get the query vector cache for the given key.
+
+        :param key:
+            the key, e.g., a pair of prediction target and inductive mode
+
+        :return:
+            the query vector cache
+        """
+        if key not in self.queries:
+            self.queries[key] = QueryVectorCache(max_size=self.max_size)
+        return self.queries[key]
+
+    def clear(self) -> None:
+        """Invalidate all cached values, e.g., after a parameter update."""
+        self.materialized.clear()
+        for cache in self.queries.values():
+            cache.clear()
@@ -101,14 +101,8 @@ class InductiveNodePieceGNN(InductiveNodePiece):
                 if hasattr(layer, "reset_parameters"):
                     layer.reset_parameters()
 
-    def _get_representations(
-        self,
-        h: Optional[torch.LongTensor],
-        r: Optional[torch.LongTensor],
-        t: Optional[torch.LongTensor],
-        mode: InductiveMode = None,
-    ) -> Tuple[HeadRepresentation, RelationRepresentation, TailRepresentation]:
-        """Get representations for head, relation and tails, in canonical shape with a GNN encoder."""
+    def _encode(self, mode: InductiveMode) -> Tuple[torch.FloatTensor, torch.FloatTensor]:
+        """Compute all entity and relation representations with the GNN encoder."""
         entity_representations = self._get_entity_representations_from_inductive_mode(mode=mode)
 
         # Extract all entity and relation representations
@@ -122,6 +116,22 @@ class InductiveNodePieceGNN(InductiveNodePiece):
                 edge_index=getattr(self, f"{mode}_edge_index"),
                 edge_type=getattr(self, f"{mode}_edge_type"),
             )
+        return x_e, x_r
+
+    def _get_representations(
+        self,
+        h: Optional[torch.LongTensor],
+        r: Optional[torch.LongTensor],
+        t: Optional[torch.LongTensor],
+        mode: InductiveMode = None,
+    ) -> Tuple[HeadRepresentation, RelationRepresentation, TailRepresentation]:
+        """Get representations for head, relation and tails, in canonical shape with a GNN encoder."""
+        cache = self._get_inference_cache()
+        if cache is None:
+            x_e, x_r = self._encode(mode=mode)
+        else:
+            # re-use the result of message passing for repeated inference
+            x_e, x_r = cache.materialize(key=(self.gnn_encoder, mode), compute=lambda: self._encode(mode=mode))
 
         # Use updated entity and relation states to extract requested IDs
         # TODO I got lost in all the Representation Modules and shape casting and wrote this ;(
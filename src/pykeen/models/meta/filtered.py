@@ -1,6 +1,6 @@
 """Filtered models."""
 
-from typing import Any, ClassVar, List, Mapping, Optional, Union
+from typing import Any, ClassVar, Iterator, List, Mapping, Optional, Union
 
 import scipy.sparse
 import torch
@@ -215,3 +215,23 @@ class CooccurrenceFilteredModel(Model):
             target=LABEL_RELATION,
             in_training=False,
         )
+
+    # docstr-coverage: inherited
+    def predict_h_chunks(
+        self, rt_batch: torch.LongTensor, *, chunk_size: int, ids: Optional[torch.LongTensor] = None, **kwargs
+    ) -> Iterator[torch.FloatTensor]:  # noqa: D102
+        # the mask is applied to the scores of all entities
+        scores = self.predict_h(rt_batch, **kwargs)
+        if ids is not None:
+            scores = scores[:, ids]
+        return iter(scores.split(chunk_size, dim=1))
+
+    # docstr-coverage: inherited
+    def predict_t_chunks(
+        self, hr_batch: torch.LongTensor, *, chunk_size: int, ids: Optional[torch.LongTensor] = None, **kwargs
+    ) -> Iterator[torch.FloatTensor]:  # noqa: D102
+        # the mask is applied to the scores of all entities
+        scores = self.predict_t(hr_batch, **kwargs)
+        if ids is not None:
+            scores = scores[:, ids]
+        return iter(scores.split(chunk_size, dim=1))
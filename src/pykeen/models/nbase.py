@@ -8,7 +8,22 @@ import logging
 from abc import ABC
 from collections import defaultdict
 from operator import itemgetter
-from typing import Any, ClassVar, Generic, Iterable, List, Mapping, Optional, Sequence, Tuple, Type, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 import torch
 from class_resolver import HintOrType, OptionalKwargs
@@ -21,9 +36,20 @@ from ..nn.modules import Interaction, interaction_resolver
 from ..nn.representation import Representation
 from ..regularizers import Regularizer, regularizer_resolver
 from ..triples import KGInfo
-from ..typing import HeadRepresentation, InductiveMode, RelationRepresentation, TailRepresentation
+from ..typing import (
+    LABEL_HEAD,
+    LABEL_TAIL,
+    HeadRepresentation,
+    InductiveMode,
+    RelationRepresentation,
+    TailRepresentation,
+    Target,
+)
 from ..utils import check_shapes, get_batchnorm_modules
 
+if TYPE_CHECKING:
+    from .cache import InferenceCache
+
 __all__ = [
     "_NewAbstractModel",
     "ERModel",
@@ -216,6 +242,13 @@ def _prepare_representation_module_list(
     return rs
 
 
+def _index_select(x: torch.FloatTensor, indices: Optional[torch.LongTensor]) -> torch.FloatTensor:
+    """Select the materialized representations for the given indices, cf. :meth:`Representation.forward`."""
+    if indices is None:
+        return x
+    return x[indices]
+
+
 def repeat_if_necessary(
     scores: torch.FloatTensor,
     representations: Sequence[Representation],
@@ -276,6 +309,9 @@ class ERModel(
     #: The interaction function
     interaction: Interaction
 
+    #: The cache for repeated inference, cf. :meth:`enable_inference_cache`
+    inference_cache: Optional[InferenceCache] = None
+
     def __init__(
         self,
         *,
@@ -336,6 +372,87 @@ class ERModel(
         # Explicitly call reset_parameters to trigger initialization
         self.reset_parameters_()
 
+    def enable_inference_cache(self, max_size: int = 4096) -> InferenceCache:
+        """
+        Enable caching for repeated inference, cf. :mod:`pykeen.models.cache`.
+
+        The cache stores the materialized entity and relation representations, and, if the interaction allows it,
+        the query vectors combining head and relation (or relation and tail) representations. It is only used in
+        evaluation mode with gradients disabled, and invalidated by :meth:`post_parameter_update` or when switching
+        to training mode.
+
+        :param max_size: >0
+            the maximum number of cached query vectors, per prediction target
+
+        :return:
+            the cache
+        """
+        from .ann import get_query_encoder
+        from .cache import InferenceCache
+
+        query_encoder = None
+        if len(self.entity_representations) == 1 and len(self.relation_representations) == 1:
+            try:
+                query_encoder = get_query_encoder(self.interaction)
+            except NotImplementedError:
+                logger.debug(f"{self.interaction} does not support query vectors; only caching representations.")
+        self.inference_cache = InferenceCache(max_size=max_size, query_encoder=query_encoder)
+        return self.inference_cache
+
+    def disable_inference_cache(self) -> None:
+        """Disable caching for repeated inference, and free the cached values."""
+        self.inference_cache = None
+
+    def _get_inference_cache(self) -> Optional[InferenceCache]:
+        """Return the inference cache, if it is enabled and can be used in the current state."""
+        # cached values are computed without gradient tracking
+        if self.inference_cache is None or self.training or torch.is_grad_enabled():
+            return None
+        return self.inference_cache
+
+    # docstr-coverage: inherited
+    def post_parameter_update(self) -> None:  # noqa: D102
+        super().post_parameter_update()
+        if self.inference_cache is not None:
+            self.inference_cache.clear()
+
+    # docstr-coverage: inherited
+    def _load_from_state_dict(self, *args, **kwargs):  # noqa: D102
+        # called by load_state_dict, also when the model is a sub-module, e.g., when restoring the best model in early
+        # stopping, or when resuming from a checkpoint
+        if self.inference_cache is not None:
+            self.inference_cache.clear()
+        return super()._load_from_state_dict(*args, **kwargs)
+
+    # docstr-coverage: inherited
+    def train(self, mode: bool = True):  # noqa: D102
+        # the parameters may change during training without an explicit call to post_parameter_update
+        if mode and self.inference_cache is not None:
+            self.inference_cache.clear()
+        return super().train(mode=mode)
+
+    def _score_cached_queries(
+        self,
+        batch: torch.LongTensor,
+        target: Target,
+        cache: InferenceCache,
+        mode: Optional[InductiveMode],
+    ) -> torch.FloatTensor:
+        """Score all entities for (head, relation) or (relation, tail) pairs using the cached query vectors."""
+        encoder = cache.query_encoder
+        assert encoder is not None
+        h, r, t = self._get_representations(h=None, r=None, t=None, mode=mode)
+        entities = cache.materialize(key=(LABEL_TAIL, mode), compute=lambda: encoder.encode_entities(t))
+
+        def compute(pairs: torch.LongTensor) -> torch.FloatTensor:
+            """Compute the query vectors."""
+            if target == LABEL_TAIL:
+                return encoder.encode_tail_query(h=h[pairs[:, 0]], r=r[pairs[:, 1]])
+            return encoder.encode_head_query(r=r[pairs[:, 0]], t=t[pairs[:, 1]])
+
+        queries = cache.get_queries(key=(target, mode)).get(pairs=batch, compute=compute)
+        return encoder.similarity(queries, entities)
+
     def append_weight_regularizer(
         self,
         parameter: Union[str, nn.Parameter, Iterable[Union[str, nn.Parameter]]],
@@ -470,6 +587,9 @@ class ERModel(
             For each h-r pair, the scores for all possible tails.
         """
         self._check_slicing(slice_size=slice_size)
+        cache = self._get_inference_cache()
+        if cache is not None and cache.query_encoder is not None:
+            return self._score_cached_queries(batch=hr_batch, target=LABEL_TAIL, cache=cache, mode=mode)
         h, r, t = self._get_representations(h=hr_batch[:, 0], r=hr_batch[:, 1], t=None, mode=mode)
         return repeat_if_necessary(
             scores=self.interaction.score_t(h=h, r=r, all_entities=t, slice_size=slice_size),
@@ -496,6 +616,9 @@ class ERModel(
             For each r-t pair, the scores for all possible heads.
         """
         self._check_slicing(slice_size=slice_size)
+        cache = self._get_inference_cache()
+        if cache is not None and cache.query_encoder is not None:
+            return self._score_cached_queries(batch=rt_batch, target=LABEL_HEAD, cache=cache, mode=mode)
         h, r, t = self._get_representations(h=None, r=rt_batch[:, 0], t=rt_batch[:, 1], mode=mode)
         return repeat_if_necessary(
             scores=self.interaction.score_h(all_entities=h, r=r, t=t, slice_size=slice_size),
@@ -503,6 +626,60 @@ class ERModel(
             num=self._get_entity_len(mode=mode),
         )
 
+    def _iter_entity_chunks(
+        self, chunk_size: int, ids: Optional[torch.LongTensor], mode: Optional[InductiveMode]
+    ) -> Iterator[torch.LongTensor]:
+        """Iterate over chunks of candidate entity IDs."""
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, but is {chunk_size}")
+        if ids is not None:
+            yield from ids.to(self.device).split(chunk_size)
+            return
+        num_entities = self._get_entity_len(mode=mode)
+        assert num_entities is not None
+        for start in range(0, num_entities, chunk_size):
+            yield torch.arange(start, min(start + chunk_size, num_entities), device=self.device)
+
+    # docstr-coverage: inherited
+    def score_t_chunks(
+        self,
+        hr_batch: torch.LongTensor,
+        *,
+        chunk_size: int,
+        ids: Optional[torch.LongTensor] = None,
+        slice_size: Optional[int] = None,
+        mode: Optional[InductiveMode] = None,
+    ) -> Iterator[torch.FloatTensor]:  # noqa: D102
+        if not self.entity_representations:
+            yield from super().score_t_chunks(
+                hr_batch, chunk_size=chunk_size, ids=ids, slice_size=slice_size, mode=mode
+            )
+            return
+        self._check_slicing(slice_size=slice_size)
+        for chunk_ids in self._iter_entity_chunks(chunk_size=chunk_size, ids=ids, mode=mode):
+            h, r, t = self._get_representations(h=hr_batch[:, 0], r=hr_batch[:, 1], t=chunk_ids, mode=mode)
+            yield self.interaction.score_t(h=h, r=r, all_entities=t, slice_size=slice_size)
+
+    # docstr-coverage: inherited
+    def score_h_chunks(
+        self,
+        rt_batch: torch.LongTensor,
+        *,
+        chunk_size: int,
+        ids: Optional[torch.LongTensor] = None,
+        slice_size: Optional[int] = None,
+        mode: Optional[InductiveMode] = None,
+    ) -> Iterator[torch.FloatTensor]:  # noqa: D102
+        if not self.entity_representations:
+            yield from super().score_h_chunks(
+                rt_batch, chunk_size=chunk_size, ids=ids, slice_size=slice_size, mode=mode
+            )
+            return
+        self._check_slicing(slice_size=slice_size)
+        for chunk_ids in self._iter_entity_chunks(chunk_size=chunk_size, ids=ids, mode=mode):
+            h, r, t = self._get_representations(h=chunk_ids, r=rt_batch[:, 0], t=rt_batch[:, 1], mode=mode)
+            yield self.interaction.score_h(all_entities=h, r=r, t=t, slice_size=slice_size)
+
     def score_r(
         self, ht_batch: torch.LongTensor, *, slice_size: Optional[int] = None, mode: Optional[InductiveMode] = None
     ) -> torch.FloatTensor:
@@ -579,8 +756,16 @@ class ERModel(
         head_representations = tail_representations = self._get_entity_representations_from_inductive_mode(mode=mode)
         head_representations = [head_representations[i] for i in self.interaction.head_indices()]
         tail_representations = [tail_representations[i] for i in self.interaction.tail_indices()]
+        cache = self._get_inference_cache()
         hr, rr, tr = [
-            [representation(indices=indices) for representation in representations]
+            [
+                (
+                    representation(indices=indices)
+                    if cache is None
+                    else _index_select(cache.materialize(key=representation, compute=representation), indices=indices)
+                )
+                for representation in representations
+            ]
             for indices, representations in (
                 (h, head_representations),
                 (r, self.relation_representations),
@@ -2,18 +2,19 @@
 
 """Prediction workflows."""
 
-import itertools as itt
 import logging
 from abc import abstractmethod
-from typing import Optional, Sequence, Tuple, Union
+from typing import Any, Iterable, Mapping, Optional, Sequence, Tuple, Union
 
 import numpy
 import numpy as np
 import pandas as pd
 import torch
+from torch_max_mem import MemoryUtilizationMaximizer
 from tqdm.auto import tqdm
 
 from .base import Model
+from ..evaluation.evaluator import PositiveFilterIndex
 from ..triples import CoreTriplesFactory, TriplesFactory
 from ..triples.utils import tensor_to_df
 from ..typing import InductiveMode, LabeledTriples, MappedTriples, ScorePack
@@ -55,6 +56,8 @@ def get_head_prediction_df(
         non-novel triples generally have higher scores. On the other hand, if you're doing hypothesis generation, they
         may pose as a distraction. If this is set to True, then non-novel triples will be removed and the column
         denoting novelty will be excluded, since all remaining triples will be novel. Defaults to false.
+        If k is given, the known triples are already excluded while collecting the k highest scoring triples, i.e.,
+        the result comprises k novel triples.
     :param testing: The mapped_triples from the testing triples factory (TriplesFactory.mapped_triples)
     :param mode:
         The pass mode, which is None in the transductive setting and one of "training",
@@ -240,12 +243,13 @@ def get_all_prediction_df(
     *,
     triples_factory: CoreTriplesFactory,
     k: Optional[int] = None,
-    batch_size: int = 1,
+    batch_size: Optional[int] = None,
     return_tensors: bool = False,
     add_novelties: bool = True,
     remove_known: bool = False,
     testing: Optional[torch.LongTensor] = None,
     mode: Optional[InductiveMode] = None,
+    chunk_size: Optional[int] = None,
 ) -> Union[ScorePack, pd.DataFrame]:
     """Compute scores for all triples, optionally returning only the k highest scoring.
 
@@ -255,7 +259,7 @@ def get_all_prediction_df(
     :param model: A PyKEEN model
     :param triples_factory: Training triples factory
     :param k: The number of triples to return. Set to ``None`` to keep all.
-    :param batch_size: The batch size to use for calculating scores
+    :param batch_size: The number of (head, relation) pairs to score at once. If None, it is determined automatically.
     :param return_tensors: If true, only return tensors. If false (default), return as a pandas DataFrame
     :param add_novelties: Should the dataframe include a column denoting if the ranked relations correspond
         to novel triples?
@@ -268,6 +272,7 @@ def get_all_prediction_df(
     :param mode:
         The pass mode, which is None in the transductive setting and one of "training",
         "validation", or "testing" in the inductive setting.
+    :param chunk_size: The number of tails to score at once. If None, all tails are scored at once.
     :return: shape: (k, 3)
         A dataframe with columns based on the settings or a tensor. Contains either the k highest scoring triples,
         or all possible triples if k is None.
@@ -289,7 +294,12 @@ def get_all_prediction_df(
         # Get scores for top 15 triples
         top_df = get_all_prediction_df(model, k=15, triples_factory=result.training)
     """
-    score_pack = predict(model=model, k=k, batch_size=batch_size, mode=mode)
+    exclude = None
+    if remove_known and k is not None:
+        exclude = triples_factory.mapped_triples
+        if testing is not None:
+            exclude = torch.cat([exclude, testing.to(exclude.device)], dim=0)
+    score_pack = predict(model=model, k=k, batch_size=batch_size, mode=mode, exclude=exclude, chunk_size=chunk_size)
     if return_tensors:
         return score_pack
 
@@ -304,17 +314,36 @@ def get_all_prediction_df(
 
 
 def predict(
-    model: Model, *, k: Optional[int] = None, batch_size: int = 1, mode: Optional[InductiveMode] = None
+    model: Model,
+    *,
+    k: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    mode: Optional[InductiveMode] = None,
+    exclude: Optional[MappedTriples] = None,
+    chunk_size: Optional[int] = None,
 ) -> ScorePack:
     """Calculate and store scores for either all triples, or the top k triples.
 
+    The scores are computed for blocks of `batch_size` (head, relation) pairs against all tails. For top-k prediction,
+    the k highest scoring triples are kept in a fixed-size buffer, which is updated after each block.
+
     :param model: A PyKEEN model
     :param k: The number of triples to return. Set to ``None`` to keep all.
-    :param batch_size: The batch size to use for calculating scores
+    :param batch_size:
+        The number of (head, relation) pairs to score at once. If None, it is determined automatically, i.e., the
+        largest block size which fits into memory is used.
     :param mode:
         The pass mode, which is None in the transductive setting and one of "training",
         "validation", or "testing" in the inductive setting.
+    :param exclude: shape: (n, 3)
+        Triples to exclude from the top k triples, e.g., the training triples to obtain only novel ones.
+    :param chunk_size:
+        The number of tails to score at once. If given, the scores are computed and consumed in chunks along the
+        entity dimension, such that the memory requirement is bounded by `batch_size * chunk_size` scores.
     :return: A score pack of parallel triples and scores
+
+    :raises ValueError:
+        if triples to exclude are given without k
     """
     logger.warning(
         f"_predict is an expensive operation, involving {model.num_entities ** 2 * model.num_real_relations} "
@@ -322,13 +351,16 @@ def predict(
     )
 
     if k is not None:
-        return _predict_k(model=model, k=k, batch_size=batch_size, mode=mode)
+        return _predict_k(model=model, k=k, batch_size=batch_size, mode=mode, exclude=exclude, chunk_size=chunk_size)
+
+    if exclude is not None:
+        raise ValueError("Excluding triples is only supported for top-k prediction.")
 
     logger.warning(
         "Not providing k to score_all_triples entails huge memory requirements for reasonably-sized "
         "knowledge graphs.",
     )
-    return _predict_all(model=model, batch_size=batch_size, mode=mode)
+    return _predict_all(model=model, batch_size=batch_size, mode=mode, chunk_size=chunk_size)
 
 
 class _ScoreConsumer:
@@ -341,25 +373,40 @@ class _ScoreConsumer:
     @abstractmethod
     def __call__(
         self,
-        head_id_range: Tuple[int, int],
-        relation_id: int,
         hr_batch: torch.LongTensor,
         scores: torch.FloatTensor,
+        offset: int = 0,
     ) -> None:
-        """Consume scores for the given hr_batch."""
+        """
+        Consume scores for the given hr_batch.
+
+        :param hr_batch: shape: (batch_size, 2)
+            the (head, relation) pairs
+        :param scores: shape: (batch_size, chunk_size)
+            the scores for a consecutive chunk of tails, or all tails
+        :param offset:
+            the ID of the first tail in the chunk
+        """
         raise NotImplementedError
 
+    def reset(self) -> None:
+        """Reset the consumer, e.g., before re-starting the consumption with a smaller batch size."""
+
     def finalize(self) -> ScorePack:
         """Finalize the result to build a score pack."""
         return _build_pack(result=self.result, scores=self.scores, flatten=self.flatten)
 
 
 class _TopKScoreConsumer(_ScoreConsumer):
-    """Collect top-k triples & scores."""
+    """Collect top-k triples & scores in a fixed-size buffer.
+
+    Once the buffer is full, only scores exceeding the smallest score in the buffer are considered, such that the cost
+    of maintaining the top-k triples decreases as the consumption progresses.
+    """
 
     flatten = False
 
-    def __init__(self, k: int, device: torch.device) -> None:
+    def __init__(self, k: int, device: torch.device, exclude: Optional[MappedTriples] = None) -> None:
         """
         Initialize the consumer.
 
@@ -367,56 +414,94 @@ class _TopKScoreConsumer(_ScoreConsumer):
             the number of top-scored triples to collect
         :param device:
             the model's device
+        :param exclude: shape: (n, 3)
+            triples to exclude, e.g., the known training triples
         """
         self.k = k
-        # initialize buffer on device
-        self.result = torch.empty(0, 3, dtype=torch.long, device=device)
-        self.scores = torch.empty(0, device=device)
+        self.filter_index = None if exclude is None else PositiveFilterIndex(mapped_triples=exclude.to(device))
+        # initialize buffer on device: the first k entries hold the current top-k, the remaining k ones the candidates
+        # of the current batch
+        self._scores = torch.empty(2 * k, device=device)
+        self._result = torch.empty(2 * k, 3, dtype=torch.long, device=device)
+        self.num_filled = 0
+        # the smallest score in the buffer, once it is full
+        self.threshold = self._scores.new_full(size=tuple(), fill_value=float("-inf"))
+        # the filter for the last (head, relation) batch, which is re-used for all its chunks
+        self._filter: Optional[Tuple[torch.LongTensor, torch.LongTensor]] = None
+
+    # docstr-coverage: inherited
+    def reset(self) -> None:  # noqa: D102
+        self.num_filled = 0
+        self.threshold.fill_(float("-inf"))
+        self._filter = None
+
+    def _lookup_filter(self, hr_batch: torch.LongTensor) -> torch.LongTensor:
+        """Lookup the known triples for the given (head, relation) pairs."""
+        assert self.filter_index is not None
+        if self._filter is None or self._filter[0] is not hr_batch:
+            filter_batch = self.filter_index.lookup(
+                hrt_batch=torch.cat([hr_batch, torch.zeros_like(hr_batch[:, :1])], dim=-1), filter_col=2
+            )
+            self._filter = (hr_batch, filter_batch)
+        return self._filter[1]
 
     # docstr-coverage: inherited
     def __call__(
         self,
-        head_id_range: Tuple[int, int],
-        relation_id: int,
         hr_batch: torch.LongTensor,
         scores: torch.FloatTensor,
+        offset: int = 0,
     ) -> None:  # noqa: D102
-        batch_size, num_entities = scores.shape
-
-        # reshape, shape: (batch_size * num_entities,)
-        top_scores = scores.view(-1)
-
-        # get top scores within batch
-        if top_scores.numel() >= self.k:
-            top_scores, top_indices = top_scores.topk(
-                k=min(self.k, top_scores.numel()),
-                largest=True,
-                sorted=False,
+        num_entities = scores.shape[1]
+
+        # exclude known triples
+        if self.filter_index is not None:
+            filter_batch = self._lookup_filter(hr_batch=hr_batch)
+            batch_ids, entity_ids = filter_batch[:, 0], filter_batch[:, 1] - offset
+            mask = (entity_ids >= 0) & (entity_ids < num_entities)
+            scores = scores.index_put(
+                (batch_ids[mask], entity_ids[mask]), scores.new_full(size=tuple(), fill_value=float("-inf"))
             )
-            h_start = head_id_range[0]
-            top_heads = h_start + torch.div(top_indices, num_entities, rounding_mode="trunc")
-            top_tails = top_indices % num_entities
-        else:
-            top_heads = hr_batch[:, 0].view(-1, 1).repeat(1, num_entities).view(-1)
-            top_tails = torch.arange(num_entities, device=hr_batch.device).view(1, -1).repeat(batch_size, 1).view(-1)
 
-        top_triples = torch.stack(
-            [
-                top_heads,
-                top_heads.new_full(size=top_heads.shape, fill_value=relation_id, dtype=top_heads.dtype),
-                top_tails,
-            ],
-            dim=-1,
-        )
-
-        # append to global top scores
-        self.scores = torch.cat([self.scores, top_scores])
-        self.result = torch.cat([self.result, top_triples])
+        # get top scores within batch, shape: (m,), with m <= k
+        scores = scores.view(-1)
+        if self.num_filled < self.k:
+            top_scores, top_indices = scores, None
+        else:
+            # only scores exceeding the current k-th largest score can enter the buffer
+            top_indices = torch.nonzero(scores > self.threshold, as_tuple=True)[0]
+            top_scores = scores[top_indices]
+        if top_scores.numel() > self.k:
+            top_scores, indices = top_scores.topk(k=self.k, largest=True, sorted=False)
+            top_indices = indices if top_indices is None else top_indices[indices]
+        elif top_indices is None:
+            top_indices = torch.arange(scores.numel(), device=scores.device)
+        num_candidates = top_scores.numel()
+
+        # append candidates to the buffer
+        start, stop = self.num_filled, self.num_filled + num_candidates
+        self._scores[start:stop] = top_scores
+        self._result[start:stop, :2] = hr_batch[torch.div(top_indices, num_entities, rounding_mode="trunc")]
+        self._result[start:stop, 2] = top_indices % num_entities + offset
 
         # reduce size if necessary
-        if self.result.shape[0] > self.k:
-            self.scores, indices = self.scores.topk(k=self.k, largest=True, sorted=False)
-            self.result = self.result[indices]
+        if stop > self.k:
+            top_scores, indices = self._scores[:stop].topk(k=self.k, largest=True, sorted=False)
+            self._result[: self.k] = self._result[indices]
+            self._scores[: self.k] = top_scores
+            stop = self.k
+        if stop == self.k:
+            self.threshold = self._scores[: self.k].min()
+        self.num_filled = stop
+
+    # docstr-coverage: inherited
+    def finalize(self) -> ScorePack:  # noqa: D102
+        result, scores = self._result[: self.num_filled], self._scores[: self.num_filled]
+        if self.filter_index is not None:
+            # there may be less than k triples which are not excluded
+            mask = scores > float("-inf")
+            result, scores = result[mask], scores[mask]
+        return _build_pack(result=result, scores=scores, flatten=self.flatten)
 
 
 class _AllConsumer(_ScoreConsumer):
@@ -449,91 +534,158 @@ class _AllConsumer(_ScoreConsumer):
     # docstr-coverage: inherited
     def __call__(
         self,
-        head_id_range: Tuple[int, int],
-        relation_id: int,
         hr_batch: torch.LongTensor,
         scores: torch.FloatTensor,
+        offset: int = 0,
     ) -> None:  # noqa: D102
-        h_start, h_stop = head_id_range
-        self.scores[relation_id, h_start:h_stop, :] = scores.to(self.scores.device)
+        hr_batch = hr_batch.cpu()
+        self.scores[hr_batch[:, 1], hr_batch[:, 0], offset : offset + scores.shape[1]] = scores.to(self.scores.device)
 
 
+def _hasher(d: Mapping[str, Any]) -> int:
+    """
+    Calculate hash based on the ID of the model.
+
+    :param d:
+        the dictionary of keyword-based parameters
+
+    :return:
+        the model's ID
+    """
+    return id(d["model"])
+
+
+#: the MemoryUtilizationMaximizer instance for :func:`_consume_scores`.
+prediction_batch_size_maximizer = MemoryUtilizationMaximizer(hasher=_hasher)
+
+
+@prediction_batch_size_maximizer
 @torch.inference_mode()
 def _consume_scores(
-    model: Model, *consumers: _ScoreConsumer, batch_size: int = 1, mode: Optional[InductiveMode]
+    model: Model,
+    consumers: Sequence[_ScoreConsumer],
+    batch_size: int,
+    mode: Optional[InductiveMode],
+    chunk_size: Optional[int] = None,
 ) -> None:
     """
     Batch-wise calculation of all triple scores and consumption.
 
+    .. note::
+        this method is wrapped into a `MemoryUtilizationMaximizer` instance to automatically tune the `batch_size`.
+
     :param model:
         the model, will be set to evaluation mode
     :param consumers:
         the consumers of score batches
     :param batch_size:
-        the batch size to use  # TODO: automatic batch size maximization
+        the number of (head, relation) pairs to score at once
     :param mode:
         The pass mode, which is None in the transductive setting and one of "training",
         "validation", or "testing" in the inductive setting.
+    :param chunk_size:
+        The number of tails to score at once. If None, all tails are scored at once.
     """
     # TODO: in the future, we may want to expose this method
     # set model to evaluation mode
     model.eval()
-
-    for r, h_start in tqdm(
-        itt.product(
-            range(model.num_real_relations),
-            range(0, model.num_entities, batch_size),
-        ),
+    # the consumption may have been interrupted by an out-of-memory error
+    for consumer in consumers:
+        consumer.reset()
+
+    # enumerate all (head, relation) pairs, relation-major
+    num_entities = model.num_entities
+    num_pairs = num_entities * model.num_real_relations
+    for start in tqdm(
+        range(0, num_pairs, batch_size),
         desc="scoring",
         unit="batch",
         unit_scale=True,
-        total=model.num_relations * model.num_entities // batch_size,
+        leave=False,
     ):
         # calculate batch scores
-        h_stop = min(h_start + batch_size, model.num_entities)
-        hs = torch.arange(h_start, h_stop, device=model.device)
-        hr_batch = torch.stack(
-            [
-                hs,
-                hs.new_full(size=(hs.shape[0],), fill_value=r),
-            ],
-            dim=-1,
-        )
-        scores = model.predict_t(hr_batch=hr_batch, mode=mode)
-        for consumer in consumers:
-            consumer(head_id_range=(h_start, h_stop), relation_id=r, hr_batch=hr_batch, scores=scores)
+        ids = torch.arange(start, min(start + batch_size, num_pairs), device=model.device)
+        hr_batch = torch.stack([ids % num_entities, torch.div(ids, num_entities, rounding_mode="trunc")], dim=-1)
+        if chunk_size is None:
+            chunks: Iterable[torch.FloatTensor] = [model.predict_t(hr_batch=hr_batch, mode=mode)]
+        else:
+            chunks = model.predict_t_chunks(hr_batch=hr_batch, chunk_size=chunk_size, mode=mode)
+        offset = 0
+        for scores in chunks:
+            for consumer in consumers:
+                consumer(hr_batch=hr_batch, scores=scores, offset=offset)
+            offset += scores.shape[1]
+
+
+def _resolve_batch_size(model: Model, batch_size: Optional[int]) -> int:
+    """Determine the upper limit of the batch size for automatic memory optimization."""
+    if batch_size:
+        return batch_size
+    if model.device.type == "cpu":
+        return 32
+    return model.num_entities * model.num_real_relations
 
 
 @torch.inference_mode()
-def _predict_all(model: Model, *, batch_size: int = 1, mode: Optional[InductiveMode]) -> ScorePack:
+def _predict_all(
+    model: Model,
+    *,
+    batch_size: Optional[int] = None,
+    mode: Optional[InductiveMode],
+    chunk_size: Optional[int] = None,
+) -> ScorePack:
     """Compute and store scores for all triples.
 
     :param model: A PyKEEN model
-    :param batch_size: The batch size to use for calculating scores
+    :param batch_size: The number of (head, relation) pairs to score at once. If None, it is determined automatically.
     :param mode:
         The pass mode, which is None in the transductive setting and one of "training",
         "validation", or "testing" in the inductive setting.
+    :param chunk_size: The number of tails to score at once. If None, all tails are scored at once.
     :return: A score pack of parallel triples and scores
     """
     consumer = _AllConsumer(num_entities=model.num_entities, num_relations=model.num_relations)
-    _consume_scores(model, consumer, batch_size=batch_size, mode=mode)
+    _consume_scores(
+        model=model,
+        consumers=[consumer],
+        batch_size=_resolve_batch_size(model=model, batch_size=batch_size),
+        mode=mode,
+        chunk_size=chunk_size,
+    )
     return consumer.finalize()
 
 
 @torch.inference_mode()
-def _predict_k(model: Model, *, k: int, batch_size: int = 1, mode: Optional[InductiveMode]) -> ScorePack:
+def _predict_k(
+    model: Model,
+    *,
+    k: int,
+    batch_size: Optional[int] = None,
+    mode: Optional[InductiveMode],
+    exclude: Optional[MappedTriples] = None,
+    chunk_size: Optional[int] = None,
+) -> ScorePack:
     """Compute and store scores for the top k-scoring triples.
 
     :param model: A PyKEEN model
     :param k: The number of triples to return
-    :param batch_size: The batch size to use for calculating scores
+    :param batch_size: The number of (head, relation) pairs to score at once. If None, it is determined automatically.
     :param mode:
         The pass mode, which is None in the transductive setting and one of "training",
         "validation", or "testing" in the inductive setting.
+    :param exclude: shape: (n, 3)
+        Triples to exclude from the result.
+    :param chunk_size: The number of tails to score at once. If None, all tails are scored at once.
     :return: A score pack of parallel triples and scores
     """
-    consumer = _TopKScoreConsumer(k=k, device=model.device)
-    _consume_scores(model, consumer, batch_size=batch_size, mode=mode)
+    consumer = _TopKScoreConsumer(k=k, device=model.device, exclude=exclude)
+    _consume_scores(
+        model=model,
+        consumers=[consumer],
+        batch_size=_resolve_batch_size(model=model, batch_size=batch_size),
+        mode=mode,
+        chunk_size=chunk_size,
+    )
     return consumer.finalize()
 
 
@@ -17,9 +17,9 @@ from more_itertools import last
 from torch.nn import functional
 
 from .text import TextEncoder, text_encoder_resolver
-from .utils import iter_matrix_power, safe_diagonal
+from .utils import estimate_return_probabilities, iter_matrix_power, safe_diagonal
 from ..triples import CoreTriplesFactory, TriplesFactory
-from ..typing import Initializer, MappedTriples, OneOrSequence
+from ..typing import Initializer, MappedTriples, OneOrSequence, TorchRandomHint
 from ..utils import compose, get_edge_index, iter_weisfeiler_lehman, upgrade_to_sequence
 
 __all__ = [
@@ -401,6 +401,10 @@ class RandomWalkPositionalEncodingInitializer(PretrainedInitializer):
     where $\mathbf{R} := \mathbf{A}\mathbf{D}^{-1}$ is the random walk matrix, with
     $\mathbf{D} := \sum_i \mathbf{A}_{i, i}$.
 
+    By default, the diagonals are computed exactly from the matrix powers. Since these eventually become dense, this
+    does not scale to large graphs. For these, pass `num_walks` to estimate the diagonals by Monte-Carlo random walks
+    instead, cf. :func:`pykeen.nn.utils.estimate_return_probabilities`.
+
     .. seealso::
         https://arxiv.org/abs/2110.07875
     """
@@ -415,6 +419,10 @@ class RandomWalkPositionalEncodingInitializer(PretrainedInitializer):
         num_entities: Optional[int] = None,
         space_dim: int = 0,
         skip_first_power: bool = True,
+        num_walks: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        random_state: TorchRandomHint = None,
     ) -> None:
         """
         Initialize the positional encoding.
@@ -445,17 +453,37 @@ class RandomWalkPositionalEncodingInitializer(PretrainedInitializer):
         :param skip_first_power:
             in most cases the adjacencies diagonal values will be zeros (since reflexive edges are not that common).
             This flag enables skipping the first matrix power.
+        :param num_walks:
+            the number of random walks per node to estimate the diagonals. If None, compute them exactly from the
+            matrix powers. Larger values increase accuracy, at the cost of runtime.
+        :param chunk_size:
+            the number of nodes to start random walks from at once. Only used if `num_walks` is given.
+        :param num_workers:
+            the number of worker processes for the random walks. Only used if `num_walks` is given.
+        :param random_state:
+            the random state for the random walks. Only used if `num_walks` is given.
         """
         edge_index = get_edge_index(
             triples_factory=triples_factory, mapped_triples=mapped_triples, edge_index=edge_index
         )
         # create random walk matrix
         rw = torch_ppr.utils.prepare_page_rank_adjacency(edge_index=edge_index, num_nodes=num_entities)
-        # stack diagonal entries of powers of rw
+        # diagonal entries of powers of rw
+        if num_walks is None:
+            diagonals = [safe_diagonal(matrix=power) for power in iter_matrix_power(matrix=rw, max_iter=dim)]
+        else:
+            diagonals = estimate_return_probabilities(
+                matrix=rw,
+                max_iter=dim,
+                num_walks=num_walks,
+                chunk_size=chunk_size,
+                num_workers=num_workers,
+                random_state=random_state,
+            ).unbind(dim=-1)
         tensor = torch.stack(
             [
-                (i ** (space_dim / 2.0)) * safe_diagonal(matrix=power)
-                for i, power in enumerate(iter_matrix_power(matrix=rw, max_iter=dim), start=1)
+                (i ** (space_dim / 2.0)) * diagonal
+                for i, diagonal in enumerate(diagonals, start=1)
                 if not skip_first_power or i > 1
             ],
             dim=-1,
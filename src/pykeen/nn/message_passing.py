@@ -650,6 +650,12 @@ class RGCNRepresentation(Representation):
         # invalidate enriched embeddings
         self.enriched_embeddings = None
 
+    # docstr-coverage: inherited
+    def _load_from_state_dict(self, *args, **kwargs):  # noqa: D102
+        # the buffered enriched embeddings have been computed from the previous parameters
+        self.enriched_embeddings = None
+        return super()._load_from_state_dict(*args, **kwargs)
+
     # docstr-coverage: inherited
     def reset_parameters(self):  # noqa: D102
         self.entity_embeddings.reset_parameters()
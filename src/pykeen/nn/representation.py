@@ -8,7 +8,7 @@ import itertools
 import logging
 import warnings
 from abc import ABC, abstractmethod
-from typing import Any, Iterable, Mapping, Optional, Sequence, Tuple, Union
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import torch
@@ -279,6 +279,27 @@ class Embedding(Representation):
     >>> import torch
     >>> batch = torch.as_tensor(data=[[0, 1, 0]]).repeat(10, 1)
     >>> scores = model.score_hrt(batch)
+
+    For large numbers of embeddings, only a small fraction of the rows is used in each training batch. With
+    ``sparse=True``, the gradient of the weights is a sparse tensor comprising only those rows, and the constrainer is
+    only applied to the rows which have been used since the last parameter update. This requires an optimizer which
+    supports sparse gradients, e.g., :class:`pykeen.optimizers.RowWiseAdagrad`. Note that any forward pass over all
+    rows, i.e., with ``indices=None``, yields a dense gradient. This includes LCWA training, and scoring all entities,
+    e.g., by :meth:`pykeen.models.Model.score_t`. Hence, :class:`torch.optim.SparseAdam`, which only supports sparse
+    gradients, can only be used with sLCWA training:
+
+    >>> from pykeen.pipeline import pipeline
+    >>> result = pipeline(
+    ...     dataset="nations",
+    ...     model=ERModel,
+    ...     model_kwargs=dict(
+    ...         interaction="distmult",
+    ...         entity_representations_kwargs=dict(embedding_dim=3, sparse=True, constrainer="normalize"),
+    ...         relation_representations_kwargs=dict(embedding_dim=3, sparse=True),
+    ...     ),
+    ...     optimizer="rowwiseadagrad",
+    ...     training_kwargs=dict(num_epochs=1),
+    ... )
     """
 
     normalizer: Optional[Normalizer]
@@ -286,6 +307,9 @@ class Embedding(Representation):
     regularizer: Optional[Regularizer]
     dropout: Optional[nn.Dropout]
 
+    #: the indices used since the last parameter update, or None, if all rows may have changed
+    _touched: Optional[List[torch.LongTensor]]
+
     def __init__(
         self,
         max_id: Optional[int] = None,
@@ -298,6 +322,7 @@ class Embedding(Representation):
         constrainer_kwargs: Optional[Mapping[str, Any]] = None,
         trainable: bool = True,
         dtype: Optional[torch.dtype] = None,
+        sparse: bool = False,
         **kwargs,
     ):
         """Instantiate an embedding with extended functionality.
@@ -341,6 +366,9 @@ class Embedding(Representation):
             Additional keyword arguments passed to the constrainer
         :param trainable: Should the wrapped embeddings be marked to require gradient. Defaults to True.
         :param dtype: The datatype (otherwise uses :func:`torch.get_default_dtype` to look up)
+        :param sparse:
+            Whether to use sparse gradients for the weights, cf. :class:`torch.nn.Embedding`. If enabled, the
+            constrainer is only applied to the rows used since the last parameter update.
         :param kwargs:
             additional keyword-based parameters passed to Representation.__init__
         """
@@ -371,8 +399,16 @@ class Embedding(Representation):
         # for the others to pass through None values
         self.initializer = initializer_resolver.make(initializer, initializer_kwargs)
         self.constrainer = constrainer_resolver.make_safe(constrainer, constrainer_kwargs)
-        self._embeddings = torch.nn.Embedding(num_embeddings=max_id, embedding_dim=_embedding_dim, dtype=dtype)
+        self._embeddings = torch.nn.Embedding(
+            num_embeddings=max_id, embedding_dim=_embedding_dim, dtype=dtype, sparse=sparse
+        )
         self._embeddings.requires_grad_(trainable)
+        self._touched = None
+
+    @property
+    def sparse(self) -> bool:
+        """Return whether the weights receive sparse gradients."""
+        return self._embeddings.sparse
 
     # docstr-coverage: inherited
     def reset_parameters(self) -> None:  # noqa: D102
@@ -385,12 +421,34 @@ class Embedding(Representation):
     def post_parameter_update(self):  # noqa: D102
         # apply constraints in-place
         if self.constrainer is not None:
-            x = self._plain_forward()
-            x = self.constrainer(x)
-            # fixme: work-around until nn.Embedding supports complex
-            if self.is_complex:
-                x = torch.view_as_real(x)
-            self._embeddings.weight.data = x.view(*self._embeddings.weight.data.shape)
+            if self._touched is None:
+                x = self._plain_forward()
+                x = self.constrainer(x)
+                # fixme: work-around until nn.Embedding supports complex
+                if self.is_complex:
+                    x = torch.view_as_real(x)
+                self._embeddings.weight.data = x.view(*self._embeddings.weight.data.shape)
+            elif self._touched:
+                # only the rows used since the last update may have changed
+                rows = torch.cat(self._touched).unique()
+                x = self._embeddings.weight.data[rows].view(-1, *self._shape)
+                # fixme: work-around until nn.Embedding supports complex
+                if self.is_complex:
+                    x = torch.view_as_real(self.constrainer(torch.view_as_complex(x)))
+                else:
+                    x = self.constrainer(x)
+                self._embeddings.weight.data[rows] = x.reshape(rows.shape[0], -1)
+        if self.sparse:
+            self._touched = []
+
+    def _track(self, indices: Optional[torch.LongTensor]) -> None:
+        """Keep track of the rows used for training in sparse mode."""
+        if not (self.sparse and self.training and torch.is_grad_enabled()):
+            return
+        if indices is None:
+            self._touched = None
+        elif self._touched is not None:
+            self._touched.append(indices.detach().view(-1))
 
     # docstr-coverage: inherited
     def _plain_forward(
@@ -402,7 +460,9 @@ class Embedding(Representation):
             x = self._embeddings.weight
         else:
             prefix_shape = indices.shape
-            x = self._embeddings(indices.to(self.device))
+            indices = indices.to(self.device)
+            x = self._embeddings(indices)
+        self._track(indices=indices)
         x = x.view(*prefix_shape, *self._shape)
         # fixme: work-around until nn.Embedding supports complex
         if self.is_complex:
@@ -825,6 +885,12 @@ class CombinedCompGCNRepresentations(nn.Module):
         # invalidate enriched embeddings
         self.enriched_representations = None
 
+    # docstr-coverage: inherited
+    def _load_from_state_dict(self, *args, **kwargs):  # noqa: D102
+        # the buffered representations have been computed from the previous parameters
+        self.enriched_representations = None
+        return super()._load_from_state_dict(*args, **kwargs)
+
     # docstr-coverage: inherited
     def train(self, mode: bool = True):  # noqa: D102
         # when changing from evaluation to training mode, the buffered representations have been computed without
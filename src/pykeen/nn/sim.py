@@ -67,7 +67,7 @@ def expected_likelihood(
     #: b = \log \det \Sigma
     sim = sim + safe_sigma.log().sum(dim=-1)
     if exact:
-        sim = sim + sim.shape[-1] * math.log(2.0 * math.pi)
+        sim = sim + mean.shape[-1] * math.log(2.0 * math.pi)
     return sim
 
 
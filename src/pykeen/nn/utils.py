@@ -8,6 +8,7 @@ import functools
 import logging
 import pathlib
 import re
+from concurrent.futures import ProcessPoolExecutor
 from itertools import chain
 from textwrap import dedent
 from typing import Any, Callable, Collection, Dict, Iterable, List, Literal, Mapping, Optional, Sequence, Union, cast
@@ -18,12 +19,13 @@ import torch
 from tqdm.auto import tqdm
 
 from ..constants import PYKEEN_MODULE
-from ..typing import OneOrSequence
-from ..utils import nested_get, rate_limited, upgrade_to_sequence
+from ..typing import OneOrSequence, TorchRandomHint
+from ..utils import ensure_torch_random_state, nested_get, rate_limited, upgrade_to_sequence
 from ..version import get_version
 
 __all__ = [
     "safe_diagonal",
+    "estimate_return_probabilities",
     "adjacency_tensor_to_stacked_matrix",
     "use_horizontal_stacking",
     "WikidataCache",
@@ -63,6 +65,183 @@ def iter_matrix_power(matrix: torch.Tensor, max_iter: int) -> Iterable[torch.Ten
         yield a
 
 
+class _TransitionSampler:
+    """Sample random walk transitions from a column-stochastic sparse matrix.
+
+    The next node is drawn uniformly from the outgoing edges, and accepted with probability proportional to the edge's
+    weight (rejection sampling). Walks which got rejected too often fall back to inverse transform sampling.
+    """
+
+    def __init__(self, matrix: torch.Tensor, max_rejections: int = 8):
+        """
+        Initialize the sampler.
+
+        :param matrix: shape: `(n, n)`
+            the sparse transition matrix, where `matrix[i, j]` is the probability to move from `j` to `i`
+        :param max_rejections:
+            the maximum number of rejection sampling rounds before falling back to inverse transform sampling
+        """
+        if matrix.is_sparse_csr:
+            matrix = matrix.to_sparse_coo()
+        matrix = matrix.coalesce()
+        target, source = matrix.indices()
+        # sort by source
+        source, order = source.sort(stable=True)
+        self.target = target[order]
+        self.weights = matrix.values()[order].double()
+        n = matrix.shape[1]
+        self.pointer = torch.zeros(n + 1, dtype=torch.long)
+        self.pointer[1:] = torch.bincount(source, minlength=n).cumsum(dim=0)
+        self.degree = self.pointer[1:] - self.pointer[:-1]
+        self.max_weight = torch.zeros(n, dtype=torch.float64).scatter_reduce_(
+            0, source, self.weights, reduce="amax", include_self=False
+        )
+        self.max_rejections = max_rejections
+        # the total weight of each source, i.e., 1, or 0 for nodes without any outgoing edge
+        cumulative = self.weights.cumsum(dim=0)
+        offset = torch.cat([cumulative.new_zeros(1), cumulative])[self.pointer]
+        self.total = offset[1:] - offset[:-1]
+        # the cumulative weight per source, shifted by the source ID to make the keys globally sorted
+        self.keys = cumulative - offset[:-1][source] + source
+
+    def _inverse_transform(self, current: torch.LongTensor, generator: torch.Generator) -> torch.LongTensor:
+        """Sample the positions of the next edges by inverse transform sampling."""
+        target = current + torch.rand(current.shape, dtype=torch.float64, generator=generator) * self.total[current]
+        position = torch.searchsorted(self.keys, target, right=True)
+        # restrict to the outgoing edges of the current node, to guard against rounding errors
+        return torch.minimum(torch.maximum(position, self.pointer[current]), self.pointer[current + 1] - 1)
+
+    def __call__(self, current: torch.LongTensor, generator: torch.Generator) -> torch.LongTensor:
+        """
+        Sample the next nodes.
+
+        :param current: shape: `(k,)`
+            the current nodes
+        :param generator:
+            the random number generator
+
+        :return: shape: `(k,)`
+            the next nodes. `-1` for walks which got stuck in a node without outgoing edges.
+        """
+        position = torch.full(current.shape, fill_value=-1, dtype=torch.long)
+        (pending,) = (self.total[current] > 0).nonzero(as_tuple=True)
+        for _ in range(self.max_rejections):
+            if not len(pending):
+                break
+            source = current[pending]
+            degree = self.degree[source]
+            candidate = self.pointer[source] + (
+                torch.rand(pending.shape, dtype=torch.float64, generator=generator) * degree
+            ).long().clamp_max(degree - 1)
+            accept = (
+                torch.rand(pending.shape, dtype=torch.float64, generator=generator) * self.max_weight[source]
+                < self.weights[candidate]
+            )
+            position[pending[accept]] = candidate[accept]
+            pending = pending[~accept]
+        if len(pending):
+            position[pending] = self._inverse_transform(current=current[pending], generator=generator)
+        result = torch.full(current.shape, fill_value=-1, dtype=torch.long)
+        alive = position >= 0
+        result[alive] = self.target[position[alive]]
+        return result
+
+
+def _estimate_return_probabilities_chunk(
+    sampler: _TransitionSampler,
+    start: int,
+    stop: int,
+    max_iter: int,
+    num_walks: int,
+    seed: int,
+) -> torch.FloatTensor:
+    """Estimate the return probabilities for the nodes in the range `[start, stop)`."""
+    generator = torch.Generator().manual_seed(seed)
+    origin = torch.arange(start, stop).repeat_interleave(num_walks)
+    current = origin
+    result = []
+    for _ in range(max_iter):
+        current = torch.where(current >= 0, sampler(current=current.clamp_min(0), generator=generator), current)
+        result.append((current == origin).view(stop - start, num_walks).float().mean(dim=-1))
+    return torch.stack(result, dim=-1)
+
+
+#: the sampler shared with the worker processes, cf. _initialize_worker
+_worker_sampler: Optional[_TransitionSampler] = None
+
+
+def _initialize_worker(sampler: _TransitionSampler) -> None:
+    """Store the sampler in a worker process, such that it is only transferred once."""
+    global _worker_sampler
+    _worker_sampler = sampler
+
+
+def _estimate_return_probabilities_worker(task: tuple[int, int, int, int, int]) -> torch.FloatTensor:
+    """Estimate the return probabilities for a chunk of nodes in a worker process."""
+    assert _worker_sampler is not None
+    start, stop, max_iter, num_walks, seed = task
+    return _estimate_return_probabilities_chunk(_worker_sampler, start, stop, max_iter, num_walks, seed)
+
+
+def estimate_return_probabilities(
+    matrix: torch.Tensor,
+    max_iter: int,
+    num_walks: int = 1_000,
+    chunk_size: Optional[int] = None,
+    num_workers: Optional[int] = None,
+    random_state: TorchRandomHint = None,
+) -> torch.FloatTensor:
+    r"""
+    Estimate the diagonals of matrix powers by Monte-Carlo random walks.
+
+    For a column-stochastic matrix $\mathbf{R}$, the diagonal entry $\mathbf{R}^{k}_{i, i}$ is the probability that
+    a random walk starting at node $i$ is back at $i$ after $k$ steps. Starting `num_walks` walks from each node and
+    counting their returns gives an unbiased estimate with standard deviation of at most $1 / (2 \sqrt{w})$, where
+    $w$ denotes the number of walks.
+
+    In contrast to :func:`iter_matrix_power`, this only requires memory linear in the number of edges, and the number
+    of simultaneous walks, rather than materializing the (eventually dense) matrix powers.
+
+    :param matrix: shape: `(n, n)`
+        the sparse, column-stochastic random walk matrix, e.g., from
+        :func:`torch_ppr.utils.prepare_page_rank_adjacency`. Columns summing to zero correspond to nodes without
+        outgoing edges, where random walks stop.
+    :param max_iter:
+        the maximum power, i.e., the length of the random walks
+    :param num_walks:
+        the number of random walks per node. Controls the trade-off between accuracy and runtime.
+    :param chunk_size:
+        the number of nodes to start random walks from at once. Defaults to `2**20 // num_walks`.
+    :param num_workers:
+        the number of worker processes. If None or 0, estimate in the current process. The result does not depend on
+        the number of workers.
+    :param random_state:
+        the random state
+
+    :return: shape: `(n, max_iter)`
+        the estimated diagonals of the first `max_iter` matrix powers
+    """
+    n = matrix.shape[0]
+    chunk_size = chunk_size or max(1, 2**20 // num_walks)
+    sampler = _TransitionSampler(matrix=matrix)
+    # draw one seed per chunk, such that the result is independent of the number of workers
+    generator = ensure_torch_random_state(random_state)
+    starts = list(range(0, n, chunk_size))
+    seeds = torch.randint(2**62, size=(len(starts),), generator=generator).tolist()
+    tasks = [(start, min(start + chunk_size, n), max_iter, num_walks, seed) for start, seed in zip(starts, seeds)]
+    if num_workers:
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=_initialize_worker, initargs=(sampler,)) as pool:
+            chunks = list(pool.map(_estimate_return_probabilities_worker, tasks))
+    else:
+        chunks = [
+            _estimate_return_probabilities_chunk(sampler, *task)
+            for task in tqdm(tasks, desc="Random walks", unit="chunk", unit_scale=True, leave=False)
+        ]
+    if not chunks:
+        return torch.empty(0, max_iter)
+    return torch.cat(chunks, dim=0)
+
+
 def safe_diagonal(matrix: torch.Tensor) -> torch.Tensor:
     """
     Extract diagonal from a potentially sparse matrix.
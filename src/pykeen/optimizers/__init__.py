@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 
-"""Optimizers available in PyKEEN."""
+"""Optimizers available in PyKEEN.
 
-from typing import Any, Mapping, Type
+Besides the optimizers from :mod:`torch.optim`, PyKEEN provides :class:`RowWiseAdagrad`. Together with
+:class:`torch.optim.SparseAdam`, :class:`torch.optim.Adagrad`, and :class:`torch.optim.SGD`, it supports the sparse
+gradients of embeddings created with ``sparse=True``, cf. :class:`pykeen.nn.representation.Embedding`.
+"""
 
+from typing import Any, Callable, Iterable, Mapping, Optional, Type, Union
+
+import torch
 from class_resolver.contrib.torch import optimizer_resolver
 from torch.optim.adagrad import Adagrad
 from torch.optim.adam import Adam
@@ -11,13 +17,101 @@ from torch.optim.adamax import Adamax
 from torch.optim.adamw import AdamW
 from torch.optim.optimizer import Optimizer
 from torch.optim.sgd import SGD
+from torch.optim.sparse_adam import SparseAdam
 
 __all__ = [
     "Optimizer",
+    "RowWiseAdagrad",
     "optimizers_hpo_defaults",
     "optimizer_resolver",
 ]
 
+
+class RowWiseAdagrad(Optimizer):
+    """An Adagrad variant with a single accumulator per row of a parameter, which supports sparse gradients.
+
+    In contrast to :class:`torch.optim.Adagrad`, the squared gradients are averaged over each row, e.g., each
+    embedding vector, before accumulation. Thus, the optimizer state only requires one value per row rather than per
+    parameter, and a step only touches the rows with non-zero (sparse) gradient.
+    """
+
+    def __init__(
+        self,
+        params: Union[Iterable[torch.Tensor], Iterable[Mapping[str, Any]]],
+        lr: float = 1.0e-02,
+        eps: float = 1.0e-10,
+        initial_accumulator_value: float = 0.0,
+    ):
+        """
+        Initialize the optimizer.
+
+        :param params:
+            the parameters to optimize, or dictionaries defining parameter groups
+        :param lr: >0
+            the learning rate
+        :param eps: >=0
+            a term added to the denominator for numerical stability
+        :param initial_accumulator_value: >=0
+            the initial value of the accumulated squared gradients
+
+        :raises ValueError:
+            if any of the hyper-parameters is out of its domain
+        """
+        if lr <= 0.0:
+            raise ValueError(f"Invalid learning rate: {lr}")
+        if eps < 0.0:
+            raise ValueError(f"Invalid epsilon value: {eps}")
+        if initial_accumulator_value < 0.0:
+            raise ValueError(f"Invalid initial_accumulator_value value: {initial_accumulator_value}")
+        super().__init__(params, dict(lr=lr, eps=eps, initial_accumulator_value=initial_accumulator_value))
+
+    @torch.no_grad()
+    def step(self, closure: Optional[Callable[[], float]] = None) -> Optional[float]:  # noqa: D102
+        loss = None
+        if closure is not None:
+            with torch.enable_grad():
+                loss = closure()
+
+        for group in self.param_groups:
+            for parameter in group["params"]:
+                if parameter.grad is None:
+                    continue
+                state = self.state[parameter]
+                if not state:
+                    state["step"] = 0
+                    state["sum"] = torch.full(
+                        size=parameter.shape[:1],
+                        fill_value=group["initial_accumulator_value"],
+                        dtype=parameter.dtype,
+                        device=parameter.device,
+                    )
+                state["step"] += 1
+
+                grad = parameter.grad
+                if grad.is_sparse:
+                    grad = grad.coalesce()
+                    rows, values = grad.indices()[0], grad.values()
+                else:
+                    rows, values = None, grad
+                # shape: (num_rows,)
+                squared = values.pow(2)
+                if parameter.ndimension() > 1:
+                    squared = squared.flatten(start_dim=1).mean(dim=1)
+                # broadcast over all but the first dimension
+                row_shape = (-1,) + (1,) * (parameter.ndimension() - 1) if parameter.ndimension() else ()
+                if rows is None:
+                    std = state["sum"].add_(squared).sqrt().add_(group["eps"])
+                    parameter.addcdiv_(values, std.view(row_shape), value=-group["lr"])
+                else:
+                    state["sum"].index_add_(0, rows, squared)
+                    std = state["sum"][rows].sqrt().add_(group["eps"])
+                    parameter.index_add_(0, rows, values.div(std.view(row_shape)).mul_(-group["lr"]))
+
+        return loss
+
+
+optimizer_resolver.register(RowWiseAdagrad, raise_on_conflict=False)
+
 #: The default strategy for optimizing the optimizers' hyper-parameters (yo dawg)
 optimizers_hpo_defaults: Mapping[Type[Optimizer], Mapping[str, Any]] = {
     Adagrad: dict(
@@ -32,7 +126,13 @@ optimizers_hpo_defaults: Mapping[Type[Optimizer], Mapping[str, Any]] = {
     AdamW: dict(
         lr=dict(type=float, low=0.001, high=0.1, scale="log"),
     ),
+    RowWiseAdagrad: dict(
+        lr=dict(type=float, low=0.001, high=0.1, scale="log"),
+    ),
     SGD: dict(
         lr=dict(type=float, low=0.001, high=0.1, scale="log"),
     ),
+    SparseAdam: dict(
+        lr=dict(type=float, low=0.001, high=0.1, scale="log"),
+    ),
 }
@@ -77,7 +77,7 @@ class BernoulliNegativeSampler(NegativeSampler):
         # Decide whether to corrupt head or tail
         head_corruption_probability = self.corrupt_head_probability[positive_batch[..., 1]].unsqueeze(dim=-1)
         head_mask = torch.rand(
-            *batch_shape, self.num_negs_per_pos, device=positive_batch.device
+            *batch_shape, self.num_negs_per_pos, device=positive_batch.device, generator=self.generator
         ) < head_corruption_probability.to(device=positive_batch.device)
 
         # clone positive batch for corruption (.repeat_interleave creates a copy)
@@ -96,6 +96,7 @@ class BernoulliNegativeSampler(NegativeSampler):
                 selection=mask,
                 size=mask.sum(),
                 max_index=self.num_entities,
+                generator=self.generator,
             )
 
         return negative_batch.view(*batch_shape, self.num_negs_per_pos, 3)
@@ -91,6 +91,25 @@ on Python's built-in sets, the :class:`pykeen.sampling.filtering.PythonSetFilter
             filterer='python-set',    
         ),
     )
+
+A vectorized alternative which is also exact is given by :class:`pykeen.sampling.filtering.SortedArrayFilterer`. It
+packs each triple into a single integer key, and looks up negative triples in a sorted array of the keys of all
+positive triples. It is a proper module which can be moved to GPU, and can be activated with:
+
+.. code-block:: python
+
+    from pykeen.pipeline import pipeline
+
+    results = pipeline(
+        dataset='YAGO3-10',
+        model='PairRE',
+        training_loop='sLCWA',
+        negative_sampler='basic',
+        negative_sampler_kwargs=dict(
+            filtered=True,
+            filterer='sorted-array',
+        ),
+    )
     
 Identifying False Negatives During Evaluation
 ---------------------------------------------
@@ -123,9 +142,10 @@ from the filtered setting. For evaluation it makes sense to use all information
 as solid evaluation results as possible.
 """  # noqa
 
+import logging
 import math
 from abc import abstractmethod
-from typing import Iterable
+from typing import ClassVar, Optional, Tuple
 
 import torch
 from class_resolver import ClassResolver
@@ -139,8 +159,11 @@ __all__ = [
     "Filterer",
     "BloomFilterer",
     "PythonSetFilterer",
+    "SortedArrayFilterer",
 ]
 
+logger = logging.getLogger(__name__)
+
 
 class Filterer(nn.Module):
     """An interface for filtering methods for negative triples."""
@@ -218,18 +241,41 @@ class BloomFilterer(Filterer):
 
     Pure PyTorch, a proper module which can be moved to GPU, and support batch-wise computation.
 
+    The filter uses a blocked layout: the bits are packed into 64 bit words, and all probes of a triple fall into the
+    same word. Thus, each lookup touches only a single word instead of `rounds` random positions of the whole array.
+    Since blocking increases the false positive rate compared to a standard Bloom filter of the same size, the number
+    of words is chosen such that the expected error rate of the blocked layout meets the desired error rate.
+
+    Triples can be added after construction via :meth:`add`. The current false positive rate can be monitored via
+    :attr:`estimated_error_rate`, and a warning is issued once it exceeds the desired error rate.
+
     .. seealso ::
         * https://github.com/hiway/python-bloom-filter/ - for calculation of sizes, and rough structure of code
         * https://github.com/skeeto/hash-prospector#two-round-functions - for parts of the hash function
+        * Putze, F., Sanders, P., & Singler, J. (2007). Cache-, Hash- and Space-Efficient Bloom Filters.
     """
 
+    #: the number of bits per word
+    word_size: ClassVar[int] = 64
+
     #: some prime numbers for tuple hashing
     mersenne: torch.LongTensor
 
-    #: The bit-array for the Bloom filter data structure
-    bit_array: torch.BoolTensor
+    #: The bit-packed array for the Bloom filter data structure, shape: (num_words,)
+    bit_array: torch.LongTensor
+
+    #: The number of set bits in each word, shape: (num_words,)
+    word_fill: torch.ByteTensor
+
+    #: The sum of the words' false positive rates, i.e., of (set bits / word size) ** rounds, shape: ()
+    fill_power_sum: torch.DoubleTensor
 
-    def __init__(self, mapped_triples: MappedTriples, error_rate: float = 0.001):
+    def __init__(
+        self,
+        mapped_triples: MappedTriples,
+        error_rate: float = 0.001,
+        capacity: Optional[int] = None,
+    ):
         """
         Initialize the Bloom filter based filterer.
 
@@ -237,13 +283,25 @@ class BloomFilterer(Filterer):
             The ID-based triples.
         :param error_rate:
             The desired error rate.
+        :param capacity:
+            The number of elements the filter is sized for. Defaults to the number of given triples. Choose a larger
+            value if more triples will be added later on via :meth:`add`.
         """
         super().__init__()
 
         # Allocate bit array
-        self.ideal_num_elements = mapped_triples.shape[0]
+        self.ideal_num_elements = max(capacity or mapped_triples.shape[0], 1)
         size = self.num_bits(num=self.ideal_num_elements, error_rate=error_rate)
-        self.register_buffer(name="bit_array", tensor=torch.zeros(size, dtype=torch.bool))
+
+        # calculate number of hashing rounds
+        self.rounds = self.num_probes(num_elements=self.ideal_num_elements, num_bits=size)
+
+        # enlarge the array until the blocked layout meets the desired error rate
+        num_words = int(math.ceil(size / self.word_size))
+        while self.expected_error_rate(self.ideal_num_elements, num_words=num_words, rounds=self.rounds) > error_rate:
+            num_words = int(math.ceil(1.05 * num_words))
+
+        self.register_buffer(name="bit_array", tensor=torch.zeros(num_words, dtype=torch.long))
         self.register_buffer(
             name="mersenne",
             tensor=torch.as_tensor(
@@ -251,23 +309,27 @@ class BloomFilterer(Filterer):
                 dtype=torch.long,
             ).unsqueeze(dim=0),
         )
+        # keep track of the fill ratio incrementally, such that monitoring the error rate is O(batch) per addition
+        self.register_buffer(name="word_fill", tensor=torch.zeros(num_words, dtype=torch.uint8))
+        self.register_buffer(name="fill_power_sum", tensor=torch.zeros(tuple(), dtype=torch.float64))
 
-        # calculate number of hashing rounds
-        self.rounds = self.num_probes(num_elements=self.ideal_num_elements, num_bits=size)
+        # Store some meta-data
+        self.error_rate = error_rate
+        self.num_elements = 0
+        # whether the warning about exceeding the desired error rate has already been issued
+        self.warned = False
 
         # index triples
         self.add(triples=mapped_triples)
 
-        # Store some meta-data
-        self.error_rate = error_rate
-
     def __repr__(self):  # noqa:D105
         return (
             f"{self.__class__.__name__}("
             f"error_rate={self.error_rate}, "
-            f"size={self.bit_array.shape[0]}, "
+            f"size={self.bit_array.shape[0] * self.word_size}, "
             f"rounds={self.rounds}, "
             f"ideal_num_elements={self.ideal_num_elements}, "
+            f"num_elements={self.num_elements}, "
             f")"
         )
 
@@ -306,33 +368,106 @@ class BloomFilterer(Filterer):
         real_num_probes_k = (num_bits / num_elements) * math.log(2)
         return int(math.ceil(real_num_probes_k))
 
+    @classmethod
+    def expected_error_rate(cls, num_elements: int, num_words: int, rounds: int) -> float:
+        """
+        Calculate the expected error rate of a blocked Bloom filter.
+
+        The number of elements per word is approximated by a Poisson distribution. For a given number of elements in a
+        word, the distribution of the number of set bits is obtained from a Markov chain over the number of set bits.
+
+        :param num_elements:
+            The number of elements.
+        :param num_words:
+            The number of words.
+        :param rounds:
+            The number of hashing rounds.
+
+        :return:
+            The expected false positive rate.
+        """
+        # transition matrix for setting a single bit at a uniformly chosen position
+        num_set = torch.arange(cls.word_size + 1, dtype=torch.float64)
+        transition = torch.diag(num_set / cls.word_size) + torch.diag(1.0 - num_set[:-1] / cls.word_size, diagonal=1)
+        transition = torch.linalg.matrix_power(transition, rounds)
+        # the probability for a query to hit only set bits, given the number of set bits
+        hit = (num_set / cls.word_size) ** rounds
+        state = torch.zeros_like(num_set)
+        state[0] = 1.0
+        load = num_elements / num_words
+        result = 0.0
+        i, p = 0, math.exp(-load)
+        while i <= load or p > 1.0e-12:
+            result += p * (state @ hit).item()
+            state = state @ transition
+            i += 1
+            p *= load / i
+        return result
+
+    @property
+    def estimated_error_rate(self) -> float:
+        """Estimate the current false positive rate from the fill ratio of the words."""
+        return self.fill_power_sum.item() / self.bit_array.shape[0]
+
+    def _hash(self, x: torch.LongTensor) -> torch.LongTensor:
+        # cf. https://github.com/skeeto/hash-prospector#two-round-functions
+        x = x ^ (x >> 16)
+        x = x * 0x7FEB352D
+        x = x ^ (x >> 15)
+        x = x * 0x846CA68B
+        x = x ^ (x >> 16)
+        return x
+
     def probe(
         self,
         batch: MappedTriples,
-    ) -> Iterable[torch.LongTensor]:
+    ) -> Tuple[torch.LongTensor, torch.LongTensor]:
         """
-        Iterate over indices from the probes.
+        Compute the word index, and the bit positions within this word.
 
-        :param batch: shape: (batch_size, 3)
+        :param batch: shape: (..., 3)
             A batch of elements.
 
-        :yields: Indices of the k-th round, shape: (batch_size,).
+        :return: shape: (...) and (rounds, ...)
+            The index of the word, and the bit positions of the individual hashing rounds within this word.
         """
         # pre-hash
-        x = (self.mersenne * batch).sum(dim=-1)
-        for _ in range(self.rounds):
-            # cf. https://github.com/skeeto/hash-prospector#two-round-functions
-            x = x ^ (x >> 16)
-            x = x * 0x7FEB352D
-            x = x ^ (x >> 15)
-            x = x * 0x846CA68B
-            x = x ^ (x >> 16)
-            yield x % self.bit_array.shape[0]
+        x = self._hash((self.mersenne * batch).sum(dim=-1))
+        words = x % self.bit_array.shape[0]
+        # each hash provides several bit positions of log2(word_size) = 6 bits each
+        bits = []
+        for i in range(self.rounds):
+            if i % 8 == 0:
+                x = self._hash(x)
+            bits.append((x >> (6 * (i % 8))) & (self.word_size - 1))
+        return words, torch.stack(bits, dim=0)
 
     def add(self, triples: MappedTriples) -> None:
         """Add triples to the Bloom filter."""
-        for i in self.probe(batch=triples):
-            self.bit_array[i] = True
+        words, bits = self.probe(batch=triples)
+        # global bit indices; de-duplicate such that each bit is set only once
+        index = (words.unsqueeze(dim=0) * self.word_size + bits).view(-1).unique()
+        words, bits = index // self.word_size, index % self.word_size
+        # since all remaining bits are distinct and not yet set, adding the bits is equivalent to a bitwise or
+        new = ((self.bit_array[words] >> bits) & 1) == 0
+        words, bits = words[new], bits[new]
+        self.bit_array.scatter_add_(dim=0, index=words, src=torch.ones_like(bits) << bits)
+        # update the fill ratio of the changed words
+        words, counts = words.unique(return_counts=True)
+        old_fill = self.word_fill[words].double() / self.word_size
+        self.word_fill[words] += counts.to(self.word_fill.dtype)
+        new_fill = self.word_fill[words].double() / self.word_size
+        self.fill_power_sum += (new_fill**self.rounds - old_fill**self.rounds).sum()
+        self.num_elements += triples.shape[0]
+        if self.warned:
+            return
+        error_rate = self.estimated_error_rate
+        if error_rate > self.error_rate:
+            self.warned = True
+            logger.warning(
+                f"The estimated error rate of {error_rate:.2e} exceeds the desired error rate of {self.error_rate}. "
+                f"Consider re-creating the filterer with a larger capacity.",
+            )
 
     def contains(self, batch: MappedTriples) -> torch.BoolTensor:
         """
@@ -345,10 +480,82 @@ class BloomFilterer(Filterer):
             The result. False guarantees that the element was not contained in the indexed triples. True can be
             erroneous.
         """
-        result = batch.new_ones(batch.shape[:-1], dtype=torch.bool)
-        for i in self.probe(batch):
-            result &= self.bit_array[i]
-        return result
+        words, bits = self.probe(batch)
+        mask = torch.zeros_like(words)
+        for bit in bits:
+            mask |= torch.ones_like(bit) << bit
+        return (self.bit_array[words] & mask) == mask
+
+
+class SortedArrayFilterer(Filterer):
+    """
+    An exact filterer based on a sorted array of packed triples.
+
+    Each triple $(h, r, t)$ is packed into a single integer key $(h \\cdot R + r) \\cdot E + t$, where $E$ and $R$
+    denote the number of entities and relations, respectively. The keys of the indexed triples are sorted once, and
+    membership is checked with a binary search via :func:`torch.searchsorted`.
+
+    Pure PyTorch, a proper module which can be moved to GPU, and support batch-wise computation.
+    """
+
+    #: The sorted keys of the indexed triples
+    keys: torch.LongTensor
+
+    #: The upper bounds of the IDs in each column, i.e., (num_entities, num_relations, num_entities)
+    max_ids: torch.LongTensor
+
+    def __init__(self, mapped_triples: MappedTriples):
+        """
+        Initialize the filterer.
+
+        :param mapped_triples:
+            The ID-based triples.
+
+        :raises ValueError:
+            if the triples' ID ranges are too large to pack a triple into a single 64 bit integer key
+        """
+        super().__init__()
+        num_entities = int(mapped_triples[:, [0, 2]].max().item()) + 1 if mapped_triples.numel() else 1
+        num_relations = int(mapped_triples[:, 1].max().item()) + 1 if mapped_triples.numel() else 1
+        if num_entities**2 * num_relations > torch.iinfo(torch.long).max:
+            raise ValueError(
+                f"Cannot pack triples with num_entities={num_entities} and num_relations={num_relations} into a single "
+                f"64 bit integer key.",
+            )
+        self.register_buffer(
+            name="max_ids",
+            tensor=torch.as_tensor(data=[num_entities, num_relations, num_entities], dtype=torch.long),
+        )
+        self.register_buffer(
+            name="keys",
+            tensor=self.pack(triples=mapped_triples.to(self.max_ids.device)).unique(sorted=True),
+        )
+
+    def __repr__(self):  # noqa:D105
+        return f"{self.__class__.__name__}(num_triples={self.keys.shape[0]})"
+
+    def pack(self, triples: MappedTriples) -> torch.LongTensor:
+        """
+        Pack triples into single integer keys.
+
+        :param triples: shape: (..., 3)
+            The ID-based triples.
+
+        :return: shape: (...)
+            The keys.
+        """
+        triples = triples.long()
+        return (triples[..., 0] * self.max_ids[1] + triples[..., 1]) * self.max_ids[2] + triples[..., 2]
+
+    # docstr-coverage: inherited
+    def contains(self, batch: MappedTriples) -> torch.BoolTensor:  # noqa: D102
+        # triples with IDs outside of the indexed range cannot be contained, and may produce colliding keys
+        valid = ((batch >= 0) & (batch < self.max_ids)).all(dim=-1)
+        if self.keys.numel() == 0:
+            return torch.zeros_like(valid)
+        query = self.pack(triples=batch)
+        index = torch.searchsorted(self.keys, query).clamp_max(self.keys.shape[0] - 1)
+        return valid & (self.keys[index] == query)
 
 
 filterer_resolver: ClassResolver[Filterer] = ClassResolver.from_subclasses(
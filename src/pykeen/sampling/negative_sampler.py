@@ -28,6 +28,9 @@ class NegativeSampler(nn.Module):
     #: A filterer for negative batches
     filterer: Optional[Filterer]
 
+    #: The random number generator used for corruption. If None, the global one is used.
+    generator: Optional[torch.Generator]
+
     num_entities: int
     num_relations: int
     num_negs_per_pos: int
@@ -65,6 +68,7 @@ class NegativeSampler(nn.Module):
         self.num_entities = num_entities or mapped_triples[:, [0, 2]].max().item() + 1
         self.num_relations = num_relations or mapped_triples[:, 1].max().item() + 1
         self.num_negs_per_pos = num_negs_per_pos if num_negs_per_pos is not None else 1
+        self.generator = None
         self.filterer = (
             filterer_resolver.make(
                 filterer,
@@ -92,7 +92,9 @@ class PseudoTypedNegativeSampler(NegativeSampler):
             Additional keyword based arguments passed to :class:`pykeen.sampling.NegativeSampler`.
         """
         super().__init__(mapped_triples=mapped_triples, **kwargs)
-        self.data, self.offsets = create_index(mapped_triples=mapped_triples, num_relations=self.num_relations)
+        data, offsets = create_index(mapped_triples=mapped_triples, num_relations=self.num_relations)
+        self.register_buffer(name="data", tensor=data)
+        self.register_buffer(name="offsets", tensor=offsets)
 
     # docstr-coverage: inherited
     def corrupt_batch(self, positive_batch: torch.LongTensor):  # noqa: D102
@@ -107,7 +109,10 @@ class PseudoTypedNegativeSampler(NegativeSampler):
         start_tails = self.offsets[2 * r + 1].unsqueeze(dim=-1)
         end = self.offsets[2 * r + 2].unsqueeze(dim=-1)
         num_choices = end - start_heads
-        negative_ids = start_heads + (torch.rand(size=(batch_size, self.num_negs_per_pos)) * num_choices).long()
+        random = torch.rand(
+            size=(batch_size, self.num_negs_per_pos), device=num_choices.device, generator=self.generator
+        )
+        negative_ids = start_heads + (random * num_choices).long()
 
         # get corresponding entity
         entity_id = self.data[negative_ids]
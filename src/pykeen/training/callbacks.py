@@ -20,11 +20,14 @@ be useful to log all batch losses. This could be accomplished with the following
 
 .. code-block:: python
 
+    from typing import Union
+
+    import torch
     from pykeen.training import TrainingCallback
 
     class BatchLossReportCallback(TrainingCallback):
-        def on_batch(self, epoch: int, batch, batch_loss: float):
-            print(epoch, batch_loss)
+        def on_batch(self, epoch: int, batch, batch_loss: Union[float, torch.Tensor]):
+            print(epoch, float(batch_loss))
 
 Implementing Gradient Clipping
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -52,8 +55,9 @@ to implement a gradient clipping callback:
 """
 
 import pathlib
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 
+import torch
 from class_resolver import ClassResolver, HintOrType, OptionalKwargs
 from torch import optim
 from torch.nn.utils import clip_grad_norm_, clip_grad_value_
@@ -119,8 +123,20 @@ class TrainingCallback:
         """Register the training loop."""
         self._training_loop = training_loop
 
-    def on_batch(self, epoch: int, batch, batch_loss: float, **kwargs: Any) -> None:
-        """Call for training batches."""
+    def on_batch(self, epoch: int, batch, batch_loss: Union[float, torch.Tensor], **kwargs: Any) -> None:
+        """Call for training batches.
+
+        :param epoch:
+            the epoch
+        :param batch:
+            the training batch
+        :param batch_loss:
+            the batch loss. By default, i.e., with ``loss_check_frequency=None``, it is a float. If the training loop
+            accumulates the loss asynchronously, cf. ``loss_check_frequency``, it is a detached 0-dimensional tensor
+            on the model's device, which only synchronizes with the device when converted via ``float``.
+        :param kwargs:
+            additional keyword-based parameters
+        """
 
     def pre_step(self, **kwargs: Any) -> None:
         """Call before the optimizer's step."""
@@ -418,7 +434,7 @@ class MultiTrainingCallback(TrainingCallback):
             callback.register_training_loop(self._training_loop)
 
     # docstr-coverage: inherited
-    def on_batch(self, epoch: int, batch, batch_loss: float, **kwargs: Any) -> None:  # noqa: D102
+    def on_batch(self, epoch: int, batch, batch_loss: Union[float, torch.Tensor], **kwargs: Any) -> None:  # noqa: D102
         for callback in self.callbacks:
             callback.on_batch(epoch=epoch, batch=batch, batch_loss=batch_loss, **kwargs)
 
@@ -7,6 +7,7 @@ from math import ceil
 from typing import Callable, Optional, Union
 
 import torch
+from torch.optim import SparseAdam
 from torch.utils.data import DataLoader
 
 from .training_loop import TrainingLoop
@@ -54,10 +55,18 @@ class LCWATrainingLoop(TrainingLoop[LCWASampleType, LCWABatchType]):
         :param kwargs:
             Additional keyword-based parameters passed to TrainingLoop.__init__
         :raises ValueError:
-            If an invalid target column is given
+            If an invalid target column is given, or if the optimizer only supports sparse gradients
         """
         super().__init__(**kwargs)
 
+        # scoring all targets uses all rows of their representations, i.e., the gradients are dense
+        if isinstance(self.optimizer, SparseAdam):
+            raise ValueError(
+                f"LCWA training scores all targets, which leads to dense gradients, but "
+                f"{self.optimizer.__class__.__name__} only supports sparse gradients. Use an optimizer which supports "
+                f"both, e.g., pykeen.optimizers.RowWiseAdagrad.",
+            )
+
         # normalize target column
         if target is None:
             target = 2
@@ -96,15 +105,17 @@ class LCWATrainingLoop(TrainingLoop[LCWASampleType, LCWABatchType]):
                 f"sampler='{sampler}'.",
             )
 
-        dataset = triples_factory.create_lcwa_instances(target=self.target)
         return DataLoader(
-            dataset=dataset,
+            dataset=triples_factory.create_lcwa_instances(
+                target=self.target,
+                batch_size=batch_size,
+                drop_last=drop_last,
+            ),
             num_workers=num_workers,
-            batch_size=batch_size,
-            drop_last=drop_last,
-            shuffle=True,
             pin_memory=pin_memory,
-            collate_fn=dataset.get_collator(),
+            # disable automatic batching
+            batch_size=None,
+            batch_sampler=None,
         )
 
     @staticmethod
@@ -130,7 +141,15 @@ class LCWATrainingLoop(TrainingLoop[LCWASampleType, LCWABatchType]):
 
         # Send batch to device
         batch_pairs = batch_pairs[start:stop].to(device=model.device)
-        batch_labels_full = batch_labels_full[start:stop].to(device=model.device)
+        if batch_labels_full.is_sparse:
+            # only the indices of the positive targets are transferred; the dense labels are created on the device
+            batch_labels_full = batch_labels_full.to(device=model.device)
+            if start is not None or stop is not None:
+                start, stop, _ = slice(start, stop).indices(batch_labels_full.shape[0])
+                batch_labels_full = batch_labels_full.narrow_copy(0, start, stop - start)
+            batch_labels_full = batch_labels_full.to_dense()
+        else:
+            batch_labels_full = batch_labels_full[start:stop].to(device=model.device)
 
         predictions = score_method(batch_pairs, slice_size=slice_size, mode=mode)
 
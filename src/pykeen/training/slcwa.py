@@ -28,12 +28,29 @@ class SLCWATrainingLoop(TrainingLoop[SLCWASampleType, SLCWABatch]):
     """A training loop that uses the stochastic local closed world assumption training approach.
 
     [ruffinelli2020]_ call the sLCWA ``NegSamp`` in their work.
+
+    By default, batches of positive triples are assembled and corrupted on the CPU by the data loader. With
+    ``device_sampling=True``, the training triples are shuffled and corrupted on the model's device instead, cf.
+    :class:`pykeen.triples.instances.DeviceBatchedSLCWAInstances`. This avoids the per-batch host-to-device transfer,
+    and can be selected in the pipeline, too:
+
+    .. code-block:: python
+
+        from pykeen.pipeline import pipeline
+
+        result = pipeline(
+            dataset="fb15k237",
+            model="transe",
+            training_loop_kwargs=dict(device_sampling=True, prefetch=2),
+        )
     """
 
     def __init__(
         self,
         negative_sampler: HintOrType[NegativeSampler] = None,
         negative_sampler_kwargs: OptionalKwargs = None,
+        device_sampling: bool = False,
+        prefetch: int = 0,
         **kwargs,
     ):
         """Initialize the training loop.
@@ -41,12 +58,18 @@ class SLCWATrainingLoop(TrainingLoop[SLCWASampleType, SLCWABatch]):
         :param negative_sampler: The class, instance, or name of the negative sampler
         :param negative_sampler_kwargs: Keyword arguments to pass to the negative sampler class on instantiation
             for every positive one
+        :param device_sampling:
+            Whether to shuffle and corrupt the training triples on the model's device.
+        :param prefetch:
+            The number of batches to prepare in advance by a background thread. Only used with device sampling.
         :param kwargs:
             Additional keyword-based parameters passed to TrainingLoop.__init__
         """
         super().__init__(**kwargs)
         self.negative_sampler = negative_sampler
         self.negative_sampler_kwargs = negative_sampler_kwargs
+        self.device_sampling = device_sampling
+        self.prefetch = prefetch
 
     # docstr-coverage: inherited
     def _create_training_data_loader(
@@ -58,6 +81,26 @@ class SLCWATrainingLoop(TrainingLoop[SLCWASampleType, SLCWABatch]):
         pin_memory: bool,
         sampler: Optional[str],
     ) -> DataLoader[SLCWABatch]:  # noqa: D102
+        if self.device_sampling:
+            if num_workers:
+                logger.warning(f"Ignoring num_workers={num_workers} since negative samples are created on the device.")
+            return DataLoader(
+                dataset=triples_factory.create_slcwa_instances(
+                    batch_size=batch_size,
+                    drop_last=drop_last,
+                    negative_sampler=self.negative_sampler,
+                    negative_sampler_kwargs=self.negative_sampler_kwargs,
+                    sampler=sampler,
+                    device=self.device,
+                    prefetch=self.prefetch,
+                ),
+                # the batches are created on the device by the main process
+                num_workers=0,
+                pin_memory=False,
+                # disable automatic batching
+                batch_size=None,
+                batch_sampler=None,
+            )
         return DataLoader(
             dataset=triples_factory.create_slcwa_instances(
                 batch_size=batch_size,
@@ -18,7 +18,7 @@ from typing import IO, Any, Generic, List, Mapping, Optional, Tuple, TypeVar, Un
 import numpy as np
 import torch
 from class_resolver import HintOrType, OptionalKwargs
-from class_resolver.contrib.torch import lr_scheduler_resolver, optimizer_resolver
+from class_resolver.contrib.torch import lr_scheduler_resolver
 from torch.optim.optimizer import Optimizer
 from torch.utils.data import DataLoader
 from tqdm.autonotebook import tqdm, trange
@@ -35,6 +35,7 @@ from .callbacks import (
 from ..constants import PYKEEN_CHECKPOINTS, PYKEEN_DEFAULT_CHECKPOINT
 from ..lr_schedulers import LRScheduler
 from ..models import RGCN, Model
+from ..optimizers import optimizer_resolver
 from ..stoppers import Stopper
 from ..trackers import ResultTracker, tracker_resolver
 from ..triples import CoreTriplesFactory, TriplesFactory
@@ -102,6 +103,12 @@ class SubBatchingNotSupportedError(NotImplementedError):
         )
 
 
+def _check_finite(loss: torch.Tensor) -> None:
+    """Raise an error if the loss is non-finite (NaN, +/-inf)."""
+    if not torch.isfinite(loss).all():
+        raise NonFiniteLossError("Loss is non-finite.")
+
+
 def _get_optimizer_kwargs(optimizer: Optimizer) -> Mapping[str, Any]:
     optimizer_kwargs = optimizer.state_dict()
     optimizer_kwargs = {
@@ -146,6 +153,7 @@ class TrainingLoop(Generic[SampleType, BatchType], ABC):
         mode: Optional[InductiveMode] = None,
         result_tracker: HintOrType[ResultTracker] = None,
         result_tracker_kwargs: OptionalKwargs = None,
+        loss_check_frequency: Optional[int] = None,
     ) -> None:
         """Initialize the training loop.
 
@@ -167,7 +175,20 @@ class TrainingLoop(Generic[SampleType, BatchType], ABC):
             the result tracker
         :param result_tracker_kwargs:
             additional keyword-based parameters to instantiate the result tracker
+        :param loss_check_frequency:
+            If None, the loss of every sub-batch is transferred to the host and checked for non-finite values directly
+            after its computation, which synchronizes the device in every step. Otherwise, the epoch loss is
+            accumulated on the model's device, and the (non-finite) accumulated loss is only inspected every
+            `loss_check_frequency` batches, as well as at the end of each epoch. 0 restricts the check to the end of
+            epochs. Notice that in this mode, a few parameter updates with non-finite loss may occur before the
+            :class:`NonFiniteLossError` is raised, and that callbacks receive the batch loss as a detached scalar
+            tensor, which only synchronizes when converted to a float.
+
+        :raises ValueError:
+            if the loss check frequency is negative
         """
+        if loss_check_frequency is not None and loss_check_frequency < 0:
+            raise ValueError(f"loss_check_frequency must be non-negative, but is {loss_check_frequency}")
         self.model = model
         self.optimizer = optimizer_resolver.make(optimizer, pos_kwargs=optimizer_kwargs, params=model.get_grad_params())
         self.lr_scheduler = lr_scheduler_resolver.make_safe(
@@ -178,6 +199,7 @@ class TrainingLoop(Generic[SampleType, BatchType], ABC):
         self.automatic_memory_optimization = automatic_memory_optimization
         self.mode = mode
         self.result_tracker = tracker_resolver.make(query=result_tracker, pos_kwargs=result_tracker_kwargs)
+        self.loss_check_frequency = loss_check_frequency
 
         logger.debug("we don't really need the triples factory: %s", triples_factory)
 
@@ -606,8 +628,10 @@ class TrainingLoop(Generic[SampleType, BatchType], ABC):
                 # Enforce training mode
                 self.model.train()
 
-                # Accumulate loss over epoch
-                current_epoch_loss = 0.0
+                # Accumulate loss over epoch; with asynchronous loss accumulation, this happens on the device
+                current_epoch_loss: Union[float, torch.Tensor] = 0.0
+                if self.loss_check_frequency is not None:
+                    current_epoch_loss = torch.zeros(size=tuple(), device=self.device)
 
                 # Batching
                 # Only create a progress bar when not in size probing mode
@@ -625,7 +649,7 @@ class TrainingLoop(Generic[SampleType, BatchType], ABC):
                 evaluated_once = False
 
                 num_training_instances = 0
-                for batch in batches:
+                for batch_index, batch in enumerate(batches, start=1):
                     # Recall that torch *accumulates* gradients. Before passing in a
                     # new instance, you need to zero out the gradients from the old instance
                     self.optimizer.zero_grad()
@@ -651,6 +675,10 @@ class TrainingLoop(Generic[SampleType, BatchType], ABC):
                         num_training_instances += stop - start
                         callback.on_batch(epoch=epoch, batch=batch, batch_loss=batch_loss)
 
+                    # deferred check for non-finite losses; a single non-finite value renders the sum non-finite
+                    if self.loss_check_frequency and batch_index % self.loss_check_frequency == 0:
+                        _check_finite(current_epoch_loss)
+
                     # when called by batch_size_search(), the parameter update should not be applied.
                     if not only_size_probing:
                         callback.pre_step()
@@ -684,6 +712,11 @@ class TrainingLoop(Generic[SampleType, BatchType], ABC):
                 if self.lr_scheduler is not None:
                     self.lr_scheduler.step(epoch=epoch)
 
+                # Synchronize the accumulated loss once per epoch
+                if isinstance(current_epoch_loss, torch.Tensor):
+                    _check_finite(current_epoch_loss)
+                    current_epoch_loss = current_epoch_loss.item()
+
                 # Track epoch loss
                 if self.model.loss.reduction == "mean":
                     epoch_loss = current_epoch_loss / num_training_instances
@@ -813,7 +846,7 @@ class TrainingLoop(Generic[SampleType, BatchType], ABC):
         current_batch_size: int,
         label_smoothing: float,
         slice_size: Optional[int],
-    ) -> float:
+    ) -> Union[float, torch.Tensor]:
         # forward pass
         loss = self._process_batch(
             batch=batch,
@@ -823,9 +856,9 @@ class TrainingLoop(Generic[SampleType, BatchType], ABC):
             slice_size=slice_size,
         )
 
-        # raise error when non-finite loss occurs (NaN, +/-inf)
-        if not torch.isfinite(loss):
-            raise NonFiniteLossError("Loss is non-finite.")
+        # raise error when non-finite loss occurs (NaN, +/-inf); deferred in asynchronous mode
+        if self.loss_check_frequency is None:
+            _check_finite(loss)
 
         # correction for loss reduction
         if self.model.loss.reduction == "mean":
@@ -834,7 +867,11 @@ class TrainingLoop(Generic[SampleType, BatchType], ABC):
 
         # backward pass
         loss.backward()
-        current_epoch_loss = loss.item()
+        if self.loss_check_frequency is None:
+            current_epoch_loss = loss.item()
+        else:
+            # keep the loss on the device to avoid a synchronization
+            current_epoch_loss = loss.detach().sum()
 
         self.model.post_forward_pass()
         # TODO why not call torch.cuda.empty_cache()? or call self._free_graph_and_cache()?
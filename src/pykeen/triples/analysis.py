@@ -6,10 +6,25 @@ import hashlib
 import itertools as itt
 import logging
 from collections import defaultdict
-from typing import Collection, DefaultDict, Iterable, Mapping, NamedTuple, Optional, Sequence, Set, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import (
+    Collection,
+    DefaultDict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import numpy
 import pandas as pd
+import scipy.sparse
 from tqdm.auto import tqdm
 
 from . import TriplesFactory
@@ -25,6 +40,7 @@ __all__ = [
     "get_entity_counts",
     "get_relation_counts",
     "get_relation_functionality",
+    "iter_patterns_sparse",
     "relation_cardinality_types",
     "relation_injectivity",
     "relation_pattern_types",
@@ -322,6 +338,296 @@ def iter_patterns(
     yield from iter_ternary_patterns(mapped_triples, pairs=pairs)
 
 
+class SparsePatternIndex(NamedTuple):
+    """A sparse-matrix index of triples for vectorized pattern mining."""
+
+    #: the number of entities, i.e., the size of the adjacency matrices
+    num_entities: int
+
+    #: the relation IDs, in order of first occurrence, i.e., the iteration order of :func:`index_pairs`
+    relations: Sequence[int]
+
+    #: a mapping from relations to their binary adjacency matrix, shape: (num_entities, num_entities)
+    adjacency: Mapping[int, scipy.sparse.csr_matrix]
+
+    #: the sorted unique keys $h \cdot n + t$ of all entity pairs occurring in any triple, shape: (num_pairs,)
+    pair_keys: numpy.ndarray
+
+    #: the binary incidence between entity pairs and relations, shape: (num_pairs, max_relation_id + 1)
+    pair_relations: scipy.sparse.csr_matrix
+
+
+def index_sparse(mapped_triples: Union[MappedTriples, Collection[Tuple[int, int, int]]]) -> SparsePatternIndex:
+    """
+    Create a sparse-matrix index for vectorized pattern mining.
+
+    :param mapped_triples: shape: (num_triples, 3)
+        The ID-based triples.
+
+    :return:
+        The sparse index.
+    """
+    triples = numpy.asarray(mapped_triples, dtype=numpy.int64).reshape(-1, 3)
+    # same order as the keys of index_pairs, which determines the (asymmetric) result of the inversion check
+    relations = pd.unique(triples[:, 1]).tolist()
+    # unique triples, since the patterns are defined on sets; sorted by relation
+    triples = numpy.unique(triples[:, [1, 0, 2]], axis=0)
+    r, h, t = triples.T
+    num_entities = int(triples[:, 1:].max(initial=-1)) + 1
+    num_relations = int(r.max(initial=-1)) + 1
+    ones = numpy.ones_like(h, dtype=numpy.int32)
+    offsets = numpy.searchsorted(r, numpy.arange(num_relations + 1))
+    adjacency = {
+        relation: scipy.sparse.csr_matrix(
+            (ones[low:high], (h[low:high], t[low:high])), shape=(num_entities, num_entities)
+        )
+        for relation in relations
+        for low, high in [offsets[relation : relation + 2]]
+    }
+    pair_keys, pair_index = numpy.unique(h * num_entities + t, return_inverse=True)
+    pair_relations = scipy.sparse.csr_matrix((ones, (pair_index.reshape(-1), r)), shape=(len(pair_keys), num_relations))
+    return SparsePatternIndex(
+        num_entities=num_entities,
+        relations=relations,
+        adjacency=adjacency,
+        pair_keys=pair_keys,
+        pair_relations=pair_relations,
+    )
+
+
+def iter_unary_patterns_sparse(index: SparsePatternIndex) -> Iterable[PatternMatch]:
+    """
+    Yield unary patterns from a sparse index, cf. :func:`iter_unary_patterns`.
+
+    :param index:
+        The sparse index.
+
+    :yields: A pattern match tuple of relation_id, pattern_type, support, and confidence.
+    """
+    logger.debug("Evaluating unary patterns: {symmetry, anti-symmetry}")
+    for r in index.relations:
+        adjacency = index.adjacency[r]
+        support = adjacency.nnz
+        confidence = adjacency.multiply(adjacency.T).nnz / support
+        yield PatternMatch(r, PATTERN_TYPE_SYMMETRY, support, confidence)
+        yield PatternMatch(r, PATTERN_TYPE_ANTI_SYMMETRY, support, 1 - confidence)
+
+
+def iter_binary_patterns_sparse(index: SparsePatternIndex) -> Iterable[PatternMatch]:
+    """
+    Yield binary patterns from a sparse index, cf. :func:`iter_binary_patterns`.
+
+    :param index:
+        The sparse index.
+
+    :yields: A pattern match tuple of relation_id, pattern_type, support, and confidence.
+    """
+    logger.debug("Evaluating binary patterns: {inversion}")
+    # the number of shared entity pairs for all pairs of relations, shape: (num_relations, num_relations)
+    intersection = (index.pair_relations.T @ index.pair_relations).tocsr()
+    for i, r1 in enumerate(index.relations):
+        support = index.adjacency[r1].nnz
+        counts = intersection[r1].toarray().reshape(-1)
+        for r in index.relations[i + 1 :]:
+            yield PatternMatch(r, PATTERN_TYPE_INVERSION, support, int(counts[r]) / support)
+
+
+def composition_candidates_sparse(index: SparsePatternIndex) -> List[Tuple[int, int]]:
+    """
+    Determine the relation pair candidates for the composition pattern, cf. :func:`composition_candidates`.
+
+    :param index:
+        The sparse index.
+
+    :return:
+        A sorted list of relation pairs $(r, r')$ for which there is at least one entity with an incoming $r$ and an
+        outgoing $r'$ edge.
+    """
+    # entity-relation incidence, shape: (num_entities, max_relation_id + 1)
+    num_relations = index.pair_relations.shape[1]
+    rows = numpy.repeat(index.pair_keys, numpy.diff(index.pair_relations.indptr))
+    columns = index.pair_relations.indices
+    ones = numpy.ones_like(columns)
+    shape = (index.num_entities, num_relations)
+    ins = scipy.sparse.csr_matrix((ones, (rows % index.num_entities, columns)), shape=shape)
+    outs = scipy.sparse.csr_matrix((ones, (rows // index.num_entities, columns)), shape=shape)
+    r1, r2 = (ins.T @ outs).nonzero()
+    return sorted(zip(r1.tolist(), r2.tolist()))
+
+
+class _CompositionBlock(NamedTuple):
+    """A chunk of relations $r''$ with their horizontally stacked adjacency matrices."""
+
+    relations: Sequence[int]
+    adjacency: scipy.sparse.csr_matrix
+
+
+def _evaluate_composition(
+    index: SparsePatternIndex,
+    r1: int,
+    block: _CompositionBlock,
+) -> Tuple[List[int], numpy.ndarray]:
+    r"""
+    Evaluate the composition patterns $r'(x, y) \land r''(y, z) \implies r(x, z)$ for a chunk of $r''$.
+
+    :param index:
+        The sparse index.
+    :param r1:
+        The relation $r'$.
+    :param block:
+        The chunk of relations $r''$.
+
+    :return: shape: (k,) and (k, num_relations)
+        The support of the $k$ relations $r''$ with non-empty support, and the confidence for each relation $r$ in the
+        order of the index' relations.
+    """
+    n = index.num_entities
+    # all paths for all r'' of the chunk at once, shape: (num_entities, chunk_size * num_entities)
+    lhs = (index.adjacency[r1] @ block.adjacency).tocoo()
+    chunk = lhs.col // n
+    keys = lhs.row.astype(numpy.int64) * n + lhs.col % n
+    support = numpy.bincount(chunk, minlength=len(block.relations))
+    # element-wise intersection with the entity pairs of all relations
+    position = numpy.searchsorted(index.pair_keys, keys).clip(max=len(index.pair_keys) - 1)
+    found = index.pair_keys[position] == keys
+    num_found = int(found.sum())
+    selection = scipy.sparse.csr_matrix(
+        (numpy.ones(num_found, dtype=numpy.int32), (chunk[found], numpy.arange(num_found))),
+        shape=(len(block.relations), num_found),
+    )
+    # shape: (chunk_size, num_relations)
+    counts = (selection @ index.pair_relations[position[found]])[:, index.relations].toarray()
+    # skip empty support, i.e., non-candidates
+    non_empty = support.nonzero()[0]
+    support = support[non_empty]
+    # division of integers is exact up to rounding, i.e., the same as for Python ints
+    return support.tolist(), counts[non_empty] / support[:, None]
+
+
+def _iter_composition_matches(
+    index: SparsePatternIndex,
+    support: Sequence[int],
+    confidence: numpy.ndarray,
+    drop_zero_confidence: bool,
+) -> Iterable[PatternMatch]:
+    """Yield the pattern matches for the result of :func:`_evaluate_composition`."""
+    if not drop_zero_confidence:
+        for s, confidences in zip(support, confidence.tolist()):
+            for r, c in zip(index.relations, confidences):
+                yield PatternMatch(r, PATTERN_TYPE_COMPOSITION, s, c)
+        return
+    relations = numpy.asarray(index.relations)
+    for i, j in zip(*(x.tolist() for x in confidence.nonzero())):
+        yield PatternMatch(int(relations[j]), PATTERN_TYPE_COMPOSITION, support[i], float(confidence[i, j]))
+
+
+#: the state shared with worker processes, cf. _initialize_worker
+_worker_state: Optional[Tuple[SparsePatternIndex, Sequence[_CompositionBlock]]] = None
+
+
+def _initialize_worker(index: SparsePatternIndex, blocks: Sequence[_CompositionBlock]) -> None:
+    """Store the index in a worker process, such that it is only transferred once."""
+    global _worker_state
+    _worker_state = (index, blocks)
+
+
+def _evaluate_composition_worker(task: Tuple[int, int]) -> Tuple[List[int], numpy.ndarray]:
+    """Evaluate a chunk of composition patterns in a worker process."""
+    assert _worker_state is not None
+    index, blocks = _worker_state
+    r1, block_id = task
+    return _evaluate_composition(index, r1=r1, block=blocks[block_id])
+
+
+def iter_ternary_patterns_sparse(
+    index: SparsePatternIndex,
+    chunk_size: int = 32,
+    num_workers: Optional[int] = None,
+    drop_zero_confidence: bool = False,
+) -> Iterable[PatternMatch]:
+    r"""
+    Yield ternary patterns from a sparse index, cf. :func:`iter_ternary_patterns`.
+
+    For each relation $r'$, the paths $r'(x, y) \land r''(y, z)$ are computed for chunks of relations $r''$ by a
+    single sparse matrix product, and their intersection with the entity pairs of all relations is counted at once.
+
+    :param index:
+        The sparse index.
+    :param chunk_size: >0
+        The maximum number of relations $r''$ to evaluate at once. Larger chunks are faster, but require more memory.
+    :param num_workers:
+        The number of worker processes. If None or 0, evaluate in the current process.
+    :param drop_zero_confidence:
+        Whether to skip patterns with zero confidence. Since there is one pattern per candidate pair and relation, this
+        avoids creating most of the pattern match tuples for graphs with many relations.
+
+    :yields: A pattern match tuple of relation_id, pattern_type, support, and confidence.
+    """
+    logger.debug("Evaluating ternary patterns: {composition}")
+    relations = sorted(index.relations)
+    blocks = [
+        _CompositionBlock(
+            relations=chunk,
+            adjacency=scipy.sparse.hstack([index.adjacency[r2] for r2 in chunk], format="csr"),
+        )
+        for chunk in (relations[i : i + chunk_size] for i in range(0, len(relations), chunk_size))
+    ]
+    # only evaluate chunks with at least one candidate
+    block_ids = dict(zip(relations, (i // chunk_size for i in range(len(relations)))))
+    tasks: DefaultDict[Tuple[int, int], int] = defaultdict(int)
+    for r1, r2 in composition_candidates_sparse(index):
+        tasks[r1, block_ids[r2]] += 1
+    results: Iterable[Tuple[List[int], numpy.ndarray]]
+    with ExitStack() as stack:
+        progress = stack.enter_context(
+            tqdm(total=sum(tasks.values()), desc="Checking ternary patterns", unit="pattern", unit_scale=True)
+        )
+        if num_workers:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=num_workers, initializer=_initialize_worker, initargs=(index, blocks))
+            )
+            results = executor.map(_evaluate_composition_worker, tasks)
+        else:
+            results = (_evaluate_composition(index, r1=r1, block=blocks[block_id]) for r1, block_id in tasks)
+        for num_candidates, (support, confidence) in zip(tasks.values(), results):
+            yield from _iter_composition_matches(
+                index, support=support, confidence=confidence, drop_zero_confidence=drop_zero_confidence
+            )
+            progress.update(num_candidates)
+
+
+def iter_patterns_sparse(
+    mapped_triples: Union[MappedTriples, Collection[Tuple[int, int, int]]],
+    chunk_size: int = 32,
+    num_workers: Optional[int] = None,
+    drop_zero_confidence: bool = False,
+) -> Iterable[PatternMatch]:
+    """Iterate over unary, binary, and ternary patterns using sparse matrices.
+
+    This yields the same patterns as :func:`iter_patterns`, but is considerably faster for larger graphs.
+
+    :param mapped_triples:
+        The ID-based triples.
+    :param chunk_size:
+        The chunk size for ternary patterns, cf. :func:`iter_ternary_patterns_sparse`.
+    :param num_workers:
+        The number of worker processes for ternary patterns, cf. :func:`iter_ternary_patterns_sparse`.
+    :param drop_zero_confidence:
+        Whether to skip patterns with zero confidence, cf. :func:`iter_ternary_patterns_sparse`.
+
+    :yields: Patterns from :func:`iter_unary_patterns_sparse`, func:`iter_binary_patterns_sparse`, and
+        :func:`iter_ternary_patterns_sparse`.
+    """
+    index = index_sparse(mapped_triples)
+
+    for pattern in itt.chain(iter_unary_patterns_sparse(index), iter_binary_patterns_sparse(index)):
+        if pattern.confidence > 0 or not drop_zero_confidence:
+            yield pattern
+    yield from iter_ternary_patterns_sparse(
+        index, chunk_size=chunk_size, num_workers=num_workers, drop_zero_confidence=drop_zero_confidence
+    )
+
+
 def triple_set_hash(
     mapped_triples: Collection[Tuple[int, int, int]],
 ) -> str:
@@ -508,6 +814,9 @@ def get_relation_counts(
 
 def relation_pattern_types(
     mapped_triples: Collection[Tuple[int, int, int]],
+    sparse: bool = True,
+    chunk_size: int = 32,
+    num_workers: Optional[int] = None,
 ) -> pd.DataFrame:
     r"""
     Categorize relations based on patterns from RotatE [sun2019]_.
@@ -534,11 +843,24 @@ def relation_pattern_types(
 
     :param mapped_triples:
         A collection of ID-based triples.
+    :param sparse:
+        Whether to use the sparse-matrix based implementation, :func:`iter_patterns_sparse`, or the set-based one,
+        :func:`iter_patterns`. Both yield the same results, but the sparse one is considerably faster.
+    :param chunk_size:
+        The chunk size for ternary patterns, cf. :func:`iter_ternary_patterns_sparse`. Only used if sparse.
+    :param num_workers:
+        The number of worker processes for ternary patterns, cf. :func:`iter_ternary_patterns_sparse`. Only used if
+        sparse.
     :returns:
         A dataframe of relation categorization
     """
     # determine patterns from triples
-    base = iter_patterns(mapped_triples=mapped_triples)
+    if sparse:
+        base = iter_patterns_sparse(
+            mapped_triples=mapped_triples, chunk_size=chunk_size, num_workers=num_workers, drop_zero_confidence=True
+        )
+    else:
+        base = iter_patterns(mapped_triples=mapped_triples)
 
     # drop zero-confidence
     base = (pattern for pattern in base if pattern.confidence > 0)
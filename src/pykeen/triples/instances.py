@@ -3,6 +3,8 @@
 """Implementation of basic instance factory which creates just instances based on standard KG triples."""
 
 import math
+import queue
+import threading
 from abc import ABC, abstractmethod
 from typing import Callable, Generic, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
 
@@ -14,7 +16,8 @@ from torch.utils import data
 
 from .utils import compute_compressed_adjacency_list
 from ..sampling import NegativeSampler, negative_sampler_resolver
-from ..typing import MappedTriples
+from ..typing import DeviceHint, MappedTriples, TorchRandomHint
+from ..utils import random_non_negative_int, resolve_device
 
 __all__ = [
     "Instances",
@@ -30,6 +33,21 @@ LCWABatchType = Tuple[MappedTriples, torch.FloatTensor]
 SLCWASampleType = Tuple[MappedTriples, MappedTriples, Optional[torch.BoolTensor]]
 
 
+def _split_workload(n: int) -> range:
+    """Split workload for multi-processing."""
+    # cf. https://pytorch.org/docs/stable/data.html#torch.utils.data.IterableDataset
+    worker_info = torch.utils.data.get_worker_info()
+    if worker_info is None:  # single-process data loading, return the full iterator
+        workload = range(n)
+    else:
+        num_workers = worker_info.num_workers
+        worker_id = worker_info.id  # 1-based
+        start = math.ceil(n / num_workers * worker_id)
+        stop = math.ceil(n / num_workers * (worker_id + 1))
+        workload = range(start, stop)
+    return workload
+
+
 class SLCWABatch(NamedTuple):
     """A batch for sLCWA training."""
 
@@ -214,17 +232,7 @@ class BaseBatchedSLCWAInstances(data.IterableDataset[SLCWABatch]):
 
     def split_workload(self, n: int) -> range:
         """Split workload for multi-processing."""
-        # cf. https://pytorch.org/docs/stable/data.html#torch.utils.data.IterableDataset
-        worker_info = torch.utils.data.get_worker_info()
-        if worker_info is None:  # single-process data loading, return the full iterator
-            workload = range(n)
-        else:
-            num_workers = worker_info.num_workers
-            worker_id = worker_info.id  # 1-based
-            start = math.ceil(n / num_workers * worker_id)
-            stop = math.ceil(n / num_workers * (worker_id + 1))
-            workload = range(start, stop)
-        return workload
+        return _split_workload(n=n)
 
     @abstractmethod
     def iter_triple_ids(self) -> Iterable[List[int]]:
@@ -256,6 +264,129 @@ class BatchedSLCWAInstances(BaseBatchedSLCWAInstances):
         )
 
 
+def _prefetch(iterable: Iterable[BatchType], size: int) -> Iterator[BatchType]:
+    """Iterate over an iterable, while a background thread produces up to `size` elements in advance."""
+    buffer: "queue.Queue[Tuple[bool, Optional[BatchType], Optional[Exception]]]" = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def _produce():
+        try:
+            for element in iterable:
+                # do not block forever if the consumer has stopped
+                while not stop.is_set():
+                    try:
+                        buffer.put((False, element, None), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            buffer.put((True, None, None))
+        except Exception as error:
+            buffer.put((True, None, error))
+
+    thread = threading.Thread(target=_produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            done, element, error = buffer.get()
+            if error is not None:
+                raise error
+            if done:
+                break
+            yield element
+    finally:
+        stop.set()
+
+
+class DeviceBatchedSLCWAInstances(BaseBatchedSLCWAInstances):
+    """
+    Random pre-batched training instances for the sLCWA training loop, which are created on a (GPU) device.
+
+    In contrast to :class:`BatchedSLCWAInstances`, the triples are moved to the device once. In each epoch, they are
+    shuffled by a single permutation, such that each batch of positive triples is a contiguous slice. The negative
+    sampler is moved to the device, too, i.e., corruption and filtering do not require any host-to-device transfer.
+
+    Optionally, the next batches are prepared by a background thread while the current one is processed.
+
+    .. note ::
+        since the batches reside on the device already, this class should only be used with a single-process
+        :class:`torch.utils.data.DataLoader` without memory pinning.
+    """
+
+    def __init__(
+        self,
+        *,
+        device: DeviceHint = None,
+        prefetch: int = 0,
+        random_state: TorchRandomHint = None,
+        **kwargs,
+    ):
+        """
+        Initialize the instances.
+
+        :param device:
+            the device on which to create the batches. If None, use a GPU if available, cf. :func:`resolve_device`.
+        :param prefetch: >=0
+            the number of batches to prepare in advance. If 0, the batches are created on demand.
+        :param random_state:
+            the random state for shuffling and corruption, or a seed thereof. If None, a seed is drawn from numpy's
+            global random state. Since the instances own their random number generator, the batches do not depend on
+            other consumers of the global one, e.g., while being prepared by the background thread.
+        :param kwargs:
+            keyword-based parameters passed to :meth:`BaseBatchedSLCWAInstances.__init__`
+
+        :raises ValueError:
+            if `prefetch` is negative
+        """
+        if prefetch < 0:
+            raise ValueError(f"prefetch must be non-negative, but is {prefetch}.")
+        super().__init__(**kwargs)
+        self.device = resolve_device(device)
+        self.prefetch = prefetch
+        self.mapped_triples = self.mapped_triples.to(device=self.device)
+        self.negative_sampler = self.negative_sampler.to(device=self.device)
+        if not isinstance(random_state, torch.Generator):
+            if random_state is None:
+                random_state = random_non_negative_int()
+            random_state = torch.Generator(device=self.device).manual_seed(random_state)
+        self.generator = random_state
+        self.negative_sampler.generator = self.generator
+
+    def _iter_slices(self, num_triples: int) -> Iterable[slice]:
+        """Iterate over the slices of the batches of one epoch."""
+        stop = num_triples - num_triples % self.batch_size if self.drop_last else num_triples
+        for start in range(0, stop, self.batch_size):
+            yield slice(start, start + self.batch_size)
+
+    def _permutation(self) -> torch.LongTensor:
+        """Create a random permutation of the triples of this worker."""
+        workload = self.split_workload(len(self.mapped_triples))
+        return workload.start + torch.randperm(len(workload), generator=self.generator, device=self.device)
+
+    # docstr-coverage: inherited
+    def iter_triple_ids(self) -> Iterable[List[int]]:  # noqa: D102
+        permutation = self._permutation()
+        for batch_slice in self._iter_slices(num_triples=len(permutation)):
+            yield permutation[batch_slice].tolist()
+
+    def _iter_batches(self) -> Iterator[SLCWABatch]:
+        """Iterate over the batches of one epoch."""
+        # a single gather per epoch; afterwards, each batch is a (contiguous) view
+        shuffled = self.mapped_triples[self._permutation()]
+        for batch_slice in self._iter_slices(num_triples=len(shuffled)):
+            positive_batch = shuffled[batch_slice]
+            negative_batch, masks = self.negative_sampler.sample(positive_batch=positive_batch)
+            yield SLCWABatch(positives=positive_batch, negatives=negative_batch, masks=masks)
+
+    def __iter__(self) -> Iterator[SLCWABatch]:
+        """Iterate over batches."""
+        if self.prefetch:
+            yield from _prefetch(self._iter_batches(), size=self.prefetch)
+        else:
+            yield from self._iter_batches()
+
+
 class SubGraphSLCWAInstances(BaseBatchedSLCWAInstances):
     """Pre-batched training instances for SLCWA of coherent subgraphs."""
 
@@ -329,6 +460,95 @@ class SubGraphSLCWAInstances(BaseBatchedSLCWAInstances):
         yield from (self.subgraph_sample() for _ in self.split_workload(n=len(self)))
 
 
+class FrontierSubGraphSLCWAInstances(SubGraphSLCWAInstances):
+    """
+    Pre-batched training instances for SLCWA of coherent subgraphs, with a fast sampler.
+
+    The subgraphs follow the same distribution as for :class:`SubGraphSLCWAInstances`: In each step, a node which is
+    already part of the subgraph is chosen with probability proportional to its number of edges which have not been
+    picked yet, and one of these edges is chosen uniformly at random. This is equivalent to choosing an entry of the
+    adjacency lists of the subgraph's nodes uniformly at random among those whose edge has not been picked yet.
+    Hence, the sampler keeps a pool of these entries (the *frontier*), which is extended by the adjacency list of each
+    newly visited node, and from which entries of already picked edges are lazily removed, i.e., when they are drawn.
+    Thus, the cost of a step does not depend on the total number of nodes. If there is no unpicked edge adjacent to the
+    subgraph, a new node is chosen uniformly at random among the unvisited nodes with at least one edge.
+
+    The batches can be produced in parallel by multiple workers of a :class:`torch.utils.data.DataLoader`.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the instances.
+
+        :param kwargs:
+            keyword-based parameters passed to :meth:`SubGraphSLCWAInstances.__init__`
+        """
+        super().__init__(**kwargs)
+        self._degrees = self.degrees.numpy()
+        self._offsets = self.offset.numpy()
+        self._edges = self.neighbors[:, 0].numpy()
+        self._others = self.neighbors[:, 1].numpy()
+        # the candidates for starting a new component
+        self._start_nodes = np.flatnonzero(self._degrees)
+
+    # docstr-coverage: inherited
+    def subgraph_sample(self) -> List[int]:  # noqa: D102
+        # derive the generator's seed from torch, to respect torch's seeding, including the one of data loader workers
+        generator = np.random.default_rng(seed=torch.randint(2**62, size=tuple()).item())
+        node_picked = np.zeros(self._degrees.shape[0], dtype=bool)
+        edge_picked = np.zeros(self._edges.shape[0], dtype=bool)
+        # the frontier, i.e., positions in the adjacency lists of visited nodes
+        frontier = np.empty(shape=(max(2 * self.batch_size, 16),), dtype=np.int64)
+        frontier_size = 0
+
+        result: List[int] = []
+        # draw uniform random numbers in bulk
+        uniform = generator.random(size=2 * self.batch_size)
+        num_draws = 0
+        while len(result) < self.batch_size:
+            if num_draws == uniform.shape[0]:
+                uniform, num_draws = generator.random(size=uniform.shape[0]), 0
+            u = uniform[num_draws]
+            num_draws += 1
+
+            if frontier_size:
+                # choose an entry uniformly at random
+                i = int(u * frontier_size)
+                position = frontier[i]
+                if edge_picked[self._edges[position]]:
+                    # lazily remove entries of already picked edges
+                    frontier_size -= 1
+                    frontier[i] = frontier[frontier_size]
+                    continue
+                new_nodes = [self._others[position]]
+            else:
+                # start a new component at a random unvisited node; try rejection sampling first
+                node = self._start_nodes[int(u * self._start_nodes.size)]
+                if node_picked[node]:
+                    candidates = self._start_nodes[~node_picked[self._start_nodes]]
+                    if not candidates.size:
+                        break
+                    node = candidates[generator.integers(candidates.size)]
+                position = self._offsets[node] + generator.integers(self._degrees[node])
+                new_nodes = [node, self._others[position]]
+
+            edge = self._edges[position]
+            result.append(int(edge))
+            edge_picked[edge] = True
+
+            # extend the frontier by the adjacency lists of newly visited nodes
+            for node in new_nodes:
+                if node_picked[node]:
+                    continue
+                node_picked[node] = True
+                start, degree = self._offsets[node], self._degrees[node]
+                if frontier_size + degree > frontier.shape[0]:
+                    frontier = np.resize(frontier, new_shape=(2 * (frontier_size + degree),))
+                frontier[frontier_size : frontier_size + degree] = np.arange(start, start + degree)
+                frontier_size += degree
+        return result
+
+
 class LCWAInstances(Instances[LCWASampleType, LCWABatchType]):
     """Triples and mappings to their indices for LCWA."""
 
@@ -368,24 +588,134 @@ class LCWAInstances(Instances[LCWASampleType, LCWABatchType]):
         :return:
             The instances.
         """
-        if target is None:
-            target = 2
-        mapped_triples = mapped_triples.numpy()
-        other_columns = sorted(set(range(3)).difference({target}))
-        unique_pairs, pair_idx_to_triple_idx = np.unique(mapped_triples[:, other_columns], return_inverse=True, axis=0)
-        num_pairs = unique_pairs.shape[0]
-        tails = mapped_triples[:, target]
-        target_size = num_relations if target == 1 else num_entities
-        compressed = scipy.sparse.coo_matrix(
-            (np.ones(mapped_triples.shape[0], dtype=np.float32), (pair_idx_to_triple_idx, tails)),
-            shape=(num_pairs, target_size),
+        pairs, compressed = _compress_lcwa_targets(
+            mapped_triples=mapped_triples, num_entities=num_entities, num_relations=num_relations, target=target
         )
-        # convert to csr for fast row slicing
-        compressed = compressed.tocsr()
-        return cls(pairs=unique_pairs, compressed=compressed)
+        return cls(pairs=pairs, compressed=compressed)
 
     def __len__(self) -> int:  # noqa: D105
         return self.pairs.shape[0]
 
     def __getitem__(self, item: int) -> LCWABatchType:  # noqa: D105
         return self.pairs[item], np.asarray(self.compressed[item, :].todense())[0, :]
+
+
+def _compress_lcwa_targets(
+    mapped_triples: MappedTriples,
+    num_entities: int,
+    num_relations: int,
+    target: Optional[int] = None,
+) -> Tuple[np.ndarray, scipy.sparse.csr_matrix]:
+    """Compute the unique pairs of the non-target columns, and the (sparse) matrix of their targets."""
+    if target is None:
+        target = 2
+    mapped_triples = mapped_triples.numpy()
+    other_columns = sorted(set(range(3)).difference({target}))
+    unique_pairs, pair_idx_to_triple_idx = np.unique(mapped_triples[:, other_columns], return_inverse=True, axis=0)
+    num_pairs = unique_pairs.shape[0]
+    tails = mapped_triples[:, target]
+    target_size = num_relations if target == 1 else num_entities
+    compressed = scipy.sparse.coo_matrix(
+        (np.ones(mapped_triples.shape[0], dtype=np.float32), (pair_idx_to_triple_idx.reshape(-1), tails)),
+        shape=(num_pairs, target_size),
+    )
+    # convert to csr for fast row slicing
+    return unique_pairs, compressed.tocsr()
+
+
+class BatchedLCWAInstances(data.IterableDataset[LCWABatchType]):
+    """
+    Random pre-batched training instances for the LCWA training loop.
+
+    In contrast to :class:`LCWAInstances`, the targets of a whole batch are obtained by a single slice of the sparse
+    target matrix, and returned as sparse tensor of shape `(batch_size, num_targets)`. Thus, only the indices of the
+    positive targets are transferred to the device, where the dense labels are created, cf.
+    :meth:`pykeen.training.LCWATrainingLoop._process_batch_static`.
+
+    .. note ::
+        this class is intended to be used with automatic batching disabled, i.e., both parameters `batch_size` and
+        `batch_sampler` of torch.utils.data.DataLoader` are set to `None`.
+    """
+
+    def __init__(
+        self,
+        *,
+        pairs: np.ndarray,
+        compressed: scipy.sparse.csr_matrix,
+        batch_size: int = 1,
+        drop_last: bool = True,
+    ):
+        """
+        Initialize the LCWA instances.
+
+        :param pairs: The unique pairs
+        :param compressed: The compressed triples in CSR format
+        :param batch_size: The batch size
+        :param drop_last: Whether to drop the last (incomplete) batch
+        """
+        self.pairs = pairs
+        self.compressed = compressed
+        self.batch_size = batch_size
+        self.drop_last = drop_last
+
+    @classmethod
+    def from_triples(
+        cls,
+        mapped_triples: MappedTriples,
+        *,
+        num_entities: int,
+        num_relations: int,
+        target: Optional[int] = None,
+        **kwargs,
+    ) -> "BatchedLCWAInstances":
+        """
+        Create batched LCWA instances from triples.
+
+        :param mapped_triples: shape: (num_triples, 3)
+            The ID-based triples.
+        :param num_entities:
+            The number of entities.
+        :param num_relations:
+            The number of relations.
+        :param target:
+            The column to predict
+        :param kwargs:
+            Keyword arguments passed to :meth:`BatchedLCWAInstances.__init__`
+
+        :return:
+            The instances.
+        """
+        pairs, compressed = _compress_lcwa_targets(
+            mapped_triples=mapped_triples, num_entities=num_entities, num_relations=num_relations, target=target
+        )
+        return cls(pairs=pairs, compressed=compressed, **kwargs)
+
+    def __getitem__(self, item: List[int]) -> LCWABatchType:
+        """Get a batch from the given list of pair IDs."""
+        targets = self.compressed[item].tocoo()
+        labels = torch.sparse_coo_tensor(
+            indices=torch.as_tensor(np.stack([targets.row, targets.col]), dtype=torch.long),
+            values=torch.as_tensor(targets.data),
+            size=targets.shape,
+        )
+        return torch.as_tensor(self.pairs[item]), labels
+
+    def iter_pair_ids(self) -> Iterable[List[int]]:
+        """Iterate over batches of pair IDs."""
+        workload = _split_workload(n=self.pairs.shape[0])
+        permutation = workload.start + torch.randperm(len(workload)).numpy()
+        stop = len(permutation) - len(permutation) % self.batch_size if self.drop_last else len(permutation)
+        for start in range(0, stop, self.batch_size):
+            yield permutation[start : start + self.batch_size].tolist()
+
+    def __iter__(self) -> Iterator[LCWABatchType]:
+        """Iterate over batches."""
+        for pair_ids in self.iter_pair_ids():
+            yield self[pair_ids]
+
+    def __len__(self) -> int:
+        """Return the number of batches."""
+        num_batches, remainder = divmod(self.pairs.shape[0], self.batch_size)
+        if remainder and not self.drop_last:
+            num_batches += 1
+        return num_batches
@@ -9,6 +9,7 @@ very easy and not a sign of the generalizability of a model to predict
 novel triples.
 """
 
+import functools
 import logging
 from typing import Collection, Iterable, List, Mapping, Optional, Set, Tuple, TypeVar, Union, cast
 
@@ -16,22 +17,28 @@ import click
 import numpy
 import scipy.sparse
 import torch
+from class_resolver import OptionalKwargs
 
 from pykeen.datasets.base import EagerDataset
 from pykeen.triples.triples_factory import CoreTriplesFactory, TriplesFactory, cat_triples
-from pykeen.typing import MappedTriples
-from pykeen.utils import compact_mapping, get_connected_components
+from pykeen.typing import MappedTriples, TorchRandomHint
+from pykeen.utils import compact_mapping, ensure_torch_random_state, get_connected_components
 
 __all__ = [
     "Sealant",
     "unleak",
     "reindex",
+    "get_candidate_pairs_lsh",
+    "minhash_signatures",
 ]
 
 logger = logging.getLogger(__name__)
 X = TypeVar("X")
 Y = TypeVar("Y")
 
+#: the prime used for the hash functions of MinHash
+_MERSENNE_PRIME = 2**31 - 1
+
 
 def _select_by_most_pairs(
     components: Collection[Collection[int]],
@@ -101,13 +108,14 @@ def _to_one_hot(
     shape: Tuple[int, int],
 ) -> scipy.sparse.spmatrix:
     """Create a one-hot matrix given indices of non-zero elements (potentially containing duplicates)."""
-    rows, cols = torch.stack([rows, cols], dim=0).unique(dim=1).numpy()
-    values = numpy.ones(rows.shape[0], dtype=numpy.int32)
-    return scipy.sparse.coo_matrix(
-        (values, (rows, cols)),
+    matrix = scipy.sparse.csr_matrix(
+        (numpy.ones(rows.shape[0], dtype=numpy.int32), (rows.numpy(), cols.numpy())),
         shape=shape,
         dtype=numpy.int32,
     )
+    # duplicates are summed up on conversion
+    matrix.data[:] = 1
+    return matrix.tocoo()
 
 
 def mapped_triples_to_sparse_matrices(
@@ -130,14 +138,11 @@ def mapped_triples_to_sparse_matrices(
     """
     num_triples = mapped_triples.shape[0]
     # compute unique pairs in triples *and* inverted triples for consistent pair-to-id mapping
-    extended_mapped_triples = torch.cat(
-        [
-            mapped_triples,
-            mapped_triples.flip(-1),
-        ],
-        dim=0,
-    )
-    pairs, pair_id = extended_mapped_triples[:, [0, 2]].unique(dim=0, return_inverse=True)
+    # encoding pairs as scalar keys preserves the lexicographic order, but avoids a row-wise unique
+    h, t = mapped_triples[:, 0], mapped_triples[:, 2]
+    num_entities = int(max(h.max(), t.max())) + 1 if num_triples else 0
+    keys = torch.cat([h * num_entities + t, t * num_entities + h], dim=0)
+    pairs, pair_id = keys.unique(return_inverse=True)
     n_pairs = pairs.shape[0]
     forward, backward = pair_id.split(num_triples)
     relations = mapped_triples[:, 1]
@@ -179,6 +184,185 @@ def get_candidate_pairs(
     return set(zip(*(sim >= threshold).nonzero()))
 
 
+def _to_binary_csr(a: scipy.sparse.spmatrix) -> scipy.sparse.csr_matrix:
+    """Convert a sparse matrix to a {0, 1} CSR matrix without (explicit) duplicate entries."""
+    a = scipy.sparse.csr_matrix(a, copy=True)
+    a.sum_duplicates()
+    a.data[:] = 1
+    return a
+
+
+def minhash_signatures(
+    a: scipy.sparse.spmatrix,
+    num_permutations: int = 128,
+    random_state: TorchRandomHint = None,
+    batch_size: int = 16,
+) -> numpy.ndarray:
+    r"""Compute MinHash signatures for sets represented as a sparse matrix.
+
+    The $i$-th entry of a signature is the minimum of the hash function $h_i(x) = (a_i x + b_i) \mod p$ over all
+    elements $x$ of the set, where $p = 2^{31} - 1$. For two sets $A$ and $B$, the probability that the $i$-th entries
+    agree equals their Jaccard similarity $J(A, B)$.
+
+    :param a: shape: (n, max_num_elements)
+        The sets. Only the sparsity pattern is used.
+    :param num_permutations:
+        The number of hash functions, i.e., the signature length.
+    :param random_state:
+        The random state for drawing the hash functions. Sets are only comparable if their signatures were computed
+        with the same random state.
+    :param batch_size:
+        The number of hash functions to evaluate at once. Memory usage is proportional to ``batch_size * a.nnz``.
+
+    :return: shape: (n, num_permutations)
+        The signatures. The signature of empty sets is $p$ everywhere.
+    """
+    generator = ensure_torch_random_state(random_state)
+    coefficients = torch.randint(1, _MERSENNE_PRIME, size=(2, num_permutations), generator=generator).numpy()
+    a = _to_binary_csr(a)
+    num_rows = a.shape[0]
+    signatures = numpy.full(shape=(num_rows, num_permutations), fill_value=_MERSENNE_PRIME, dtype=numpy.int64)
+    non_empty = numpy.diff(a.indptr) > 0
+    if not non_empty.any():
+        return signatures
+    # element IDs are smaller than p for less than 2**31 elements, and a * x + b < 2**63 does not overflow
+    elements = a.indices.astype(numpy.int64)[:, None]
+    # segment starts of non-empty rows
+    starts = a.indptr[:-1][non_empty]
+    for start in range(0, num_permutations, batch_size):
+        stop = min(start + batch_size, num_permutations)
+        hashes = elements * coefficients[0, start:stop]
+        hashes += coefficients[1, start:stop]
+        hashes %= _MERSENNE_PRIME
+        signatures[non_empty, start:stop] = numpy.minimum.reduceat(hashes, starts, axis=0)
+    return signatures
+
+
+def _get_num_rows_per_band(threshold: float, num_permutations: int, tolerance: float) -> int:
+    """Choose the largest number of rows per band such that pairs at the threshold are missed with low probability."""
+    for num_rows in sorted((r for r in range(1, num_permutations + 1) if num_permutations % r == 0), reverse=True):
+        num_bands = num_permutations // num_rows
+        # probability that a pair with Jaccard similarity equal to the threshold does not collide in any band
+        if (1.0 - threshold**num_rows) ** num_bands <= tolerance:
+            return num_rows
+    return 1
+
+
+def _lsh_collisions(
+    a: numpy.ndarray,
+    b: numpy.ndarray,
+    num_rows: int,
+) -> numpy.ndarray:
+    """Find pairs of rows in $a$ and $b$ whose signatures agree in at least one band.
+
+    :param a: shape: (m, num_permutations)
+        The first signatures.
+    :param b: shape: (n, num_permutations)
+        The second signatures.
+    :param num_rows:
+        The number of rows per band.
+
+    :return: shape: (2, num_pairs)
+        The unique pairs of indices. May contain a few false positives due to hash collisions of bands.
+    """
+    # random odd multipliers to combine the entries of a band into a single 64 bit key
+    multipliers = numpy.random.default_rng(seed=0).integers(2**62, size=(num_rows,), dtype=numpy.int64) * 2 + 1
+    codes = []
+    for start in range(0, a.shape[1], num_rows):
+        with numpy.errstate(over="ignore"):
+            key_a, key_b = (x[:, start : start + num_rows] @ multipliers for x in (a, b))
+        order = numpy.argsort(key_b, kind="stable")
+        key_b = key_b[order]
+        # the range of rows in b with the same key, for each row of a
+        low, high = numpy.searchsorted(key_b, key_a, side="left"), numpy.searchsorted(key_b, key_a, side="right")
+        count = high - low
+        left = numpy.repeat(numpy.arange(a.shape[0]), count)
+        # position within the range
+        offset = numpy.arange(count.sum()) - numpy.repeat(numpy.cumsum(count) - count, count)
+        right = order[numpy.repeat(low, count) + offset]
+        codes.append(left * b.shape[0] + right)
+    codes = numpy.unique(numpy.concatenate(codes))
+    return numpy.stack([codes // b.shape[0], codes % b.shape[0]])
+
+
+def get_candidate_pairs_lsh(
+    *,
+    a: scipy.sparse.spmatrix,
+    b: Optional[scipy.sparse.spmatrix] = None,
+    threshold: float,
+    no_self: bool = True,
+    num_permutations: int = 128,
+    num_rows_per_band: Optional[int] = None,
+    tolerance: float = 1.0e-06,
+    random_state: TorchRandomHint = None,
+) -> Set[Tuple[int, int]]:
+    """Find pairs of sets with Jaccard similarity above threshold using MinHash and locality-sensitive hashing.
+
+    In contrast to :func:`get_candidate_pairs`, this method never materializes the dense similarity matrix. Instead,
+    it computes :func:`minhash_signatures`, splits them into bands of ``num_rows_per_band`` entries, and considers all
+    pairs as candidates, which agree in all entries of at least one band. The Jaccard similarity of these candidates is
+    then verified exactly, such that there are no false positives. A pair with Jaccard similarity $s$ is missed with
+    probability $(1 - s^r)^b$, where $r$ is the number of rows per band, and $b$ the number of bands.
+
+    Since it works on any sets represented as sparse matrices, it can also be used to find near-duplicate entity
+    neighbourhoods.
+
+    :param a: shape: (m, max_num_elements)
+        The first set.
+    :param b: shape: (n, max_num_elements)
+        The second set. If not specified, reuse the first set.
+    :param threshold:
+        The threshold above which the similarity has to be.
+    :param no_self:
+        Whether to exclude (i, i) pairs.
+    :param num_permutations:
+        The number of hash functions, cf. :func:`minhash_signatures`.
+    :param num_rows_per_band:
+        The number of rows per band. Has to divide ``num_permutations``. If None, choose the largest one, for which a
+        pair with similarity equal to the threshold is missed with probability at most ``tolerance``.
+    :param tolerance:
+        The maximum probability to miss a pair at the threshold, if the number of rows per band is chosen automatically.
+    :param random_state:
+        The random state for drawing the hash functions.
+
+    :return:
+        A set of index pairs.
+
+    :raises ValueError:
+        if the number of rows per band does not divide the number of permutations
+    """
+    if num_rows_per_band is None:
+        num_rows_per_band = _get_num_rows_per_band(
+            threshold=threshold, num_permutations=num_permutations, tolerance=tolerance
+        )
+    if num_permutations % num_rows_per_band:
+        raise ValueError(
+            f"The number of rows per band, {num_rows_per_band}, does not divide the number of permutations, "
+            f"{num_permutations}."
+        )
+    a = _to_binary_csr(a)
+    b = a if b is None else _to_binary_csr(b)
+    # compute the signatures at once, such that they share the same hash functions
+    signatures = minhash_signatures(
+        scipy.sparse.vstack([a, b]), num_permutations=num_permutations, random_state=random_state
+    )
+    # empty sets have zero similarity to any other set, but would all end up in the same bucket
+    non_empty_a, non_empty_b = (numpy.flatnonzero(x.getnnz(axis=1)) for x in (a, b))
+    left, right = _lsh_collisions(
+        signatures[non_empty_a], signatures[a.shape[0] + non_empty_b], num_rows=num_rows_per_band
+    )
+    left, right = non_empty_a[left], non_empty_b[right]
+    if no_self:
+        mask = left != right
+        left, right = left[mask], right[mask]
+    # exact verification
+    intersection_size = numpy.asarray(a[left].multiply(b[right]).sum(axis=1)).reshape(-1)
+    size_a, size_b = (numpy.asarray(x.sum(axis=1)).reshape(-1) for x in (a, b))
+    divisor = numpy.clip(size_a[left] + size_b[right] - intersection_size, a_min=1, a_max=None)
+    keep = intersection_size / divisor >= threshold
+    return set(zip(left[keep].tolist(), right[keep].tolist()))
+
+
 class Sealant:
     """Stores inverse frequencies and inverse mappings in a given triples factory."""
 
@@ -192,6 +376,8 @@ class Sealant:
         triples_factory: CoreTriplesFactory,
         minimum_frequency: Optional[float] = None,
         symmetric: bool = True,
+        lsh: bool = False,
+        lsh_kwargs: OptionalKwargs = None,
     ):
         """Index the inverse frequencies and the inverse relations in the triples factory.
 
@@ -200,6 +386,10 @@ class Sealant:
             default value, 0.97, is taken from `Toutanova and Chen (2015)
             <https://www.aclweb.org/anthology/W15-4007/>`_, who originally described the generation of FB15k-237.
         :param symmetric: If the similarities are computed as symmetric
+        :param lsh: Whether to find the candidates with MinHash and locality-sensitive hashing, cf.
+            :func:`get_candidate_pairs_lsh`, instead of computing the dense similarity matrix. This requires much less
+            memory for many relations, and yields the same pairs with high probability.
+        :param lsh_kwargs: Additional keyword-based parameters passed to :func:`get_candidate_pairs_lsh`.
         :raises NotImplementedError:
             If symmetric is False
         """
@@ -211,8 +401,12 @@ class Sealant:
         # compute similarities
         if symmetric:
             rel, inv = triples_factory_to_sparse_matrices(triples_factory=triples_factory)
-            self.candidate_duplicate_relations = get_candidate_pairs(a=rel, threshold=self.minimum_frequency)
-            self.candidate_inverse_relations = get_candidate_pairs(a=rel, b=inv, threshold=self.minimum_frequency)
+            if lsh:
+                find_candidates = functools.partial(get_candidate_pairs_lsh, **(lsh_kwargs or {}))
+            else:
+                find_candidates = get_candidate_pairs
+            self.candidate_duplicate_relations = find_candidates(a=rel, threshold=self.minimum_frequency)
+            self.candidate_inverse_relations = find_candidates(a=rel, b=inv, threshold=self.minimum_frequency)
         else:
             raise NotImplementedError
         logger.info(
@@ -224,7 +418,7 @@ class Sealant:
             f" at similarity > {self.minimum_frequency} in {self.triples_factory}",
         )
         self.candidates = set(self.candidate_duplicate_relations).union(self.candidate_inverse_relations)
-        sizes = dict(zip(*triples_factory.mapped_triples[:, 1].unique(return_counts=True)))
+        sizes = dict(zip(*(x.tolist() for x in triples_factory.mapped_triples[:, 1].unique(return_counts=True))))
         self.relations_to_delete = _select_by_most_pairs(
             size=sizes,
             components=get_connected_components((a, b) for a, b in self.candidates if a != b),
@@ -241,6 +435,8 @@ def unleak(
     *triples_factories: CoreTriplesFactory,
     n: Union[None, int, float] = None,
     minimum_frequency: Optional[float] = None,
+    lsh: bool = False,
+    lsh_kwargs: OptionalKwargs = None,
 ) -> Iterable[CoreTriplesFactory]:
     """Unleak a train, test, and validate triples factory.
 
@@ -251,6 +447,9 @@ def unleak(
     :param minimum_frequency: The minimum overlap between two relations' triples to consider them as inverses or
         duplicates. The default value, 0.97, is taken from `Toutanova and Chen (2015)
         <https://www.aclweb.org/anthology/W15-4007/>`_, who originally described the generation of FB15k-237.
+    :param lsh: Whether to find inverse and duplicate relations with MinHash and locality-sensitive hashing, cf.
+        :class:`Sealant`.
+    :param lsh_kwargs: Additional keyword-based parameters passed to :func:`get_candidate_pairs_lsh`.
     :returns:
         A sequence of reindexed triples factories
     """
@@ -263,7 +462,7 @@ def unleak(
         )
 
     # Calculate which relations are the inverse ones
-    sealant = Sealant(train, minimum_frequency=minimum_frequency)
+    sealant = Sealant(train, minimum_frequency=minimum_frequency, lsh=lsh, lsh_kwargs=lsh_kwargs)
 
     if not sealant.relations_to_delete:
         logger.info(f"no relations to delete identified from {train}")
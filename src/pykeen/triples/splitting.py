@@ -305,6 +305,83 @@ class RandomizedCleaner(Cleaner):
         return reference, other
 
 
+class BatchedRandomizedCleaner(Cleaner):
+    """Cleanup a triples array with the same randomized semantics as :class:`RandomizedCleaner`, but in batches.
+
+    Since moving triples to the reference only ever covers more IDs, the triples which have to be moved never become
+    candidates again. Hence, repeatedly choosing a random candidate is equivalent to processing all initial candidates
+    in a random order, and moving a triple if it still contains an ID without any occurrence in the reference.
+
+    Moreover, within this order, a triple is moved if and only if it is the first one containing one of the IDs which
+    are not yet covered. Thus, the moves of a whole batch can be determined at once from the first occurrence of each
+    uncovered ID, and the per-entity and per-relation counts of the reference are updated in-place after each batch.
+    This avoids re-computing the move mask from scratch after every single move.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None) -> None:
+        """
+        Initialize the cleaner.
+
+        :param batch_size:
+            the number of candidate triples to process at once. Defaults to processing all candidates in a single
+            batch. The result does not depend on the batch size.
+        """
+        self.batch_size = batch_size
+
+    # docstr-coverage: inherited
+    def cleanup_pair(
+        self,
+        reference: MappedTriples,
+        other: MappedTriples,
+        random_state: TorchRandomHint,
+    ) -> Tuple[MappedTriples, MappedTriples]:  # noqa: D102
+        if len(other) == 0:
+            return reference, other
+        generator = ensure_torch_random_state(random_state)
+        columns = [[0, 2], [1]]
+        # the number of occurrences of each entity / relation in the reference
+        counts = [
+            torch.bincount(
+                reference[:, col].reshape(-1),
+                minlength=max(int(triples[:, col].max()) for triples in (reference, other) if len(triples)) + 1,
+            )
+            for col in columns
+        ]
+        # the initial candidates, in random order
+        candidate_mask = torch.zeros(len(other), dtype=torch.bool)
+        for col, count in zip(columns, counts):
+            candidate_mask |= (count[other[:, col]] == 0).any(dim=-1)
+        (candidates,) = candidate_mask.nonzero(as_tuple=True)
+        if len(candidates) == 0:
+            return reference, other
+        candidates = candidates[torch.randperm(len(candidates), generator=generator)]
+        # the first position in the random order of a triple with an uncovered ID; entries of IDs which got covered
+        # are never accessed again
+        first = [torch.full_like(count, fill_value=len(candidates)) for count in counts]
+        move_mask = torch.zeros(len(other), dtype=torch.bool)
+        batch_size = self.batch_size or len(candidates)
+        for start in range(0, len(candidates), batch_size):
+            batch = candidates[start : start + batch_size]
+            triples = other[batch]
+            positions = torch.arange(start, start + len(batch))
+            moved = torch.zeros(len(batch), dtype=torch.bool)
+            for col, count, first_position in zip(columns, counts, first):
+                ids = triples[:, col]
+                uncovered = count[ids] == 0
+                ids = ids[uncovered]
+                # the (batch-local) positions of all occurrences of uncovered IDs
+                local = uncovered.nonzero(as_tuple=True)[0]
+                first_position.scatter_reduce_(0, ids, positions[local], reduce="amin")
+                moved[local[first_position[ids] == positions[local]]] = True
+            # update counts in-place
+            moved_triples = triples[moved]
+            for col, count in zip(columns, counts):
+                ids = moved_triples[:, col].reshape(-1)
+                count.index_add_(0, ids, torch.ones_like(ids))
+            move_mask[batch[moved]] = True
+        return torch.cat([reference, other[move_mask]], dim=0), other[~move_mask]
+
+
 class DeterministicCleaner(Cleaner):
     """Cleanup a triples array (testing) with respect to another (training)."""
 
@@ -483,9 +560,9 @@ def split(
     :param random_state:
         The random state used to shuffle and split the triples.
     :param randomize_cleanup:
-        If true, uses the non-deterministic method for moving triples to the training set. This has the advantage that
-        it does not necessarily have to move all of them, but it might be significantly slower since it moves one
-        triple at a time.
+        If true, uses the non-deterministic method for moving triples to the training set, cf.
+        :class:`BatchedRandomizedCleaner`. This has the advantage that it does not necessarily have to move all of
+        them.
     :param method:
         The name of the method to use, cf. :data:`splitter_resolver`. Defaults to "coverage".
 
@@ -507,7 +584,7 @@ def split(
     splitter_cls: Type[Splitter] = splitter_resolver.lookup(method)
     kwargs = dict()
     if splitter_cls is CleanupSplitter and randomize_cleanup:
-        kwargs["cleaner"] = cleaner_resolver.normalize_cls(RandomizedCleaner)
+        kwargs["cleaner"] = cleaner_resolver.normalize_cls(BatchedRandomizedCleaner)
     return splitter_resolver.make(splitter_cls, pos_kwargs=kwargs).split(
         mapped_triples=mapped_triples,
         ratios=ratios,
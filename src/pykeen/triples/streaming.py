@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""Streaming ingestion of label-based triples which are too large to fit into memory.
+
+The ingestion works in three passes, none of which requires to hold all triples in memory:
+
+1. The labeled triples are read chunk-wise. Each chunk is mapped to IDs with vocabularies which are grown on the fly,
+   i.e., IDs are assigned in the order of first occurrence. The ID-based triples are appended to a temporary file.
+2. Once the vocabularies are complete, the IDs are re-assigned, e.g., to follow the sorted label order. The triples
+   are re-mapped chunk-wise and partitioned into buckets of consecutive head IDs, each of which is small enough to be
+   sorted in memory.
+3. Each bucket is de-duplicated and sorted in memory. Since the buckets are ordered by head ID, concatenating them
+   yields the unique triples in lexicographic order, just like :func:`numpy.unique` would. The result is written to a
+   file which is finally memory-mapped.
+"""
+
+import logging
+import pathlib
+from typing import Dict, Iterable, Mapping, Tuple
+
+import numpy as np
+import pandas
+import torch
+
+from .utils import _unique_rows
+from ..typing import LabeledTriples, MappedTriples
+
+__all__ = [
+    "StreamingVocabulary",
+    "map_triples_streaming",
+    "unique_triples_external",
+    "open_mapped_triples",
+]
+
+logger = logging.getLogger(__name__)
+
+#: the data type of the memory-mapped ID-based triples
+MAPPED_TRIPLES_DTYPE = np.dtype("<i8")
+
+
+class StreamingVocabulary:
+    """A label vocabulary which assigns IDs in the order of first occurrence."""
+
+    def __init__(self):
+        """Initialize the vocabulary."""
+        self.label_to_id: Dict[str, int] = {}
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.label_to_id)
+
+    def __call__(self, labels: np.ndarray) -> np.ndarray:
+        """
+        Map labels to IDs, and add unknown labels to the vocabulary.
+
+        :param labels:
+            The labels.
+
+        :return: same shape as labels
+            The IDs.
+        """
+        codes, uniques = pandas.factorize(labels.ravel())
+        # only the unique labels of the chunk require a Python-level lookup
+        ids = np.asarray(
+            [self.label_to_id.setdefault(label, len(self.label_to_id)) for label in uniques.tolist()],
+            dtype=np.int64,
+        )
+        return ids[codes].reshape(labels.shape)
+
+    def relabel(self, label_to_id: Mapping[str, int]) -> np.ndarray:
+        """
+        Create a lookup table to re-assign IDs.
+
+        :param label_to_id:
+            The new label to ID mapping. May lack labels, which are mapped to -1.
+
+        :return: shape: (len(self),)
+            An array `a`, where `a[i]` contains the new ID of the label with old ID `i`.
+        """
+        lookup = np.full(shape=(len(self),), fill_value=-1, dtype=np.int64)
+        for label, old_id in self.label_to_id.items():
+            lookup[old_id] = label_to_id.get(label, -1)
+        return lookup
+
+
+def map_triples_streaming(
+    chunks: Iterable[LabeledTriples],
+    path: pathlib.Path,
+) -> Tuple[int, StreamingVocabulary, StreamingVocabulary, np.ndarray]:
+    """
+    Map chunks of labeled triples to IDs, and append them to a binary file.
+
+    :param chunks:
+        The chunks of label-based triples, each of shape (n, 3), cf. :func:`pykeen.triples.utils.iter_triples_chunks`.
+    :param path:
+        The path of the binary file to write the ID-based triples to.
+
+    :return:
+        A tuple `(num_triples, entity_vocabulary, relation_vocabulary, head_counts)`, where `head_counts` contains the
+        number of triples for each head entity ID.
+    """
+    entity_vocabulary = StreamingVocabulary()
+    relation_vocabulary = StreamingVocabulary()
+    head_counts = np.zeros(shape=(0,), dtype=np.int64)
+    num_triples = 0
+    with path.open("wb") as file:
+        for chunk in chunks:
+            mapped = np.empty(shape=chunk.shape, dtype=MAPPED_TRIPLES_DTYPE)
+            mapped[:, 0::2] = entity_vocabulary(chunk[:, 0::2])
+            mapped[:, 1] = relation_vocabulary(chunk[:, 1])
+            chunk_head_counts = np.bincount(mapped[:, 0], minlength=len(entity_vocabulary))
+            chunk_head_counts[: head_counts.shape[0]] += head_counts
+            head_counts = chunk_head_counts
+            file.write(mapped.tobytes())
+            num_triples += chunk.shape[0]
+            logger.debug(f"Mapped {num_triples:,} triples.")
+    return num_triples, entity_vocabulary, relation_vocabulary, head_counts
+
+
+def _get_buckets(head_counts: np.ndarray, bucket_size: int) -> np.ndarray:
+    """Assign consecutive head IDs to buckets of roughly the given size."""
+    offsets = np.cumsum(head_counts) - head_counts
+    _, buckets = np.unique(offsets // bucket_size, return_inverse=True)
+    return buckets
+
+
+def unique_triples_external(
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+    num_triples: int,
+    entity_lookup: np.ndarray,
+    relation_lookup: np.ndarray,
+    head_counts: np.ndarray,
+    chunk_size: int = 10_000_000,
+) -> int:
+    """
+    Re-map the IDs of triples stored in a binary file, and write the unique triples in sorted order.
+
+    :param input_path:
+        The path to the binary file of ID-based triples, as written by :func:`map_triples_streaming`.
+    :param output_path:
+        The path to write the resulting triples to. The file can be opened with :func:`open_mapped_triples`.
+    :param num_triples:
+        The number of triples in the input file.
+    :param entity_lookup: shape: (num_old_entities,)
+        The new entity IDs, indexed by the old entity IDs. Triples with a new ID of -1 are dropped.
+    :param relation_lookup: shape: (num_old_relations,)
+        The new relation IDs, indexed by the old relation IDs. Triples with a new ID of -1 are dropped.
+    :param head_counts: shape: (num_old_entities,)
+        The number of triples per (old) head ID, used to partition the triples into buckets.
+    :param chunk_size:
+        The number of triples to process at once. The memory requirement of sorting a bucket is roughly twice as large.
+
+    :return:
+        The number of unique triples written to the output file.
+    """
+    # bucket by *new* head ID, such that the concatenation of the sorted buckets is sorted
+    new_head_counts = np.zeros(shape=(max(entity_lookup.max(initial=-1) + 1, 0),), dtype=np.int64)
+    known = entity_lookup >= 0
+    np.add.at(new_head_counts, entity_lookup[known], head_counts[known])
+    buckets = _get_buckets(head_counts=new_head_counts, bucket_size=chunk_size)
+    num_buckets = int(buckets.max(initial=-1)) + 1
+    logger.info(f"Partitioning {num_triples:,} triples into {num_buckets:,} buckets.")
+
+    bucket_paths = [output_path.with_name(f"{output_path.name}.bucket-{i}") for i in range(num_buckets)]
+    bucket_files = [path.open("wb") for path in bucket_paths]
+    try:
+        if num_triples > 0:
+            triples = np.memmap(input_path, dtype=MAPPED_TRIPLES_DTYPE, mode="r", shape=(num_triples, 3))
+            for start in range(0, num_triples, chunk_size):
+                chunk = np.asarray(triples[start : start + chunk_size])
+                chunk = np.stack(
+                    [entity_lookup[chunk[:, 0]], relation_lookup[chunk[:, 1]], entity_lookup[chunk[:, 2]]],
+                    axis=-1,
+                )
+                chunk = chunk[(chunk >= 0).all(axis=-1)]
+                chunk_buckets = buckets[chunk[:, 0]]
+                order = np.argsort(chunk_buckets, kind="stable")
+                chunk, chunk_buckets = chunk[order], chunk_buckets[order]
+                bucket_ids, bucket_starts = np.unique(chunk_buckets, return_index=True)
+                for bucket_id, part in zip(bucket_ids.tolist(), np.split(chunk, bucket_starts[1:])):
+                    bucket_files[bucket_id].write(part.astype(MAPPED_TRIPLES_DTYPE).tobytes())
+            del triples
+    finally:
+        for file in bucket_files:
+            file.close()
+
+    num_unique = 0
+    with output_path.open("wb") as file:
+        for path in bucket_paths:
+            triples = np.fromfile(path, dtype=MAPPED_TRIPLES_DTYPE).reshape(-1, 3)
+            triples = _unique_rows(triples)
+            file.write(triples.tobytes())
+            num_unique += triples.shape[0]
+            path.unlink()
+    logger.info(f"Wrote {num_unique:,} unique triples to {output_path.as_uri()}")
+    return num_unique
+
+
+def open_mapped_triples(path: pathlib.Path, num_triples: int) -> MappedTriples:
+    """
+    Open memory-mapped ID-based triples.
+
+    The file is mapped in copy-on-write mode, i.e., all processes opening the same file share the same physical
+    memory, and in-place modifications of the tensor are not written back to disk.
+
+    :param path:
+        The path to the binary file.
+    :param num_triples:
+        The number of triples.
+
+    :return: shape: (num_triples, 3)
+        The memory-mapped ID-based triples.
+    """
+    if num_triples == 0:
+        # empty files cannot be memory-mapped
+        return torch.empty(0, 3, dtype=torch.long)
+    return torch.from_numpy(np.memmap(path, dtype=MAPPED_TRIPLES_DTYPE, mode="c", shape=(num_triples, 3)))
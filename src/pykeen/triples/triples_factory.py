@@ -4,9 +4,11 @@
 
 import dataclasses
 import itertools
+import json
 import logging
 import pathlib
 import re
+import tempfile
 import warnings
 from abc import abstractmethod
 from typing import (
@@ -33,13 +35,31 @@ import pandas as pd
 import torch
 from torch.utils.data import Dataset
 
-from .instances import BatchedSLCWAInstances, LCWAInstances, SubGraphSLCWAInstances
+from .instances import (
+    BatchedLCWAInstances,
+    BatchedSLCWAInstances,
+    DeviceBatchedSLCWAInstances,
+    FrontierSubGraphSLCWAInstances,
+    LCWAInstances,
+)
 from .splitting import split
-from .utils import TRIPLES_DF_COLUMNS, load_triples, tensor_to_df
+from .streaming import (
+    MAPPED_TRIPLES_DTYPE,
+    map_triples_streaming,
+    open_mapped_triples,
+    unique_triples_external,
+)
+from .utils import (
+    TRIPLES_DF_COLUMNS,
+    _read_metadata,
+    _unique_rows,
+    _write_metadata,
+    iter_triples_chunks,
+    load_triples,
+    tensor_to_df,
+)
 from ..typing import (
-    LABEL_HEAD,
-    LABEL_RELATION,
-    LABEL_TAIL,
+    DeviceHint,
     EntityMapping,
     LabeledTriples,
     MappedTriples,
@@ -105,6 +125,16 @@ def create_relation_mapping(relations: Iterable[str]) -> RelationMapping:
     return {str(label): i for (i, label) in enumerate(relation_labels)}
 
 
+def _map_labels_to_ids(labels: np.ndarray, label_to_id: Mapping[str, int]) -> np.ndarray:
+    """Map a 1-dimensional array of labels to pre-defined IDs in a vectorized fashion; unknown labels get the ID -1."""
+    if not label_to_id:
+        return np.full(shape=labels.shape, fill_value=-1, dtype=np.int64)
+    # only the unique labels require a lookup in the mapping
+    codes, uniques = pd.factorize(labels)
+    ids = np.fromiter((label_to_id.get(label, -1) for label in uniques), dtype=np.int64, count=len(uniques))
+    return ids[codes]
+
+
 def _map_triples_elements_to_ids(
     triples: LabeledTriples,
     entity_to_id: EntityMapping,
@@ -116,39 +146,28 @@ def _map_triples_elements_to_ids(
         return torch.empty(0, 3, dtype=torch.long)
 
     # When triples that don't exist are trying to be mapped, they get the id "-1"
-    entity_getter = np.vectorize(entity_to_id.get)
-    head_column = entity_getter(triples[:, 0:1], [-1])
-    tail_column = entity_getter(triples[:, 2:3], [-1])
-    relation_getter = np.vectorize(relation_to_id.get)
-    relation_column = relation_getter(triples[:, 1:2], [-1])
+    triples_of_ids = np.empty(shape=triples.shape, dtype=np.int64)
+    for column, label_to_id in enumerate((entity_to_id, relation_to_id, entity_to_id)):
+        triples_of_ids[:, column] = _map_labels_to_ids(labels=triples[:, column], label_to_id=label_to_id)
 
     # Filter all non-existent triples
-    head_filter = head_column < 0
-    relation_filter = relation_column < 0
-    tail_filter = tail_column < 0
-    num_no_head = head_filter.sum()
-    num_no_relation = relation_filter.sum()
-    num_no_tail = tail_filter.sum()
+    unknown = triples_of_ids < 0
+    num_no_head, num_no_relation, num_no_tail = unknown.sum(axis=0).tolist()
 
     if (num_no_head > 0) or (num_no_relation > 0) or (num_no_tail > 0):
         logger.warning(
             f"You're trying to map triples with {num_no_head + num_no_tail} entities and {num_no_relation} relations"
             f" that are not in the training set. These triples will be excluded from the mapping.",
         )
-        non_mappable_triples = head_filter | relation_filter | tail_filter
-        head_column = head_column[~non_mappable_triples, None]
-        relation_column = relation_column[~non_mappable_triples, None]
-        tail_column = tail_column[~non_mappable_triples, None]
+        non_mappable_triples = unknown.any(axis=1)
+        triples_of_ids = triples_of_ids[~non_mappable_triples]
         logger.warning(
             f"In total {non_mappable_triples.sum():.0f} from {triples.shape[0]:.0f} triples were filtered out",
         )
 
-    triples_of_ids = np.concatenate([head_column, relation_column, tail_column], axis=1)
-
-    triples_of_ids = np.array(triples_of_ids, dtype=np.int64)
     # Note: Unique changes the order of the triples
     # Note: Using unique means implicit balancing of training samples
-    unique_mapped_triples = np.unique(ar=triples_of_ids, axis=0)
+    unique_mapped_triples = _unique_rows(triples_of_ids)
     return torch.tensor(unique_mapped_triples, dtype=torch.long)
 
 
@@ -282,6 +301,41 @@ class Labeling:
         return self.label(range(self.max_id))
 
 
+#: the data type of the byte offsets of labels stored in binary format
+LABEL_OFFSETS_DTYPE = np.dtype("<i8")
+
+
+def _open_array(path: pathlib.Path, dtype: np.dtype) -> np.ndarray:
+    """Memory-map a one-dimensional array stored as raw binary file in copy-on-write mode."""
+    if path.stat().st_size == 0:
+        # empty files cannot be memory-mapped
+        return np.empty(shape=(0,), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="c")
+
+
+def _write_label_to_id(path: pathlib.Path, name: str, label_to_id: Mapping[str, int]) -> None:
+    """Write a label to ID mapping as raw arrays of IDs, byte offsets, and UTF-8 encoded labels."""
+    items = sorted(label_to_id.items(), key=lambda item: item[1])
+    encoded = [label.encode("utf-8") for label, _ in items]
+    offsets = np.zeros(shape=(len(encoded) + 1,), dtype=LABEL_OFFSETS_DTYPE)
+    np.cumsum([len(label) for label in encoded], out=offsets[1:])
+    np.asarray([i for _, i in items], dtype=MAPPED_TRIPLES_DTYPE).tofile(path.joinpath(f"{name}.ids.bin"))
+    offsets.tofile(path.joinpath(f"{name}.offsets.bin"))
+    path.joinpath(f"{name}.labels.bin").write_bytes(b"".join(encoded))
+
+
+def _read_label_to_id(path: pathlib.Path, name: str) -> Dict[str, int]:
+    """Read a label to ID mapping written by :func:`_write_label_to_id`, or from the legacy TSV format."""
+    legacy_path = path.joinpath(f"{name}.tsv.gz")
+    if not path.joinpath(f"{name}.ids.bin").is_file() and legacy_path.is_file():
+        df = pd.read_csv(legacy_path, sep="\t")
+        return dict(zip(df["label"], df["id"]))
+    ids = _open_array(path.joinpath(f"{name}.ids.bin"), dtype=MAPPED_TRIPLES_DTYPE)
+    offsets = _open_array(path.joinpath(f"{name}.offsets.bin"), dtype=LABEL_OFFSETS_DTYPE).tolist()
+    labels = memoryview(_open_array(path.joinpath(f"{name}.labels.bin"), dtype=np.uint8))
+    return {str(labels[start:stop], encoding="utf-8"): i for start, stop, i in zip(offsets, offsets[1:], ids.tolist())}
+
+
 def restrict_triples(
     mapped_triples: MappedTriples,
     entities: Optional[Collection[int]] = None,
@@ -387,6 +441,13 @@ class KGInfo:
 class CoreTriplesFactory(KGInfo):
     """Create instances from ID-based triples."""
 
+    #: the version of the binary format written by :meth:`to_path_binary`
+    binary_format_version: ClassVar[int] = 1
+    header_file_name: ClassVar[str] = "header.json"
+    mapped_triples_file_name: ClassVar[str] = "mapped_triples.bin"
+    #: the pickle file for metadata entries which cannot be stored in the JSON header
+    metadata_file_name: ClassVar[str] = "metadata.pth"
+    #: the file names of the legacy binary format, based on pickles
     triples_file_name: ClassVar[str] = "numeric_triples.tsv.gz"
     base_file_name: ClassVar[str] = "base.pth"
 
@@ -527,9 +588,31 @@ class CoreTriplesFactory(KGInfo):
             ]
         )
 
-    def create_slcwa_instances(self, *, sampler: Optional[str] = None, **kwargs) -> Dataset:
-        """Create sLCWA instances for this factory's triples."""
-        cls = BatchedSLCWAInstances if sampler is None else SubGraphSLCWAInstances
+    def create_slcwa_instances(self, *, sampler: Optional[str] = None, device: DeviceHint = None, **kwargs) -> Dataset:
+        """
+        Create sLCWA instances for this factory's triples.
+
+        :param sampler:
+            the batch sampler to use. Either None, or "schlichtkrull".
+        :param device:
+            if given, shuffle and corrupt the triples on this device, cf. :class:`DeviceBatchedSLCWAInstances`.
+            Cannot be combined with a sampler.
+        :param kwargs:
+            additional keyword-based parameters passed to the instances' constructor
+
+        :return:
+            the sLCWA instances
+
+        :raises ValueError:
+            if both, a sampler and a device are given
+        """
+        if device is not None:
+            if sampler is not None:
+                raise ValueError(f"The sampler {sampler} cannot be used with device-side negative sampling.")
+            cls = DeviceBatchedSLCWAInstances
+            kwargs["device"] = device
+        else:
+            cls = BatchedSLCWAInstances if sampler is None else FrontierSubGraphSLCWAInstances
         if "shuffle" in kwargs:
             if kwargs.pop("shuffle"):
                 warnings.warn("Training instances are always shuffled.", DeprecationWarning)
@@ -542,13 +625,28 @@ class CoreTriplesFactory(KGInfo):
             **kwargs,
         )
 
-    def create_lcwa_instances(self, use_tqdm: Optional[bool] = None, target: Optional[int] = None) -> Dataset:
-        """Create LCWA instances for this factory's triples."""
-        return LCWAInstances.from_triples(
+    def create_lcwa_instances(self, use_tqdm: Optional[bool] = None, target: Optional[int] = None, **kwargs) -> Dataset:
+        """
+        Create LCWA instances for this factory's triples.
+
+        :param use_tqdm:
+            ignored
+        :param target:
+            the column to predict
+        :param kwargs:
+            if given, e.g., `batch_size` and `drop_last`, create pre-batched instances with sparse labels, cf.
+            :class:`BatchedLCWAInstances`
+
+        :return:
+            the LCWA instances
+        """
+        cls = BatchedLCWAInstances if kwargs else LCWAInstances
+        return cls.from_triples(
             mapped_triples=self._add_inverse_triples_if_necessary(mapped_triples=self.mapped_triples),
             num_entities=self.num_entities,
             num_relations=self.num_relations,
             target=target,
+            **kwargs,
         )
 
     def get_most_frequent_relations(self, n: Union[int, float]) -> Set[int]:
@@ -634,8 +732,7 @@ class CoreTriplesFactory(KGInfo):
             The random state used to shuffle and split the triples.
         :param randomize_cleanup:
             If true, uses the non-deterministic method for moving triples to the training set. This has the
-            advantage that it does not necessarily have to move all of them, but it might be significantly
-            slower since it moves one triple at a time.
+            advantage that it does not necessarily have to move all of them.
         :param method:
             The name of the method to use, from SPLIT_METHODS. Defaults to "coverage".
 
@@ -795,10 +892,14 @@ class CoreTriplesFactory(KGInfo):
         path: Union[str, pathlib.Path, TextIO],
     ) -> "CoreTriplesFactory":  # noqa: D102
         """
-        Load triples factory from a binary file.
+        Load triples factory from a directory in binary format.
+
+        The ID-based triples are memory-mapped in copy-on-write mode, i.e., the loading time does not depend on the
+        number of triples, and all processes loading the same directory share the same physical memory. Directories
+        written in the legacy format of older versions, based on PyTorch's .pt files, can be loaded, too.
 
         :param path:
-            The path, pointing to an existing PyTorch .pt file.
+            The path to a directory written by :meth:`to_path_binary`.
 
         :return:
             The loaded triples factory.
@@ -811,6 +912,30 @@ class CoreTriplesFactory(KGInfo):
     def _from_path_binary(
         cls,
         path: pathlib.Path,
+    ) -> MutableMapping[str, Any]:
+        header_path = path.joinpath(cls.header_file_name)
+        if not header_path.is_file():
+            return cls._from_path_binary_legacy(path=path)
+        header = json.loads(header_path.read_text())
+        version = header["version"]
+        if version > cls.binary_format_version:
+            raise ValueError(
+                f"{path.as_uri()} uses version {version} of the binary format, but only versions up to "
+                f"{cls.binary_format_version} are supported. Please upgrade PyKEEN.",
+            )
+        data = dict(header["state"])
+        if "metadata" in data:
+            data["metadata"] = _read_metadata(path=path.joinpath(cls.metadata_file_name), metadata=data["metadata"])
+        data["mapped_triples"] = open_mapped_triples(
+            path=path.joinpath(cls.mapped_triples_file_name),
+            num_triples=header["num_triples"],
+        )
+        return data
+
+    @classmethod
+    def _from_path_binary_legacy(
+        cls,
+        path: pathlib.Path,
     ) -> MutableMapping[str, Any]:
         # load base
         data = dict(torch.load(path.joinpath(cls.base_file_name)))
@@ -826,7 +951,11 @@ class CoreTriplesFactory(KGInfo):
         path: Union[str, pathlib.Path, TextIO],
     ) -> pathlib.Path:
         """
-        Save triples factory to path in (PyTorch's .pt) binary format.
+        Save triples factory to a directory in binary format.
+
+        The format consists of a JSON header with the metadata, and raw little-endian arrays, which can be
+        memory-mapped by :meth:`from_path_binary`. Metadata entries which cannot be represented as JSON, e.g., paths
+        or tensors, are stored in an additional pickle file.
 
         :param path:
             The path to store the triples factory to.
@@ -836,13 +965,20 @@ class CoreTriplesFactory(KGInfo):
         path = normalize_path(path, mkdir=True)
 
         # store numeric triples
-        pd.DataFrame(
-            data=self.mapped_triples.numpy(),
-            columns=[LABEL_HEAD, LABEL_RELATION, LABEL_TAIL],
-        ).to_csv(path.joinpath(self.triples_file_name), sep="\t", index=False)
+        self.mapped_triples.detach().cpu().numpy().astype(MAPPED_TRIPLES_DTYPE).tofile(
+            path.joinpath(self.mapped_triples_file_name)
+        )
 
         # store metadata
-        torch.save(self._get_binary_state(), path.joinpath(self.base_file_name))
+        state = self._get_binary_state()
+        if "metadata" in state:
+            state["metadata"] = _write_metadata(path=path.joinpath(self.metadata_file_name), metadata=state["metadata"])
+        header = dict(
+            version=self.binary_format_version,
+            num_triples=self.num_triples,
+            state=state,
+        )
+        path.joinpath(self.header_file_name).write_text(json.dumps(header, indent=2))
         logger.info(f"Stored {self} to {path.as_uri()}")
 
         return path
@@ -1028,6 +1164,100 @@ class TriplesFactory(CoreTriplesFactory):
             },
         )
 
+    @classmethod
+    def from_path_streaming(
+        cls,
+        path: Union[str, pathlib.Path],
+        *,
+        directory: Union[None, str, pathlib.Path] = None,
+        chunk_size: int = 10_000_000,
+        create_inverse_triples: bool = False,
+        filter_out_candidate_inverse_relations: bool = True,
+        metadata: Optional[Dict[str, Any]] = None,
+        load_triples_kwargs: Optional[Mapping[str, Any]] = None,
+    ) -> "TriplesFactory":
+        """
+        Create a new triples factory from a triples file which is too large to fit into memory.
+
+        In contrast to :meth:`from_path`, the file is processed in chunks: the label to ID mappings are built in a
+        single streaming pass, the ID-based triples are de-duplicated with an external sort, and the result is written
+        to a file in ``directory``. The returned factory's ``mapped_triples`` are memory-mapped from this file. Thus,
+        the file must not be deleted while the factory is in use. The result is equal to the one of :meth:`from_path`
+        with ``compact_id=True``, except that entities which only occur in filtered-out triples with candidate inverse
+        relations keep their ID.
+
+        :param path:
+            The path where the label-based triples are stored, cf. :func:`pykeen.triples.utils.iter_triples_chunks`.
+        :param directory:
+            The directory to store the memory-mapped triples in. Defaults to a new temporary directory.
+        :param chunk_size:
+            The number of triples to process at once.
+        :param create_inverse_triples:
+            Whether to create inverse triples.
+        :param filter_out_candidate_inverse_relations:
+            Whether to remove triples with relations with the inverse suffix.
+        :param metadata:
+            Arbitrary key/value pairs to store as metadata with the triples factory. Do not
+            include ``path`` as a key because it is automatically taken from the ``path``
+            kwarg to this function.
+        :param load_triples_kwargs: Optional keyword arguments to pass to
+            :func:`pykeen.triples.utils.iter_triples_chunks`. Could include the ``delimiter`` or a
+            ``column_remapping``.
+
+        :return:
+            A new triples factory with memory-mapped triples.
+        """
+        path = normalize_path(path)
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="pykeen-")
+        directory = normalize_path(directory, mkdir=True)
+        logger.info(f"Streaming triples from {path.as_uri()} to {directory.as_uri()}")
+
+        # first pass: build vocabularies in order of occurrence
+        raw_path = directory.joinpath("mapped_triples.raw")
+        num_triples, entity_vocabulary, relation_vocabulary, head_counts = map_triples_streaming(
+            chunks=iter_triples_chunks(path, chunk_size=chunk_size, **(load_triples_kwargs or {})),
+            path=raw_path,
+        )
+
+        # assign the same IDs as from_labeled_triples would
+        entity_to_id = {label: i for i, label in enumerate(sorted(entity_vocabulary.label_to_id))}
+        relation_labels: Collection[str] = relation_vocabulary.label_to_id.keys()
+        if filter_out_candidate_inverse_relations:
+            inverse_relations = {r for r in relation_labels if r.endswith(INVERSE_SUFFIX)}
+            if inverse_relations:
+                logger.warning(
+                    f"Some triples already have the inverse relation suffix {INVERSE_SUFFIX}. "
+                    f"Re-creating inverse triples to ensure consistency. You may disable this behaviour by passing "
+                    f"filter_out_candidate_inverse_relations=False",
+                )
+                relation_labels = set(relation_labels).difference(inverse_relations)
+        relation_to_id = create_relation_mapping(relation_labels)
+
+        # second & third pass: re-map, and de-duplicate
+        output_path = directory.joinpath("mapped_triples.bin")
+        num_triples = unique_triples_external(
+            input_path=raw_path,
+            output_path=output_path,
+            num_triples=num_triples,
+            entity_lookup=entity_vocabulary.relabel(entity_to_id),
+            relation_lookup=relation_vocabulary.relabel(relation_to_id),
+            head_counts=head_counts,
+            chunk_size=chunk_size,
+        )
+        raw_path.unlink()
+
+        return cls(
+            mapped_triples=open_mapped_triples(path=output_path, num_triples=num_triples),
+            entity_to_id=entity_to_id,
+            relation_to_id=relation_to_id,
+            create_inverse_triples=create_inverse_triples,
+            metadata={
+                "path": path,
+                **(metadata or {}),
+            },
+        )
+
     def __eq__(self, __o: object) -> bool:  # noqa: D105
         return (
             isinstance(__o, TriplesFactory)
@@ -1060,10 +1290,7 @@ class TriplesFactory(CoreTriplesFactory):
                 self.relation_to_id,
             ),
         ):
-            pd.DataFrame(data=data.items(), columns=["label", "id"],).sort_values(by="id").set_index("id").to_csv(
-                path.joinpath(f"{name}.tsv.gz"),
-                sep="\t",
-            )
+            _write_label_to_id(path=path, name=name, label_to_id=data)
         return path
 
     @classmethod
@@ -1071,11 +1298,7 @@ class TriplesFactory(CoreTriplesFactory):
         data = super()._from_path_binary(path)
         # load entity/relation to ID
         for name in [cls.file_name_entity_to_id, cls.file_name_relation_to_id]:
-            df = pd.read_csv(
-                path.joinpath(f"{name}.tsv.gz"),
-                sep="\t",
-            )
-            data[name] = dict(zip(df["label"], df["id"]))
+            data[name] = _read_label_to_id(path=path, name=name)
         return data
 
     # docstr-coverage: inherited
@@ -7,10 +7,9 @@ import pathlib
 from typing import Any, ClassVar, Dict, Iterable, Mapping, MutableMapping, Optional, TextIO, Tuple, Union
 
 import numpy as np
-import pandas
 import torch
 
-from .triples_factory import TriplesFactory
+from .triples_factory import TriplesFactory, _read_label_to_id, _write_label_to_id
 from .utils import load_triples
 from ..typing import EntityMapping, LabeledTriples, MappedTriples
 
@@ -149,12 +148,7 @@ class TriplesNumericLiteralsFactory(TriplesFactory):
     def to_path_binary(self, path: Union[str, pathlib.Path, TextIO]) -> pathlib.Path:  # noqa: D102
         path = super().to_path_binary(path=path)
         # save literal-to-id mapping
-        pandas.DataFrame(data=self.literals_to_id.items(), columns=["label", "id"],).sort_values(by="id").set_index(
-            "id"
-        ).to_csv(
-            path.joinpath(f"{self.file_name_literal_to_id}.tsv.gz"),
-            sep="\t",
-        )
+        _write_label_to_id(path=path, name=self.file_name_literal_to_id, label_to_id=self.literals_to_id)
         # save numeric literals
         np.save(str(path.joinpath(self.file_name_numeric_literals)), self.numeric_literals)
         return path
@@ -163,13 +157,10 @@ class TriplesNumericLiteralsFactory(TriplesFactory):
     def _from_path_binary(cls, path: pathlib.Path) -> MutableMapping[str, Any]:
         data = super()._from_path_binary(path)
         # load literal-to-id
-        df = pandas.read_csv(
-            path.joinpath(f"{cls.file_name_literal_to_id}.tsv.gz"),
-            sep="\t",
-        )
-        data["literals_to_id"] = dict(zip(df["label"], df["id"]))
+        data["literals_to_id"] = _read_label_to_id(path=path, name=cls.file_name_literal_to_id)
         # load literals
         data["numeric_literals"] = np.load(
-            str(path.joinpath(cls.file_name_numeric_literals).with_suffix(suffix=".npy"))
+            str(path.joinpath(cls.file_name_numeric_literals).with_suffix(suffix=".npy")),
+            mmap_mode="c",
         )
         return data
@@ -2,8 +2,9 @@
 
 """Instance creation utilities."""
 
+import json
 import pathlib
-from typing import Callable, List, Mapping, Optional, Sequence, Set, TextIO, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Sequence, Set, TextIO, Tuple, Union
 
 import numpy as np
 import pandas
@@ -15,6 +16,7 @@ from ..typing import LabeledTriples, MappedTriples
 __all__ = [
     "compute_compressed_adjacency_list",
     "load_triples",
+    "iter_triples_chunks",
     "get_entities",
     "get_relations",
     "tensor_to_df",
@@ -70,13 +72,47 @@ def load_triples(
             if path.startswith(f"{prefix}:"):
                 return handler(path[len(f"{prefix}:") :])
 
+    df = pandas.read_csv(path, **_get_read_csv_kwargs(delimiter, encoding, column_remapping))
+    return _df_to_triples(df, column_remapping=column_remapping)
+
+
+def iter_triples_chunks(
+    path: Union[str, pathlib.Path, TextIO],
+    chunk_size: int = 10_000_000,
+    delimiter: str = "\t",
+    encoding: Optional[str] = None,
+    column_remapping: Optional[Sequence[int]] = None,
+) -> Iterable[LabeledTriples]:
+    """Iterate over chunks of triples saved as tab separated values.
+
+    In contrast to :func:`load_triples`, the file is never loaded entirely into memory.
+
+    :param path: The path to a file with three columns - the head, relation, and tail.
+    :param chunk_size: The maximum number of triples per chunk.
+    :param delimiter: The delimiter between the columns in the file
+    :param encoding: The encoding for the file. Defaults to utf-8.
+    :param column_remapping: A remapping if the three columns do not follow the order head-relation-tail.
+        For example, if the order is head-tail-relation, pass ``(0, 2, 1)``
+
+    :yields: numpy arrays of shape (n, 3) representing "labeled" triples, with n <= chunk_size.
+    """
+    kwargs = _get_read_csv_kwargs(delimiter, encoding, column_remapping)
+    for df in pandas.read_csv(path, chunksize=chunk_size, **kwargs):
+        yield _df_to_triples(df, column_remapping=column_remapping)
+
+
+def _get_read_csv_kwargs(
+    delimiter: str,
+    encoding: Optional[str],
+    column_remapping: Optional[Sequence[int]],
+) -> Dict[str, Any]:
+    """Get the keyword-based parameters for reading triples with :func:`pandas.read_csv`."""
     if encoding is None:
         encoding = "utf-8"
     if column_remapping is not None:
         if len(column_remapping) != 3:
             raise ValueError("remapping must have length of three")
-    df = pandas.read_csv(
-        path,
+    return dict(
         sep=delimiter,
         encoding=encoding,
         dtype=str,
@@ -84,11 +120,72 @@ def load_triples(
         usecols=column_remapping,
         keep_default_na=False,
     )
+
+
+def _df_to_triples(df: pandas.DataFrame, column_remapping: Optional[Sequence[int]]) -> LabeledTriples:
     if column_remapping is not None:
         df = df[[df.columns[c] for c in column_remapping]]
     return df.to_numpy()
 
 
+def _is_json_serializable(value: Any) -> bool:
+    """Check whether a value is restored unchanged after a round-trip through JSON."""
+    try:
+        return json.loads(json.dumps(value)) == value
+    except (TypeError, ValueError):
+        return False
+
+
+def _write_metadata(path: pathlib.Path, metadata: Mapping[str, Any]) -> Dict[str, Any]:
+    """Store the metadata entries which cannot be represented as JSON in a pickle file.
+
+    :param path:
+        the path of the pickle file. It is only written if there are any such entries, and removed otherwise.
+    :param metadata:
+        the metadata
+
+    :return:
+        the remaining metadata entries, which can be stored as JSON
+    """
+    json_metadata, pickled_metadata = dict(), dict()
+    for key, value in metadata.items():
+        if _is_json_serializable(key) and _is_json_serializable(value):
+            json_metadata[key] = value
+        else:
+            pickled_metadata[key] = value
+    if pickled_metadata:
+        torch.save(pickled_metadata, path)
+    elif path.is_file():
+        path.unlink()
+    return json_metadata
+
+
+def _read_metadata(path: pathlib.Path, metadata: Optional[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Complement metadata loaded from JSON by the entries stored in a pickle file by :func:`_write_metadata`."""
+    if not path.is_file():
+        return None if metadata is None else dict(metadata)
+    return {**(metadata or {}), **torch.load(path)}
+
+
+def _unique_rows(triples: np.ndarray) -> np.ndarray:
+    """Get the unique rows in lexicographic order."""
+    if triples.shape[0] == 0:
+        return triples
+    min_ids, max_ids = triples.min(axis=0), triples.max(axis=0) + 1
+    sizes = (max_ids - min_ids).tolist()
+    # pack into a single key, if possible; Python integers do not overflow
+    if sizes[0] * sizes[1] * sizes[2] >= np.iinfo(np.int64).max:
+        return np.unique(triples, axis=0)
+    keys = ((triples[:, 0] - min_ids[0]) * sizes[1] + (triples[:, 1] - min_ids[1])) * sizes[2] + (
+        triples[:, 2] - min_ids[2]
+    )
+    keys = np.unique(keys)
+    result = np.empty(shape=(keys.shape[0], 3), dtype=triples.dtype)
+    keys, result[:, 2] = np.divmod(keys, sizes[2])
+    result[:, 0], result[:, 1] = np.divmod(keys, sizes[1])
+    return result + min_ids
+
+
 def get_entities(triples: torch.LongTensor) -> Set[int]:
     """Get all entities from the triples."""
     return set(triples[:, [0, 2]].flatten().tolist())
@@ -172,15 +269,19 @@ def compute_compressed_adjacency_list(
     """
     num_entities = num_entities or mapped_triples[:, [0, 2]].max().item() + 1
     num_triples = mapped_triples.shape[0]
-    adj_lists: List[List[Tuple[int, float]]] = [[] for _ in range(num_entities)]
-    for i, (s, _, o) in enumerate(mapped_triples):
-        adj_lists[s].append((i, o.item()))
-        adj_lists[o].append((i, s.item()))
-    degrees = torch.tensor([len(a) for a in adj_lists], dtype=torch.long)
+    heads, tails = mapped_triples[:, 0].long(), mapped_triples[:, 2].long()
+    # each triple contributes one entry to the adjacency list of its head, and one to the one of its tail
+    nodes = torch.cat([heads, tails])
+    edges = torch.arange(num_triples).repeat(2)
+    others = torch.cat([tails, heads])
+    roles = torch.arange(2).repeat_interleave(num_triples)
+    # sort by node, then by triple, then head before tail
+    order = torch.as_tensor(np.lexsort((roles.numpy(), edges.numpy(), nodes.numpy())))
+    degrees = torch.bincount(nodes, minlength=num_entities)
     assert torch.sum(degrees) == 2 * num_triples
 
     offset = torch.empty(num_entities, dtype=torch.long)
     offset[0] = 0
     offset[1:] = torch.cumsum(degrees, dim=0)[:-1]
-    compressed_adj_lists = torch.cat([torch.as_tensor(adj_list, dtype=torch.long) for adj_list in adj_lists], dim=0)
+    compressed_adj_lists = torch.stack([edges[order], others[order]], dim=-1)
     return degrees, offset, compressed_adj_lists
@@ -2,6 +2,7 @@
 
 """Test cases for PyKEEN."""
 
+import copy
 import logging
 import os
 import pathlib
@@ -59,6 +60,7 @@ from pykeen.datasets.kinships import KINSHIPS_TRAIN_PATH
 from pykeen.datasets.mocks import create_inductive_dataset
 from pykeen.datasets.nations import NATIONS_TEST_PATH, NATIONS_TRAIN_PATH
 from pykeen.evaluation import Evaluator, MetricResults, evaluator_resolver
+from pykeen.evaluation.rank_statistics import RankStatistics, is_streamable
 from pykeen.losses import Loss, PairwiseLoss, PointwiseLoss, SetwiseLoss, UnsupportedLabelSmoothingError
 from pykeen.metrics import rank_based_metric_resolver
 from pykeen.metrics.ranking import (
@@ -1087,6 +1089,81 @@ class ModelTestCase(unittest_templates.GenericTestCase[Model]):
         assert scores.shape == (self.batch_size, self.instance.num_entities)
         self._check_scores(batch, scores)
 
+    def test_predict_chunks(self) -> None:
+        """Test that chunked prediction agrees with predicting the scores for all entities at once."""
+        batch = self.factory.mapped_triples[: self.batch_size].to(self.instance.device)
+        chunk_size = self.instance.num_entities // 3 + 1
+        for target in (LABEL_HEAD, LABEL_TAIL):
+            with self.subTest(target=target):
+                try:
+                    scores = self.instance.predict(batch, target=target, mode=self.mode)
+                    chunks = list(self.instance.predict_chunks(batch, target, chunk_size=chunk_size, mode=self.mode))
+                except RuntimeError as e:
+                    if str(e) == "fft: ATen not compiled with MKL support":
+                        self.skipTest(str(e))
+                    else:
+                        raise e
+                assert all(chunk.shape[1] <= chunk_size for chunk in chunks)
+                assert torch.allclose(torch.cat(chunks, dim=1), scores, atol=1.0e-06)
+
+    def test_inference_cache(self) -> None:
+        """Test that predicting with the inference cache agrees with predicting without it."""
+        if not isinstance(self.instance, ERModel):
+            self.skipTest("only ERModel supports the inference cache")
+        batch = self.factory.mapped_triples[: self.batch_size].to(self.instance.device)
+        targets = (LABEL_HEAD, LABEL_TAIL)
+        try:
+            with torch.inference_mode():
+                expected = [self.instance.predict(batch, target=target, mode=self.mode) for target in targets]
+                cache = self.instance.enable_inference_cache(max_size=self.batch_size)
+                # the second round uses the cached values
+                for _ in range(2):
+                    for target, scores in zip(targets, expected):
+                        assert torch.allclose(
+                            self.instance.predict(batch, target=target, mode=self.mode),
+                            scores,
+                            rtol=1.0e-04,
+                            atol=1.0e-05,
+                        )
+        except RuntimeError as e:
+            if str(e) == "fft: ATen not compiled with MKL support":
+                self.skipTest(str(e))
+            else:
+                raise e
+        assert cache.materialized
+        if cache.query_encoder is not None:
+            assert cache.hits > 0
+        # the cache is invalidated by parameter updates
+        self.instance.post_parameter_update()
+        assert not cache.materialized
+        self.instance.disable_inference_cache()
+
+    def test_inference_cache_load_state_dict(self) -> None:
+        """Test that the inference cache is invalidated when loading a state dict."""
+        if not isinstance(self.instance, ERModel):
+            self.skipTest("only ERModel supports the inference cache")
+        batch = self.factory.mapped_triples[: self.batch_size, :2].to(self.instance.device)
+        state_dict = copy.deepcopy(self.instance.state_dict())
+        try:
+            with torch.inference_mode():
+                expected = self.instance.predict_t(batch, mode=self.mode)
+            self.instance.reset_parameters_()
+            self.instance.enable_inference_cache(max_size=self.batch_size)
+            with torch.inference_mode():
+                # fill the cache with values for the re-initialized parameters
+                self.instance.predict_t(batch, mode=self.mode)
+            self.instance.load_state_dict(state_dict)
+            with torch.inference_mode():
+                scores = self.instance.predict_t(batch, mode=self.mode)
+        except RuntimeError as e:
+            if str(e) == "fft: ATen not compiled with MKL support":
+                self.skipTest(str(e))
+            else:
+                raise e
+        finally:
+            self.instance.disable_inference_cache()
+        assert torch.allclose(scores, expected, rtol=1.0e-04, atol=1.0e-05)
+
     @pytest.mark.slow
     def test_train_slcwa(self) -> None:
         """Test that sLCWA training does not fail."""
@@ -2071,6 +2148,35 @@ class EvaluationLoopTestCase(GenericTestCase[pykeen.evaluation.evaluation_loop.E
         batch = next(iter(self.instance.get_loader(batch_size=self.batch_size)))
         self.instance.process_batch(batch=batch)
 
+    def test_evaluate_sharded(self):
+        """Test that sharded evaluation gives the same results as single-process evaluation."""
+        expected = self.instance.evaluate(batch_size=self.batch_size, use_tqdm=False)
+        result = self.instance.evaluate(batch_size=self.batch_size, use_tqdm=False, num_shards=2, start_method="fork")
+        self.assertEqual(expected.data, result.data)
+        # the model's parameters are not left in shared memory
+        parameters = list(self.instance.model.parameters())
+        assert not any(parameter.is_shared() or parameter.is_inference() for parameter in parameters)
+        # the model can still be updated in-place, e.g., by an optimizer after evaluation by an early stopper
+        self.instance.model.reset_parameters_()
+        optimizer = torch.optim.SGD(params=parameters, lr=1.0)
+        for parameter in parameters:
+            parameter.grad = torch.ones_like(parameter)
+        optimizer.step()
+
+    @pytest.mark.slow
+    def test_evaluate_sharded_spawn(self):
+        """Test sharded evaluation with freshly spawned worker processes."""
+        expected = self.instance.evaluate(batch_size=self.batch_size, use_tqdm=False)
+        result = self.instance.evaluate(batch_size=self.batch_size, use_tqdm=False, num_shards=2, start_method="spawn")
+        self.assertEqual(expected.data, result.data)
+
+    def test_evaluate_chunked(self):
+        """Test that streaming the scores in chunks along the entity dimension gives the same results."""
+        expected = self.instance.evaluate(batch_size=self.batch_size, use_tqdm=False)
+        self.instance.evaluator.score_chunk_size = 5
+        result = self.instance.evaluate(batch_size=self.batch_size, use_tqdm=False)
+        self.assertEqual(expected.data, result.data)
+
 
 class EvaluationOnlyModelTestCase(unittest_templates.GenericTestCase[pykeen.models.EvaluationOnlyModel]):
     """Test case for evaluation only models."""
@@ -2152,6 +2258,19 @@ class RankBasedMetricTestCase(unittest_templates.GenericTestCase[RankBasedMetric
         """Test __call__."""
         self._test_call(ranks=self.ranks, num_candidates=self.num_candidates)
 
+    def test_streaming(self):
+        """Test computing the metric from merged streaming rank statistics."""
+        statistics = [RankStatistics.for_metrics([self.instance]) for _ in range(2)]
+        for i, (ranks, num_candidates) in enumerate(
+            zip(numpy.array_split(self.ranks, 3), numpy.array_split(self.num_candidates, 3))
+        ):
+            statistics[min(i, 1)].update(ranks=ranks, num_candidates=num_candidates)
+        self.assertEqual(is_streamable(self.instance), statistics[0].ranks is None)
+        self.assertAlmostEqual(
+            statistics[0].merge(statistics[1]).compute(self.instance),
+            self.instance(ranks=self.ranks, num_candidates=self.num_candidates),
+        )
+
     def test_call_best(self):
         """Test __call__ with optimal ranks."""
         self._test_call(ranks=numpy.ones(shape=(self.num_ranks,)), num_candidates=self.num_candidates)
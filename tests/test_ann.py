@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for approximate nearest neighbour search."""
+
+import torch
+
+from pykeen.models import ERMLPE, ComplEx, DistMult, RotatE, TransE
+from pykeen.models.ann import EntityIndex, InvertedFileIndex, RecallReport, evaluate_recall
+from pykeen.typing import LABEL_HEAD, LABEL_TAIL
+from tests import cases
+
+
+class EntityIndexTestCase(cases.PredictBaseTestCase):
+    """Tests for the approximate top-k index."""
+
+    batch_size = 8
+    model_cls = DistMult
+    model_kwargs = {}
+    k: int = 5
+
+    def _test_model(self, model_cls, **kwargs):
+        """Test that probing all clusters reproduces exact scoring, and probing fewer clusters scores less."""
+        model = model_cls(triples_factory=self.factory, random_seed=0, **kwargs)
+        index = EntityIndex(model=model, random_state=0)
+        num_lists = index.index.num_lists
+        for target, batch, predict in (
+            (LABEL_TAIL, self.batch[:, :2], model.predict_t),
+            (LABEL_HEAD, self.batch[:, 1:], model.predict_h),
+        ):
+            result = index.search(batch, k=self.k, target=target, num_probes=num_lists)
+            assert result.scores.shape == result.indices.shape == (self.batch_size, self.k)
+            exact = predict(batch).topk(k=self.k, dim=-1)
+            assert torch.allclose(result.scores, exact.values, atol=1.0e-05)
+            assert (result.num_candidates == self.factory.num_entities).all()
+
+            report = evaluate_recall(index=index, batch=batch, k=self.k, target=target, num_probes=num_lists)
+            assert isinstance(report, RecallReport)
+            self.assertEqual(1.0, report.recall)
+            report = evaluate_recall(index=index, batch=batch, k=self.k, target=target, num_probes=1)
+            assert 0.0 <= report.recall <= 1.0
+            assert report.candidate_fraction < 1.0
+
+    def test_distmult(self):
+        """Test DistMult."""
+        self._test_model(DistMult)
+
+    def test_complex(self):
+        """Test ComplEx."""
+        self._test_model(ComplEx)
+
+    def test_transe(self):
+        """Test TransE with the L1 norm."""
+        self._test_model(TransE, scoring_fct_norm=1)
+
+    def test_rotate(self):
+        """Test RotatE."""
+        self._test_model(RotatE)
+
+    def test_unsupported(self):
+        """Test that an error is raised for unsupported interactions."""
+        with self.assertRaises(NotImplementedError):
+            EntityIndex(model=ERMLPE(triples_factory=self.factory))
+
+    def test_padding(self):
+        """Test that the result is padded when there are less than k candidates."""
+        vectors = torch.rand(4, 2)
+        index = InvertedFileIndex(
+            vectors=vectors, similarity=lambda q, c: (q.unsqueeze(-2) * c).sum(-1), num_lists=4, random_state=0
+        )
+        result = index.search(queries=vectors[:1], k=3, num_probes=1)
+        assert result.num_candidates.item() == 1
+        assert (result.indices[:, 1:] == -1).all()
+        assert torch.isneginf(result.scores[:, 1:]).all()
+
+    def test_skewed_clusters(self):
+        """Test that clusters of very different sizes are scored list by list against shared vectors."""
+        generator = torch.manual_seed(0)
+        # one large cluster around the origin, and a few small, well-separated ones
+        centers = torch.as_tensor([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0], [-10.0, 0.0]])
+        sizes = [200, 3, 2, 1]
+        vectors = torch.cat(
+            [center + 0.1 * torch.randn(size, 2, generator=generator) for center, size in zip(centers, sizes)]
+        )
+        shapes = []
+
+        def similarity(queries: torch.FloatTensor, candidates: torch.FloatTensor) -> torch.FloatTensor:
+            """Record the shape of the candidates, and calculate the negative Euclidean distance."""
+            shapes.append(candidates.shape)
+            return -torch.cdist(queries, candidates)
+
+        index = InvertedFileIndex(vectors=vectors, similarity=similarity, num_lists=4, random_state=0)
+        assert sorted((index.offsets[1:] - index.offsets[:-1]).tolist()) == sorted(sizes)
+        queries = vectors[[0, 200, 203, 205]]
+        shapes.clear()
+        result = index.search(queries=queries, k=4, num_probes=index.num_lists)
+        # the candidate vectors are never expanded along the batch dimension
+        assert all(len(shape) == 2 and shape[0] <= max(sizes) for shape in shapes)
+        exact = similarity(queries, vectors).topk(k=4, dim=-1)
+        assert torch.allclose(result.scores, exact.values, atol=1.0e-03)
+        assert (result.num_candidates == vectors.shape[0]).all()
+        # probing the nearest cluster of a small cluster's member only scores that cluster
+        result = index.search(queries=queries[-1:], k=4, num_probes=1)
+        assert result.num_candidates.item() == 1
+        assert result.indices[0, 0].item() == 205
@@ -34,6 +34,20 @@ class TestUtils(unittest.TestCase):
         )
         self.assertEqual(set(_old_skyline(pairs)), set(triple_analysis._get_skyline(pairs)))
 
+    def test_iter_patterns_sparse(self):
+        """Test that the sparse pattern mining engine yields the same patterns as the set-based one."""
+        mapped_triples = Nations().training.mapped_triples
+        expected = list(triple_analysis.iter_patterns(mapped_triples.tolist()))
+        for kwargs in (dict(), dict(chunk_size=7), dict(num_workers=2)):
+            with self.subTest(**kwargs):
+                self.assertEqual(
+                    sorted(expected), sorted(triple_analysis.iter_patterns_sparse(mapped_triples, **kwargs))
+                )
+        self.assertEqual(
+            sorted(pattern for pattern in expected if pattern.confidence > 0),
+            sorted(triple_analysis.iter_patterns_sparse(mapped_triples, drop_zero_confidence=True)),
+        )
+
 
 def _test_count_dataframe(
     dataset: Dataset,
@@ -11,7 +11,7 @@ from timeit import default_timer
 from pykeen.constants import PYKEEN_DATASETS
 from pykeen.datasets import Nations
 from pykeen.datasets.base import Dataset
-from pykeen.datasets.utils import _cached_get_dataset, _digest_kwargs
+from pykeen.datasets.utils import _cached_get_dataset, _digest_kwargs, prune_dataset_cache
 
 
 def _time_cached_get_dataset(name: str) -> float:
@@ -33,6 +33,36 @@ class TestDatasetCaching(unittest.TestCase):
         t1 = _time_cached_get_dataset("nations")
         t2 = _time_cached_get_dataset("nations")
         assert t2 < t1 + 1.0e-04
+        assert any(directory.iterdir())
+
+    def test_cache_hit_type(self):
+        """Test that a dataset loaded from the cache is an instance of the requested class."""
+        reference = Nations()
+        _cached_get_dataset("nations", {})
+        dataset = _cached_get_dataset("nations", {})
+        assert isinstance(dataset, Nations)
+        assert dataset == reference
+
+    def test_opt_out(self):
+        """Test disabling the cache."""
+        assert isinstance(_cached_get_dataset("nations", {}, cache=False), Nations)
+
+    def test_inverse_triples(self):
+        """Test that the cache is shared between datasets with and without inverse triples."""
+        reference = Nations()
+        _cached_get_dataset("nations", {})
+        for create_inverse_triples in (True, False):
+            dataset = _cached_get_dataset("nations", dict(create_inverse_triples=create_inverse_triples))
+            assert dataset.create_inverse_triples == create_inverse_triples
+            assert dataset.training.real_num_relations == reference.training.num_relations
+
+    def test_prune(self):
+        """Test pruning the cache."""
+        _cached_get_dataset("nations", {})
+        directory = PYKEEN_DATASETS.joinpath(Nations().get_normalized_name(), "cache")
+        assert not prune_dataset_cache(name="nations")
+        assert prune_dataset_cache(name="nations", prune_all=True)
+        assert not any(directory.glob("*/*/cache.json"))
 
     def test_serialization(self):
         """Test dataset serialization."""
@@ -4,6 +4,8 @@
 
 import itertools
 import logging
+import pathlib
+import tempfile
 import unittest
 from operator import itemgetter
 from typing import Any, Collection, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
@@ -24,6 +26,7 @@ from pykeen.evaluation.classification_evaluator import (
     ClassificationMetricResults,
 )
 from pykeen.evaluation.evaluator import (
+    PositiveFilterIndex,
     create_dense_positive_mask_,
     create_sparse_positive_filter_,
     filter_scores_,
@@ -33,6 +36,7 @@ from pykeen.evaluation.evaluator import (
 from pykeen.evaluation.rank_based_evaluator import MacroRankBasedEvaluator, SampledRankBasedEvaluator, sample_negatives
 from pykeen.evaluation.ranking_metric_lookup import MetricKey
 from pykeen.evaluation.ranks import Ranks
+from pykeen.evaluation.score_histogram import ScoreHistogram
 from pykeen.metrics.ranking import (
     AdjustedArithmeticMeanRankIndex,
     ArithmeticMeanRank,
@@ -82,6 +86,31 @@ class RankBasedEvaluatorTests(cases.EvaluatorTestCase):
             self.assertIsInstance(value, (float, int))
 
 
+class StreamingRankBasedEvaluatorTests(RankBasedEvaluatorTests):
+    """unittest for the RankBasedEvaluator with streaming rank statistics."""
+
+    kwargs = dict(streaming=True)
+
+    def test_merge(self):
+        """Test that merging evaluators of individual shards is equivalent to evaluating all at once."""
+        hrt_batch, scores, mask = self._get_input()
+        true_scores = scores[torch.arange(0, hrt_batch.shape[0]), hrt_batch[:, 2]][:, None]
+        shards = [self.cls(**self.instance_kwargs) for _ in range(2)]
+        for evaluator, indices in zip([self.instance] + shards, [slice(None), slice(None, 2), slice(2, None)]):
+            evaluator.process_scores_(
+                hrt_batch=hrt_batch[indices],
+                target=LABEL_TAIL,
+                true_scores=true_scores[indices],
+                scores=scores[indices],
+                dense_positive_mask=mask[indices] if mask is not None else None,
+            )
+        shards[0].merge(shards[1])
+        expected, result = self.instance.finalize().data, shards[0].finalize().data
+        self.assertEqual(expected.keys(), result.keys())
+        for key, value in expected.items():
+            self.assertAlmostEqual(value, result[key], places=5, msg=key)
+
+
 class SampledRankBasedEvaluatorTests(RankBasedEvaluatorTests):
     """unittest for the SampledRankBasedEvaluator."""
 
@@ -94,6 +123,30 @@ class SampledRankBasedEvaluatorTests(RankBasedEvaluatorTests):
         kwargs["additional_filter_triples"] = self.dataset.training.mapped_triples
         return kwargs
 
+    def test_negatives_cache(self):
+        """Test caching the sampled negatives to disk."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory).joinpath("negatives.pt")
+            kwargs = dict(
+                evaluation_factory=self.factory,
+                additional_filter_triples=self.dataset.training.mapped_triples,
+                num_negatives=3,
+                negatives_path=path,
+            )
+            first = self.cls(random_state=0, **kwargs)
+            assert path.is_file()
+            with self.assertLogs("pykeen.evaluation.rank_based_evaluator", level="INFO") as context:
+                second = self.cls(random_state=0, **kwargs)
+            assert any("Loaded cached negatives" in record.getMessage() for record in context.records)
+            for side in (LABEL_HEAD, LABEL_TAIL):
+                assert (first.negative_samples[side] == second.negative_samples[side]).all()
+            # negatives sampled with different inputs are rejected
+            for key, value in dict(random_state=1, num_negatives=4, additional_filter_triples=None).items():
+                with self.subTest(**{key: value}), self.assertLogs(
+                    "pykeen.evaluation.rank_based_evaluator", level="WARNING"
+                ):
+                    self.cls(**{"random_state": 0, **kwargs, key: value})
+
 
 class MacroRankBasedEvaluatorTests(RankBasedEvaluatorTests):
     """unittest for the MacroRankBasedEvaluator."""
@@ -148,6 +201,54 @@ class ClassificationEvaluatorTest(cases.EvaluatorTestCase):
                     self.assertAlmostEqual(act_score, exp_score, msg=f"failed for {name}", delta=7)
 
 
+class ExactClassificationEvaluatorTest(ClassificationEvaluatorTest):
+    """Unittest for the ClassificationEvaluator keeping all scores."""
+
+    kwargs = dict(exact=True)
+
+
+class ScoreHistogramTests(unittest.TestCase):
+    """Tests for the score histogram used for streaming classification evaluation."""
+
+    def setUp(self) -> None:
+        """Set up random scores, where positives tend to have larger scores."""
+        generator = numpy.random.default_rng(seed=42)
+        self.y_true = generator.random(size=(1000,)) < 0.2
+        self.y_score = generator.random(size=(1000,)) + 0.3 * self.y_true
+
+    def _histogram(self, resolution: float, num_shards: int = 1) -> ScoreHistogram:
+        """Build a histogram, possibly by merging histograms of individual shards."""
+        histograms = []
+        for y_score, y_true in zip(
+            numpy.array_split(self.y_score, num_shards), numpy.array_split(self.y_true, num_shards)
+        ):
+            histograms.append(ScoreHistogram(resolution=resolution))
+            histograms[-1].update(scores=y_score, positives=y_true)
+        for histogram in histograms[1:]:
+            histograms[0].merge(histogram)
+        return histograms[0]
+
+    def test_bounds(self):
+        """Test that the exact values lie within the bounds, and are recovered for fine resolutions."""
+        coarse, fine = self._histogram(resolution=0.1, num_shards=3), self._histogram(resolution=1.0e-08)
+        for name, metric in CLASSIFICATION_METRICS.items():
+            with self.subTest(metric=name):
+                exp_score = metric.score(y_true=self.y_true.astype(int), y_score=self.y_score)
+                lower, upper = coarse.bounds(metric)
+                assert lower - 1.0e-08 <= coarse.compute(metric) <= upper + 1.0e-08
+                assert lower - 1.0e-08 <= exp_score <= upper + 1.0e-08
+                self.assertAlmostEqual(exp_score, fine.compute(metric), places=6)
+
+    def test_merge(self):
+        """Test that merging histograms is equivalent to building a single one."""
+        expected, merged = self._histogram(resolution=0.01), self._histogram(resolution=0.01, num_shards=4)
+        numpy.testing.assert_array_equal(expected.bins, merged.bins)
+        numpy.testing.assert_array_equal(expected.counts, merged.counts)
+        numpy.testing.assert_allclose(expected.score_sums, merged.score_sums)
+        with self.assertRaises(ValueError):
+            merged.merge(ScoreHistogram(resolution=0.1))
+
+
 class EvaluatorUtilsTests(unittest.TestCase):
     """Test the utility functions used by evaluators."""
 
@@ -190,6 +291,39 @@ class EvaluatorUtilsTests(unittest.TestCase):
         assert number_of_options.shape == (batch_size,)
         assert (number_of_options == exp_number_of_options).all(), (number_of_options, exp_number_of_options)
 
+    def test_ranks_from_filtered_scores(self):
+        """Test the fused computation of filtered ranks from raw scores and a sparse filter."""
+        batch_size, num_entities, num_filtered = 7, 33, 50
+        # use few distinct values to produce ties
+        scores = torch.randint(5, size=(batch_size, num_entities), generator=self.generator).float()
+        scores[0, 1] = float("nan")
+        true_indices = torch.randint(num_entities, size=(batch_size,), generator=self.generator)
+        filter_batch = torch.cat(
+            [
+                torch.stack(
+                    [
+                        torch.randint(batch_size, size=(num_filtered,), generator=self.generator),
+                        torch.randint(num_entities, size=(num_filtered,), generator=self.generator),
+                    ],
+                    dim=-1,
+                ),
+                torch.stack([torch.arange(batch_size), true_indices], dim=-1),
+            ]
+        )
+        # reference: filtering by NaN
+        batch_ids = torch.arange(batch_size)
+        true_scores = scores[batch_ids, true_indices, None]
+        filtered_scores = filter_scores_(scores=scores.clone(), filter_batch=filter_batch)
+        filtered_scores[batch_ids, true_indices] = true_scores[:, 0]
+        expected = Ranks.from_scores(true_score=true_scores, all_scores=filtered_scores)
+        for chunk_size in (None, 1, 4, num_entities):
+            ranks = Ranks.from_filtered_scores(
+                scores=scores, true_indices=true_indices, filter_batch=filter_batch, chunk_size=chunk_size
+            )
+            for key in ("optimistic", "pessimistic", "realistic", "number_of_options"):
+                with self.subTest(chunk_size=chunk_size, key=key):
+                    assert torch.equal(getattr(ranks, key), getattr(expected, key))
+
     def test_create_sparse_positive_filter_(self):
         """Test method create_sparse_positive_filter_."""
         batch_size = 4
@@ -215,6 +349,26 @@ class EvaluatorUtilsTests(unittest.TestCase):
             same = batch[batch_id, 1:]
             assert (int(entity_id),) + tuple(map(int, same)) in triples
 
+    def test_positive_filter_index(self):
+        """Test that the sorted positive filter index agrees with the dense reference implementation."""
+        factory = Nations().training
+        all_triples = factory.mapped_triples
+        batch = all_triples[torch.randperm(all_triples.shape[0], generator=self.generator)[:16]]
+        # include a triple with an entity unknown to the index
+        batch = torch.cat([batch, torch.as_tensor([[0, 0, factory.num_entities + 3]])], dim=0)
+        index = PositiveFilterIndex(mapped_triples=all_triples)
+        for filter_col in (0, 2):
+            expected, _ = create_sparse_positive_filter_(
+                hrt_batch=batch,
+                all_pos_triples=all_triples,
+                filter_col=filter_col,
+            )
+            positives = index.lookup(hrt_batch=batch, filter_col=filter_col)
+            assert positives.shape[1] == 2
+            assert set(map(tuple, positives.tolist())) == set(map(tuple, expected.tolist()))
+        with self.assertRaises(NotImplementedError):
+            index.lookup(hrt_batch=batch, filter_col=1)
+
     def test_create_dense_positive_mask_(self):
         """Test method create_dense_positive_mask_."""
         batch_size = 3
@@ -544,7 +698,29 @@ def test_sample_negatives():
         full_negatives = full_negatives.view(-1, 3)
         negative_set = set(map(tuple, full_negatives.tolist()))
         assert negative_set.isdisjoint(true)
-        # TODO: check no repetitions (if possible)
+        # check no repetitions, unless there are less candidates than negatives
+        for row, triple in zip(negatives.tolist(), evaluation_triples.tolist()):
+            num_candidates = sum(
+                (*triple[:i], e, *triple[i + 1 :]) not in true for e in range(dataset.num_entities)  # noqa: E203
+            )
+            assert len(set(row)) == min(num_negatives, num_candidates)
+
+
+def test_sample_negatives_reproducible():
+    """Test that sample_negatives is reproducible with a random state, and repeats negatives if necessary."""
+    dataset = Nations()
+    num_negatives = dataset.num_entities
+    kwargs = dict(
+        evaluation_triples=dataset.validation.mapped_triples,
+        additional_filter_triples=dataset.training.mapped_triples,
+        num_entities=dataset.num_entities,
+        num_samples=num_negatives,
+    )
+    first = sample_negatives(random_state=42, **kwargs)
+    second = sample_negatives(random_state=42, **kwargs)
+    for side in (LABEL_HEAD, LABEL_TAIL):
+        assert first[side].shape == (dataset.validation.num_triples, num_negatives)
+        assert (first[side] == second[side]).all()
 
 
 class CandidateSetSizeTests(unittest.TestCase):
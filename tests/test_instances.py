@@ -1,9 +1,20 @@
 """Tests for training instances."""
 
+from collections import Counter
 from typing import Any, MutableMapping
 
+import torch
+import unittest_templates
+
+from pykeen.datasets import Nations
 from pykeen.triples import LCWAInstances, SLCWAInstances
-from pykeen.triples.instances import BatchedSLCWAInstances, SubGraphSLCWAInstances
+from pykeen.triples.instances import (
+    BatchedLCWAInstances,
+    BatchedSLCWAInstances,
+    DeviceBatchedSLCWAInstances,
+    FrontierSubGraphSLCWAInstances,
+    SubGraphSLCWAInstances,
+)
 from tests import cases
 
 
@@ -51,3 +62,97 @@ class SubGraphSLCWAInstancesTestCase(cases.BatchSLCWATrainingInstancesTestCase):
     """Tests for subgraph sLCWA training instances."""
 
     cls = SubGraphSLCWAInstances
+
+
+class FrontierSubGraphSLCWAInstancesTestCase(cases.BatchSLCWATrainingInstancesTestCase):
+    """Tests for subgraph sLCWA training instances with the frontier-based sampler."""
+
+    cls = FrontierSubGraphSLCWAInstances
+
+    def test_subgraph_sample(self):
+        """Test that the sampled edges are unique and form coherent components."""
+        triple_ids = self.instance.subgraph_sample()
+        assert len(triple_ids) == self.batch_size == len(set(triple_ids))
+
+    def test_distribution(self):
+        """Test that the distribution agrees with the one of the reference sampler."""
+        # a path a-b-c with an additional edge b-d, and a disconnected edge e-f
+        mapped_triples = torch.as_tensor([[0, 0, 1], [1, 0, 2], [1, 0, 3], [4, 0, 5]])
+        num_samples = 4000
+        distributions = []
+        for cls in (SubGraphSLCWAInstances, FrontierSubGraphSLCWAInstances):
+            torch.manual_seed(42)
+            instance = cls(mapped_triples=mapped_triples, batch_size=2)
+            samples = [tuple(instance.subgraph_sample()) for _ in range(num_samples)]
+            distributions.append(Counter(samples))
+        reference, distribution = distributions
+        assert set(distribution).issubset(reference)
+        for key, count in reference.items():
+            # roughly 4 standard deviations of the relative frequency
+            self.assertAlmostEqual(count / num_samples, distribution[key] / num_samples, delta=0.03)
+
+
+class DeviceBatchedSLCWAInstancesTestCase(cases.BatchSLCWATrainingInstancesTestCase):
+    """Tests for sLCWA training instances created on a device."""
+
+    cls = DeviceBatchedSLCWAInstances
+    kwargs = dict(cases.BatchSLCWATrainingInstancesTestCase.kwargs, device="cpu", prefetch=2)
+
+    def test_epoch(self):
+        """Test that each triple is used exactly once per epoch."""
+        positives = torch.cat([batch.positives for batch in self.instance], dim=0)
+        assert positives.shape == self.factory.mapped_triples.shape
+        assert (positives.unique(dim=0) == self.factory.mapped_triples.unique(dim=0)).all()
+
+    def test_reproducibility(self):
+        """Test that the batches only depend on the random state, even when prefetched."""
+        kwargs = dict(self.kwargs, mapped_triples=self.factory.mapped_triples, prefetch=2, random_state=42)
+        batches = []
+        for _ in range(2):
+            instance = self.cls(**kwargs)
+            # consume the global random state in between, as, e.g., dropout would
+            torch.rand(100)
+            batches.append(list(instance))
+        assert len(batches[0]) == len(batches[1])
+        for batch, other in zip(*batches):
+            assert torch.equal(batch.positives, other.positives)
+            assert torch.equal(batch.negatives, other.negatives)
+
+
+class BatchedLCWAInstancesTestCase(unittest_templates.GenericTestCase[BatchedLCWAInstances]):
+    """Tests for batched LCWA training instances."""
+
+    cls = BatchedLCWAInstances
+    batch_size: int = 3
+    kwargs = dict(batch_size=batch_size, drop_last=False)
+
+    def _pre_instantiation_hook(self, kwargs: MutableMapping[str, Any]) -> MutableMapping[str, Any]:  # noqa: D102
+        kwargs = super()._pre_instantiation_hook(kwargs=kwargs)
+        self.factory = Nations().training
+        self.reference = LCWAInstances.from_triples(
+            mapped_triples=self.factory.mapped_triples,
+            num_entities=self.factory.num_entities,
+            num_relations=self.factory.num_relations,
+        )
+        kwargs["pairs"] = self.reference.pairs
+        kwargs["compressed"] = self.reference.compressed
+        return kwargs
+
+    def test_getitem(self):
+        """Test that the sparse labels agree with the dense ones."""
+        pair_ids = [5, 1, 7]
+        pairs, labels = self.instance[pair_ids]
+        assert labels.is_sparse
+        assert labels.shape == (len(pair_ids), self.factory.num_entities)
+        for pair, row, pair_id in zip(pairs, labels.to_dense(), pair_ids):
+            expected_pair, expected_row = self.reference[pair_id]
+            assert (pair.numpy() == expected_pair).all()
+            assert (row.numpy() == expected_row).all()
+
+    def test_data_loader(self):
+        """Test that each pair is used exactly once per epoch."""
+        batches = list(torch.utils.data.DataLoader(dataset=self.instance, batch_size=None, num_workers=2))
+        pairs = torch.cat([pairs for pairs, _ in batches], dim=0)
+        assert pairs.shape == self.reference.pairs.shape
+        assert (pairs.unique(dim=0).numpy() == self.reference.pairs).all()
+        assert sum(labels._nnz() for _, labels in batches) == self.factory.num_triples
@@ -17,8 +17,10 @@ from pykeen.triples.leakage import (
     _generate_compact_vectorized_lookup,
     _translate_triples,
     get_candidate_pairs,
+    get_candidate_pairs_lsh,
     jaccard_similarity_scipy,
     mapped_triples_to_sparse_matrices,
+    minhash_signatures,
     triples_factory_to_sparse_matrices,
 )
 
@@ -270,3 +272,40 @@ class TestLeakage(unittest.TestCase):
             (5, 2),
         }
         self.assertEqual(expected_candidate_pairs, candidate_pairs)
+
+    def test_minhash_signatures(self):
+        """Test :func:`minhash_signatures`."""
+        rel, _ = triples_factory_to_sparse_matrices(Nations().training)
+        # duplicate a row
+        a = scipy.sparse.vstack([rel, rel.tocsr()[:1]])
+        signatures = minhash_signatures(a, num_permutations=64, random_state=42)
+        # check shape
+        assert signatures.shape == (a.shape[0], 64)
+        # check determinism
+        numpy.testing.assert_array_equal(signatures, minhash_signatures(a, num_permutations=64, random_state=42))
+        # check that identical sets have identical signatures
+        numpy.testing.assert_array_equal(signatures[0], signatures[-1])
+        # check that the agreement of signatures estimates the Jaccard similarity
+        sim = jaccard_similarity_scipy(a=a, b=a)
+        agreement = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=-1)
+        assert numpy.abs(sim - agreement).mean() < 0.05
+
+    def test_candidate_pairs_lsh(self):
+        """Test that :func:`get_candidate_pairs_lsh` finds the same pairs as :func:`get_candidate_pairs`."""
+        rel, inv = triples_factory_to_sparse_matrices(Nations().training)
+        for threshold, b in itt.product((0.3, 0.5, 0.7, 0.97), (None, inv)):
+            with self.subTest(threshold=threshold, inverse=b is not None):
+                self.assertEqual(
+                    get_candidate_pairs(a=rel, b=b, threshold=threshold),
+                    get_candidate_pairs_lsh(a=rel, b=b, threshold=threshold, random_state=42),
+                )
+        with self.assertRaises(ValueError):
+            get_candidate_pairs_lsh(a=rel, threshold=0.5, num_permutations=128, num_rows_per_band=3)
+
+    def test_sealant_lsh(self):
+        """Test that :class:`Sealant` finds the same relations to delete with LSH."""
+        triples_factory = Nations().training
+        exact = Sealant(triples_factory, minimum_frequency=0.5)
+        approximate = Sealant(triples_factory, minimum_frequency=0.5, lsh=True, lsh_kwargs=dict(random_state=42))
+        self.assertEqual(exact.candidates, approximate.candidates)
+        self.assertEqual(exact.relations_to_delete, approximate.relations_to_delete)
@@ -158,6 +158,32 @@ class TestDistMult(cases.ModelTestCase):
         # this is only done in one of the models
         self._test_score_all_triples(k=None)
 
+    def test_score_all_triples_top_k(self):
+        """Test that the top-k triples agree with the ones obtained from scoring all triples."""
+        k = 15
+        all_scores = predict(model=self.instance, k=None).scores
+        for batch_size in (1, 7, None):
+            top_triples, top_scores = predict(model=self.instance, batch_size=batch_size, k=k)
+            assert torch.allclose(top_scores, all_scores[:k])
+            assert torch.allclose(self.instance.predict_hrt(top_triples.clone()).view(-1), top_scores)
+
+    def test_score_all_triples_exclude(self):
+        """Test excluding known triples while collecting the top-k triples."""
+        k = 15
+        top_triples, _ = predict(model=self.instance, batch_size=7, k=k, exclude=self.factory.mapped_triples)
+        assert top_triples.shape == (k, 3)
+        known = set(map(tuple, self.factory.mapped_triples.tolist()))
+        assert not known.intersection(map(tuple, top_triples.tolist()))
+
+    def test_score_all_triples_chunked(self):
+        """Test that chunking along the entity dimension does not change the top-k triples."""
+        k = 15
+        for exclude in (None, self.factory.mapped_triples):
+            expected = predict(model=self.instance, batch_size=7, k=k, exclude=exclude)
+            actual = predict(model=self.instance, batch_size=7, k=k, exclude=exclude, chunk_size=4)
+            assert torch.allclose(actual.scores, expected.scores)
+            assert set(map(tuple, actual.result.tolist())) == set(map(tuple, expected.result.tolist()))
+
 
 class TestDistMA(cases.ModelTestCase):
     """Test the DistMA model."""
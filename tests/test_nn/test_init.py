@@ -185,3 +185,30 @@ class RandomWalkPositionalEncodingInitializerTestCase(cases.InitializerTestCase)
             skip_first_power=False,
         )
         assert torch.allclose(initializer.tensor, rwpe_vectors, rtol=1.0e-03)
+
+
+class MonteCarloRandomWalkPositionalEncodingInitializerTestCase(cases.InitializerTestCase):
+    """Tests for random-walk positional encoding estimated by Monte-Carlo random walks."""
+
+    def setUp(self) -> None:
+        """Prepare for test."""
+        dataset = Nations()
+        self.triples_factory = dataset.training
+        self.kwargs = dict(triples_factory=self.triples_factory, dim=3, num_walks=10_000, random_state=42)
+        self.initializer = pykeen.nn.init.RandomWalkPositionalEncodingInitializer(**self.kwargs)
+        self.num_entities = dataset.num_entities
+        self.shape = self.initializer.tensor.shape[1:]
+
+    def test_exact(self):
+        """Test that the estimate is close to the exact diagonals."""
+        exact = pykeen.nn.init.RandomWalkPositionalEncodingInitializer(triples_factory=self.triples_factory, dim=3)
+        assert self.initializer.tensor.shape == exact.tensor.shape
+        # the standard deviation is at most 0.005
+        assert torch.allclose(self.initializer.tensor, exact.tensor, atol=0.03)
+
+    def test_num_workers(self):
+        """Test that the result does not depend on the number of workers."""
+        kwargs = dict(self.kwargs, num_walks=100, chunk_size=3)
+        expected = pykeen.nn.init.RandomWalkPositionalEncodingInitializer(**kwargs).tensor
+        initializer = pykeen.nn.init.RandomWalkPositionalEncodingInitializer(**kwargs, num_workers=2)
+        assert torch.equal(expected, initializer.tensor)
@@ -58,6 +58,38 @@ class TensorEmbeddingTests(cases.RepresentationTestCase):
     )
 
 
+class SparseEmbeddingTests(cases.RepresentationTestCase):
+    """Tests for Embedding with sparse gradients."""
+
+    cls = pykeen.nn.representation.Embedding
+    kwargs = dict(
+        embedding_dim=13,
+        constrainer="normalize",
+        sparse=True,
+    )
+
+    def test_sparse_gradient(self):
+        """Test that the weights receive a sparse gradient."""
+        self.instance.train()
+        self.instance(indices=torch.as_tensor([1, 3])).sum().backward()
+        assert self.instance._embeddings.weight.grad.is_sparse
+
+    def test_post_parameter_update(self):
+        """Test that the constrainer is only applied to the used rows."""
+        # the first update applies the constraint to all rows
+        self.instance.post_parameter_update()
+        self.instance._embeddings.weight.data *= 2.0
+        self.instance.train()
+        indices = torch.as_tensor([[1, 3], [3, 5]])
+        self.instance(indices=indices).sum().backward()
+        self.instance.post_parameter_update()
+        norms = self.instance._embeddings.weight.data.norm(dim=-1)
+        mask = torch.zeros(self.max_id, dtype=torch.bool)
+        mask[indices.view(-1)] = True
+        assert torch.allclose(norms[mask], torch.ones(1))
+        assert torch.allclose(norms[~mask], torch.full((1,), fill_value=2.0))
+
+
 class RGCNRepresentationTests(cases.TriplesFactoryRepresentationTestCase):
     """Test RGCN representations."""
 
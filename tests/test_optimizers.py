@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for optimizers."""
+
+import unittest
+
+import torch
+
+from pykeen.optimizers import RowWiseAdagrad, optimizer_resolver
+
+
+class RowWiseAdagradTests(unittest.TestCase):
+    """Tests for the row-wise Adagrad optimizer."""
+
+    def setUp(self) -> None:
+        """Prepare the test case."""
+        self.generator = torch.manual_seed(42)
+        self.weight = torch.rand(7, 3, generator=self.generator)
+        self.indices = torch.as_tensor([1, 3, 3, 6])
+
+    def _step(self, sparse: bool) -> torch.FloatTensor:
+        """Perform two optimization steps with embeddings using sparse or dense gradients."""
+        embedding = torch.nn.Embedding.from_pretrained(self.weight.clone(), freeze=False, sparse=sparse)
+        optimizer = RowWiseAdagrad(embedding.parameters(), lr=0.1)
+        for _ in range(2):
+            optimizer.zero_grad()
+            embedding(self.indices).pow(2).sum().backward()
+            optimizer.step()
+        return embedding.weight.detach()
+
+    def test_resolve(self):
+        """Test that the optimizer can be looked up by name."""
+        assert optimizer_resolver.lookup("rowwiseadagrad") is RowWiseAdagrad
+
+    def test_sparse_dense(self):
+        """Test that sparse and dense gradients lead to the same result."""
+        dense = self._step(sparse=False)
+        sparse = self._step(sparse=True)
+        assert torch.allclose(dense, sparse)
+        # only the used rows are changed
+        unused = torch.ones(self.weight.shape[0], dtype=torch.bool)
+        unused[self.indices] = False
+        assert torch.allclose(sparse[unused], self.weight[unused])
+        assert not torch.allclose(sparse[~unused], self.weight[~unused])
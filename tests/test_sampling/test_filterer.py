@@ -8,7 +8,7 @@ import torch
 import unittest_templates
 
 from pykeen.datasets import Nations
-from pykeen.sampling.filtering import BloomFilterer, Filterer, PythonSetFilterer
+from pykeen.sampling.filtering import BloomFilterer, Filterer, PythonSetFilterer, SortedArrayFilterer
 from pykeen.utils import set_random_seed
 
 
@@ -62,6 +62,67 @@ class BloomFiltererTest(FiltererTest):
 
     cls = BloomFilterer
 
+    def test_add(self):
+        """Test adding triples after construction."""
+        num_initial = self.mapped_triples.shape[0] // 2
+        instance = BloomFilterer(
+            mapped_triples=self.mapped_triples[:num_initial], capacity=self.mapped_triples.shape[0]
+        )
+        initial_error_rate = instance.estimated_error_rate
+        instance.add(triples=self.mapped_triples[num_initial:])
+        assert instance.contains(batch=self.mapped_triples).all()
+        assert instance.num_elements == self.mapped_triples.shape[0]
+        assert initial_error_rate <= instance.estimated_error_rate <= 10 * instance.error_rate
+
+    def test_word_fill(self):
+        """Test that the incrementally tracked fill of the words matches the bit array."""
+        num_entities = self.triples_factory.num_entities
+        for _ in range(2):
+            self.instance.add(triples=torch.randint(num_entities, size=(100, 3), generator=self.generator))
+        bits = (self.instance.bit_array.unsqueeze(dim=-1) >> torch.arange(self.instance.word_size)) & 1
+        fill = bits.sum(dim=-1)
+        assert (self.instance.word_fill.long() == fill).all()
+        expected = ((fill.double() / self.instance.word_size) ** self.instance.rounds).mean().item()
+        self.assertAlmostEqual(expected, self.instance.estimated_error_rate)
+
+    def test_add_warns_once(self):
+        """Test that exceeding the error rate is only warned about once."""
+        instance = BloomFilterer(mapped_triples=self.mapped_triples[:10], capacity=10)
+        num_entities = self.triples_factory.num_entities
+        with self.assertLogs("pykeen.sampling.filtering", level="WARNING") as context:
+            for _ in range(3):
+                instance.add(triples=torch.randint(num_entities, size=(1_000, 3), generator=self.generator))
+        assert len(context.records) == 1
+
+    def test_error_rate(self):
+        """Test the estimated error rate against the observed error rate."""
+        num_entities = self.triples_factory.num_entities
+        batch = torch.randint(num_entities, size=(100_000, 3), generator=self.generator) + num_entities
+        observed = self.instance.contains(batch=batch).float().mean().item()
+        self.assertAlmostEqual(observed, self.instance.estimated_error_rate, delta=self.instance.error_rate)
+        assert self.instance.estimated_error_rate <= 2 * self.instance.error_rate
+
+
+class SortedArrayFiltererTest(FiltererTest):
+    """Tests for the sorted array filterer."""
+
+    cls = SortedArrayFilterer
+
+    def test_exact(self):
+        """Test that the filterer agrees with the exact Python set-based filterer."""
+        num_entities, num_relations = self.triples_factory.num_entities, self.triples_factory.num_relations
+        negative_batch = torch.stack(
+            [
+                torch.randint(high=high, size=(self.batch_size, self.num_negs_per_pos), generator=self.generator)
+                for high in (num_entities, num_relations, num_entities)
+            ],
+            dim=-1,
+        )
+        # ensure that there are some positives
+        negative_batch[:, 0] = self.positive_batch
+        reference = PythonSetFilterer(mapped_triples=self.mapped_triples)
+        assert (self.instance(negative_batch=negative_batch) == reference(negative_batch=negative_batch)).all()
+
 
 class FiltererMetaTestCase(unittest_templates.MetaTestCase[Filterer]):
     """Test all filterers are tested."""
@@ -1,9 +1,11 @@
 """Tests for splitting of triples."""
+
 import numpy
 import pytest
 import torch
 
 from pykeen.triples.splitting import (
+    BatchedRandomizedCleaner,
     CleanupSplitter,
     CoverageSplitter,
     DeterministicCleaner,
@@ -176,6 +178,23 @@ class RandomizedCleanerTests(CleanerTestCase):
             self.fail("training was not correct")
 
 
+class BatchedRandomizedCleanerTests(RandomizedCleanerTests):
+    """Tests for the batched randomized cleaner."""
+
+    cls = BatchedRandomizedCleaner
+    kwargs = dict(batch_size=5)
+
+    def test_batch_size(self):
+        """Test that the result does not depend on the batch size."""
+        expected = BatchedRandomizedCleaner(batch_size=None).cleanup_pair(self.reference, self.other, random_state=42)
+        for batch_size in (1, 7):
+            result = BatchedRandomizedCleaner(batch_size=batch_size).cleanup_pair(
+                self.reference, self.other, random_state=42
+            )
+            for x, y in zip(expected, result):
+                assert torch.equal(x, y)
+
+
 class CleanupSplitterTest(SplitterTestCase):
     """Tests for cleanup splitter."""
 
@@ -5,7 +5,6 @@
 import tempfile
 from typing import Any, ClassVar, MutableMapping, Optional, Type
 
-import torch
 import unittest_templates
 from torch.optim import Adam, Optimizer
 
@@ -104,13 +103,15 @@ class TrainingLoopTestCase(unittest_templates.GenericTestCase[TrainingLoop]):
                 loss = super()._process_batch(*args, **kwargs)
                 self.patience -= 1
                 if self.patience < 0:
-                    return torch.as_tensor([float("nan")], device=loss.device, dtype=torch.float32)
+                    # keep the autograd graph, since non-finite checks may be deferred until after the backward pass
+                    return loss * float("nan")
                 return loss
 
         training_loop = NaNTrainingLoop(
             model=model,
             triples_factory=self.triples_factory,
             optimizer=self.optimizer_cls(model.get_grad_params()),
+            **(self.kwargs or {}),
         )
         with self.assertRaises(NonFiniteLossError):
             training_loop.train(
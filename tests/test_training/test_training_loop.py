@@ -2,7 +2,13 @@
 
 """Test for sLCWA and LCWA."""
 
+import numpy.testing
+import torch
+from torch.optim import SparseAdam
+
 from pykeen.losses import MarginRankingLoss, NSSALoss, SoftplusLoss
+from pykeen.models import ERModel, TransE
+from pykeen.optimizers import RowWiseAdagrad
 from pykeen.sampling.filtering import BloomFilterer, PythonSetFilterer
 from pykeen.training import LCWATrainingLoop, SLCWATrainingLoop
 from tests.test_training import cases
@@ -66,6 +72,15 @@ class BloomFilteredSLCWATrainingLoopTestCase(cases.SLCWATrainingLoopTestCase):
     loss_cls = MarginRankingLoss
 
 
+class DeviceSamplingSLCWATrainingLoopTestCase(cases.SLCWATrainingLoopTestCase):
+    """Test sLCWA with filtered negative sampling on the model's device."""
+
+    cls = SLCWATrainingLoop
+    filterer_cls = BloomFilterer
+    loss_cls = MarginRankingLoss
+    kwargs = dict(device_sampling=True, prefetch=2)
+
+
 class MRLossLCWATrainingLoopTestCase(cases.TrainingLoopTestCase):
     """Test LCWA with margin ranking loss."""
 
@@ -85,3 +100,73 @@ class SoftPlusLCWATrainingLoopTestCase(cases.TrainingLoopTestCase):
 
     cls = LCWATrainingLoop
     loss_cls = SoftplusLoss
+
+
+class SparseEmbeddingLCWATrainingLoopTestCase(cases.TrainingLoopTestCase):
+    """Test LCWA with embeddings using sparse gradients."""
+
+    cls = LCWATrainingLoop
+    loss_cls = SoftplusLoss
+    optimizer_cls = RowWiseAdagrad
+
+    def pre_setup_hook(self) -> None:  # noqa: D102
+        super().pre_setup_hook()
+        self.model = ERModel(
+            triples_factory=self.triples_factory,
+            interaction="distmult",
+            entity_representations_kwargs=dict(embedding_dim=8, sparse=True),
+            relation_representations_kwargs=dict(embedding_dim=8, sparse=True),
+            loss=self.loss,
+            random_seed=self.random_seed,
+        )
+        self.optimizer = self.optimizer_cls(self.model.get_grad_params())
+
+    def test_sparse_only_optimizer(self):
+        """Test that an optimizer which only supports sparse gradients is rejected."""
+        with self.assertRaises(ValueError):
+            LCWATrainingLoop(
+                model=self.model,
+                triples_factory=self.triples_factory,
+                optimizer=SparseAdam(self.model.get_grad_params()),
+            )
+
+
+class AsynchronousLossSLCWATrainingLoopTestCase(cases.SLCWATrainingLoopTestCase):
+    """Test sLCWA with loss accumulation on the device and deferred non-finite checks."""
+
+    cls = SLCWATrainingLoop
+    filterer_cls = None
+    loss_cls = MarginRankingLoss
+    kwargs = dict(loss_check_frequency=2)
+
+    def test_loss_equivalence(self):
+        """Test that the epoch losses match those of synchronous loss accumulation."""
+        losses = []
+        for loss_check_frequency in (None, 2):
+            torch.manual_seed(self.random_seed)
+            model = TransE(triples_factory=self.triples_factory, random_seed=self.random_seed)
+            training_loop = SLCWATrainingLoop(
+                model=model,
+                triples_factory=self.triples_factory,
+                automatic_memory_optimization=False,
+                optimizer=self.optimizer_cls(model.get_grad_params()),
+                loss_check_frequency=loss_check_frequency,
+            )
+            losses.append(
+                training_loop.train(
+                    triples_factory=self.triples_factory,
+                    num_epochs=2,
+                    batch_size=self.batch_size,
+                    sub_batch_size=self.sub_batch_size,
+                    use_tqdm=False,
+                )
+            )
+        numpy.testing.assert_allclose(*losses, rtol=1.0e-05)
+
+
+class AsynchronousLossLCWATrainingLoopTestCase(cases.TrainingLoopTestCase):
+    """Test LCWA with loss accumulation on the device, and non-finite checks only at the end of epochs."""
+
+    cls = LCWATrainingLoop
+    loss_cls = SoftplusLoss
+    kwargs = dict(loss_check_frequency=0)
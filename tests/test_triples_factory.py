@@ -3,6 +3,7 @@
 """Unit tests for triples factories."""
 
 import itertools as itt
+import json
 import os
 import tempfile
 import unittest
@@ -476,6 +477,31 @@ class TestUtils(unittest.TestCase):
         _triples = load_triples(path).tolist()
         self.assertEqual(expected_triples, _triples)
 
+    def test_from_path_streaming(self):
+        """Test streaming ingestion of triples from a file against loading it at once."""
+        expected = TriplesFactory.from_path(path=NATIONS_TRAIN_PATH)
+        with tempfile.TemporaryDirectory() as directory:
+            # a small chunk size to enforce multiple chunks and buckets
+            factory = TriplesFactory.from_path_streaming(path=NATIONS_TRAIN_PATH, directory=directory, chunk_size=100)
+            self.assertEqual(expected.entity_to_id, factory.entity_to_id)
+            self.assertEqual(expected.relation_to_id, factory.relation_to_id)
+            self.assertEqual(expected.mapped_triples.tolist(), factory.mapped_triples.tolist())
+            self.assertEqual(["mapped_triples.bin"], os.listdir(directory))
+            del factory
+
+    def test_from_path_streaming_duplicates(self):
+        """Test streaming ingestion of triples with duplicates and candidate inverse relations."""
+        labeled_triples = np.concatenate([triples, triples[::-1], [["susan", f"likes{INVERSE_SUFFIX}", "dish"]]])
+        expected = TriplesFactory.from_labeled_triples(triples=labeled_triples)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory).joinpath("triples.tsv")
+            np.savetxt(path, labeled_triples, fmt="%s", delimiter="\t")
+            factory = TriplesFactory.from_path_streaming(path=path, directory=directory, chunk_size=2)
+            self.assertEqual(expected.entity_to_id, factory.entity_to_id)
+            self.assertEqual(expected.relation_to_id, factory.relation_to_id)
+            self.assertEqual(expected.mapped_triples.tolist(), factory.mapped_triples.tolist())
+            del factory
+
     def test_labeled_binary(self):
         """Test binary i/o on labeled triples factory."""
         tf1 = Nations().training
@@ -498,6 +524,18 @@ class TestUtils(unittest.TestCase):
             # check for equality
             self.assert_tf_equal(tf, tf2)
 
+    def test_binary_version(self):
+        """Test that newer versions of the binary format are rejected."""
+        tf = Nations().training
+        with tempfile.TemporaryDirectory() as directory:
+            path = tf.to_path_binary(directory)
+            header_path = path.joinpath(TriplesFactory.header_file_name)
+            header = json.loads(header_path.read_text())
+            header["version"] = TriplesFactory.binary_format_version + 1
+            header_path.write_text(json.dumps(header))
+            with self.assertRaises(ValueError):
+                TriplesFactory.from_path_binary(path)
+
     def assert_tf_equal(self, tf1, tf2) -> None:
         """Check two triples factories have all of the same stuff."""
         # TODO: this could be (Core)TriplesFactory.__equal__